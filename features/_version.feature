@@ -162,7 +162,10 @@ Feature: Pro is expected version
           sudo apt install ubuntu-pro-client
       to get the latest bug fixes and new features.
       """
-    And I verify that files exist matching `/run/ubuntu-advantage/candidate-version`
+    # The candidate is only looked up in the background, never by commands
+    And I verify that no files exist matching `/run/ubuntu-advantage/candidate-version`
+    When I run `pro refresh messages` with sudo
+    Then I verify that files exist matching `/run/ubuntu-advantage/candidate-version`
     # We forge a candidate to see results
     When I delete the file `/run/ubuntu-advantage/candidate-version`
     And I create the file `/run/ubuntu-advantage/candidate-version` with the following:
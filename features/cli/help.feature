@@ -6,7 +6,7 @@ Feature: Pro Client help text
     When I run `pro --help` as non-root
     Then I will see the following on stdout:
       """
-      usage: pro [-h] [--debug] [--version] <command> ...
+      usage: pro [-h] [--debug] [--profile FILE] [--version] <command> ...
 
       Quick start commands:
 
@@ -39,6 +39,7 @@ Feature: Pro Client help text
 
         -h, --help       Displays help on pro and command line options
         --debug          show all debug log messages to console
+        --profile FILE   write a trace of where time is spent to FILE
         --version        show version of pro
 
       Use pro <command> --help for more information about a command.
@@ -47,7 +48,7 @@ Feature: Pro Client help text
     When I run `pro help` as non-root
     Then I will see the following on stdout:
       """
-      usage: pro [-h] [--debug] [--version] <command> ...
+      usage: pro [-h] [--debug] [--profile FILE] [--version] <command> ...
 
       Quick start commands:
 
@@ -80,6 +81,7 @@ Feature: Pro Client help text
 
         -h, --help       Displays help on pro and command line options
         --debug          show all debug log messages to console
+        --profile FILE   write a trace of where time is spent to FILE
         --version        show version of pro
 
       Use pro <command> --help for more information about a command.
@@ -113,7 +115,7 @@ Feature: Pro Client help text
     When I run `pro api --help` as non-root
     Then stdout matches regexp:
       """
-      usage: pro api \[-h\] \[--show-progress\] \[--args \[OPTIONS .*\]\](.|\n)*\[--data DATA\](.|\n)*
+      usage: pro api \[-h\] \[--show-progress\] \[--stream\] \[--args \[OPTIONS .*\]\](.|\n)*\[--data DATA\](.|\n)*
                      endpoint
 
       Calls the Client API endpoints.
@@ -130,9 +132,13 @@ Feature: Pro Client help text
         -h, --help            show this help message and exit
         --show-progress       For endpoints that support progress updates, show each(.|\n)*
                               progress update on a new line in JSON format
+        --stream              For endpoints that support streaming, print each(.|\n)*
+                              record on a new line in JSON format as soon as it is(.|\n)*
         --args \[OPTIONS .*\](.|\n)*Options to pass to the API endpoint, formatted as(.|\n)*
                               key=value
         --data DATA           arguments in JSON format to the API endpoint
+        --output OUTPUT       For endpoints that support it, write the raw result(.|\n)*
+        --compress            gzip-compress the result written to --output
       """
     When I run `pro disable --help` as non-root
     Then I will see the following on stdout:
@@ -635,7 +641,7 @@ Feature: Pro Client help text
     When I verify that running `pro --no-command` `with sudo` exits `2`
     Then I will see the following on stderr:
       """
-      usage: pro [-h] [--debug] [--version] <command> ...
+      usage: pro [-h] [--debug] [--profile FILE] [--version] <command> ...
       pro: error: the following arguments are required: <command>
       """
 
@@ -1,11 +1,15 @@
+import asyncio
 import logging
 import os
 import sys
-import time
 
 from uaclient import http, log, system
 from uaclient.config import UAConfig
-from uaclient.daemon import poll_for_pro_license, retry_auto_attach
+from uaclient.daemon import (
+    poll_for_pro_license,
+    retry_auto_attach,
+    run_until_complete,
+)
 
 LOG = logging.getLogger("ubuntupro.daemon")
 
@@ -15,11 +19,21 @@ WAIT_FOR_CLOUD_CONFIG_SLEEP_TIME = 10
 WAIT_FOR_CLOUD_CONFIG_POLL_TIMES = 120
 
 
-def _wait_for_cloud_config():
+async def _wait_for_cloud_config(cloud_config_ready: asyncio.Event):
+    try:
+        await _poll_cloud_config()
+    finally:
+        cloud_config_ready.set()
+
+
+async def _poll_cloud_config():
     LOG.debug("waiting for cloud-config.service to finish")
     for i in range(WAIT_FOR_CLOUD_CONFIG_POLL_TIMES + 1):
-        state = system.get_systemd_unit_active_state("cloud-config.service")
-        ci_state = system.get_systemd_unit_active_state("cloud-init.service")
+        states = system.get_systemd_units_active_states(
+            ["cloud-config.service", "cloud-init.service"]
+        )
+        state = states["cloud-config.service"]
+        ci_state = states["cloud-init.service"]
         LOG.debug("cloud-config.service state: %r", state)
         LOG.debug("cloud-init.service state: %r", ci_state)
         # if cloud-config.service is not yet activating but cloud-init is
@@ -33,7 +47,7 @@ def _wait_for_cloud_config():
                     "cloud-config.service is activating. "
                     "waiting to check again."
                 )
-                time.sleep(WAIT_FOR_CLOUD_CONFIG_SLEEP_TIME)
+                await asyncio.sleep(WAIT_FOR_CLOUD_CONFIG_SLEEP_TIME)
             else:
                 LOG.warning(
                     "cloud-config.service is still activating after "
@@ -45,6 +59,37 @@ def _wait_for_cloud_config():
             return
 
 
+async def _run(cfg: UAConfig):
+    # The license polling starts right away, alongside the cloud-config
+    # checks: only the auto attach itself needs to wait for cloud-config.
+    # The retry mode is decided once cloud-config is done, as a failed auto
+    # attach in cloud-config is what creates the flag file.
+    cloud_config_ready = asyncio.Event()
+    cloud_config_task = asyncio.ensure_future(
+        _wait_for_cloud_config(cloud_config_ready)
+    )
+    try:
+        LOG.debug("checking for condition files")
+        is_correct_cloud = any(
+            os.path.exists("/run/cloud-init/cloud-id-{}".format(cloud))
+            for cloud in ("gce", "azure", "lxd")
+        )
+        if is_correct_cloud and not os.path.exists(
+            retry_auto_attach.FLAG_FILE_PATH
+        ):
+            LOG.info("mode: poll for pro license")
+            await poll_for_pro_license.poll(cfg, cloud_config_ready)
+
+        # not using elif because `poll` may create the flag file
+
+        await cloud_config_ready.wait()
+        if os.path.exists(retry_auto_attach.FLAG_FILE_PATH):
+            LOG.info("mode: retry auto attach")
+            await retry_auto_attach.retry(cfg, cloud_config_ready)
+    finally:
+        cloud_config_task.cancel()
+
+
 def main() -> int:
     log.setup_journald_logging()
 
@@ -54,24 +99,7 @@ def main() -> int:
 
     LOG.info("daemon starting")
 
-    _wait_for_cloud_config()
-
-    LOG.debug("checking for condition files")
-    is_correct_cloud = any(
-        os.path.exists("/run/cloud-init/cloud-id-{}".format(cloud))
-        for cloud in ("gce", "azure", "lxd")
-    )
-    if is_correct_cloud and not os.path.exists(
-        retry_auto_attach.FLAG_FILE_PATH
-    ):
-        LOG.info("mode: poll for pro license")
-        poll_for_pro_license.poll_for_pro_license(cfg)
-
-    # not using elif because `poll_for_pro_license` may create the flag file
-
-    if os.path.exists(retry_auto_attach.FLAG_FILE_PATH):
-        LOG.info("mode: retry auto attach")
-        retry_auto_attach.retry_auto_attach(cfg)
+    run_until_complete(_run(cfg))
 
     LOG.info("daemon ending")
     return 0
@@ -5,6 +5,7 @@ import logging
 from uaclient import log
 from uaclient.apt import update_esm_caches
 from uaclient.config import UAConfig
+from uaclient.version import update_candidate_version_cache
 
 LOG = logging.getLogger("ubuntupro.lib.esm_cache")
 
@@ -16,6 +17,13 @@ def main(cfg: UAConfig) -> None:
         msg = getattr(e, "msg", str(e))
         LOG.error("Error updating the cache: %s", msg)
 
+    # apt just refreshed its lists, so this is the right moment to look up
+    # the ubuntu-pro-client candidate version in the background
+    try:
+        update_candidate_version_cache()
+    except Exception as e:
+        LOG.warning("Error updating the candidate version cache: %s", str(e))
+
 
 if __name__ == "__main__":
     log.setup_journald_logging()
@@ -6,7 +6,7 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import Callable, Optional
 
-from uaclient import http, log
+from uaclient import http, log, status, version
 from uaclient.config import UAConfig
 from uaclient.exceptions import (
     InvalidFileEncodingError,
@@ -19,7 +19,7 @@ from uaclient.files.state_files import (
     timer_jobs_state_file,
 )
 from uaclient.timer.metering import metering_enabled_resources
-from uaclient.timer.update_messaging import update_motd_messages
+from uaclient.timer.update_messaging import update_motd_messages_on_change
 
 LOG = logging.getLogger("ubuntupro.timer")
 UPDATE_MESSAGING_INTERVAL = 21600  # 6 hours
@@ -113,7 +113,7 @@ class MeteringTimedJob(TimedJob):
 metering_job = MeteringTimedJob(metering_enabled_resources, METERING_INTERVAL)
 update_message_job = TimedJob(
     "update_messaging",
-    update_motd_messages,
+    update_motd_messages_on_change,
     UPDATE_MESSAGING_INTERVAL,
 )
 
@@ -186,3 +186,13 @@ if __name__ == "__main__":
     http.configure_web_proxy(cfg.http_proxy, cfg.https_proxy)
 
     run_jobs(cfg=cfg, current_time=current_time)
+
+    try:
+        status.update_status_snapshot(cfg)
+    except Exception as e:
+        LOG.warning("Error updating the status snapshot: %s", str(e))
+
+    try:
+        version.update_candidate_version_cache()
+    except Exception as e:
+        LOG.warning("Error updating the candidate version cache: %s", str(e))
@@ -58,6 +58,7 @@ setuptools.setup(
     packages=setuptools.find_packages(
         exclude=[
             "*.testing",
+            "*.benchmarks",
             "tests.*",
             "*.tests",
             "tests",
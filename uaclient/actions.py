@@ -1,11 +1,15 @@
 import datetime
 import glob
+import io
 import json
 import logging
 import os
 import re
 import shutil
-from typing import List, Optional
+import stat
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple  # noqa: F401
 
 from uaclient import (
     api,
@@ -52,6 +56,11 @@ UA_SERVICES = (
 )
 
 USER_LOG_COLLECTED_LIMIT = 10
+# Number of commands run at the same time when collecting logs
+COLLECT_LOGS_MAX_WORKERS = 4
+# Log files are redacted in chunks of roughly this many characters, which
+# bounds the memory used to collect them regardless of their size
+COLLECT_LOGS_CHUNK_SIZE = 1024 * 1024
 
 
 def _handle_partial_attach(
@@ -355,44 +364,132 @@ def _get_state_files(cfg: config.UAConfig):
     ]
 
 
+def _redact_line(line: str) -> str:
+    content = line.rstrip("\n")
+    return util.redact_sensitive_logs(content) + line[len(content) :]
+
+
+def _write_redacted_file(
+    source: str, destination: str, overwrite_source: bool = False
+) -> None:
+    """Copy source to destination, redacting sensitive information.
+
+    The file is processed in chunks of whole lines, so that the memory
+    used does not depend on the size of the file. Redaction never spans
+    more than one line.
+
+    @param source: The path of the log file to redact.
+    @param destination: The path where the redacted content is written.
+    @param overwrite_source: If True, also replace the original file with
+        the redacted content, keeping its permissions and ownership.
+    """
+    source_dir = os.path.dirname(source) or "."
+    source_stat = os.stat(source)
+    tmpf = tempfile.NamedTemporaryFile(
+        mode="w",
+        encoding="utf-8",
+        delete=False,
+        dir=source_dir if overwrite_source else os.path.dirname(destination),
+    )
+    try:
+        with tmpf, io.open(source, "r", encoding="utf-8") as stream:
+            LOG.debug("Redacting file %s into %s", source, tmpf.name)
+            while True:
+                lines = stream.readlines(COLLECT_LOGS_CHUNK_SIZE)
+                if not lines:
+                    break
+                chunk = "".join(lines)
+                if util.redact_sensitive_logs(chunk) != chunk:
+                    # Some patterns can match across newlines, so redact
+                    # line by line to never consume the following lines
+                    chunk = "".join(_redact_line(line) for line in lines)
+                tmpf.write(chunk)
+
+        if overwrite_source:
+            shutil.copyfile(tmpf.name, destination)
+            os.chmod(tmpf.name, stat.S_IMODE(source_stat.st_mode))
+            os.chown(tmpf.name, source_stat.st_uid, source_stat.st_gid)
+            os.rename(tmpf.name, source)
+        else:
+            os.chmod(tmpf.name, 0o644)
+            os.rename(tmpf.name, destination)
+    except Exception:
+        if os.path.exists(tmpf.name):
+            os.unlink(tmpf.name)
+        raise
+
+
 def collect_logs(cfg: config.UAConfig, output_dir: str):
     """
     Write all relevant Ubuntu Pro logs to the specified directory
     """
-    _write_command_output_to_file(
-        "cloud-id", "{}/cloud-id.txt".format(output_dir)
-    )
-    _write_command_output_to_file(
-        "{} status".format(livepatch.LIVEPATCH_CMD),
-        "{}/livepatch-status.txt".format(output_dir),
-    )
-    _write_command_output_to_file(
-        "systemctl list-timers --all",
-        "{}/systemd-timers.txt".format(output_dir),
-    )
-    _write_command_output_to_file(
+    commands = [
+        ("cloud-id", "{}/cloud-id.txt".format(output_dir), None),
         (
-            "journalctl --boot=0 -o short-precise "
-            "-u cloud-init-local.service "
-            "-u cloud-init-config.service "
-            "-u cloud-config.service"
+            "{} status".format(livepatch.LIVEPATCH_CMD),
+            "{}/livepatch-status.txt".format(output_dir),
+            None,
         ),
-        "{}/cloud-init-journal.txt".format(output_dir),
-    )
-    _write_command_output_to_file(
-        ("journalctl -o short-precise " "{}").format(
-            " ".join(
-                ["-u {}".format(s) for s in UA_SERVICES if ".service" in s]
+        (
+            "systemctl list-timers --all",
+            "{}/systemd-timers.txt".format(output_dir),
+            None,
+        ),
+        (
+            (
+                "journalctl --boot=0 -o short-precise "
+                "-u cloud-init-local.service "
+                "-u cloud-init-config.service "
+                "-u cloud-config.service"
+            ),
+            "{}/cloud-init-journal.txt".format(output_dir),
+            None,
+        ),
+        (
+            ("journalctl -o short-precise " "{}").format(
+                " ".join(
+                    ["-u {}".format(s) for s in UA_SERVICES if ".service" in s]
+                )
+            ),
+            "{}/pro-journal.txt".format(output_dir),
+            None,
+        ),
+        *(
+            (
+                "systemctl status {}".format(service),
+                "{}/{}.txt".format(output_dir, service),
+                [0, 3],
             )
+            for service in UA_SERVICES
         ),
-        "{}/pro-journal.txt".format(output_dir),
-    )
-    for service in UA_SERVICES:
-        _write_command_output_to_file(
-            "systemctl status {}".format(service),
-            "{}/{}.txt".format(output_dir, service),
-            return_codes=[0, 3],
+    ]  # type: List[Tuple[str, str, Optional[List[int]]]]
+
+    # The commands and the kernel logs don't depend on each other nor on the
+    # log files below, so they run in the background while we process those
+    with ThreadPoolExecutor(max_workers=COLLECT_LOGS_MAX_WORKERS) as executor:
+        futures = [
+            executor.submit(
+                _write_command_output_to_file, cmd, filename, return_codes
+            )
+            for cmd, filename, return_codes in commands
+        ]
+        futures.append(
+            executor.submit(
+                _write_apparmor_logs_to_file,
+                "{}/apparmor_logs.txt".format(output_dir),
+            )
         )
+
+        _collect_log_files(cfg, output_dir)
+
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                LOG.warning("Failed to collect command output: %s", str(e))
+
+
+def _collect_log_files(cfg: config.UAConfig, output_dir: str):
     pro_status, _ = status(cfg=cfg, show_all=False)
     system.write_file(
         "{}/pro-status.json".format(output_dir),
@@ -417,10 +514,9 @@ def collect_logs(cfg: config.UAConfig, output_dir: str):
             LOG.warning("Skipping symlinked user log file: %s", log_file)
             continue
         try:
-            content = util.redact_sensitive_logs(system.load_file(log_file))
-            system.write_file(
+            _write_redacted_file(
+                log_file,
                 os.path.join(output_dir, "user{}.log".format(log_file_idx)),
-                content,
             )
         except Exception as e:
             LOG.warning(
@@ -431,24 +527,18 @@ def collect_logs(cfg: config.UAConfig, output_dir: str):
     for f in state_files + glob.glob(DEFAULT_LOG_PREFIX + "*"):
         if os.path.isfile(f):
             try:
-                content = system.load_file(f)
+                # if root, overwrite the original with redacted content
+                _write_redacted_file(
+                    f,
+                    os.path.join(output_dir, os.path.basename(f)),
+                    overwrite_source=util.we_are_currently_root(),
+                )
             except Exception as e:
                 # If we fail to load that file for any reason we will
                 # not break the command, we will instead warn the user
                 # about the issue and try to process the other files
                 LOG.warning("Failed to load file: %s\n%s", f, str(e))
                 continue
-            content = util.redact_sensitive_logs(content)
-            if util.we_are_currently_root():
-                # if root, overwrite the original with redacted content
-                system.write_file(f, content)
-
-            system.write_file(
-                os.path.join(output_dir, os.path.basename(f)), content
-            )
-
-    # get apparmor logs
-    _write_apparmor_logs_to_file("{}/apparmor_logs.txt".format(output_dir))
 
     # include apparmor profiles
     for f in APPARMOR_PROFILES:
@@ -1,11 +1,12 @@
 import json
 from importlib import import_module
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+from uaclient import profiling
 from uaclient.api import AbstractProgress, errors
 from uaclient.api.data_types import APIData, APIResponse, ErrorWarningObject
 from uaclient.config import UAConfig
-from uaclient.data_types import IncorrectFieldTypeError
+from uaclient.data_types import DataObject, IncorrectFieldTypeError
 from uaclient.messages import API_UNKNOWN_ARG, WARN_NEW_VERSION_AVAILABLE
 from uaclient.version import check_for_new_version
 
@@ -95,6 +96,43 @@ def _process_data(
     return kwargs, warnings
 
 
+def _get_endpoint_options(
+    endpoint_path: str, endpoint, options: List[str], data: str
+) -> Tuple[Any, List[ErrorWarningObject]]:
+    if not endpoint.options_cls:
+        if options or data:
+            raise errors.APINoArgsForEndpoint(endpoint=endpoint_path)
+        return None, []
+
+    fields = [f.key for f in endpoint.options_cls.fields]
+    if options:
+        kwargs, warnings = _process_options(options, fields)
+    elif data:
+        kwargs, warnings = _process_data(data, fields)
+    else:
+        kwargs, warnings = {}, []
+
+    try:
+        return endpoint.options_cls.from_dict(kwargs), warnings
+    except IncorrectFieldTypeError as e:
+        raise errors.APIMissingArg(arg=e.key, endpoint=endpoint_path)
+
+
+def _get_new_version_warnings() -> List[ErrorWarningObject]:
+    new_version = check_for_new_version()
+    if new_version:
+        return [
+            ErrorWarningObject(
+                title=WARN_NEW_VERSION_AVAILABLE.format(
+                    version=new_version
+                ).msg,
+                code=WARN_NEW_VERSION_AVAILABLE.name,
+                meta={},
+            )
+        ]
+    return []
+
+
 def call_api(
     endpoint_path: str,
     options: List[str],
@@ -111,66 +149,32 @@ def call_api(
     module = import_module("uaclient.api." + endpoint_path)
     endpoint = module.endpoint
 
-    option_warnings = []
+    try:
+        endpoint_options, option_warnings = _get_endpoint_options(
+            endpoint_path, endpoint, options, data
+        )
+    except errors.APIError as e:
+        return errors.error_out(e)
 
     if endpoint.options_cls:
-        fields = [f.key for f in endpoint.options_cls.fields]
-        try:
-            if options:
-                kwargs, warnings = _process_options(options, fields)
-            elif data:
-                kwargs, warnings = _process_data(data, fields)
-            else:
-                kwargs, warnings = {}, []
-            option_warnings.extend(warnings)
-        except errors.APIError as e:
-            return errors.error_out(e)
-
-        try:
-            options = endpoint.options_cls.from_dict(kwargs)
-        except IncorrectFieldTypeError as e:
-            return errors.error_out(
-                errors.APIMissingArg(arg=e.key, endpoint=endpoint_path)
-            )
-
-        try:
-            if endpoint.supports_progress:
-                result = endpoint.fn(
-                    options, cfg, progress_object=progress_object
-                )
-            else:
-                result = endpoint.fn(options, cfg)
-        except Exception as e:
-            return errors.error_out(e)
-
+        fn_args = [endpoint_options, cfg]
     else:
-        if options or data:
-            return errors.error_out(
-                errors.APINoArgsForEndpoint(endpoint=endpoint_path)
-            )
-        try:
+        fn_args = [cfg]
+
+    try:
+        with profiling.span("api.call_api", endpoint=endpoint_path):
             if endpoint.supports_progress:
-                result = endpoint.fn(cfg, progress_object=progress_object)
+                result = endpoint.fn(*fn_args, progress_object=progress_object)
             else:
-                result = endpoint.fn(cfg)
-        except Exception as e:
-            return errors.error_out(e)
-
-    new_version = check_for_new_version()
-    if new_version:
-        option_warnings.append(
-            ErrorWarningObject(
-                title=WARN_NEW_VERSION_AVAILABLE.format(
-                    version=new_version
-                ).msg,
-                code=WARN_NEW_VERSION_AVAILABLE.name,
-                meta={},
-            )
-        )
+                result = endpoint.fn(*fn_args)
+    except Exception as e:
+        return errors.error_out(e)
 
     return APIResponse(
         _schema_version=endpoint.version,
-        warnings=result.warnings + option_warnings,
+        warnings=result.warnings
+        + option_warnings
+        + _get_new_version_warnings(),
         data=APIData(
             type=endpoint.name,
             attributes=result,
@@ -179,6 +183,115 @@ def call_api(
     )
 
 
+def stream_api(
+    endpoint_path: str,
+    options: List[str],
+    data: str,
+    cfg: UAConfig,
+) -> Iterator[DataObject]:
+    """
+    Calls an endpoint that supports streaming, yielding its records as soon
+    as they are produced.
+
+    Every record is an APIStreamRecord. The last object yielded is always an
+    APIResponse without attributes, carrying the result, errors, warnings and
+    meta of the whole call. If the call fails midway, the records already
+    yielded are followed by a failure APIResponse.
+    """
+    if endpoint_path not in VALID_ENDPOINTS:
+        yield errors.error_out(
+            errors.APIInvalidEndpoint(endpoint=endpoint_path)
+        )
+        return
+
+    module = import_module("uaclient.api." + endpoint_path)
+    endpoint = module.endpoint
+
+    if endpoint.stream_fn is None:
+        yield errors.error_out(
+            errors.APIStreamNotSupported(endpoint=endpoint_path)
+        )
+        return
+
+    try:
+        endpoint_options, option_warnings = _get_endpoint_options(
+            endpoint_path, endpoint, options, data
+        )
+    except errors.APIError as e:
+        yield errors.error_out(e)
+        return
+
+    if endpoint.options_cls:
+        fn_args = [endpoint_options, cfg]
+    else:
+        fn_args = [cfg]
+
+    try:
+        for record in endpoint.stream_fn(*fn_args):
+            yield record
+    except Exception as e:
+        yield errors.error_out(e)
+        return
+
+    yield APIResponse(
+        _schema_version=endpoint.version,
+        warnings=option_warnings + _get_new_version_warnings(),
+        data=APIData(type=endpoint.name, attributes=None, meta={}),
+    )
+
+
+def write_api(
+    endpoint_path: str,
+    options: List[str],
+    data: str,
+    cfg: UAConfig,
+    output_path: Optional[str] = None,
+    compress: bool = False,
+) -> APIResponse:
+    """
+    Calls an endpoint that supports writing its raw result directly to
+    output_path, or to stdout if no path is given, optionally gzip-compressed.
+
+    The returned APIResponse has no attributes: it only carries the result,
+    errors, warnings and meta of the call.
+    """
+    if endpoint_path not in VALID_ENDPOINTS:
+        return errors.error_out(
+            errors.APIInvalidEndpoint(endpoint=endpoint_path)
+        )
+
+    module = import_module("uaclient.api." + endpoint_path)
+    endpoint = module.endpoint
+
+    if endpoint.write_fn is None:
+        return errors.error_out(
+            errors.APIWriteNotSupported(endpoint=endpoint_path)
+        )
+
+    try:
+        endpoint_options, option_warnings = _get_endpoint_options(
+            endpoint_path, endpoint, options, data
+        )
+    except errors.APIError as e:
+        return errors.error_out(e)
+
+    if endpoint.options_cls:
+        fn_args = [endpoint_options, cfg]
+    else:
+        fn_args = [cfg]
+
+    try:
+        endpoint.write_fn(*fn_args, output_path=output_path, compress=compress)
+    except Exception as e:
+        return errors.error_out(e)
+
+    return APIResponse(
+        _schema_version=endpoint.version,
+        warnings=option_warnings + _get_new_version_warnings(),
+        data=APIData(type=endpoint.name, attributes=None, meta={}),
+    )
+
+
 class APIEndpoint:
     def __init__(
         self,
@@ -187,9 +300,13 @@ class APIEndpoint:
         fn: Callable,
         options_cls,
         supports_progress: bool = False,
+        stream_fn: Optional[Callable] = None,
+        write_fn: Optional[Callable] = None,
     ):
         self.version = version
         self.name = name
         self.fn = fn
         self.options_cls = options_cls
         self.supports_progress = supports_progress
+        self.stream_fn = stream_fn
+        self.write_fn = write_fn
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Union  # noqa: F401
+from typing import Any, Dict, List, Optional, Union  # noqa: F401
 
 from uaclient.data_types import DataObject, Field, StringDataValue, data_list
 from uaclient.util import get_pro_environment
@@ -30,7 +30,9 @@ class APIData(DataObject):
         Field("meta", DataObject),
     ]
 
-    def __init__(self, *, type: str, attributes: DataObject, meta: dict):
+    def __init__(
+        self, *, type: str, attributes: Optional[DataObject], meta: dict
+    ):
         self.type = type
         self.attributes = attributes
         self.meta = {
@@ -67,3 +69,18 @@ class APIResponse(DataObject):
         self.errors = errors
         self.warnings = warnings
         self.data = data
+
+
+class APIStreamRecord(DataObject):
+    fields = [
+        Field("type", StringDataValue),
+        Field("id", StringDataValue, required=False),
+        Field("attributes", DataObject),
+    ]
+
+    def __init__(
+        self, *, type: str, attributes: DataObject, id: Optional[str] = None
+    ):
+        self.type = type
+        self.id = id
+        self.attributes = attributes
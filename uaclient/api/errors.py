@@ -71,3 +71,11 @@ class APIJSONDataFormatError(APIError):
 
 class APIBadArgsFormat(APIError):
     _formatted_msg = messages.E_API_BAD_ARGS_FORMAT
+
+
+class APIStreamNotSupported(APIError):
+    _formatted_msg = messages.E_API_STREAM_NOT_SUPPORTED
+
+
+class APIWriteNotSupported(APIError):
+    _formatted_msg = messages.E_API_WRITE_NOT_SUPPORTED
@@ -3,8 +3,12 @@ import pytest
 
 from uaclient import exceptions
 from uaclient.api import errors
-from uaclient.api.api import call_api
-from uaclient.api.data_types import APIResponse, ErrorWarningObject
+from uaclient.api.api import call_api, stream_api, write_api
+from uaclient.api.data_types import (
+    APIResponse,
+    APIStreamRecord,
+    ErrorWarningObject,
+)
 from uaclient.data_types import IncorrectFieldTypeError
 from uaclient.messages import (
     API_UNKNOWN_ARG,
@@ -12,6 +16,8 @@ from uaclient.messages import (
     E_API_INVALID_ENDPOINT,
     E_API_MISSING_ARG,
     E_API_NO_ARG_FOR_ENDPOINT,
+    E_API_STREAM_NOT_SUPPORTED,
+    E_API_WRITE_NOT_SUPPORTED,
     WARN_NEW_VERSION_AVAILABLE,
 )
 from uaclient.testing import fakes
@@ -403,3 +409,172 @@ class TestAPICall:
         )
         assert m_error_out.call_args[0][0].msg == exception.msg
         assert m_error_out.call_args[0][0].msg_code == exception.msg_code
+
+
+class TestAPIStream:
+    @mock.patch("uaclient.api.errors.error_out")
+    @mock.patch("uaclient.api.api.import_module")
+    def test_endpoint_without_stream_support(
+        self, m_import_module, m_error_out, FakeConfig
+    ):
+        mock_endpoint = mock.MagicMock(stream_fn=None)
+        m_import_module.return_value.endpoint = mock_endpoint
+
+        with mock.patch(
+            "uaclient.api.api.VALID_ENDPOINTS", ["example_endpoint"]
+        ):
+            result = list(stream_api("example_endpoint", [], "", FakeConfig()))
+
+        assert [m_error_out.return_value] == result
+        arg = m_error_out.call_args[0][0]
+        assert isinstance(arg, errors.APIStreamNotSupported)
+        assert (
+            arg.msg
+            == E_API_STREAM_NOT_SUPPORTED.format(
+                endpoint="example_endpoint"
+            ).msg
+        )
+        assert mock_endpoint.fn.call_count == 0
+
+    @pytest.mark.parametrize(
+        ["options_cls", "arguments"],
+        ((None, []), (mock.MagicMock(), ["key=value"])),
+    )
+    @mock.patch("uaclient.api.api.check_for_new_version", return_value=None)
+    @mock.patch("uaclient.api.api.import_module")
+    def test_stream_endpoint(
+        self,
+        m_import_module,
+        _m_new_version_api,
+        options_cls,
+        arguments,
+        FakeConfig,
+    ):
+        records = [
+            APIStreamRecord(type="Record", id=str(i), attributes=mock.ANY)
+            for i in range(3)
+        ]
+        mock_endpoint = mock.MagicMock(options_cls=options_cls)
+        mock_endpoint.name = "Example"
+        mock_endpoint.version = "v1"
+        mock_endpoint.stream_fn.return_value = iter(records)
+        m_import_module.return_value.endpoint = mock_endpoint
+        cfg = FakeConfig()
+
+        with mock.patch(
+            "uaclient.api.api.VALID_ENDPOINTS", ["example_endpoint"]
+        ):
+            result = list(stream_api("example_endpoint", arguments, "", cfg))
+
+        assert records == result[:-1]
+        response = result[-1]
+        assert isinstance(response, APIResponse)
+        assert response.result == "success"
+        assert response._schema_version == "v1"
+        assert response.data.type == "Example"
+        assert response.data.attributes is None
+        assert mock_endpoint.fn.call_count == 0
+        if options_cls:
+            assert mock_endpoint.stream_fn.call_args_list == [
+                mock.call(options_cls.from_dict.return_value, cfg)
+            ]
+        else:
+            assert mock_endpoint.stream_fn.call_args_list == [mock.call(cfg)]
+
+    @mock.patch("uaclient.api.errors.error_out")
+    @mock.patch("uaclient.api.api.import_module")
+    def test_stream_endpoint_error_midway(
+        self, m_import_module, m_error_out, FakeConfig
+    ):
+        exception = fakes.FakeUbuntuProError()
+        record = APIStreamRecord(type="Record", attributes=mock.ANY)
+
+        def stream_fn(cfg):
+            yield record
+            raise exception
+
+        mock_endpoint = mock.MagicMock(options_cls=None, stream_fn=stream_fn)
+        m_import_module.return_value.endpoint = mock_endpoint
+
+        with mock.patch(
+            "uaclient.api.api.VALID_ENDPOINTS", ["example_endpoint"]
+        ):
+            result = list(stream_api("example_endpoint", [], "", FakeConfig()))
+
+        assert [record, m_error_out.return_value] == result
+        assert m_error_out.call_args_list == [mock.call(exception)]
+
+
+class TestAPIWrite:
+    @mock.patch("uaclient.api.errors.error_out")
+    @mock.patch("uaclient.api.api.import_module")
+    def test_endpoint_without_write_support(
+        self, m_import_module, m_error_out, FakeConfig
+    ):
+        mock_endpoint = mock.MagicMock(write_fn=None)
+        m_import_module.return_value.endpoint = mock_endpoint
+
+        with mock.patch(
+            "uaclient.api.api.VALID_ENDPOINTS", ["example_endpoint"]
+        ):
+            result = write_api("example_endpoint", [], "", FakeConfig())
+
+        assert m_error_out.return_value == result
+        arg = m_error_out.call_args[0][0]
+        assert isinstance(arg, errors.APIWriteNotSupported)
+        assert (
+            arg.msg
+            == E_API_WRITE_NOT_SUPPORTED.format(
+                endpoint="example_endpoint"
+            ).msg
+        )
+        assert mock_endpoint.fn.call_count == 0
+
+    @mock.patch("uaclient.api.api.check_for_new_version", return_value=None)
+    @mock.patch("uaclient.api.api.import_module")
+    def test_write_endpoint(
+        self, m_import_module, _m_new_version_api, FakeConfig
+    ):
+        mock_endpoint = mock.MagicMock(options_cls=None)
+        mock_endpoint.name = "Example"
+        mock_endpoint.version = "v1"
+        m_import_module.return_value.endpoint = mock_endpoint
+        cfg = FakeConfig()
+
+        with mock.patch(
+            "uaclient.api.api.VALID_ENDPOINTS", ["example_endpoint"]
+        ):
+            result = write_api(
+                "example_endpoint",
+                [],
+                "",
+                cfg,
+                output_path="/tmp/out",
+                compress=True,
+            )
+
+        assert result.result == "success"
+        assert result.data.type == "Example"
+        assert result.data.attributes is None
+        assert mock_endpoint.fn.call_count == 0
+        assert [
+            mock.call(cfg, output_path="/tmp/out", compress=True)
+        ] == mock_endpoint.write_fn.call_args_list
+
+    @mock.patch("uaclient.api.errors.error_out")
+    @mock.patch("uaclient.api.api.import_module")
+    def test_write_endpoint_error(
+        self, m_import_module, m_error_out, FakeConfig
+    ):
+        exception = OSError("disk full")
+        mock_endpoint = mock.MagicMock(options_cls=None)
+        mock_endpoint.write_fn.side_effect = exception
+        m_import_module.return_value.endpoint = mock_endpoint
+
+        with mock.patch(
+            "uaclient.api.api.VALID_ENDPOINTS", ["example_endpoint"]
+        ):
+            result = write_api("example_endpoint", [], "", FakeConfig())
+
+        assert m_error_out.return_value == result
+        assert [mock.call(exception)] == m_error_out.call_args_list
@@ -8,25 +8,26 @@ from uaclient.api.u.pro.packages.summary.v1 import (
 M_PATH = "uaclient.api.u.pro.packages.summary.v1."
 
 
-@mock.patch(M_PATH + "get_installed_packages_by_origin")
+@mock.patch(M_PATH + "get_security_status_data")
 class TestPackagesSummaryV1:
-    def test_package_summary(self, m_packages, FakeConfig):
-        m_packages.return_value = {
-            "all": ["pkg"],
-            "esm-apps": ["pkg"] * 2,
-            "esm-infra": ["pkg"] * 3,
-            "main": ["pkg"] * 4,
-            "multiverse": ["pkg"] * 5,
-            "restricted": ["pkg"] * 6,
-            "third-party": ["pkg"] * 7,
-            "universe": ["pkg"] * 8,
-            "unknown": ["pkg"] * 9,
+    def test_package_summary(self, m_data, FakeConfig):
+        m_data.return_value = {
+            "packages_by_origin": {
+                "esm-apps": ["pkg"] * 2,
+                "esm-infra": ["pkg"] * 3,
+                "main": ["pkg"] * 4,
+                "multiverse": ["pkg"] * 5,
+                "restricted": ["pkg"] * 6,
+                "third-party": ["pkg"] * 7,
+                "universe": ["pkg"] * 8,
+                "unknown": ["pkg"] * 9,
+            }
         }
 
         result = _summary(cfg=FakeConfig())
 
         assert isinstance(result, PackageSummaryResult)
-        assert result.summary.num_installed_packages == 1
+        assert result.summary.num_installed_packages == 44
         assert result.summary.num_esm_apps_packages == 2
         assert result.summary.num_esm_infra_packages == 3
         assert result.summary.num_main_packages == 4
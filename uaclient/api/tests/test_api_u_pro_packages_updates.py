@@ -2,36 +2,34 @@ import mock
 
 from uaclient.api.u.pro.packages.updates.v1 import (
     PackageUpdatesResult,
+    UpdateInfo,
+    UpdateSummary,
     _updates,
+    _updates_stream,
 )
 
 M_PATH = "uaclient.api.u.pro.packages.updates.v1."
 
 
 class TestPackagesUpdatesV1:
-    @mock.patch(M_PATH + "get_ua_info")
-    @mock.patch(M_PATH + "get_installed_packages_by_origin")
-    @mock.patch(M_PATH + "filter_updates")
-    @mock.patch(M_PATH + "create_updates_list")
-    def test_package_updates(
-        self, m_updates, m_filter, _m_packages, _m_ua_info, FakeConfig
-    ):
-        m_filter.return_value = {
-            "esm-apps": ["update"],
-            "esm-infra": ["update"] * 2,
-            "standard-security": ["update"] * 3,
-            "standard-updates": ["update"] * 4,
+    @mock.patch(M_PATH + "get_security_status_data")
+    def test_package_updates(self, m_data, FakeConfig):
+        update = {
+            "download_size": 123,
+            "origin": "somewhere",
+            "package": "pkg",
+            "status": "status",
+            "version": "version",
+        }
+        m_data.return_value = {
+            "updates": [
+                dict(update, service_name=service)
+                for service in ["esm-apps"]
+                + ["esm-infra"] * 2
+                + ["standard-security"] * 3
+                + ["standard-updates"] * 4
+            ]
         }
-        m_updates.return_value = [
-            {
-                "download_size": 123,
-                "origin": "somewhere",
-                "package": "pkg",
-                "service_name": "service",
-                "status": "status",
-                "version": "version",
-            }
-        ]
 
         result = _updates(cfg=FakeConfig())
 
@@ -43,10 +41,38 @@ class TestPackagesUpdatesV1:
         assert result.summary.num_standard_updates == 4
         assert result.summary.num_updates == 10
 
-        assert len(result.updates) == 1
+        assert len(result.updates) == 10
         assert result.updates[0].download_size == 123
         assert result.updates[0].origin == "somewhere"
         assert result.updates[0].package == "pkg"
-        assert result.updates[0].provided_by == "service"
+        assert result.updates[0].provided_by == "esm-apps"
         assert result.updates[0].status == "status"
         assert result.updates[0].version == "version"
+
+    @mock.patch(M_PATH + "get_security_status_data")
+    def test_package_updates_stream(self, m_data, FakeConfig):
+        m_data.return_value = {
+            "updates": [
+                {
+                    "download_size": 123,
+                    "origin": "somewhere",
+                    "package": "pkg{}".format(i),
+                    "service_name": service,
+                    "status": "status",
+                    "version": "version",
+                }
+                for i, service in enumerate(["esm-apps", "standard-security"])
+            ]
+        }
+
+        records = list(_updates_stream(cfg=FakeConfig()))
+
+        assert ["UpdateInfo", "UpdateInfo", "UpdateSummary"] == [
+            record.type for record in records
+        ]
+        assert isinstance(records[0].attributes, UpdateInfo)
+        assert ["pkg0", "pkg1"] == [
+            record.attributes.package for record in records[:2]
+        ]
+        assert isinstance(records[2].attributes, UpdateSummary)
+        assert records[2].attributes.num_updates == 2
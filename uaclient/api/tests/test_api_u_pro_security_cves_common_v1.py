@@ -3,9 +3,12 @@ import pytest
 
 from uaclient.api.u.pro.security.cves._common.v1 import (
     VulnerabilitiesAlreadyFixed,
+    VulnerabilityFilter,
     VulnerabilityParser,
     VulnerabilityStatus,
     _get_vulnerability_fix_status,
+    get_evaluation_workers,
+    get_vulnerabilities,
 )
 
 M_PATH = "uaclient.api.u.pro.security.cves._common.v1."
@@ -233,6 +236,276 @@ class TestVulnerabilityParser:
             == expected_result
         )
 
+    @mock.patch(
+        M_PATH + "VulnerabilityParser._get_installed_source_pkg_version"
+    )
+    def test_source_vulnerabilities_are_gone_through_once_per_source(
+        self, m_get_installed_source_pkg_version
+    ):
+        m_get_installed_source_pkg_version.return_value = "1.1.3"
+        installed_pkgs_by_source = {
+            "test1": {
+                "test1-bin1": "1.1.1",
+                "test1-bin": "1.1.4",
+                "test1-bin2": "1.1.1",
+            },
+            "test2": {"test2-bin2-1": "1.1.1"},
+            "other": {},
+        }
+        parser = ConcreteVulnerabilityParser()
+
+        with mock.patch.object(
+            parser,
+            "get_package_vulnerabilities",
+            wraps=parser.get_package_vulnerabilities,
+        ) as m_get_package_vulnerabilities:
+            result = parser.get_vulnerabilities_for_installed_pkgs(
+                VULNERABILITIES_DATA, installed_pkgs_by_source
+            )
+
+        assert [
+            mock.call(VULNERABILITIES_DATA["packages"]["test1"]),
+            mock.call(VULNERABILITIES_DATA["packages"]["test2"]),
+        ] == m_get_package_vulnerabilities.call_args_list
+        assert [
+            "test1-bin",
+            "test1-bin1",
+            "test1-bin2",
+            "test2-bin2-1",
+        ] == list(result.vulnerabilities_info["packages"])
+
+    @pytest.mark.parametrize("workers", (2, 3, 8))
+    @mock.patch(
+        M_PATH + "VulnerabilityParser._get_installed_source_pkg_version"
+    )
+    def test_workers_give_the_same_result_as_a_single_process(
+        self, m_get_installed_source_pkg_version, workers
+    ):
+        m_get_installed_source_pkg_version.return_value = "1.1.3"
+        installed_pkgs_by_source = {
+            "test2": {"test2-bin2-1": "1.1.1"},
+            "other1": {"other1-bin": "1.0"},
+            "test1": {
+                "test1-bin1": "1.1.1",
+                "test1-bin": "1.1.4",
+                "test1-bin2": "1.1.1",
+            },
+            "other2": {"other2-bin": "1.0"},
+        }
+        parser = ConcreteVulnerabilityParser()
+
+        expected = parser.get_vulnerabilities_for_installed_pkgs(
+            VULNERABILITIES_DATA, installed_pkgs_by_source
+        )
+        result = parser.get_vulnerabilities_for_installed_pkgs(
+            VULNERABILITIES_DATA, installed_pkgs_by_source, workers=workers
+        )
+
+        assert expected == result
+        for key in ("packages", "vulnerabilities"):
+            assert list(expected.vulnerabilities_info[key]) == list(
+                result.vulnerabilities_info[key]
+            )
+
+    @pytest.mark.parametrize(
+        "vulnerability_filter",
+        (
+            VulnerabilityFilter(fixable=True),
+            VulnerabilityFilter(unfixable=True, packages=["test1"]),
+            VulnerabilityFilter(packages=["test2-bin2-1", "test1-bin"]),
+            VulnerabilityFilter(min_priority="high"),
+        ),
+    )
+    @mock.patch(
+        M_PATH + "VulnerabilityParser._get_installed_source_pkg_version"
+    )
+    def test_filter_gives_the_same_result_as_filtering_afterwards(
+        self, m_get_installed_source_pkg_version, vulnerability_filter
+    ):
+        m_get_installed_source_pkg_version.return_value = "1.1.1"
+        installed_pkgs_by_source = {
+            "test1": {
+                "test1-bin1": "1.1.1",
+                "test1-bin": "1.1.1",
+                "test1-bin2": "1.1.1",
+            },
+            "test2": {"test2-bin2-1": "1.1.1"},
+        }
+        parser = ConcreteVulnerabilityParser()
+
+        full_result = parser.get_vulnerabilities_for_installed_pkgs(
+            VULNERABILITIES_DATA, installed_pkgs_by_source
+        ).vulnerabilities_info
+        result = parser.get_vulnerabilities_for_installed_pkgs(
+            VULNERABILITIES_DATA,
+            installed_pkgs_by_source,
+            vulnerability_filter=vulnerability_filter,
+        ).vulnerabilities_info
+
+        allowed_packages = {
+            bin_pkg_name
+            for binary_pkgs in vulnerability_filter.filter_installed_pkgs(
+                installed_pkgs_by_source
+            ).values()
+            for bin_pkg_name in binary_pkgs
+        }
+        expected_packages = {}
+        for pkg_name, pkg in full_result["packages"].items():
+            cves = [
+                cve
+                for cve in pkg["cves"]
+                if vulnerability_filter.match_fix(
+                    cve["fix_version"], cve["fix_origin"]
+                )
+                and vulnerability_filter.match_priority(
+                    full_result["vulnerabilities"][cve["name"]].get(
+                        "ubuntu_priority"
+                    )
+                )
+            ]
+            if cves and pkg_name in allowed_packages:
+                expected_packages[pkg_name] = cves
+        assert expected_packages == {
+            pkg_name: pkg["cves"]
+            for pkg_name, pkg in result["packages"].items()
+        }
+
+    @mock.patch(
+        M_PATH + "VulnerabilityParser._get_installed_source_pkg_version"
+    )
+    def test_fixable_filter_does_not_query_dpkg(
+        self, m_get_installed_source_pkg_version
+    ):
+        installed_pkgs_by_source = {
+            "test1": {"test1-bin1": "1.1.1", "test1-bin2": "1.1.1"}
+        }
+        parser = ConcreteVulnerabilityParser()
+
+        result = parser.get_vulnerabilities_for_installed_pkgs(
+            VULNERABILITIES_DATA,
+            installed_pkgs_by_source,
+            vulnerability_filter=VulnerabilityFilter(fixable=True),
+        ).vulnerabilities_info
+
+        assert ["test1-bin1"] == list(result["packages"])
+        assert 0 == m_get_installed_source_pkg_version.call_count
+
+
+class TestVulnerabilityFilter:
+    @pytest.mark.parametrize(
+        "min_priority,priority,expected",
+        (
+            (None, None, True),
+            (None, "low", True),
+            ("medium", "low", False),
+            ("medium", "medium", True),
+            ("medium", "critical", True),
+            ("medium", "untriaged", False),
+            ("negligible", None, False),
+        ),
+    )
+    def test_match_priority(self, min_priority, priority, expected):
+        vulnerability_filter = VulnerabilityFilter(min_priority=min_priority)
+
+        assert expected == vulnerability_filter.match_priority(priority)
+
+    @pytest.mark.parametrize(
+        "fixable,unfixable,fix_version,fix_origin,expected",
+        (
+            (False, False, None, None, True),
+            (False, False, "1.0", "esm-infra", True),
+            (True, False, None, None, False),
+            (True, False, "1.0", None, False),
+            (True, False, "1.0", "esm-infra", True),
+            (False, True, None, None, True),
+            (False, True, "1.0", None, True),
+            (False, True, "1.0", "esm-infra", False),
+        ),
+    )
+    def test_match_fix(
+        self, fixable, unfixable, fix_version, fix_origin, expected
+    ):
+        vulnerability_filter = VulnerabilityFilter(
+            fixable=fixable, unfixable=unfixable
+        )
+
+        assert expected == vulnerability_filter.match_fix(
+            fix_version, fix_origin
+        )
+
+
+@mock.patch(M_PATH + "get_evaluation_workers", return_value=1)
+@mock.patch(M_PATH + "query_installed_source_pkg_versions")
+@mock.patch(M_PATH + "VulnerabilityResultCache.delete_result_cache")
+@mock.patch(M_PATH + "VulnerabilityResultCache.save_result_cache")
+@mock.patch(M_PATH + "VulnerabilityResultCache.is_cache_valid")
+@mock.patch(M_PATH + "VulnerabilityData.get")
+@mock.patch(
+    M_PATH + "VulnerabilityData.refreshed", new_callable=mock.PropertyMock
+)
+class TestGetVulnerabilities:
+    @pytest.mark.parametrize(
+        "vulnerability_filter,refreshed,saved,deleted",
+        (
+            (None, True, True, False),
+            (VulnerabilityFilter(), False, True, False),
+            (VulnerabilityFilter(fixable=True), False, False, False),
+            (VulnerabilityFilter(packages=["test1"]), True, False, True),
+        ),
+    )
+    def test_only_complete_results_are_cached(
+        self,
+        m_refreshed,
+        m_data_get,
+        m_is_cache_valid,
+        m_save_result_cache,
+        m_delete_result_cache,
+        m_query_installed_pkgs,
+        _m_get_evaluation_workers,
+        vulnerability_filter,
+        refreshed,
+        saved,
+        deleted,
+    ):
+        m_refreshed.return_value = refreshed
+        m_data_get.return_value = {"packages": {}}
+        m_is_cache_valid.return_value = False
+        m_query_installed_pkgs.return_value = {}
+
+        get_vulnerabilities(
+            parser=ConcreteVulnerabilityParser(),
+            cfg=mock.MagicMock(),
+            series="jammy",
+            vulnerability_filter=vulnerability_filter,
+        )
+
+        assert saved == m_save_result_cache.called
+        assert deleted == m_delete_result_cache.called
+
+
+class TestGetEvaluationWorkers:
+    @pytest.mark.parametrize(
+        "features,cpu_count,expected",
+        (
+            ({}, 4, 1),
+            ({"vulnerability_evaluation_workers": 3}, 4, 3),
+            ({"vulnerability_evaluation_workers": "2"}, 4, 2),
+            ({"vulnerability_evaluation_workers": 0}, 4, 4),
+            ({"vulnerability_evaluation_workers": 0}, None, 1),
+            ({"vulnerability_evaluation_workers": -1}, 4, 1),
+            ({"vulnerability_evaluation_workers": "many"}, 4, 1),
+        ),
+    )
+    @mock.patch(M_PATH + "os.cpu_count")
+    def test_get_evaluation_workers(
+        self, m_cpu_count, features, cpu_count, expected, FakeConfig
+    ):
+        m_cpu_count.return_value = cpu_count
+        cfg = FakeConfig()
+        cfg.override_features(features)
+
+        assert expected == get_evaluation_workers(cfg)
+
 
 class TestGetVulnerabilityFixStatus:
     @pytest.mark.parametrize(
@@ -4,6 +4,7 @@ import datetime
 import mock
 import pytest
 
+from uaclient import exceptions
 from uaclient.api.u.pro.security.cves.v1 import (
     AffectedPackage,
     CVEAffectedPackage,
@@ -12,6 +13,7 @@ from uaclient.api.u.pro.security.cves.v1 import (
     CVEsResult,
     RelatedUSN,
     _cves,
+    _cves_stream,
 )
 
 M_PATH = "uaclient.api.u.pro.security.cves.v1."
@@ -324,6 +326,7 @@ class TestCVEs:
         installed_pkgs_by_source,
         cve_options,
         expected_result,
+        FakeConfig,
     ):
         m_get_source_pkgs.return_value = installed_pkgs_by_source
         m_vulnerability_data_get.return_value = copy.deepcopy(
@@ -332,4 +335,150 @@ class TestCVEs:
         m_get_apt_cache_datetime.return_value = datetime.datetime(
             2024, 6, 24, 13, 19, 16
         )
-        assert _cves(cve_options, None) == expected_result
+        assert _cves(cve_options, FakeConfig()) == expected_result
+
+    @mock.patch(
+        M_VULN_COMMON_PATH + "VulnerabilityResultCache.save_result_cache"
+    )
+    @mock.patch(M_VULN_COMMON_PATH + "VulnerabilityData.get")
+    @mock.patch(
+        M_VULN_COMMON_PATH + "VulnerabilityData.refreshed",
+        new_callable=mock.PropertyMock,
+    )
+    @mock.patch(M_VULN_COMMON_PATH + "query_installed_source_pkg_versions")
+    def test_stream_data(
+        self,
+        m_get_source_pkgs,
+        _m_vulnerability_data_refreshed,
+        m_vulnerability_data_get,
+        _m_vulnerability_result_save_cache,
+        FakeConfig,
+    ):
+        m_get_source_pkgs.return_value = INSTALLED_PKGS_BY_SOURCE
+        m_vulnerability_data_get.return_value = copy.deepcopy(
+            VULNEBILITIES_DATA
+        )
+
+        records = list(_cves_stream(CVEsOptions(fixable=True), FakeConfig()))
+
+        assert [
+            ("AffectedPackage", "test1-bin"),
+            ("AffectedPackage", "test1-bin1"),
+            ("CVEInfo", "CVE-2022-56789"),
+        ] == [(record.type, record.id) for record in records]
+        assert ["CVE-2022-56789"] == [
+            cve.name for cve in records[0].attributes.cves
+        ]
+        assert "low" == records[2].attributes.priority
+
+
+@mock.patch(M_PATH + "get_apt_cache_datetime", return_value=None)
+@mock.patch(
+    M_PATH + "query_installed_source_pkg_versions",
+    return_value=INSTALLED_PKGS_BY_SOURCE,
+)
+@mock.patch(
+    M_VULN_COMMON_PATH + "query_installed_source_pkg_versions",
+    return_value=INSTALLED_PKGS_BY_SOURCE,
+)
+@mock.patch(M_VULN_COMMON_PATH + "VulnerabilityResultCache.save_result_cache")
+@mock.patch(M_VULN_COMMON_PATH + "VulnerabilityData.get")
+@mock.patch(
+    M_VULN_COMMON_PATH + "VulnerabilityData.refreshed",
+    new_callable=mock.PropertyMock,
+    return_value=True,
+)
+class TestCVEsFilters:
+    @pytest.mark.parametrize(
+        "cve_options,expected_packages",
+        (
+            (
+                CVEsOptions(packages=["test1-bin1"]),
+                {"test1-bin1": ["CVE-2022-12345", "CVE-2022-56789"]},
+            ),
+            (
+                CVEsOptions(packages=["test1"], fixable=True),
+                {
+                    "test1-bin": ["CVE-2022-56789"],
+                    "test1-bin1": ["CVE-2022-56789"],
+                },
+            ),
+            (
+                CVEsOptions(packages=["test1-bin"], unfixable=True),
+                {"test1-bin": ["CVE-2022-12345"]},
+            ),
+            (CVEsOptions(packages=["other"]), {}),
+            (
+                CVEsOptions(priority="low"),
+                {
+                    "test1-bin": ["CVE-2022-12345", "CVE-2022-56789"],
+                    "test1-bin1": ["CVE-2022-12345", "CVE-2022-56789"],
+                },
+            ),
+            (CVEsOptions(priority="medium"), {}),
+        ),
+    )
+    @pytest.mark.parametrize("cached", (False, True))
+    def test_options_are_applied_before_and_after_the_cache(
+        self,
+        _m_refreshed,
+        m_vulnerability_data_get,
+        m_save_result_cache,
+        _m_common_get_source_pkgs,
+        _m_get_source_pkgs,
+        _m_get_apt_cache_datetime,
+        cve_options,
+        expected_packages,
+        cached,
+        FakeConfig,
+    ):
+        m_vulnerability_data_get.return_value = copy.deepcopy(
+            VULNEBILITIES_DATA
+        )
+        if cached:
+            # The cache has the result for every package and CVE
+            full_result = _cves(CVEsOptions(), FakeConfig())
+            assert 1 == m_save_result_cache.call_count
+            cache_content = m_save_result_cache.call_args[0][0]
+            m_save_result_cache.reset_mock()
+            m_vulnerability_data_get.return_value = copy.deepcopy(
+                VULNEBILITIES_DATA
+            )
+            with mock.patch(
+                M_VULN_COMMON_PATH + "VulnerabilityResultCache.is_cache_valid",
+                return_value=True,
+            ), mock.patch(
+                M_VULN_COMMON_PATH
+                + "VulnerabilityResultCache.get_result_cache",
+                return_value=cache_content,
+            ):
+                _m_refreshed.return_value = False
+                result = _cves(cve_options, FakeConfig())
+            assert 2 == len(full_result.packages)
+        else:
+            result = _cves(cve_options, FakeConfig())
+
+        assert expected_packages == {
+            pkg_name: [cve.name for cve in pkg.cves]
+            for pkg_name, pkg in result.packages.items()
+        }
+        assert {
+            cve.name for pkg in result.packages.values() for cve in pkg.cves
+        } == set(result.cves)
+        # A partial result is never cached
+        assert 0 == m_save_result_cache.call_count
+
+    def test_invalid_priority(
+        self,
+        _m_refreshed,
+        m_vulnerability_data_get,
+        m_save_result_cache,
+        m_common_get_source_pkgs,
+        _m_get_source_pkgs,
+        _m_get_apt_cache_datetime,
+        FakeConfig,
+    ):
+        with pytest.raises(exceptions.InvalidArgChoice):
+            _cves(CVEsOptions(priority="urgent"), FakeConfig())
+
+        assert 0 == m_common_get_source_pkgs.call_count
@@ -861,7 +861,7 @@ class TestQueryInstalledPkgSources:
         assert results == query_installed_source_pkg_versions()
         _format = "-f=${Package},${Source},${Version},${db:Status-Status}\n"
         assert [
-            mock.call(["dpkg-query", _format, "-W"])
+            mock.call(["dpkg-query", _format, "-W"], cache=True)
         ] == subp.call_args_list
 
 
@@ -4,11 +4,13 @@ import pytest
 from uaclient import messages
 from uaclient.api.u.pro.security.fix._common import FixStatus
 from uaclient.api.u.pro.security.fix._common.execute.v1 import (
+    AptUpgradeBatch,
     FailedUpgrade,
     FixExecuteError,
     FixExecuteResult,
     UpgradedPackage,
     _execute_fix,
+    _execute_fixes,
 )
 from uaclient.api.u.pro.security.fix._common.plan.v1 import (
     ESM_INFRA_POCKET,
@@ -337,15 +339,197 @@ class TestExecute:
     )
     @mock.patch("uaclient.apt.run_apt_update_command")
     @mock.patch("uaclient.apt.run_apt_command")
-    @mock.patch("uaclient.apt.get_pkg_version")
+    @mock.patch("uaclient.apt.get_pkg_versions")
     def test_execute(
         self,
-        m_get_pkg_version,
+        m_get_pkg_versions,
         _m_run_apt_cmd,
         _m_run_apt_update,
         security_issue,
         expected_result,
         pkg_version,
     ):
-        m_get_pkg_version.return_value = pkg_version
+        m_get_pkg_versions.side_effect = lambda pkgs: (
+            {pkg: pkg_version for pkg in pkgs} if pkg_version else {}
+        )
         assert expected_result == _execute_fix(security_issue)
+
+    @staticmethod
+    def _apt_upgrade_issue(title, binary_packages, pocket):
+        return FixPlanResult(
+            title=title,
+            description="description",
+            current_status="still-affected",
+            expected_status=FixStatus.SYSTEM_NON_VULNERABLE.value.msg,
+            affected_packages=binary_packages,
+            plan=[
+                FixPlanAptUpgradeStep(
+                    data=AptUpgradeData(
+                        binary_packages=binary_packages,
+                        source_packages=binary_packages,
+                        pocket=pocket,
+                    ),
+                    order=1,
+                ),
+            ],
+            warnings=None,
+            error=None,
+            additional_data=None,
+        )
+
+    @mock.patch("uaclient.apt.run_apt_update_command")
+    @mock.patch("uaclient.apt.run_apt_command")
+    @mock.patch("uaclient.apt.get_pkg_versions")
+    def test_execute_fixes_in_a_single_apt_transaction(
+        self, m_get_pkg_versions, m_run_apt_cmd, m_run_apt_update
+    ):
+        m_get_pkg_versions.return_value = {"pkg1": "1.1", "pkg2": "2.1"}
+        apt_upgrade_batch = AptUpgradeBatch()
+
+        results = _execute_fixes(
+            [
+                self._apt_upgrade_issue(
+                    "CVE-1", ["pkg1", "pkg2"], STANDARD_UPDATES_POCKET
+                ),
+                self._apt_upgrade_issue(
+                    "CVE-2", ["pkg2", "pkg3"], ESM_INFRA_POCKET
+                ),
+            ],
+            apt_upgrade_batch,
+        )
+        # Later fixes of the same execution don't update apt again
+        _execute_fixes(
+            [self._apt_upgrade_issue("CVE-3", ["pkg4"], ESM_INFRA_POCKET)],
+            apt_upgrade_batch,
+        )
+
+        assert 1 == m_run_apt_update.call_count
+        assert [
+            mock.call(
+                cmd=["apt-get", "install", "--only-upgrade", "-y"]
+                + ["pkg1", "pkg2", "pkg3"],
+                override_env_vars={"DEBIAN_FRONTEND": "noninteractive"},
+            ),
+            mock.call(
+                cmd=["apt-get", "install", "--only-upgrade", "-y", "pkg4"],
+                override_env_vars={"DEBIAN_FRONTEND": "noninteractive"},
+            ),
+        ] == m_run_apt_cmd.call_args_list
+        assert [
+            mock.call(["pkg1", "pkg2", "pkg3"]),
+            mock.call(["pkg4"]),
+        ] == m_get_pkg_versions.call_args_list
+        assert [
+            [
+                UpgradedPackage(
+                    name="pkg1", version="1.1", pocket=STANDARD_UPDATES_POCKET
+                ),
+                UpgradedPackage(
+                    name="pkg2", version="2.1", pocket=STANDARD_UPDATES_POCKET
+                ),
+            ],
+            [
+                UpgradedPackage(
+                    name="pkg2", version="2.1", pocket=ESM_INFRA_POCKET
+                ),
+            ],
+        ] == [result.upgraded_packages for result in results]
+        assert [
+            FixStatus.SYSTEM_NON_VULNERABLE.value.msg,
+            FixStatus.SYSTEM_NON_VULNERABLE.value.msg,
+        ] == [result.status for result in results]
+
+    @mock.patch("uaclient.apt.run_apt_update_command")
+    @mock.patch(
+        "uaclient.apt.run_apt_command", side_effect=Exception("apt failed")
+    )
+    @mock.patch("uaclient.apt.get_pkg_versions")
+    def test_failed_apt_transaction_is_reported_for_each_issue(
+        self, m_get_pkg_versions, _m_run_apt_cmd, _m_run_apt_update
+    ):
+        security_issues = [
+            self._apt_upgrade_issue(
+                "CVE-1", ["pkg1"], STANDARD_UPDATES_POCKET
+            ),
+            self._apt_upgrade_issue("CVE-2", ["pkg2"], ESM_INFRA_POCKET),
+        ]
+        # Errors keep the order of the plan steps
+        security_issues[1].plan.append(
+            FixPlanAttachStep(
+                data=AttachData(
+                    reason="test",
+                    required_service=ESM_INFRA_POCKET,
+                    source_packages=["pkg3"],
+                ),
+                order=2,
+            )
+        )
+
+        results = _execute_fixes(security_issues)
+
+        assert 0 == m_get_pkg_versions.call_count
+        assert [
+            FixStatus.SYSTEM_STILL_VULNERABLE.value.msg,
+            FixStatus.SYSTEM_STILL_VULNERABLE.value.msg,
+        ] == [result.status for result in results]
+        assert [
+            FixExecuteError(
+                error_type="fix-error-installing-pkg",
+                reason="apt failed",
+                failed_upgrades=[
+                    FailedUpgrade(name="pkg1", pocket=STANDARD_UPDATES_POCKET)
+                ],
+            )
+        ] == results[0].errors
+        assert [
+            "fix-error-installing-pkg",
+            "fix-requires-attach",
+        ] == [error.error_type for error in results[1].errors]
+
+    @mock.patch("uaclient.apt.run_apt_update_command")
+    @mock.patch("uaclient.apt.run_apt_command")
+    @mock.patch("uaclient.apt.get_pkg_versions")
+    def test_only_issues_that_fail_on_their_own_are_reported(
+        self, m_get_pkg_versions, m_run_apt_cmd, m_run_apt_update
+    ):
+        def _run_apt_command(cmd, **kwargs):
+            if "pkg2" in cmd:
+                raise Exception("apt failed")
+
+        m_run_apt_cmd.side_effect = _run_apt_command
+        m_get_pkg_versions.return_value = {"pkg1": "1.1"}
+
+        results = _execute_fixes(
+            [
+                self._apt_upgrade_issue(
+                    "CVE-1", ["pkg1"], STANDARD_UPDATES_POCKET
+                ),
+                self._apt_upgrade_issue("CVE-2", ["pkg2"], ESM_INFRA_POCKET),
+            ]
+        )
+
+        assert 1 == m_run_apt_update.call_count
+        assert [
+            ["pkg1", "pkg2"],
+            ["pkg1"],
+            ["pkg2"],
+        ] == [c[1]["cmd"][4:] for c in m_run_apt_cmd.call_args_list]
+        assert [
+            FixStatus.SYSTEM_NON_VULNERABLE.value.msg,
+            FixStatus.SYSTEM_STILL_VULNERABLE.value.msg,
+        ] == [result.status for result in results]
+        assert [
+            UpgradedPackage(
+                name="pkg1", version="1.1", pocket=STANDARD_UPDATES_POCKET
+            )
+        ] == results[0].upgraded_packages
+        assert not results[0].errors
+        assert [
+            FixExecuteError(
+                error_type="fix-error-installing-pkg",
+                reason="apt failed",
+                failed_upgrades=[
+                    FailedUpgrade(name="pkg2", pocket=ESM_INFRA_POCKET)
+                ],
+            )
+        ] == results[1].errors
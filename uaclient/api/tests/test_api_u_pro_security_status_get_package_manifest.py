@@ -1,7 +1,15 @@
+import gzip
+
 import mock
+import pytest
 
 from uaclient import apt
-from uaclient.api.u.security.package_manifest.v1 import _package_manifest
+from uaclient.api.u.security.package_manifest.v1 import (
+    _package_manifest,
+    _package_manifest_stream,
+    endpoint,
+    write_package_manifest,
+)
 from uaclient.snap import SnapPackage
 
 M_PATH = "uaclient.api.u.security.package_manifest.v1"
@@ -9,7 +17,7 @@ M_PATH = "uaclient.api.u.security.package_manifest.v1"
 
 @mock.patch("uaclient.snap.get_snap_info")
 @mock.patch("uaclient.snap.system.subp")
-@mock.patch(M_PATH + ".apt.get_installed_packages")
+@mock.patch(M_PATH + ".apt.iter_installed_packages")
 class TestPackageInstalledV1:
     def test_snap_packages_added(
         self, m_installed_apt_pkgs, m_sys_subp, m_get_snap_info, FakeConfig
@@ -109,3 +117,84 @@ class TestPackageInstalledV1:
             + "snap:canonical-livepatch\tlatest/stable\t146\n"
             == result.manifest_data
         )
+
+    def test_stream_apt_snap_packages(
+        self, m_installed_apt_pkgs, m_sys_subp, m_get_snap_info, FakeConfig
+    ):
+        m_installed_apt_pkgs.return_value = [
+            apt.InstalledAptPackage(name="one", arch="all", version="4:1.0.2"),
+        ]
+        m_sys_subp.return_value = (
+            "Name  Version Rev Tracking Publisher Notes\n"
+            "helloworld 6.0.16 126 latest/stable dev1 -\n"
+        ), ""
+        m_get_snap_info.side_effect = [
+            SnapPackage(
+                "helloworld",
+                "6.0.16",
+                "126",
+                "latest/stable",
+                "dev1",
+            ),
+        ]
+        records = list(_package_manifest_stream(FakeConfig()))
+        assert ["PackageManifestEntry"] * 2 == [r.type for r in records]
+        assert [
+            "one\t4:1.0.2\n",
+            "snap:helloworld\tlatest/stable\t126\n",
+        ] == [r.attributes.manifest_line for r in records]
+
+
+@mock.patch(M_PATH + "._iter_manifest_lines")
+class TestWritePackageManifest:
+    @pytest.mark.parametrize("compress", (False, True))
+    def test_write_to_file(self, m_iter_manifest_lines, compress, tmpdir):
+        m_iter_manifest_lines.return_value = iter(
+            ["one\t4:1.0.2\n", "snap:helloworld\tlatest/stable\t126\n"]
+        )
+        output_path = tmpdir.join("manifest").strpath
+
+        write_package_manifest(output_path, compress=compress)
+
+        if compress:
+            with gzip.open(output_path, "rt") as f:
+                content = f.read()
+        else:
+            with open(output_path) as f:
+                content = f.read()
+        assert "one\t4:1.0.2\nsnap:helloworld\tlatest/stable\t126\n" == content
+        assert ["manifest"] == [p.basename for p in tmpdir.listdir()]
+
+    def test_write_to_file_error_keeps_previous_file(
+        self, m_iter_manifest_lines, tmpdir
+    ):
+        def lines():
+            yield "one\t4:1.0.2\n"
+            raise OSError("snapd is gone")
+
+        m_iter_manifest_lines.return_value = lines()
+        output_file = tmpdir.join("manifest")
+        output_file.write("old manifest\n")
+
+        with pytest.raises(OSError):
+            write_package_manifest(output_file.strpath)
+
+        assert "old manifest\n" == output_file.read()
+        assert ["manifest"] == [p.basename for p in tmpdir.listdir()]
+
+    def test_write_to_stdout(self, m_iter_manifest_lines, capsys):
+        m_iter_manifest_lines.return_value = iter(["one\t4:1.0.2\n"])
+
+        write_package_manifest()
+
+        assert "one\t4:1.0.2\n" == capsys.readouterr()[0]
+
+    @mock.patch(M_PATH + ".write_package_manifest")
+    def test_endpoint_writes_the_manifest(
+        self, m_write_package_manifest, _m_iter_manifest_lines, FakeConfig
+    ):
+        endpoint.write_fn(FakeConfig(), output_path="manifest", compress=True)
+
+        assert [
+            mock.call("manifest", compress=True)
+        ] == m_write_package_manifest.call_args_list
@@ -127,3 +127,51 @@ class TestEnabledServicesV1:
 
         assert [] == _enabled_services(cfg=mock.MagicMock()).enabled_services
         assert 1 == m_is_attached.call_count
+
+    @mock.patch("uaclient.util.we_are_currently_root", return_value=False)
+    @mock.patch("uaclient.status.get_status_snapshot")
+    @mock.patch("uaclient.api.u.pro.status.enabled_services.v1._is_attached")
+    def test_enabled_services_from_status_snapshot(
+        self, m_is_attached, m_get_status_snapshot, _m_we_are_currently_root
+    ):
+        m_get_status_snapshot.return_value.get_status.return_value = {
+            "attached": True,
+            "services": [
+                {"name": "ent1", "status": "disabled", "variants": {}},
+                {
+                    "name": "ent2",
+                    "status": "enabled",
+                    "variants": {
+                        "generic": {"name": "generic", "status": "disabled"},
+                        "variant": {"name": "variant", "status": "enabled"},
+                    },
+                    "warning": None,
+                },
+                {
+                    "name": "ent3",
+                    "status": "warning",
+                    "variants": {},
+                    "warning": {
+                        "code": "warning_code",
+                        "message": "warning_msg",
+                    },
+                },
+            ],
+        }
+
+        result = _enabled_services(cfg=mock.MagicMock())
+
+        assert 0 == m_is_attached.call_count
+        assert [
+            EnabledService(
+                name="ent2", variant_enabled=True, variant_name="variant"
+            ),
+            EnabledService(name="ent3"),
+        ] == result.enabled_services
+        assert [
+            ErrorWarningObject(
+                title="warning_msg",
+                code="warning_code",
+                meta={"service": "ent3"},
+            )
+        ] == result.warnings
@@ -17,25 +17,34 @@ M_PATH = "uaclient.api.u.unattended_upgrades.status.v1"
 class TestUnattendedUpgradesGetAptDailyJob:
     @pytest.mark.parametrize(
         [
-            "systemd_unit_active_return",
+            "systemd_units_active_states",
             "expected_return",
         ],
         (
-            ((True, True), True),
-            ((False, True), False),
-            ((True, False), False),
-            ((False, False), False),
+            (("active", "active"), True),
+            (("inactive", "active"), False),
+            (("active", "inactive"), False),
+            (("inactive", "inactive"), False),
+            ((None, None), False),
         ),
     )
-    @mock.patch(M_PATH + ".system.is_systemd_unit_active")
+    @mock.patch(M_PATH + ".system.get_systemd_units_active_states")
     def test_get_apt_daily_job_status(
         self,
-        m_is_systemd_unit_active,
-        systemd_unit_active_return,
+        m_get_systemd_units_active_states,
+        systemd_units_active_states,
         expected_return,
     ):
-        m_is_systemd_unit_active.side_effect = systemd_unit_active_return
+        m_get_systemd_units_active_states.return_value = dict(
+            zip(
+                ["apt-daily.timer", "apt-daily-upgrade.timer"],
+                systemd_units_active_states,
+            )
+        )
         assert expected_return is api._get_apt_daily_job_status()
+        assert [
+            mock.call(["apt-daily.timer", "apt-daily-upgrade.timer"])
+        ] == m_get_systemd_units_active_states.call_args_list
 
 
 class TestIsUnattendedUpgradesRunning:
@@ -235,3 +244,71 @@ class TestUnattendedUpgradesStatusV1:
         )
 
         assert _m_apt_is_installed.call_count == 1
+
+
+@mock.patch(M_PATH + "._get_apt_daily_job_status", return_value=True)
+@mock.patch(M_PATH + ".get_apt_config_keys", return_value=[])
+@mock.patch(M_PATH + ".get_apt_config_values")
+@mock.patch("uaclient.apt.is_installed", return_value=True)
+@mock.patch("uaclient.apt.get_dpkg_status_time", return_value=1.0)
+@mock.patch("uaclient.apt.get_apt_config_mtimes")
+class TestUnattendedUpgradesSnapshot:
+    CFG = {
+        "APT::Periodic::Enable": "1",
+        "APT::Periodic::Update-Package-Lists": "1",
+        "APT::Periodic::Unattended-Upgrade": "1",
+        "Unattended-Upgrade::Allowed-Origins": ["test"],
+    }
+
+    @pytest.mark.parametrize(
+        "second_mtimes,expected_reads",
+        (
+            ({"/etc/apt/apt.conf.d": 1.0}, 1),
+            ({"/etc/apt/apt.conf.d": 2.0}, 2),
+            ({"/etc/apt/apt.conf.d": 1.0, "/etc/apt/apt.conf": 1.0}, 2),
+        ),
+    )
+    def test_snapshot_is_kept_until_apt_config_changes(
+        self,
+        m_mtimes,
+        _m_dpkg_status_time,
+        m_is_installed,
+        m_apt_cfg_values,
+        _m_apt_cfg_keys,
+        _m_apt_job_status,
+        second_mtimes,
+        expected_reads,
+        FakeConfig,
+    ):
+        m_mtimes.side_effect = [{"/etc/apt/apt.conf.d": 1.0}, second_mtimes]
+        m_apt_cfg_values.side_effect = lambda _names: dict(self.CFG)
+
+        first = api._status(FakeConfig())
+        second = api._status(FakeConfig())
+
+        assert first.to_dict() == second.to_dict()
+        assert second.unattended_upgrades_running is True
+        assert expected_reads == m_apt_cfg_values.call_count
+        assert expected_reads == m_is_installed.call_count
+
+    @mock.patch("uaclient.util.we_are_currently_root", return_value=False)
+    def test_snapshot_is_not_written_as_non_root(
+        self,
+        _m_we_are_currently_root,
+        m_mtimes,
+        _m_dpkg_status_time,
+        m_is_installed,
+        m_apt_cfg_values,
+        _m_apt_cfg_keys,
+        _m_apt_job_status,
+        FakeConfig,
+        unattended_upgrades_snapshot_file,
+    ):
+        m_mtimes.return_value = {"/etc/apt/apt.conf.d": 1.0}
+        m_apt_cfg_values.side_effect = lambda _names: dict(self.CFG)
+
+        api._status(FakeConfig())
+        api._status(FakeConfig())
+
+        assert not unattended_upgrades_snapshot_file.is_present
+        assert 2 == m_apt_cfg_values.call_count
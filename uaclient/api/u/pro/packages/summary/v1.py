@@ -2,7 +2,10 @@ from uaclient.api.api import APIEndpoint
 from uaclient.api.data_types import AdditionalInfo
 from uaclient.config import UAConfig
 from uaclient.data_types import DataObject, Field, IntDataValue
-from uaclient.security_status import get_installed_packages_by_origin
+from uaclient.security_status import (
+    get_package_names_by_origin,
+    get_security_status_data,
+)
 
 
 class PackageSummary(DataObject):
@@ -99,7 +102,7 @@ def _summary(cfg: UAConfig) -> PackageSummaryResult:
     This endpoint shows a summary of installed packages in the system,
     categorized by origin.
     """
-    packages = get_installed_packages_by_origin()
+    packages = get_package_names_by_origin(get_security_status_data(cfg))
     summary = PackageSummary(
         num_installed_packages=len(packages["all"]),
         num_esm_apps_packages=len(packages["esm-apps"]),
@@ -1,7 +1,8 @@
-from typing import List
+from collections import Counter
+from typing import Any, Dict, Iterator, List
 
 from uaclient.api.api import APIEndpoint
-from uaclient.api.data_types import AdditionalInfo
+from uaclient.api.data_types import AdditionalInfo, APIStreamRecord
 from uaclient.config import UAConfig
 from uaclient.data_types import (
     DataObject,
@@ -10,12 +11,7 @@ from uaclient.data_types import (
     StringDataValue,
     data_list,
 )
-from uaclient.security_status import (
-    create_updates_list,
-    filter_updates,
-    get_installed_packages_by_origin,
-    get_ua_info,
-)
+from uaclient.security_status import get_security_status_data
 
 
 class UpdateSummary(DataObject):
@@ -126,24 +122,14 @@ def updates() -> PackageUpdatesResult:
     return _updates(UAConfig())
 
 
-def _updates(cfg: UAConfig) -> PackageUpdatesResult:
-    """
-    This endpoint shows available updates for packages in a system, categorized
-    by where they can be obtained.
-    """
-    ua_info = get_ua_info(cfg)
-    packages = get_installed_packages_by_origin()
-    upgradable_versions = filter_updates(packages["all"])
-    update_list = create_updates_list(upgradable_versions, ua_info)
-
-    num_esm_apps_updates = len(upgradable_versions["esm-apps"])
-    num_esm_infra_updates = len(upgradable_versions["esm-infra"])
-    num_standard_security_updates = len(
-        upgradable_versions["standard-security"]
-    )
-    num_standard_updates = len(upgradable_versions["standard-updates"])
+def _get_update_summary(update_list: List[Dict[str, Any]]) -> UpdateSummary:
+    num_updates = Counter(update["service_name"] for update in update_list)
+    num_esm_apps_updates = num_updates["esm-apps"]
+    num_esm_infra_updates = num_updates["esm-infra"]
+    num_standard_security_updates = num_updates["standard-security"]
+    num_standard_updates = num_updates["standard-updates"]
 
-    summary = UpdateSummary(
+    return UpdateSummary(
         num_updates=num_esm_apps_updates
         + num_esm_infra_updates
         + num_standard_security_updates
@@ -153,26 +139,59 @@ def _updates(cfg: UAConfig) -> PackageUpdatesResult:
         num_standard_security_updates=num_standard_security_updates,
         num_standard_updates=num_standard_updates,
     )
-    updates = [
-        UpdateInfo(
-            download_size=update["download_size"],
-            origin=update["origin"],
-            package=update["package"],
-            provided_by=update["service_name"],
-            status=update["status"],
-            version=update["version"],
-        )
-        for update in update_list
-    ]
+
+
+def _get_update_info(update: Dict[str, Any]) -> UpdateInfo:
+    return UpdateInfo(
+        download_size=update["download_size"],
+        origin=update["origin"],
+        package=update["package"],
+        provided_by=update["service_name"],
+        status=update["status"],
+        version=update["version"],
+    )
+
+
+def _updates(cfg: UAConfig) -> PackageUpdatesResult:
+    """
+    This endpoint shows available updates for packages in a system, categorized
+    by where they can be obtained.
+    """
+    update_list = get_security_status_data(cfg)["updates"]
+
+    summary = _get_update_summary(update_list)
+    updates = [_get_update_info(update) for update in update_list]
 
     return PackageUpdatesResult(summary=summary, updates=updates)
 
 
+def _updates_stream(cfg: UAConfig) -> Iterator[APIStreamRecord]:
+    """
+    Streaming version of this endpoint: yields one UpdateInfo record per
+    available update, followed by a single UpdateSummary record.
+
+    Only the serialization is streamed: the security status of the system
+    is computed as a whole before the first record.
+    """
+    update_list = get_security_status_data(cfg)["updates"]
+
+    for update in update_list:
+        yield APIStreamRecord(
+            type="UpdateInfo", attributes=_get_update_info(update)
+        )
+
+    yield APIStreamRecord(
+        type="UpdateSummary",
+        attributes=_get_update_summary(update_list),
+    )
+
+
 endpoint = APIEndpoint(
     version="v1",
     name="PackageUpdates",
     fn=_updates,
     options_cls=None,
+    stream_fn=_updates_stream,
 )
 
 _doc = {
@@ -186,6 +205,16 @@ result = updates()
     "result_class": PackageUpdatesResult,
     "exceptions": [],
     "example_cli": "pro api u.pro.packages.updates.v1",
+    "example_cli_extra": """
+This endpoint also supports streaming output with
+``pro api u.pro.packages.updates.v1 --stream``. Each available update is then
+printed on its own line as an ``UpdateInfo`` record, followed by an
+``UpdateSummary`` record and a final line with the result of the call.
+
+Only the output is streamed: the available updates are still computed as a
+whole before the first record is printed, so streaming lowers the memory
+needed to print the result, not the time it takes to get the first record.
+""",
     "example_json": """
 {
     "summary": {
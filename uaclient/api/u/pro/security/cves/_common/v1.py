@@ -2,13 +2,15 @@ import abc
 import datetime
 import enum
 import json
+import logging
+import multiprocessing
 import os
 from collections import defaultdict
 from functools import lru_cache
-from typing import Any, Dict, List, NamedTuple, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple  # noqa: F401
 from urllib.parse import urljoin
 
-from uaclient import apt, exceptions, http, system, util
+from uaclient import apt, exceptions, http, profiling, system, util
 from uaclient.api.u.pro.security.fix._common import (
     query_installed_source_pkg_versions,
 )
@@ -32,6 +34,15 @@ from uaclient.entitlements.fips import FIPSEntitlement, FIPSUpdatesEntitlement
 from uaclient.files.data_types import DataObjectFile
 from uaclient.files.files import UAFile
 
+LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
+
+# The Ubuntu priorities of the vulnerabilities, from the lowest to the highest
+PRIORITIES = ("negligible", "low", "medium", "high", "critical")
+
+# Each worker gets several chunks of source packages, so that a worker
+# going through packages with many vulnerabilities doesn't hold up the others
+CHUNKS_PER_WORKER = 4
+
 
 class VulnerabilityCacheETag(DataObject):
     fields = [Field("etag", StringDataValue)]
@@ -126,6 +137,7 @@ class VulnerabilityData:
         vulnerability_json_data = self.get()
         return vulnerability_json_data["published_at"]
 
+    @profiling.profiled("VulnerabilityData.get")
     def get(self):
         last_etag = self._get_etag()
 
@@ -173,6 +185,107 @@ VulnerabilityParserResult = NamedTuple(
 )
 
 
+SourceVulnerability = NamedTuple(
+    "SourceVulnerability",
+    [
+        ("name", str),
+        ("info", Any),
+        ("status", Any),
+        ("source_fixed_version", Any),
+        ("not_fixable", bool),
+        ("pocket", Any),
+        ("bin_fix_versions", Optional[Dict[str, str]]),
+    ],
+)
+
+
+class VulnerabilityFilter:
+    """
+    The vulnerabilities a query is interested in.
+
+    The filter is applied while evaluating the vulnerabilities, so that
+    narrow queries don't go through packages and vulnerabilities they would
+    leave out of their result anyway.
+    """
+
+    def __init__(
+        self,
+        *,
+        packages: Optional[List[str]] = None,
+        fixable: bool = False,
+        unfixable: bool = False,
+        min_priority: Optional[str] = None
+    ):
+        self.packages = set(packages) if packages else None
+        self.fixable = fixable
+        self.unfixable = unfixable
+        self.min_priority = min_priority
+
+    @property
+    def is_empty(self) -> bool:
+        return (
+            self.packages is None
+            and not self.fixable
+            and not self.unfixable
+            and self.min_priority is None
+        )
+
+    def filter_installed_pkgs(
+        self, installed_pkgs_by_source: Dict[str, Dict[str, str]]
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        Keep the installed packages matching the package names, which can
+        be names of source packages or of binary packages.
+        """
+        if self.packages is None:
+            return installed_pkgs_by_source
+
+        filtered_pkgs = {}  # type: Dict[str, Dict[str, str]]
+        for source_pkg, binary_pkgs in installed_pkgs_by_source.items():
+            if source_pkg in self.packages:
+                filtered_pkgs[source_pkg] = binary_pkgs
+                continue
+            matching_binary_pkgs = {
+                bin_pkg_name: bin_pkg_version
+                for bin_pkg_name, bin_pkg_version in binary_pkgs.items()
+                if bin_pkg_name in self.packages
+            }
+            if matching_binary_pkgs:
+                filtered_pkgs[source_pkg] = matching_binary_pkgs
+        return filtered_pkgs
+
+    def match_fix(
+        self, fix_version: Optional[str], fix_origin: Optional[str]
+    ) -> bool:
+        is_fixable = fix_version and fix_origin
+
+        if self.unfixable and is_fixable:
+            return False
+        elif self.fixable and not is_fixable:
+            return False
+        return True
+
+    def match_priority(self, priority: Optional[str]) -> bool:
+        if self.min_priority is None:
+            return True
+        if priority not in PRIORITIES:
+            return False
+        return PRIORITIES.index(priority) >= PRIORITIES.index(
+            self.min_priority
+        )
+
+    def match_source_vulnerability(self, vuln: SourceVulnerability) -> bool:
+        if vuln.not_fixable and not self.match_fix(None, None):
+            return False
+        # Without a pocket, no binary package can get a fix for it
+        if self.fixable and not vuln.pocket:
+            return False
+        if self.min_priority is not None:
+            info = vuln.info if isinstance(vuln.info, dict) else {}
+            return self.match_priority(info.get("ubuntu_priority"))
+        return True
+
+
 class VulnerabilitiesAlreadyFixed:
     def __init__(self):
         self._vulns = defaultdict(set)
@@ -322,7 +435,8 @@ class VulnerabilityParser(metaclass=abc.ABCMeta):
                 "-W",
                 "-f=${source:Version}",
                 binary_pkg_name,
-            ]
+            ],
+            cache=True,
         )
 
         return out
@@ -390,19 +504,62 @@ class VulnerabilityParser(metaclass=abc.ABCMeta):
     ):
         return apt.version_compare(vuln_bin_fix_version, bin_version) > 0
 
-    def _list_binary_packages(self, installed_pkgs_by_source: Dict[str, Any]):
-        for source_pkg, binary_pkgs in installed_pkgs_by_source.items():
-            for (
-                binary_pkg_name,
-                binary_installed_version,
-            ) in sorted(binary_pkgs.items()):
-                yield source_pkg, binary_pkg_name, binary_installed_version
+    def _get_source_vulnerabilities(
+        self, affected_pkg: Dict[str, Any], vulns_info: Dict[str, Any]
+    ) -> List[SourceVulnerability]:
+        """
+        Return what every binary package of a source package shares about
+        its vulnerabilities, sorted by vulnerability name.
+        """
+        vuln_source_versions = affected_pkg.get("source_versions", {})
+        source_vulnerabilities = []
+        for vuln_name, vuln in sorted(
+            self.get_package_vulnerabilities(affected_pkg).items(),
+            key=lambda x: x[0],
+        ):
+            vuln_source_fixed_version = vuln.get("source_fixed_version")
+            vuln_pkg_status = vuln.get("status")
+            not_fixable = self.is_vulnerability_not_fixable(
+                vuln_pkg_status=vuln_pkg_status,
+                vuln_source_fixed_version=vuln_source_fixed_version,
+            )
 
-    def get_vulnerabilities_for_installed_pkgs(
+            pocket = None
+            vuln_bin_fix_versions = None
+            if not not_fixable:
+                try:
+                    pocket = vuln_source_versions[
+                        vuln_source_fixed_version
+                    ].get("pocket")
+                    vuln_bin_fix_versions = vuln_source_versions[
+                        vuln_source_fixed_version
+                    ].get("binary_packages", {})
+                except KeyError:
+                    # There is bug in the data where some sources are
+                    # not present. The Security team is already aware
+                    # of this issue and they are handling it
+                    pass
+
+            source_vulnerabilities.append(
+                SourceVulnerability(
+                    name=vuln_name,
+                    info=vulns_info.get(vuln_name, ""),
+                    status=vuln_pkg_status,
+                    source_fixed_version=vuln_source_fixed_version,
+                    not_fixable=not_fixable,
+                    pocket=pocket,
+                    bin_fix_versions=vuln_bin_fix_versions,
+                )
+            )
+
+        return source_vulnerabilities
+
+    def _evaluate_installed_pkgs(
         self,
         vulnerabilities_data: Dict[str, Any],
         installed_pkgs_by_source: Dict[str, Dict[str, str]],
-    ):
+        vulnerability_filter: VulnerabilityFilter,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         packages = {}  # type: Dict[str, Any]
         vulnerabilities = {}  # type: Dict[str, Any]
 
@@ -411,97 +568,189 @@ class VulnerabilityParser(metaclass=abc.ABCMeta):
             self.vulnerability_type, {}
         )
 
-        for (
-            source_pkg,
-            bin_pkg_name,
-            bin_pkg_version,
-        ) in self._list_binary_packages(installed_pkgs_by_source):
-            affected_pkg = affected_pkgs.get(source_pkg, {})
-            vuln_source_versions = affected_pkg.get("source_versions", {})
-
-            for vuln_name, vuln in sorted(
-                self.get_package_vulnerabilities(affected_pkg).items(),
-                key=lambda x: x[0],
-            ):
-                vuln_info = vulns_info.get(vuln_name, "")
-                vuln_source_fixed_version = vuln.get("source_fixed_version")
-                vuln_pkg_status = vuln.get("status")
-
-                if self.is_vulnerability_not_fixable(
-                    vuln_pkg_status=vuln_pkg_status,
-                    vuln_source_fixed_version=vuln_source_fixed_version,
-                ):
-                    self._add_unfixable_vulnerability(
-                        packages=packages,
-                        bin_pkg_name=bin_pkg_name,
-                        bin_pkg_version=bin_pkg_version,
-                        vuln_name=vuln_name,
-                        vuln_pkg_status=vuln_pkg_status,
-                    )
-                    self._add_vulnerability_info(
-                        vuln_name=vuln_name,
-                        vulnerabilities=vulnerabilities,
-                        vuln_info=vuln_info,
-                        vulns_data=vulnerabilities_data,
+        for source_pkg, binary_pkgs in installed_pkgs_by_source.items():
+            # The vulnerabilities of the source package are the same for
+            # all of its binary packages, so they are only gone through
+            # once, when the first binary package needs them
+            source_vulns = None  # type: Optional[List[SourceVulnerability]]
+
+            for bin_pkg_name, bin_pkg_version in sorted(binary_pkgs.items()):
+                if source_vulns is None:
+                    source_vulns = [
+                        vuln
+                        for vuln in self._get_source_vulnerabilities(
+                            affected_pkgs.get(source_pkg, {}), vulns_info
+                        )
+                        if vulnerability_filter.match_source_vulnerability(
+                            vuln
+                        )
+                    ]
+
+                for vuln in source_vulns:
+                    if vuln.not_fixable:
+                        self._add_unfixable_vulnerability(
+                            packages=packages,
+                            bin_pkg_name=bin_pkg_name,
+                            bin_pkg_version=bin_pkg_version,
+                            vuln_name=vuln.name,
+                            vuln_pkg_status=vuln.status,
+                        )
+                        self._add_vulnerability_info(
+                            vuln_name=vuln.name,
+                            vulnerabilities=vulnerabilities,
+                            vuln_info=vuln.info,
+                            vulns_data=vulnerabilities_data,
+                        )
+                        continue
+
+                    if vuln.bin_fix_versions is None:
+                        continue
+
+                    vuln_bin_fix_version = vuln.bin_fix_versions.get(
+                        bin_pkg_name
                     )
-                    continue
 
-                try:
-                    pocket = vuln_source_versions[
-                        vuln_source_fixed_version
-                    ].get("pocket")
-                    vuln_bin_fix_version = (
-                        vuln_source_versions[vuln_source_fixed_version]
-                        .get("binary_packages", {})
-                        .get(bin_pkg_name)
-                    )
-                except KeyError:
-                    # There is bug in the data where some sources are
-                    # not present. The Security team is already aware
-                    # of this issue and they are handling it
-                    continue
-
-                if self.is_vulnerability_valid_but_not_fixable(
-                    vuln_bin_fix_version,
-                    bin_pkg_name,
-                    vuln_source_fixed_version,
-                ):
-                    self._add_unfixable_vulnerability(
-                        packages=packages,
-                        bin_pkg_name=bin_pkg_name,
-                        bin_pkg_version=bin_pkg_version,
-                        vuln_name=vuln_name,
-                        vuln_pkg_status="unknown",
-                    )
-                    self._add_vulnerability_info(
-                        vuln_name=vuln_name,
-                        vulnerabilities=vulnerabilities,
-                        vuln_info=vuln_info,
-                        vulns_data=vulnerabilities_data,
-                    )
+                    if vulnerability_filter.match_fix(
+                        None, None
+                    ) and self.is_vulnerability_valid_but_not_fixable(
+                        vuln_bin_fix_version,
+                        bin_pkg_name,
+                        vuln.source_fixed_version,
+                    ):
+                        self._add_unfixable_vulnerability(
+                            packages=packages,
+                            bin_pkg_name=bin_pkg_name,
+                            bin_pkg_version=bin_pkg_version,
+                            vuln_name=vuln.name,
+                            vuln_pkg_status="unknown",
+                        )
+                        self._add_vulnerability_info(
+                            vuln_name=vuln.name,
+                            vulnerabilities=vulnerabilities,
+                            vuln_info=vuln.info,
+                            vulns_data=vulnerabilities_data,
+                        )
+
+                    if vuln_bin_fix_version is None:
+                        continue
+
+                    if not vulnerability_filter.match_fix(
+                        vuln_bin_fix_version, vuln.pocket
+                    ):
+                        continue
+
+                    if self.vulnerability_affects_system(
+                        bin_pkg_version,
+                        vuln_bin_fix_version,
+                    ):
+                        self._add_fixable_vulnerability(
+                            packages=packages,
+                            bin_pkg_name=bin_pkg_name,
+                            bin_pkg_version=bin_pkg_version,
+                            vuln_name=vuln.name,
+                            vuln_pkg_status=vuln.status,
+                            vuln_bin_fix_version=vuln_bin_fix_version,
+                            vuln_pocket=vuln.pocket,
+                        )
+                        self._add_vulnerability_info(
+                            vuln_name=vuln.name,
+                            vulnerabilities=vulnerabilities,
+                            vuln_info=vuln.info,
+                            vulns_data=vulnerabilities_data,
+                        )
+
+        return packages, vulnerabilities
+
+    def _evaluate_installed_pkgs_in_workers(
+        self,
+        vulnerabilities_data: Dict[str, Any],
+        installed_pkgs_by_source: Dict[str, Dict[str, str]],
+        vulnerability_filter: VulnerabilityFilter,
+        workers: int,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        global _worker_state
+
+        sources = list(installed_pkgs_by_source)
+        chunk_size = -(-len(sources) // (workers * CHUNKS_PER_WORKER))
+        chunks = [
+            sources[i : i + chunk_size]
+            for i in range(0, len(sources), chunk_size)
+        ]
 
-                if vuln_bin_fix_version is None:
-                    continue
-
-                if self.vulnerability_affects_system(
-                    bin_pkg_version,
-                    vuln_bin_fix_version,
-                ):
-                    self._add_fixable_vulnerability(
-                        packages=packages,
-                        bin_pkg_name=bin_pkg_name,
-                        bin_pkg_version=bin_pkg_version,
-                        vuln_name=vuln_name,
-                        vuln_pkg_status=vuln_pkg_status,
-                        vuln_bin_fix_version=vuln_bin_fix_version,
-                        vuln_pocket=pocket,
-                    )
-                    self._add_vulnerability_info(
-                        vuln_name=vuln_name,
-                        vulnerabilities=vulnerabilities,
-                        vuln_info=vuln_info,
-                        vulns_data=vulnerabilities_data,
+        # The workers are forked, so they share the parsed vulnerability
+        # data with this process instead of receiving a copy of it
+        _worker_state = (
+            self,
+            vulnerabilities_data,
+            installed_pkgs_by_source,
+            vulnerability_filter,
+        )
+        try:
+            context = multiprocessing.get_context("fork")
+            with context.Pool(min(workers, len(chunks))) as pool:
+                results = pool.map(_evaluate_chunk, chunks)
+        finally:
+            _worker_state = None
+
+        # The chunks are merged in order, which gives the same result as
+        # going through every source package in this process
+        packages = {}  # type: Dict[str, Any]
+        vulnerabilities = {}  # type: Dict[str, Any]
+        for chunk_packages, chunk_vulnerabilities in results:
+            for bin_pkg_name, pkg in chunk_packages.items():
+                if bin_pkg_name in packages:
+                    packages[bin_pkg_name][self.vulnerability_type].extend(
+                        pkg[self.vulnerability_type]
                     )
+                else:
+                    packages[bin_pkg_name] = pkg
+            for vuln_name, vuln_info in chunk_vulnerabilities.items():
+                vulnerabilities.setdefault(vuln_name, vuln_info)
+
+        return packages, vulnerabilities
+
+    def get_vulnerabilities_for_installed_pkgs(
+        self,
+        vulnerabilities_data: Dict[str, Any],
+        installed_pkgs_by_source: Dict[str, Dict[str, str]],
+        workers: int = 1,
+        vulnerability_filter: Optional[VulnerabilityFilter] = None,
+    ):
+        """
+        Find the vulnerabilities affecting the installed packages.
+
+        With more than one worker, the source packages are split between
+        that many processes. This is only worth it for very large sets of
+        installed packages, as starting the workers has a cost of its own.
+
+        With a vulnerability filter, only the packages and vulnerabilities
+        matching it are evaluated.
+        """
+        if vulnerability_filter is None:
+            vulnerability_filter = VulnerabilityFilter()
+        installed_pkgs_by_source = vulnerability_filter.filter_installed_pkgs(
+            installed_pkgs_by_source
+        )
+
+        if (
+            workers > 1
+            and len(installed_pkgs_by_source) > 1
+            and "fork" in multiprocessing.get_all_start_methods()
+        ):
+            packages, vulnerabilities = (
+                self._evaluate_installed_pkgs_in_workers(
+                    vulnerabilities_data,
+                    installed_pkgs_by_source,
+                    vulnerability_filter,
+                    workers,
+                )
+            )
+        else:
+            packages, vulnerabilities = self._evaluate_installed_pkgs(
+                vulnerabilities_data,
+                installed_pkgs_by_source,
+                vulnerability_filter,
+            )
 
         return VulnerabilityParserResult(
             vulnerability_data_published_at=vulnerabilities_data.get(
@@ -514,6 +763,54 @@ class VulnerabilityParser(metaclass=abc.ABCMeta):
         )
 
 
+# The parser, the vulnerability data, the installed packages and the filter,
+# as seen by the forked workers evaluating the vulnerabilities
+_worker_state = (
+    None
+)  # type: Optional[Tuple[VulnerabilityParser, Dict[str, Any], Dict[str, Dict[str, str]], VulnerabilityFilter]]  # noqa: E501
+
+
+def _evaluate_chunk(
+    sources: List[str],
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    assert _worker_state is not None
+    (
+        parser,
+        vulnerabilities_data,
+        installed_pkgs_by_source,
+        vulnerability_filter,
+    ) = _worker_state
+    return parser._evaluate_installed_pkgs(
+        vulnerabilities_data,
+        {source: installed_pkgs_by_source[source] for source in sources},
+        vulnerability_filter,
+    )
+
+
+def get_evaluation_workers(cfg: UAConfig) -> int:
+    """
+    Return the number of processes evaluating the vulnerabilities.
+
+    This is the vulnerability_evaluation_workers feature, where 0 means one
+    worker per CPU. Vulnerabilities are evaluated in this process by default.
+    """
+    workers = cfg.features.get("vulnerability_evaluation_workers")
+    if workers is None:
+        return 1
+    try:
+        workers = int(workers)
+        if workers < 0:
+            raise ValueError(workers)
+    except (TypeError, ValueError):
+        LOG.warning(
+            "Ignoring invalid vulnerability_evaluation_workers: %s", workers
+        )
+        return 1
+    if workers == 0:
+        return os.cpu_count() or 1
+    return workers
+
+
 class VulnerabilityResultCache:
 
     def __init__(self, vulnerability_type: str, series: Optional[str] = None):
@@ -575,12 +872,24 @@ class VulnerabilityResultCache:
     def get_result_cache(self):
         return json.loads(system.load_file(self._get_result_cache_path()))
 
+    def delete_result_cache(self):
+        if util.we_are_currently_root():
+            system.ensure_file_absent(self._get_result_cache_path())
+
 
 def get_vulnerabilities(
     parser: VulnerabilityParser,
     cfg: UAConfig,
     series: Optional[str],
+    vulnerability_filter: Optional[VulnerabilityFilter] = None,
 ):
+    """
+    Return the vulnerabilities affecting the system.
+
+    The complete result is cached until the vulnerability data or the
+    installed packages change, and it is returned as is while it is valid.
+    Otherwise, only the vulnerabilities matching the filter are evaluated.
+    """
     vulnerabilities_data = VulnerabilityData(
         cfg=cfg,
         series=series,
@@ -605,11 +914,18 @@ def get_vulnerabilities(
         parser.get_vulnerabilities_for_installed_pkgs(
             vulnerabilities_data=vulnerabilities_json_data,
             installed_pkgs_by_source=installed_pkgs_by_source,
+            workers=get_evaluation_workers(cfg),
+            vulnerability_filter=vulnerability_filter,
         )
     )
 
-    vulnerabilities_result.save_result_cache(
-        vulnerabilities_parser_result.vulnerabilities_info
-    )
+    if vulnerability_filter is None or vulnerability_filter.is_empty:
+        vulnerabilities_result.save_result_cache(
+            vulnerabilities_parser_result.vulnerabilities_info
+        )
+    elif vulnerabilities_data.refreshed:
+        # A partial result can't be cached, and the cached one was computed
+        # from the previous vulnerability data
+        vulnerabilities_result.delete_result_cache()
 
     return vulnerabilities_parser_result
@@ -1,12 +1,15 @@
 import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
-from uaclient import system, util
+from uaclient import exceptions, system, util
 from uaclient.api.api import APIEndpoint
-from uaclient.api.data_types import AdditionalInfo
+from uaclient.api.data_types import AdditionalInfo, APIStreamRecord
 from uaclient.api.u.pro.security.cves._common.v1 import (
+    PRIORITIES,
+    VulnerabilityFilter,
     VulnerabilityParser,
     get_vulnerabilities,
+    query_installed_source_pkg_versions,
 )
 from uaclient.apt import get_apt_cache_datetime
 from uaclient.config import UAConfig
@@ -36,16 +39,38 @@ class CVEsOptions(DataObject):
             False,
             doc="Show only fixable CVES.",
         ),
+        Field(
+            "packages",
+            data_list(StringDataValue),
+            False,
+            doc=(
+                "Show only CVEs affecting these installed packages, given by"
+                " source or binary package name."
+            ),
+        ),
+        Field(
+            "priority",
+            StringDataValue,
+            False,
+            doc=(
+                "Show only CVEs with this Ubuntu priority or a higher one."
+                " One of: {}.".format(", ".join(PRIORITIES))
+            ),
+        ),
     ]
 
     def __init__(
         self,
         *,
         unfixable: Optional[bool] = False,
-        fixable: Optional[bool] = False
+        fixable: Optional[bool] = False,
+        packages: Optional[List[str]] = None,
+        priority: Optional[str] = None
     ):
         self.unfixable = unfixable
         self.fixable = fixable
+        self.packages = packages
+        self.priority = priority
 
 
 class CVEAffectedPackage(DataObject):
@@ -252,37 +277,72 @@ class CVEParser(VulnerabilityParser):
         return vulnerability_info
 
 
-def cve_status_match_options(cve, options) -> bool:
-    is_fixable = cve.get("fix_version") and cve.get("fix_origin")
-
-    if options.unfixable and is_fixable:
-        return False
-    elif options.fixable and not is_fixable:
-        return False
-    return True
-
-
 def cves(
     options: CVEsOptions,
 ) -> CVEsResult:
     return _cves(options, UAConfig())
 
 
-def _parse_vulnerabilities(
+def _get_vulnerability_filter(options: CVEsOptions) -> VulnerabilityFilter:
+    if options.priority is not None and options.priority not in PRIORITIES:
+        raise exceptions.InvalidArgChoice(
+            arg="priority", choices=", ".join(PRIORITIES)
+        )
+
+    return VulnerabilityFilter(
+        packages=options.packages,
+        fixable=bool(options.fixable),
+        unfixable=bool(options.unfixable),
+        min_priority=options.priority,
+    )
+
+
+def _get_allowed_packages(
+    vulnerability_filter: VulnerabilityFilter,
+) -> Optional[Set[str]]:
+    if vulnerability_filter.packages is None:
+        return None
+
+    return {
+        bin_pkg_name
+        for binary_pkgs in vulnerability_filter.filter_installed_pkgs(
+            query_installed_source_pkg_versions()
+        ).values()
+        for bin_pkg_name in binary_pkgs
+    }
+
+
+def _iter_affected_packages(
     options: CVEsOptions,
     vulnerabilities: Dict[str, Any],
-    vulnerability_data_published_at: str,
-) -> CVEsResult:
-    packages = {}
-    allowed_cves = set()
+    allowed_cves: Set[str],
+) -> Iterator[Tuple[str, AffectedPackage]]:
+    """
+    Yield the affected packages matching the options, adding the name of
+    every CVE that affects them to allowed_cves.
+
+    The evaluation of the vulnerabilities already left most of what doesn't
+    match the options out, but a cached result has everything.
+    """
+    vulnerability_filter = _get_vulnerability_filter(options)
+    allowed_packages = _get_allowed_packages(vulnerability_filter)
+    cves_info = vulnerabilities.get("vulnerabilities", {})
+
     for pkg_name, package_info in sorted(
         vulnerabilities.get("packages", {}).items()
     ):
+        if allowed_packages is not None and pkg_name not in allowed_packages:
+            continue
+
         pkg_cves = []
         for cve in sorted(
             package_info.get("cves", []), key=lambda cve: cve["name"]
         ):
-            if cve_status_match_options(cve, options):
+            if vulnerability_filter.match_fix(
+                cve.get("fix_version"), cve.get("fix_origin")
+            ) and vulnerability_filter.match_priority(
+                cves_info.get(cve["name"], {}).get("ubuntu_priority")
+            ):
                 pkg_cves.append(
                     CVEAffectedPackage(
                         name=cve["name"],
@@ -294,13 +354,24 @@ def _parse_vulnerabilities(
                 allowed_cves.add(cve["name"])
 
         if pkg_cves:
-            packages[pkg_name] = AffectedPackage(
+            yield pkg_name, AffectedPackage(
                 current_version=package_info["current_version"],
                 cves=pkg_cves,
             )
 
-    cves = {
-        cve_name: CVEInfo(
+
+def _iter_cves_info(
+    vulnerabilities: Dict[str, Any],
+    allowed_cves: Set[str],
+) -> Iterator[Tuple[str, CVEInfo]]:
+    for cve_name, cve in sorted(
+        vulnerabilities.get("vulnerabilities", {}).items(),
+        key=lambda v: v[0],
+    ):
+        if cve_name not in allowed_cves:
+            continue
+
+        yield cve_name, CVEInfo(
             description=cve["description"],
             published_at=util.parse_rfc3339_date(cve["published_at"]),
             priority=cve["ubuntu_priority"],
@@ -316,12 +387,18 @@ def _parse_vulnerabilities(
             ],
             related_packages=cve.get("related_packages", []),
         )
-        for cve_name, cve in sorted(
-            vulnerabilities.get("vulnerabilities", {}).items(),
-            key=lambda v: v[0],
-        )
-        if cve_name in allowed_cves
-    }
+
+
+def _parse_vulnerabilities(
+    options: CVEsOptions,
+    vulnerabilities: Dict[str, Any],
+    vulnerability_data_published_at: str,
+) -> CVEsResult:
+    allowed_cves = set()  # type: Set[str]
+    packages = dict(
+        _iter_affected_packages(options, vulnerabilities, allowed_cves)
+    )
+    cves = dict(_iter_cves_info(vulnerabilities, allowed_cves))
 
     return CVEsResult(
         packages=packages,
@@ -333,15 +410,10 @@ def _parse_vulnerabilities(
     )
 
 
-def _cves(
+def _get_cve_vulnerabilities(
     options: CVEsOptions,
     cfg: UAConfig,
-) -> CVEsResult:
-    """
-    This endpoint shows the CVE vulnerabilities in the system.
-    By default, this API will show all CVEs that affect the system.
-    """
-
+):
     # By default we return all affected CVEs. If a user provides
     # both options, we just switch to the default approach
     if options.unfixable and options.fixable:
@@ -350,12 +422,24 @@ def _cves(
 
     series = system.get_release_info().series
 
-    cve_vulnerabilities_result = get_vulnerabilities(
+    return get_vulnerabilities(
         parser=CVEParser(),
         cfg=cfg,
         series=series,
+        vulnerability_filter=_get_vulnerability_filter(options),
     )
 
+
+def _cves(
+    options: CVEsOptions,
+    cfg: UAConfig,
+) -> CVEsResult:
+    """
+    This endpoint shows the CVE vulnerabilities in the system.
+    By default, this API will show all CVEs that affect the system.
+    The options narrow down the CVEs and packages that are evaluated.
+    """
+    cve_vulnerabilities_result = _get_cve_vulnerabilities(options, cfg)
     cve_vulnerabilities = cve_vulnerabilities_result.vulnerabilities_info
 
     return _parse_vulnerabilities(
@@ -365,11 +449,42 @@ def _cves(
     )
 
 
+def _cves_stream(
+    options: CVEsOptions,
+    cfg: UAConfig,
+) -> Iterator[APIStreamRecord]:
+    """
+    Streaming version of this endpoint: yields one AffectedPackage record
+    per affected package, followed by one CVEInfo record per CVE that
+    affects them. Records are identified by package and CVE name.
+
+    Only the serialization is streamed: the vulnerabilities are evaluated,
+    or read from the result cache, as a whole before the first record.
+    """
+    cve_vulnerabilities = _get_cve_vulnerabilities(
+        options, cfg
+    ).vulnerabilities_info
+
+    allowed_cves = set()  # type: Set[str]
+    for pkg_name, affected_package in _iter_affected_packages(
+        options, cve_vulnerabilities, allowed_cves
+    ):
+        yield APIStreamRecord(
+            type="AffectedPackage", id=pkg_name, attributes=affected_package
+        )
+
+    for cve_name, cve_info in _iter_cves_info(
+        cve_vulnerabilities, allowed_cves
+    ):
+        yield APIStreamRecord(type="CVEInfo", id=cve_name, attributes=cve_info)
+
+
 endpoint = APIEndpoint(
     version="v1",
     name="CVEs",
     fn=_cves,
     options_cls=CVEsOptions,
+    stream_fn=_cves_stream,
 )
 
 _doc = {
@@ -385,6 +500,17 @@ result = cves(options)
     "ignore_result_classes": [DataObject],
     "exceptions": [],
     "example_cli": "pro api u.pro.security.cves.v1",
+    "example_cli_extra": """
+This endpoint also supports streaming output with
+``pro api u.pro.security.cves.v1 --stream``. Each affected package is then
+printed on its own line as an ``AffectedPackage`` record identified by the
+package name, followed by one ``CVEInfo`` record per CVE identified by the CVE
+name, and a final line with the result of the call.
+
+Only the output is streamed: the CVEs affecting the system are still evaluated
+as a whole before the first record is printed, so streaming lowers the memory
+needed to print the result, not the time it takes to get the first record.
+""",
     "example_json": """
 {
     "cves": {
@@ -471,7 +471,8 @@ def query_installed_source_pkg_versions() -> Dict[str, Dict[str, str]]:
             "dpkg-query",
             "-f=${Package},${Source},${Version}," + status_field + "\n",
             "-W",
-        ]
+        ],
+        cache=True,
     )
     installed_packages = {}  # type: Dict[str, Dict[str, str]]
     for pkg_line in out.splitlines():
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple  # noqa: F401
 
 from uaclient import apt, messages, util
 from uaclient.api.u.pro.security.fix._common import FixStatus, status_message
@@ -125,6 +125,135 @@ class ExecuteContext:
         self.errors = []  # type: List[FixExecuteError]
 
 
+class AptUpgradeBatch:
+    """The apt upgrade steps of several security issues.
+
+    The steps are queued while the fix plans are handled, then run as a
+    single apt transaction: at most one apt update for the whole batch,
+    one install of every binary package and one apt cache open to read the
+    upgraded versions. The results are still reported for each issue: if
+    the single install fails, each issue is installed on its own to find
+    out which ones can't be upgraded.
+    """
+
+    def __init__(self):
+        self.apt_updated = False
+        # Each step is queued with the position its error would have taken
+        # in the issue errors, had it been run when handled
+        self.pending_steps = (
+            []
+        )  # type: List[Tuple[ExecuteContext, FixPlanAptUpgradeStep, int]]
+
+    def add(
+        self, execute_context: ExecuteContext, step: FixPlanAptUpgradeStep
+    ):
+        self.pending_steps.append(
+            (execute_context, step, len(execute_context.errors))
+        )
+
+    def _install(self, binary_packages: List[str]):
+        if not self.apt_updated:
+            apt.run_apt_update_command()
+            self.apt_updated = True
+        apt.run_apt_command(
+            cmd=["apt-get", "install", "--only-upgrade", "-y"]
+            + binary_packages,
+            override_env_vars={"DEBIAN_FRONTEND": "noninteractive"},
+        )
+
+    def _add_upgraded_packages(
+        self,
+        execute_context: ExecuteContext,
+        step: FixPlanAptUpgradeStep,
+        pkg_versions: Dict[str, str],
+    ):
+        for pkg in step.data.binary_packages:
+            pkg_version = pkg_versions.get(pkg)
+
+            if pkg_version:
+                execute_context.upgraded_pkgs.append(
+                    UpgradedPackage(
+                        name=pkg,
+                        version=pkg_version,
+                        pocket=step.data.pocket,
+                    )
+                )
+
+    def _add_install_error(
+        self,
+        execute_context: ExecuteContext,
+        step: FixPlanAptUpgradeStep,
+        error_index: int,
+        error: Exception,
+        inserted_errors: Dict[int, int],
+    ):
+        # The error is inserted where the step would have added it, which
+        # moves the position of the next errors of the same issue
+        execute_context.status = FixStatus.SYSTEM_STILL_VULNERABLE.value.msg
+        offset = inserted_errors.get(id(execute_context), 0)
+        execute_context.errors.insert(
+            error_index + offset,
+            FixExecuteError(
+                error_type="fix-error-installing-pkg",
+                reason=getattr(error, "msg", str(error)),
+                failed_upgrades=[
+                    FailedUpgrade(name=pkg, pocket=step.data.pocket)
+                    for pkg in step.data.source_packages
+                ],
+            ),
+        )
+        inserted_errors[id(execute_context)] = offset + 1
+
+    def _run_steps_one_by_one(
+        self,
+        pending_steps: List[Tuple[ExecuteContext, FixPlanAptUpgradeStep, int]],
+    ):
+        inserted_errors = {}  # type: Dict[int, int]
+        for execute_context, step, error_index in pending_steps:
+            try:
+                self._install(step.data.binary_packages)
+                pkg_versions = apt.get_pkg_versions(step.data.binary_packages)
+            except Exception as e:
+                self._add_install_error(
+                    execute_context, step, error_index, e, inserted_errors
+                )
+                continue
+
+            self._add_upgraded_packages(execute_context, step, pkg_versions)
+
+    def run(self):
+        pending_steps = self.pending_steps
+        self.pending_steps = []
+        if not pending_steps:
+            return
+
+        binary_packages = []  # type: List[str]
+        for _, step, _ in pending_steps:
+            binary_packages.extend(
+                pkg
+                for pkg in step.data.binary_packages
+                if pkg not in binary_packages
+            )
+
+        try:
+            self._install(binary_packages)
+            pkg_versions = apt.get_pkg_versions(binary_packages)
+        except Exception as e:
+            if len(pending_steps) == 1:
+                execute_context, step, error_index = pending_steps[0]
+                self._add_install_error(
+                    execute_context, step, error_index, e, {}
+                )
+            else:
+                # Retry each issue on its own, so that only the issues
+                # whose packages can't be upgraded are reported as errors
+                self._run_steps_one_by_one(pending_steps)
+            return
+
+        for execute_context, step, _ in pending_steps:
+            self._add_upgraded_packages(execute_context, step, pkg_versions)
+
+
 def _handle_error(
     execute_context: ExecuteContext, security_issue: FixPlanResult
 ):
@@ -212,7 +341,9 @@ def _handle_enable(execute_context: ExecuteContext, step: FixPlanEnableStep):
 
 
 def _handle_apt_upgrade(
-    execute_context: ExecuteContext, step: FixPlanAptUpgradeStep
+    execute_context: ExecuteContext,
+    step: FixPlanAptUpgradeStep,
+    apt_upgrade_batch: AptUpgradeBatch,
 ):
     if execute_context.require_attach or execute_context.require_enable:
         return
@@ -234,39 +365,7 @@ def _handle_apt_upgrade(
         execute_context.status = "error"
         return
 
-    try:
-        apt.run_apt_update_command()
-        apt.run_apt_command(
-            cmd=["apt-get", "install", "--only-upgrade", "-y"]
-            + step.data.binary_packages,
-            override_env_vars={"DEBIAN_FRONTEND": "noninteractive"},
-        )
-
-        for pkg in step.data.binary_packages:
-            pkg_version = apt.get_pkg_version(pkg)
-
-            if pkg_version:
-                execute_context.upgraded_pkgs.append(
-                    UpgradedPackage(
-                        name=pkg,
-                        version=pkg_version,
-                        pocket=step.data.pocket,
-                    )
-                )
-
-    except Exception as e:
-        msg = getattr(e, "msg", str(e))
-        execute_context.status = FixStatus.SYSTEM_STILL_VULNERABLE.value.msg
-        execute_context.errors.append(
-            FixExecuteError(
-                error_type="fix-error-installing-pkg",
-                reason=msg,
-                failed_upgrades=[
-                    FailedUpgrade(name=pkg, pocket=step.data.pocket)
-                    for pkg in step.data.source_packages
-                ],
-            )
-        )
+    apt_upgrade_batch.add(execute_context, step)
 
 
 def _handle_noop(execute_context: ExecuteContext, step: FixPlanNoOpStep):
@@ -274,34 +373,67 @@ def _handle_noop(execute_context: ExecuteContext, step: FixPlanNoOpStep):
         execute_context.status = FixStatus.SYSTEM_NOT_AFFECTED.value.msg
 
 
-def _execute_fix(security_issue: FixPlanResult) -> FixExecuteResult:
-    execute_context = ExecuteContext()
+def _execute_fixes(
+    security_issues: List[FixPlanResult],
+    apt_upgrade_batch: Optional[AptUpgradeBatch] = None,
+) -> List[FixExecuteResult]:
+    """Execute the fix plans, upgrading all their packages at once.
+
+    :param apt_upgrade_batch: Shared by several calls in the same
+        execution, so that apt update is only run once.
+    """
+    if apt_upgrade_batch is None:
+        apt_upgrade_batch = AptUpgradeBatch()
+
+    execute_contexts = []  # type: List[ExecuteContext]
+    for security_issue in security_issues:
+        execute_context = ExecuteContext()
+        execute_contexts.append(execute_context)
+
+        if security_issue.error:
+            _handle_error(execute_context, security_issue)
+
+        if security_issue.warnings:
+            for warning in security_issue.warnings:
+                if isinstance(warning, FixPlanWarningSecurityIssueNotFixed):
+                    _handle_security_issue_not_fixed(execute_context, warning)
+                elif isinstance(
+                    warning, FixPlanWarningPackageCannotBeInstalled
+                ):
+                    _handle_package_cannot_be_installed(
+                        execute_context, warning
+                    )
 
-    if security_issue.error:
-        _handle_error(execute_context, security_issue)
-
-    if security_issue.warnings:
-        for warning in security_issue.warnings:
-            if isinstance(warning, FixPlanWarningSecurityIssueNotFixed):
-                _handle_security_issue_not_fixed(execute_context, warning)
-            elif isinstance(warning, FixPlanWarningPackageCannotBeInstalled):
-                _handle_package_cannot_be_installed(execute_context, warning)
-
-    if security_issue.plan:
-        for step in security_issue.plan:
-            if isinstance(step, FixPlanAttachStep):
-                _handle_attach(execute_context, step)
-            elif isinstance(step, FixPlanEnableStep):
-                _handle_enable(execute_context, step)
-            elif isinstance(step, FixPlanAptUpgradeStep):
-                _handle_apt_upgrade(execute_context, step)
-            elif isinstance(step, FixPlanNoOpStep):
-                _handle_noop(execute_context, step)
-
-    return FixExecuteResult(
-        title=security_issue.title,
-        description=security_issue.description,
-        status=execute_context.status,
-        upgraded_packages=execute_context.upgraded_pkgs,
-        errors=None if not execute_context.errors else execute_context.errors,
-    )
+        if security_issue.plan:
+            for step in security_issue.plan:
+                if isinstance(step, FixPlanAttachStep):
+                    _handle_attach(execute_context, step)
+                elif isinstance(step, FixPlanEnableStep):
+                    _handle_enable(execute_context, step)
+                elif isinstance(step, FixPlanAptUpgradeStep):
+                    _handle_apt_upgrade(
+                        execute_context, step, apt_upgrade_batch
+                    )
+                elif isinstance(step, FixPlanNoOpStep):
+                    _handle_noop(execute_context, step)
+
+    apt_upgrade_batch.run()
+
+    return [
+        FixExecuteResult(
+            title=security_issue.title,
+            description=security_issue.description,
+            status=execute_context.status,
+            upgraded_packages=execute_context.upgraded_pkgs,
+            errors=(
+                None if not execute_context.errors else execute_context.errors
+            ),
+        )
+        for security_issue, execute_context in zip(
+            security_issues, execute_contexts
+        )
+    ]
+
+
+def _execute_fix(security_issue: FixPlanResult) -> FixExecuteResult:
+    return _execute_fixes([security_issue])[0]
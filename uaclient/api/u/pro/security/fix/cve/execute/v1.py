@@ -16,6 +16,7 @@ from uaclient.api.u.pro.security.fix._common.execute.v1 import (  # noqa: F401
     FixExecuteResult,
     UpgradedPackage,
     _execute_fix,
+    _execute_fixes,
 )
 from uaclient.api.u.pro.security.fix.cve.plan.v1 import (
     CVEFixPlanOptions,
@@ -77,16 +78,13 @@ def _execute(
     This endpoint fixes the specified CVEs on the machine.
     """
     fix_plan = _plan(CVEFixPlanOptions(cves=options.cves), cfg=cfg)
-    cves_result = []  # type: List[FixExecuteResult]
+    cves_result = _execute_fixes(fix_plan.cves_data.cves)
     all_cves_status = FixStatus.SYSTEM_NOT_AFFECTED.value.msg
 
-    for cve in fix_plan.cves_data.cves:
-        cve_result = _execute_fix(cve)
-
+    for cve_result in cves_result:
         all_cves_status = get_expected_overall_status(
             all_cves_status, cve_result.status
         )
-        cves_result.append(cve_result)
 
     return CVESAPIFixExecuteResult(
         cves_data=CVEAPIFixExecuteResult(
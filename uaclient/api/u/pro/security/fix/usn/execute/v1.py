@@ -11,11 +11,16 @@ from uaclient.api.u.pro.security.fix._common import (
 # The rationale is that we want users to import such Data Objects
 # directly from the associated endpoints and not through the _common module
 from uaclient.api.u.pro.security.fix._common.execute.v1 import (  # noqa: F401
+    AptUpgradeBatch,
     FailedUpgrade,
     FixExecuteError,
     FixExecuteResult,
     UpgradedPackage,
     _execute_fix,
+    _execute_fixes,
+)
+from uaclient.api.u.pro.security.fix._common.plan.v1 import (  # noqa: F401
+    FixPlanResult,
 )
 from uaclient.api.u.pro.security.fix.usn.plan.v1 import (
     USNFixPlanOptions,
@@ -103,10 +108,18 @@ def _execute(
     fix_plan = _plan(USNFixPlanOptions(usns=options.usns), cfg=cfg)
     usns_result = []  # type: List[FixExecuteUSNResult]
     all_usns_status = FixStatus.SYSTEM_NOT_AFFECTED.value.msg
+    apt_upgrade_batch = AptUpgradeBatch()
 
-    for usn in fix_plan.usns_data.usns:
-        target_usn_result = _execute_fix(usn.target_usn_plan)
-
+    target_usns_result = _execute_fixes(
+        [usn.target_usn_plan for usn in fix_plan.usns_data.usns],
+        apt_upgrade_batch,
+    )
+    # The related USNs are only fixed for the target USNs that were fixed.
+    # They are all executed together, in a second apt transaction.
+    related_usns_plan = []  # type: List[FixPlanResult]
+    for usn, target_usn_result in zip(
+        fix_plan.usns_data.usns, target_usns_result
+    ):
         all_usns_status = get_expected_overall_status(
             all_usns_status, target_usn_result.status
         )
@@ -119,15 +132,22 @@ def _execute(
             target_usn_result.status
             != FixStatus.SYSTEM_STILL_VULNERABLE.value.msg
         ):
-            related_usns_result = []  # type: List[FixExecuteResult]
-
-            for related_usn in usn.related_usns_plan:
-                related_usns_result.append(_execute_fix(related_usn))
-
-            usn_fix_execute_result.related_usns = related_usns_result
+            related_usns_plan.extend(usn.related_usns_plan)
+            usn_fix_execute_result.related_usns = []
 
         usns_result.append(usn_fix_execute_result)
 
+    related_usns_result = iter(
+        _execute_fixes(related_usns_plan, apt_upgrade_batch)
+    )
+    for usn, usn_fix_execute_result in zip(
+        fix_plan.usns_data.usns, usns_result
+    ):
+        if usn_fix_execute_result.related_usns is not None:
+            usn_fix_execute_result.related_usns = [
+                next(related_usns_result) for _ in usn.related_usns_plan
+            ]
+
     return USNSAPIFixExecuteResult(
         usns_data=USNAPIFixExecuteResult(
             status=all_usns_status, usns=usns_result
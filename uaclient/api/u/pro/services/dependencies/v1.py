@@ -110,11 +110,13 @@ def _dependencies(cfg: UAConfig) -> DependenciesResult:
     dependencies between services.
     """
     services = []
+    ent_dependencies = entitlements.get_entitlement_dependencies(cfg)
     for ent_cls in entitlements.ENTITLEMENT_CLASSES:
-        ent = ent_cls(cfg)
         incompatible_with = []
         depends_on = []
-        for ent_with_reason in ent.incompatible_services:
+        for ent_with_reason in ent_dependencies.incompatible_services[
+            ent_cls.name
+        ]:
             incompatible_with.append(
                 ServiceWithReason(
                     name=ent_with_reason.entitlement.name,
@@ -124,7 +126,9 @@ def _dependencies(cfg: UAConfig) -> DependenciesResult:
                     ),
                 )
             )
-        for ent_with_reason in ent.required_services:
+        for ent_with_reason in ent_dependencies.required_services[
+            ent_cls.name
+        ]:
             depends_on.append(
                 ServiceWithReason(
                     name=ent_with_reason.entitlement.name,
@@ -1,5 +1,6 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
+from uaclient import util
 from uaclient.api.api import APIEndpoint
 from uaclient.api.data_types import AdditionalInfo, ErrorWarningObject
 from uaclient.api.u.pro.status.is_attached.v1 import _is_attached
@@ -62,8 +63,16 @@ def _enabled_services(cfg: UAConfig) -> EnabledServicesResult:
     """
     This endpoint shows the Pro services that are enabled on the machine.
     """
-    from uaclient.entitlements import ENTITLEMENT_CLASSES
+    from uaclient.entitlements import ENTITLEMENT_CLASSES, get_entitlement
     from uaclient.entitlements.entitlement_status import UserFacingStatus
+    from uaclient.status import get_status_snapshot
+
+    if not util.we_are_currently_root():
+        snapshot = get_status_snapshot(cfg)
+        if snapshot is not None:
+            return _enabled_services_from_status(
+                snapshot.get_status(show_all=True)
+            )
 
     if not _is_attached(cfg).is_attached:
         return EnabledServicesResult(enabled_services=[])
@@ -71,15 +80,15 @@ def _enabled_services(cfg: UAConfig) -> EnabledServicesResult:
     enabled_services = []  # type: List[EnabledService]
     warnings = []  # type: List[ErrorWarningObject]
     for ent_cls in ENTITLEMENT_CLASSES:
-        ent = ent_cls(cfg)
+        ent = get_entitlement(cfg, ent_cls.name)
         ent_status, details = ent.user_facing_status()
 
         if ent_status in (UserFacingStatus.ACTIVE, UserFacingStatus.WARNING):
             ent_name = ent.presentation_name
             enabled_service = EnabledService(name=ent_name)
 
-            for _, variant_cls in ent.variants.items():
-                variant = variant_cls(cfg)
+            for variant_name in ent.variants:
+                variant = get_entitlement(cfg, ent.name, variant_name)
 
                 if variant.user_facing_status()[0] == UserFacingStatus.ACTIVE:
                     enabled_service = EnabledService(
@@ -108,6 +117,56 @@ def _enabled_services(cfg: UAConfig) -> EnabledServicesResult:
     return result
 
 
+def _enabled_services_from_status(
+    status: Dict[str, Any]
+) -> EnabledServicesResult:
+    """Return the enabled services listed in a status dict."""
+    from uaclient.entitlements.entitlement_status import UserFacingStatus
+
+    if not status.get("attached"):
+        return EnabledServicesResult(enabled_services=[])
+
+    enabled_services = []  # type: List[EnabledService]
+    warnings = []  # type: List[ErrorWarningObject]
+    for service in status.get("services", []):
+        service_status = service.get("status")
+        if service_status not in (
+            UserFacingStatus.ACTIVE.value,
+            UserFacingStatus.WARNING.value,
+        ):
+            continue
+
+        ent_name = service.get("name", "")
+        enabled_service = EnabledService(name=ent_name)
+        for variant_name, variant in (service.get("variants") or {}).items():
+            if variant.get("status") == UserFacingStatus.ACTIVE.value:
+                enabled_service = EnabledService(
+                    name=ent_name,
+                    variant_enabled=True,
+                    variant_name=variant_name,
+                )
+                break
+
+        enabled_services.append(enabled_service)
+
+        warning = service.get("warning")
+        if service_status == UserFacingStatus.WARNING.value and warning:
+            warnings.append(
+                ErrorWarningObject(
+                    title=warning.get("message") or "",
+                    code=warning.get("code") or "",
+                    meta={"service": ent_name},
+                )
+            )
+
+    result = EnabledServicesResult(
+        enabled_services=sorted(enabled_services, key=lambda x: x.name),
+    )
+    result.warnings = warnings
+
+    return result
+
+
 endpoint = APIEndpoint(
     version="v1",
     name="EnabledServices",
@@ -1,6 +1,12 @@
+import gzip
+import os
+import sys
+import tempfile
+from typing import Iterator, Optional
+
 from uaclient import apt, snap
 from uaclient.api.api import APIEndpoint
-from uaclient.api.data_types import AdditionalInfo
+from uaclient.api.data_types import AdditionalInfo, APIStreamRecord
 from uaclient.config import UAConfig
 from uaclient.data_types import DataObject, Field, StringDataValue
 
@@ -21,6 +27,19 @@ class PackageManifestResult(DataObject, AdditionalInfo):
         self.manifest_data = manifest_data
 
 
+class PackageManifestEntry(DataObject):
+    fields = [
+        Field(
+            "manifest_line",
+            StringDataValue,
+            doc="A single line of the package manifest",
+        ),
+    ]
+
+    def __init__(self, manifest_line: str):
+        self.manifest_line = manifest_line
+
+
 # The return class was once called PackageManifestResults
 # We are keeping compatibility
 PackageManifestResults = PackageManifestResult
@@ -30,26 +49,87 @@ def package_manifest() -> PackageManifestResult:
     return _package_manifest(UAConfig())
 
 
-def _package_manifest(cfg: UAConfig) -> PackageManifestResult:
-    """
-    This endpoint returns the status of installed packages (``apt`` and
-    ``snap``), formatted as a manifest file (i.e., ``package_name\\tversion``).
-    """
-    manifest = ""
-    apt_pkgs = apt.get_installed_packages()
-    for apt_pkg in apt_pkgs:
+def _iter_manifest_lines() -> Iterator[str]:
+    for apt_pkg in apt.iter_installed_packages():
         arch = "" if apt_pkg.arch == "all" else ":" + apt_pkg.arch
-        manifest += "{}{}\t{}\n".format(apt_pkg.name, arch, apt_pkg.version)
+        yield "{}{}\t{}\n".format(apt_pkg.name, arch, apt_pkg.version)
 
-    pkgs = snap.get_installed_snaps()
-    for pkg in pkgs:
-        manifest += "snap:{name}\t{channel}\t{revision}\n".format(
+    for pkg in snap.iter_installed_snaps():
+        yield "snap:{name}\t{channel}\t{revision}\n".format(
             name=pkg.name,
             channel=pkg.channel,
             revision=pkg.revision,
         )
 
-    return PackageManifestResult(manifest_data=manifest)
+
+def _package_manifest(cfg: UAConfig) -> PackageManifestResult:
+    """
+    This endpoint returns the status of installed packages (``apt`` and
+    ``snap``), formatted as a manifest file (i.e., ``package_name\\tversion``).
+    """
+    return PackageManifestResult(manifest_data="".join(_iter_manifest_lines()))
+
+
+def write_package_manifest(
+    output_path: Optional[str] = None, compress: bool = False
+) -> None:
+    """
+    Write the package manifest line by line to output_path, or to stdout if
+    no path is given, without building it in memory first.
+
+    When writing to a file, the manifest is written to a temporary file in
+    the same directory and renamed into place once complete.
+
+    :param output_path: the file to write the manifest to
+    :param compress: whether to gzip-compress the manifest
+    """
+    if output_path is None:
+        sys.stdout.flush()
+        if compress:
+            with gzip.open(sys.stdout.buffer, "wt") as gz_stdout:
+                gz_stdout.writelines(_iter_manifest_lines())
+        else:
+            sys.stdout.writelines(_iter_manifest_lines())
+        sys.stdout.flush()
+        return
+
+    tmpf = tempfile.NamedTemporaryFile(
+        mode="wb" if compress else "w",
+        encoding=None if compress else "utf-8",
+        delete=False,
+        dir=os.path.dirname(output_path) or ".",
+    )
+    try:
+        if compress:
+            with gzip.open(tmpf, "wt") as gz_file:
+                gz_file.writelines(_iter_manifest_lines())
+        else:
+            tmpf.writelines(_iter_manifest_lines())
+        tmpf.close()
+        os.chmod(tmpf.name, 0o644)
+        os.rename(tmpf.name, output_path)
+    except Exception:
+        tmpf.close()
+        os.unlink(tmpf.name)
+        raise
+
+
+def _write_package_manifest(
+    cfg: UAConfig, *, output_path: Optional[str] = None, compress: bool = False
+) -> None:
+    write_package_manifest(output_path, compress=compress)
+
+
+def _package_manifest_stream(cfg: UAConfig) -> Iterator[APIStreamRecord]:
+    """
+    Streaming version of this endpoint: yields one PackageManifestEntry
+    record per installed package.
+    """
+    for line in _iter_manifest_lines():
+        yield APIStreamRecord(
+            type="PackageManifestEntry",
+            attributes=PackageManifestEntry(manifest_line=line),
+        )
 
 
 endpoint = APIEndpoint(
@@ -57,6 +137,8 @@ endpoint = APIEndpoint(
     name="Packages",
     fn=_package_manifest,
     options_cls=None,
+    stream_fn=_package_manifest_stream,
+    write_fn=_write_package_manifest,
 )
 
 _doc = {
@@ -66,10 +148,26 @@ _doc = {
 from uaclient.api.u.security.package_manifest.v1 import package_manifest
 
 result = package_manifest()
-""",
+
+# Or, to write the manifest straight to a (optionally gzipped) file:
+from uaclient.api.u.security.package_manifest.v1 import write_package_manifest
+
+write_package_manifest("/tmp/manifest.gz", compress=True)
+""",  # noqa: E501
     "result_class": PackageManifestResult,
     "exceptions": [],
     "example_cli": "pro api u.security.package_manifest.v1",
+    "example_cli_extra": """
+This endpoint also supports streaming output with
+``pro api u.security.package_manifest.v1 --stream``. Each manifest line is
+then printed on its own line as a ``PackageManifestEntry`` record, followed by
+a final line with the result of the call.
+
+The manifest can also be written directly to a file, optionally
+gzip-compressed, with
+``pro api u.security.package_manifest.v1 --output manifest.gz --compress``.
+Use ``--output -`` to write it to stdout instead.
+""",
     "example_json": """
 {
     "package_manifest":"package1\\t1.0\\npackage2\\t2.3\\n"
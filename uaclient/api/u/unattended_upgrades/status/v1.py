@@ -1,8 +1,9 @@
 import datetime
+import logging
 import os
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from uaclient import apt, exceptions, messages, system
+from uaclient import apt, exceptions, messages, system, util
 from uaclient.api.api import APIEndpoint
 from uaclient.api.data_types import AdditionalInfo
 from uaclient.api.exceptions import UnattendedUpgradesError
@@ -17,6 +18,9 @@ from uaclient.data_types import (
     StringDataValue,
     data_list,
 )
+from uaclient.files import state_files
+
+LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
 
 UNATTENDED_UPGRADES_CONFIG_KEYS = [
     "APT::Periodic::Enable",
@@ -138,14 +142,8 @@ class UnattendedUpgradesStatusResult(DataObject, AdditionalInfo):
 
 def _get_apt_daily_job_status() -> bool:
     try:
-        apt_daily_job_enabled = system.is_systemd_unit_active(
-            "apt-daily.timer"
-        )
-        apt_daily_upgrade_job_enabled = system.is_systemd_unit_active(
-            "apt-daily-upgrade.timer"
-        )
-        systemd_apt_timer_enabled = (
-            apt_daily_job_enabled and apt_daily_upgrade_job_enabled
+        systemd_apt_timer_enabled = system.are_systemd_units_active(
+            ["apt-daily.timer", "apt-daily-upgrade.timer"]
         )
     except exceptions.ProcessExecutionError as e:
         raise UnattendedUpgradesError(error_msg=str(e))
@@ -189,6 +187,68 @@ def _get_unattended_upgrades_last_run() -> Optional[datetime.datetime]:
     return datetime.datetime.fromtimestamp(creation_epoch)
 
 
+def _get_unattended_upgrades_snapshot_inputs() -> Dict[str, Any]:
+    return {
+        "apt_config_mtimes": apt.get_apt_config_mtimes(),
+        "dpkg_status_mtime": apt.get_dpkg_status_time(),
+    }
+
+
+def _get_unattended_upgrades_snapshot(
+    inputs: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """Return the snapshot, if it was taken with the same inputs."""
+    try:
+        content = state_files.unattended_upgrades_snapshot_file.read()
+    except Exception as e:
+        LOG.warning(
+            "Ignoring invalid unattended-upgrades snapshot: %s", str(e)
+        )
+        return None
+
+    if not content or content.get("inputs") != inputs:
+        return None
+    return content
+
+
+def _get_unattended_upgrades_state() -> (
+    Tuple[bool, Dict[str, Union[str, List[str]]]]
+):
+    """
+    Return if unattended-upgrades is installed, and its APT configuration.
+
+    Opening the apt cache and reinitializing the APT configuration are the
+    slowest parts of the endpoint, so their results are kept in a snapshot
+    until dpkg or the APT configuration files change.
+    """
+    # The inputs are taken first, so that any change while we read the
+    # configuration invalidates the snapshot
+    inputs = _get_unattended_upgrades_snapshot_inputs()
+    snapshot = _get_unattended_upgrades_snapshot(inputs)
+    if snapshot is not None:
+        return snapshot["installed"], snapshot["config"]
+
+    installed = apt.is_installed("unattended-upgrades")
+    unattended_upgrades_cfg = {}  # type: Dict[str, Union[str, List[str]]]
+    if installed:
+        unattended_upgrades_cfg = get_apt_config_values(
+            set(
+                UNATTENDED_UPGRADES_CONFIG_KEYS
+                + get_apt_config_keys("Unattended-Upgrade")
+            )
+        )
+
+    if util.we_are_currently_root():
+        state_files.unattended_upgrades_snapshot_file.write(
+            {
+                "inputs": inputs,
+                "installed": installed,
+                "config": unattended_upgrades_cfg,
+            }
+        )
+    return installed, unattended_upgrades_cfg
+
+
 def status() -> UnattendedUpgradesStatusResult:
     return _status(UAConfig())
 
@@ -206,7 +266,8 @@ def _status(cfg: UAConfig) -> UnattendedUpgradesStatusResult:
         configurations, unparsed. This means that this field will maintain both
         original name and values for those configurations.
     """
-    if not apt.is_installed("unattended-upgrades"):
+    installed, unattended_upgrades_cfg = _get_unattended_upgrades_state()
+    if not installed:
         return UnattendedUpgradesStatusResult(
             systemd_apt_timer_enabled=False,
             apt_periodic_job_enabled=False,
@@ -224,13 +285,6 @@ def _status(cfg: UAConfig) -> UnattendedUpgradesStatusResult:
     systemd_apt_timer_enabled = _get_apt_daily_job_status()
     unattended_upgrades_last_run = _get_unattended_upgrades_last_run()
 
-    unattended_upgrades_cfg = get_apt_config_values(
-        set(
-            UNATTENDED_UPGRADES_CONFIG_KEYS
-            + get_apt_config_keys("Unattended-Upgrade")
-        )
-    )
-
     # If that key is not present on the APT Config, we assume it
     # that the config is "enabled", as by default this configuration
     # will not be present in APT
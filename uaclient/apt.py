@@ -8,7 +8,16 @@ import re
 import subprocess
 import tempfile
 from functools import lru_cache, wraps
-from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Union
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Union,
+)
 
 import apt_pkg  # type: ignore
 from apt.progress.base import AcquireProgress  # type: ignore
@@ -18,6 +27,7 @@ from uaclient import (
     exceptions,
     gpg,
     messages,
+    profiling,
     secret_manager,
     system,
     util,
@@ -58,6 +68,14 @@ APT_METHOD_HTTPS_FILE = "/usr/lib/apt/methods/https"
 CA_CERTIFICATES_FILE = "/usr/sbin/update-ca-certificates"
 APT_PROXY_CONF_FILE = "/etc/apt/apt.conf.d/90ubuntu-advantage-aptproxy"
 
+APT_CONFIG_MAIN_PATH = "/etc/apt/apt.conf"
+APT_CONFIG_PARTS_DIR = "/etc/apt/apt.conf.d"
+APT_SOURCES_PATH = "/etc/apt/sources.list"
+APT_SOURCES_PARTS_DIR = "/etc/apt/sources.list.d"
+APT_PREFERENCES_PATH = "/etc/apt/preferences"
+APT_PREFERENCES_PARTS_DIR = "/etc/apt/preferences.d"
+APT_LISTS_DIR = "/var/lib/apt/lists"
+
 APT_UPDATE_SUCCESS_STAMP_PATH = "/var/lib/apt/periodic/update-success-stamp"
 DPKG_STATUS_PATH = "/var/lib/dpkg/status"
 
@@ -225,6 +243,7 @@ def run_apt_command(
     cmd: List[str],
     error_msg: Optional[str] = None,
     override_env_vars: Optional[Dict[str, str]] = None,
+    cache: bool = False,
 ) -> str:
     """Run an apt command, retrying upon failure APT_RETRIES times.
 
@@ -232,6 +251,8 @@ def run_apt_command(
     :param error_msg: The string to raise as UbuntuProError when all retries
        are exhausted in failure.
     :param override_env_vars: Passed directly as subp's override_env_vars arg
+    :param cache: True for read-only commands, whose output subp may reuse.
+       Any other apt command is considered to change the system.
 
     :return: stdout from successful run of the apt command.
     :raise UbuntuProError: on issues running apt-cache policy.
@@ -242,6 +263,8 @@ def run_apt_command(
             capture=True,
             retry_sleeps=APT_RETRIES,
             override_env_vars=override_env_vars,
+            cache=cache,
+            mutating=not cache,
         )
     except exceptions.ProcessExecutionError as e:
         LOG.error("Error running apt command %s: %s", str(cmd), str(e))
@@ -273,6 +296,7 @@ def get_apt_cache_policy(
         cmd=["apt-cache", "policy"],
         error_msg=error_msg,
         override_env_vars=override_env_vars,
+        cache=True,
     )
 
 
@@ -287,7 +311,8 @@ class PreserveAptCfg:
             key: copy.deepcopy(cfg.get(key)) for key in cfg.keys()
         }
 
-        return self.apt_func()
+        with profiling.span("apt.PreserveAptCfg"):
+            return self.apt_func()
 
     def __exit__(self, type, value, traceback):
         cfg = apt_pkg.config
@@ -343,6 +368,24 @@ def get_pkg_version(pkg_name: str) -> Optional[str]:
     return None
 
 
+def get_pkg_versions(pkg_names: Iterable[str]) -> Dict[str, str]:
+    """Return the installed version of each package, from one cache open.
+
+    Packages that are unknown or not installed are left out.
+    """
+    versions = {}
+    with PreserveAptCfg(get_apt_pkg_cache) as cache:
+        for pkg_name in pkg_names:
+            try:
+                package = cache[pkg_name]
+            except KeyError:
+                continue
+            if package.current_ver:
+                versions[pkg_name] = package.current_ver.ver_str
+
+    return versions
+
+
 def get_pkg_candidate_version(
     pkg_name: str, check_esm_cache: bool = False
 ) -> Optional[str]:
@@ -625,7 +668,7 @@ def add_auth_apt_repo(
     if check_updates_pocket:
         updates_enabled = False
         policy = run_apt_command(
-            ["apt-cache", "policy"], messages.APT_POLICY_FAILED
+            ["apt-cache", "policy"], messages.APT_POLICY_FAILED, cache=True
         )
         for line in policy.splitlines():
             # We only care about $suite-updates lines
@@ -761,13 +804,13 @@ def add_ppa_pinning(apt_preference_file, repo_url, origin, priority):
 def get_apt_auth_file_from_apt_config():
     """Return to patch to the system configured APT auth file."""
     out, _err = system.subp(
-        ["apt-config", "shell", "key", APT_CONFIG_AUTH_PARTS_DIR]
+        ["apt-config", "shell", "key", APT_CONFIG_AUTH_PARTS_DIR], cache=True
     )
     if out:  # then auth.conf.d parts is present
         return out.split("'")[1] + "90ubuntu-advantage"
     else:  # then use configured /etc/apt/auth.conf
         out, _err = system.subp(
-            ["apt-config", "shell", "key", APT_CONFIG_AUTH_FILE]
+            ["apt-config", "shell", "key", APT_CONFIG_AUTH_FILE], cache=True
         )
         return out.split("'")[1].rstrip("/")
 
@@ -779,7 +822,7 @@ def find_apt_list_files(repo_url, series):
         repo_path = repo_path[:-1]
     lists_dir = "/var/lib/apt/lists"
     out, _err = system.subp(
-        ["apt-config", "shell", "key", APT_CONFIG_LISTS_DIR]
+        ["apt-config", "shell", "key", APT_CONFIG_LISTS_DIR], cache=True
     )
     if out:  # then lists dir is present in config
         lists_dir = out.split("'")[1]
@@ -804,20 +847,26 @@ def is_installed(pkg: str) -> bool:
     return pkg in get_installed_packages_names()
 
 
-def get_installed_packages() -> List[InstalledAptPackage]:
-    installed = []
+def iter_installed_packages() -> Iterator[InstalledAptPackage]:
+    """
+    Yield the installed packages while walking the apt cache.
+
+    The apt configuration is restored when the generator is exhausted or
+    closed, so callers that stop early should close it.
+    """
     with PreserveAptCfg(get_apt_pkg_cache) as cache:
         for package in cache.packages:
             installed_version = package.current_ver
             if installed_version:
-                installed.append(
-                    InstalledAptPackage(
-                        name=package.name,
-                        version=installed_version.ver_str,
-                        arch=installed_version.arch,
-                    )
+                yield InstalledAptPackage(
+                    name=package.name,
+                    version=installed_version.ver_str,
+                    arch=installed_version.arch,
                 )
-    return installed
+
+
+def get_installed_packages() -> List[InstalledAptPackage]:
+    return list(iter_installed_packages())
 
 
 def get_installed_packages_names() -> List[str]:
@@ -1105,6 +1154,72 @@ def get_apt_config_values(
     return apt_cfg_dict
 
 
+def _get_mtimes(paths: List[str], parts_dirs: List[str]) -> Dict[str, float]:
+    """
+    Get the mtime of each existing path, and of each parts directory along
+    with every file in it.
+
+    The directories themselves are included, so that adding or removing a
+    file changes the result even if the file mtimes don't.
+    """
+    paths = list(paths)
+    for parts_dir in parts_dirs:
+        paths.append(parts_dir)
+        try:
+            paths += sorted(
+                os.path.join(parts_dir, name) for name in os.listdir(parts_dir)
+            )
+        except OSError:
+            pass
+
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime
+        except OSError:
+            pass
+    return mtimes
+
+
+def get_apt_config_mtimes() -> Dict[str, float]:
+    """Get the mtime of every file the APT configuration is read from."""
+    paths = [APT_CONFIG_MAIN_PATH]
+    if os.environ.get("APT_CONFIG"):
+        paths.append(os.environ["APT_CONFIG"])
+    return _get_mtimes(paths, [APT_CONFIG_PARTS_DIR])
+
+
+def get_apt_state_mtimes() -> Dict[str, float]:
+    """
+    Get the mtime of every file the apt caches are built from: the APT
+    configuration, sources, preferences, package lists and dpkg status, for
+    both the system and the ESM caches.
+
+    apt update moves the package lists into place, so the mtime of the lists
+    directories is enough to notice new lists.
+    """
+    mtimes = get_apt_config_mtimes()
+    mtimes.update(
+        _get_mtimes(
+            [
+                APT_SOURCES_PATH,
+                APT_PREFERENCES_PATH,
+                APT_LISTS_DIR,
+                DPKG_STATUS_PATH,
+                os.path.join(ESM_APT_ROOTDIR, "etc/apt/sources.list"),
+                os.path.join(ESM_APT_ROOTDIR, "var/lib/apt/lists"),
+            ],
+            [
+                APT_SOURCES_PARTS_DIR,
+                APT_PREFERENCES_PARTS_DIR,
+                os.path.join(ESM_APT_ROOTDIR, "etc/apt/sources.list.d"),
+                os.path.join(ESM_APT_ROOTDIR, "etc/apt/preferences.d"),
+            ],
+        )
+    )
+    return mtimes
+
+
 def get_system_sources_file() -> str:
     old_sources_path = "/etc/apt/sources.list"
     new_sources_path = "/etc/apt/sources.list.d/ubuntu.sources"
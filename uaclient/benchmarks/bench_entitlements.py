@@ -0,0 +1,48 @@
+import pytest
+
+from uaclient import entitlements
+from uaclient.api.u.pro.services.dependencies.v1 import _dependencies
+from uaclient.api.u.pro.status.enabled_services.v1 import _enabled_services
+from uaclient.benchmarks import fixtures
+from uaclient.entitlements import ENTITLEMENT_CLASSES
+
+# The number of services unknown to this client listed in the contract
+EXTRA_ENTITLEMENTS = 20
+
+
+@pytest.mark.usefixtures("on_synthetic_system")
+class TestEntitlementsBenchmarks:
+    @pytest.fixture
+    def attached_config(self, FakeConfig, fake_machine_token_file):
+        fake_machine_token_file.attached = True
+        fake_machine_token_file.token = fixtures.generate_machine_token(
+            [cls.name for cls in ENTITLEMENT_CLASSES], EXTRA_ENTITLEMENTS
+        )
+        return FakeConfig()
+
+    def test_enable_preparation(
+        self, benchmark, attached_config, fake_machine_token_file
+    ):
+        """What pro enable does for every service before enabling it."""
+        names = entitlements.valid_services(attached_config)
+
+        def _prepare_enable():
+            # Every pro enable runs in a new process, so start from a token
+            # without any data derived from it yet
+            fake_machine_token_file.generation += 1
+            found, not_found = entitlements.get_valid_entitlement_names(
+                names, attached_config
+            )
+            _enabled_services(attached_config)
+            _dependencies(attached_config)
+            for name in entitlements.order_entitlements_for_enabling(
+                attached_config, found
+            ):
+                ent = entitlements.entitlement_factory(attached_config, name)
+                entitlements.get_title(attached_config, name)
+                ent.variants
+            return found, not_found
+
+        benchmark("enable_preparation", _prepare_enable)
+
+        assert (names, []) == _prepare_enable()
@@ -0,0 +1,52 @@
+import pytest
+
+from uaclient import security_status
+from uaclient.benchmarks import fixtures
+from uaclient.files import state_files
+
+
+@pytest.mark.usefixtures("on_synthetic_system")
+class TestSecurityStatusBenchmarks:
+    def test_security_status_dict(self, benchmark, scale, FakeConfig):
+        cfg = FakeConfig()
+
+        def _security_status_dict():
+            # A CLI run starts without any cached candidate version
+            security_status._is_candidate_version.cache_clear()
+            state_files.security_status_cache_file.delete()
+            return security_status.security_status_dict(cfg)
+
+        benchmark("security_status_dict", _security_status_dict)
+
+        summary = security_status.security_status_dict(cfg)["summary"]
+        assert scale == summary["num_installed_packages"]
+        assert summary["num_esm_infra_updates"] > 0
+        assert summary["num_esm_apps_updates"] > 0
+        assert summary["num_standard_security_updates"] > 0
+
+    def test_security_status_dict_cached(self, benchmark, scale, FakeConfig):
+        cfg = FakeConfig()
+
+        def _security_status_dict():
+            # Later runs, without any apt change, reuse the cached results
+            security_status._is_candidate_version.cache_clear()
+            return security_status.security_status_dict(cfg)
+
+        benchmark("security_status_dict_cached", _security_status_dict)
+
+        summary = security_status.security_status_dict(cfg)["summary"]
+        assert scale == summary["num_installed_packages"]
+        assert state_files.security_status_cache_file.is_present
+
+    def test_get_installed_packages_by_origin(self, benchmark, scale):
+        benchmark(
+            "get_installed_packages_by_origin",
+            security_status.get_installed_packages_by_origin,
+        )
+
+        packages = security_status.get_installed_packages_by_origin()
+        assert scale == len(packages["all"])
+        assert len(packages["main"]) + len(packages["universe"]) == scale
+        assert {fixtures.binary_name(0)} <= {
+            package.name for package in packages["main"]
+        }
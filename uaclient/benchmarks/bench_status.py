@@ -0,0 +1,58 @@
+import mock
+import pytest
+
+from uaclient import status
+from uaclient.api.api import call_api
+from uaclient.benchmarks import fixtures
+from uaclient.entitlements import ENTITLEMENT_CLASSES
+
+# The number of services unknown to this client listed in the contract
+EXTRA_ENTITLEMENTS = 20
+API_CALLS = 100
+
+
+@pytest.mark.usefixtures("on_synthetic_system")
+class TestStatusBenchmarks:
+    @pytest.fixture
+    def attached_config(self, FakeConfig, fake_machine_token_file):
+        fake_machine_token_file.attached = True
+        fake_machine_token_file.token = fixtures.generate_machine_token(
+            [cls.name for cls in ENTITLEMENT_CLASSES], EXTRA_ENTITLEMENTS
+        )
+        return FakeConfig()
+
+    def test_attached_status(self, benchmark, attached_config):
+        benchmark("status", lambda: status.status(cfg=attached_config))
+
+        result = status.status(cfg=attached_config)
+        assert result["attached"]
+        assert len(ENTITLEMENT_CLASSES) == len(result["services"])
+
+    def test_nonroot_status_snapshot(self, benchmark, attached_config):
+        status.status(cfg=attached_config)
+
+        def _nonroot_status():
+            snapshot = status.get_status_snapshot(attached_config)
+            assert snapshot is not None
+            snapshot.get_status()
+            snapshot.get_tabular()
+
+        with mock.patch(
+            "uaclient.util.we_are_currently_root", return_value=False
+        ):
+            benchmark("nonroot_status_snapshot", _nonroot_status)
+
+    def test_format_tabular(self, benchmark, attached_config):
+        result = status.status(cfg=attached_config)
+
+        benchmark("format_tabular", lambda: status.format_tabular(result))
+
+    def test_api_dispatch(self, benchmark, attached_config):
+        def _call_api():
+            for _ in range(API_CALLS):
+                call_api("u.pro.version.v1", [], "", attached_config)
+
+        benchmark("call_api", _call_api)
+
+        result = call_api("u.pro.version.v1", [], "", attached_config)
+        assert "success" == result.result
@@ -0,0 +1,98 @@
+import mock
+import pytest
+
+from uaclient.api.u.pro.security.cves._common.v1 import (
+    query_installed_source_pkg_versions,
+)
+from uaclient.api.u.pro.security.cves.v1 import CVEParser, CVEsOptions, _cves
+from uaclient.api.u.pro.security.fix._common import CVE, USN
+from uaclient.api.u.pro.security.fix._common.plan.v1 import _fix_plan_cve
+from uaclient.benchmarks import fixtures
+
+M_PLAN_PATH = "uaclient.api.u.pro.security.fix._common.plan.v1."
+# Every affected binary package is looked up in the apt cache, so the CVE
+# affects a bounded number of source packages at every scale
+FIX_PLAN_SOURCES = 50
+EVALUATION_WORKERS = 4
+
+
+@pytest.mark.usefixtures("on_synthetic_system")
+class TestVulnerabilityBenchmarks:
+    def test_get_vulnerabilities_for_installed_pkgs(self, benchmark, scale):
+        data = fixtures.generate_vulnerability_data(scale)
+        installed_pkgs = query_installed_source_pkg_versions()
+
+        def _parse():
+            return CVEParser().get_vulnerabilities_for_installed_pkgs(
+                vulnerabilities_data=data,
+                installed_pkgs_by_source=installed_pkgs,
+            )
+
+        benchmark("get_vulnerabilities_for_installed_pkgs", _parse)
+
+        result = _parse().vulnerabilities_info
+        assert scale == len(result["packages"])
+
+    def test_get_vulnerabilities_for_installed_pkgs_in_workers(
+        self, benchmark, scale
+    ):
+        data = fixtures.generate_vulnerability_data(scale)
+        installed_pkgs = query_installed_source_pkg_versions()
+
+        def _parse():
+            return CVEParser().get_vulnerabilities_for_installed_pkgs(
+                vulnerabilities_data=data,
+                installed_pkgs_by_source=installed_pkgs,
+                workers=EVALUATION_WORKERS,
+            )
+
+        benchmark("get_vulnerabilities_for_installed_pkgs_in_workers", _parse)
+
+        result = _parse().vulnerabilities_info
+        assert scale == len(result["packages"])
+
+    def test_cves_api(self, benchmark, scale, synthetic_config):
+        benchmark("cves_api", lambda: _cves(CVEsOptions(), synthetic_config))
+
+        result = _cves(CVEsOptions(), synthetic_config)
+        assert scale == len(result.packages)
+
+    def test_cves_api_narrow_query(self, benchmark, scale, synthetic_config):
+        # Fixable CVEs for the binary packages of a single source package
+        options = CVEsOptions(
+            packages=[fixtures.source_name(0)], fixable=True, priority="medium"
+        )
+        benchmark(
+            "cves_api_narrow_query", lambda: _cves(options, synthetic_config)
+        )
+
+        result = _cves(options, synthetic_config)
+        assert sorted(result.packages) == [
+            fixtures.binary_name(i)
+            for i in range(fixtures.BINARIES_PER_SOURCE)
+        ]
+
+    @mock.patch(
+        M_PLAN_PATH + "_check_cve_fixed_by_livepatch",
+        return_value=(None, None),
+    )
+    def test_fix_plan_cve(
+        self, _m_livepatch, benchmark, scale, synthetic_config
+    ):
+        cve_response, usn_response = fixtures.generate_security_issue(
+            scale, FIX_PLAN_SOURCES
+        )
+        cve = CVE(client=mock.MagicMock(), response=cve_response)
+        usn = USN(client=mock.MagicMock(), response=usn_response)
+
+        with mock.patch(
+            M_PLAN_PATH + "_get_cve_data", return_value=(cve, [usn])
+        ):
+            benchmark(
+                "fix_plan_cve",
+                lambda: _fix_plan_cve(cve_response["id"], synthetic_config),
+            )
+            plan = _fix_plan_cve(cve_response["id"], synthetic_config)
+
+        assert cve_response["id"] == plan.title
+        assert plan.plan
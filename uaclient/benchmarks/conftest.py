@@ -0,0 +1,186 @@
+import json
+import os
+import time
+from urllib.parse import urljoin
+
+import mock
+import pytest
+
+from uaclient import apt, security_status, system
+from uaclient.benchmarks import fixtures
+from uaclient.defaults import VULNERABILITY_DATA_TMPL
+from uaclient.files import state_files
+from uaclient.files.files import UAFile
+
+THRESHOLDS_FILE = os.path.join(os.path.dirname(__file__), "thresholds.json")
+SCALES = ("1000", "5000", "20000")
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--scale",
+        choices=SCALES,
+        default=SCALES[0],
+        help="number of installed packages on the synthetic system",
+    )
+
+
+@pytest.fixture(scope="session")
+def scale(request):
+    return int(request.config.getoption("--scale"))
+
+
+@pytest.fixture(scope="session")
+def thresholds():
+    with open(THRESHOLDS_FILE) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def benchmark(scale, thresholds, capsys):
+    """Time a function and compare it to its threshold for this scale.
+
+    The function is called once to warm up caches that would be warm on a
+    real system, then the best of the measured rounds is kept.
+
+    Thresholds are set to three to five times the timings measured
+    on a developer machine, with a 0.1s floor, so that slower CI runners do
+    not fail on noise while regressions that change the scaling still do.
+    """
+
+    def _benchmark(name, func, rounds=3):
+        func()
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        threshold = thresholds[name][str(scale)]
+        with capsys.disabled():
+            print(
+                "\n{}[{}]: {:.3f}s (threshold {:.3f}s)".format(
+                    name, scale, best, threshold
+                )
+            )
+        assert best <= threshold, (
+            "{} took {:.3f}s with {} packages, over its threshold of "
+            "{:.3f}s".format(name, best, scale, threshold)
+        )
+        return best
+
+    return _benchmark
+
+
+def _get_apt_pkg_cache(root):
+    # Same as apt.get_apt_pkg_cache, with the synthetic root as Dir, the way
+    # apt.get_esm_apt_pkg_cache points apt to the ESM root
+    def _get_cache():
+        for key in apt.apt_pkg.config.keys():
+            apt.apt_pkg.config.clear(key)
+        apt.apt_pkg.config.set("Dir", root)
+        apt.apt_pkg.init()
+        return apt.apt_pkg.Cache(None)
+
+    return _get_cache
+
+
+@pytest.fixture(scope="session")
+def synthetic_system(scale, tmp_path_factory):
+    """Generate the state of a system with scale installed packages."""
+    base = str(tmp_path_factory.mktemp("synthetic-{}".format(scale)))
+    apt.apt_pkg.init()
+    arch = apt.apt_pkg.config.find("APT::Architecture")
+
+    apt_root = os.path.join(base, "root")
+    esm_root = os.path.join(base, "esm")
+    fixtures.generate_apt_root(apt_root, scale, arch)
+    fixtures.generate_esm_apt_root(esm_root, scale, arch)
+
+    feed = os.path.join(base, "vulnerability-data.json.xz")
+    fixtures.write_vulnerability_feed(feed, scale)
+
+    return {
+        "base": base,
+        "apt_root": apt_root,
+        "esm_root": esm_root,
+        "vulnerability_feed": feed,
+        "dpkg_query_output": fixtures.get_dpkg_query_output(scale),
+    }
+
+
+@pytest.yield_fixture
+def on_synthetic_system(synthetic_system):
+    """Point the Pro Client to the synthetic system state.
+
+    Apt caches, the series, dpkg-query and the vulnerability data downloads
+    all come from the generated files: nothing is read from the host
+    package state or from the network.
+    """
+
+    def _subp(args, *_args, **_kwargs):
+        if args[0] == "dpkg-query":
+            return synthetic_system["dpkg_query_output"], ""
+        return "", ""
+
+    base = synthetic_system["base"]
+    esm_root = synthetic_system["esm_root"]
+    get_cache = _get_apt_pkg_cache(synthetic_system["apt_root"])
+    release_info = system.ReleaseInfo(
+        distribution="Ubuntu",
+        release="22.04",
+        series=fixtures.SERIES,
+        pretty_version="22.04 LTS (Jammy Jellyfish)",
+    )
+    esm_structure = {
+        key: [path.replace(apt.ESM_APT_ROOTDIR, esm_root, 1) for path in paths]
+        for key, paths in apt.ESM_BASIC_FILE_STRUCTURE.items()
+    }
+    # The series is part of this cached map
+    security_status.get_origin_information_to_service_map.cache_clear()
+    with mock.patch("uaclient.apt.ESM_APT_ROOTDIR", esm_root), mock.patch(
+        "uaclient.apt.ESM_BASIC_FILE_STRUCTURE", esm_structure
+    ), mock.patch("uaclient.apt.get_apt_pkg_cache", get_cache), mock.patch(
+        "uaclient.security_status.get_apt_pkg_cache", get_cache
+    ), mock.patch(
+        "uaclient.system.get_release_info", return_value=release_info
+    ), mock.patch(
+        "uaclient.security_status.get_release_info", return_value=release_info
+    ), mock.patch(
+        "uaclient.system._subp", side_effect=_subp
+    ), mock.patch(
+        "uaclient.api.u.pro.security.cves._common.v1.VULNERABILITY_CACHE_PATH",
+        os.path.join(base, "vulnerability-cache"),
+    ), mock.patch.object(
+        state_files.status_cache_file,
+        "pro_file",
+        UAFile("status.json", directory=base, private=False),
+    ):
+        yield synthetic_system
+    security_status.get_origin_information_to_service_map.cache_clear()
+
+
+@pytest.fixture
+def synthetic_config(FakeConfig, synthetic_system, tmpdir):
+    """A config downloading the synthetic vulnerability data."""
+    overlay = tmpdir.join("responses.json")
+    cfg = FakeConfig()
+    url = urljoin(
+        cfg.vulnerability_data_url_prefix,
+        VULNERABILITY_DATA_TMPL.format(series=fixtures.SERIES),
+    )
+    overlay.write(
+        json.dumps(
+            {
+                url: [
+                    {
+                        "response": {
+                            "file_path": synthetic_system["vulnerability_feed"]
+                        }
+                    }
+                ]
+            }
+        )
+    )
+    cfg.override_features({"serviceclient_url_responses": overlay.strpath})
+    return cfg
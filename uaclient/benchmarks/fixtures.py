@@ -0,0 +1,368 @@
+"""
+Generators for the synthetic system state used by the benchmarks.
+
+Everything is derived from a number of installed binary packages, so that
+the same scenario can be generated at different scales. Three binary
+packages are built from each source package. Some of them have updates
+available in the Ubuntu security pocket, in esm-infra or in esm-apps, and
+most of the source packages are affected by CVEs.
+"""
+
+import datetime
+import json
+import lzma
+import os
+from typing import Any, Dict, List, Tuple
+
+SERIES = "jammy"
+ARCHIVE_URL = "http://archive.ubuntu.com/ubuntu"
+ESM_INFRA_URL = "https://esm.ubuntu.com/infra/ubuntu"
+ESM_APPS_URL = "https://esm.ubuntu.com/apps/ubuntu"
+BINARIES_PER_SOURCE = 3
+INSTALLED_VERSION = "1.0-1"
+SECURITY_VERSION = "1.0-1ubuntu0.1"
+ESM_VERSION = "1.0-1ubuntu0.1~esm1"
+CVES_PER_SOURCE = 2
+PUBLISHED_AT = "2024-01-01T00:00:00"
+
+
+def binary_name(index: int) -> str:
+    return "bench-pkg{}".format(index)
+
+
+def source_name(index: int) -> str:
+    return "bench-src{}".format(index // BINARIES_PER_SOURCE)
+
+
+def component(index: int) -> str:
+    # One source package out of four comes from universe
+    return "universe" if (index // BINARIES_PER_SOURCE) % 4 == 3 else "main"
+
+
+def fixed_version(index: int) -> str:
+    """Return the version fixing the package, if there is an update."""
+    source_index = index // BINARIES_PER_SOURCE
+    if source_index % 10 == 0:
+        return SECURITY_VERSION
+    if source_index % 10 in (1, 3):
+        return ESM_VERSION
+    return ""
+
+
+def pocket(index: int) -> str:
+    """Return the pocket of the update of the package, if any."""
+    if fixed_version(index) == SECURITY_VERSION:
+        return "security"
+    if fixed_version(index) == ESM_VERSION:
+        return "esm-apps" if component(index) == "universe" else "esm-infra"
+    return ""
+
+
+def _write_lines(path: str, lines: List[str]):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write("\n".join(lines))
+
+
+def _package_stanza(
+    index: int, version: str, arch: str, installed: bool
+) -> List[str]:
+    stanza = ["Package: {}".format(binary_name(index))]
+    if installed:
+        stanza.append("Status: install ok installed")
+    stanza += [
+        "Priority: optional",
+        "Section: {}".format(component(index)),
+        "Installed-Size: 100",
+        "Maintainer: Ubuntu Developers <ubuntu-devel@lists.ubuntu.com>",
+        "Architecture: {}".format(arch),
+        "Source: {} ({})".format(source_name(index), version),
+        "Version: {}".format(version),
+    ]
+    if not installed:
+        stanza += [
+            "Filename: pool/{}.deb".format(binary_name(index)),
+            "Size: 1000",
+            "SHA256: {}".format("0" * 64),
+        ]
+    stanza += ["Description: synthetic benchmark package", ""]
+    return stanza
+
+
+def _write_apt_repository(
+    root: str,
+    url: str,
+    suite: str,
+    origin: str,
+    packages: Dict[str, List[int]],
+    versions: Dict[int, str],
+    arch: str,
+):
+    lists_prefix = os.path.join(
+        root,
+        "var/lib/apt/lists",
+        "{}_dists_{}".format(url.split("://")[1].replace("/", "_"), suite),
+    )
+    _write_lines(
+        lists_prefix + "_InRelease",
+        [
+            "Origin: {}".format(origin),
+            "Label: {}".format(origin),
+            "Suite: {}".format(suite),
+            "Codename: {}".format(SERIES),
+            "Architectures: {}".format(arch),
+            "Components: {}".format(" ".join(sorted(packages))),
+            "",
+        ],
+    )
+    for comp, indexes in packages.items():
+        lines = []  # type: List[str]
+        for index in indexes:
+            lines += _package_stanza(index, versions[index], arch, False)
+        _write_lines(
+            "{}_{}_binary-{}_Packages".format(lists_prefix, comp, arch), lines
+        )
+    with open(os.path.join(root, "etc/apt/sources.list"), "a") as f:
+        f.write(
+            "deb {} {} {}\n".format(url, suite, " ".join(sorted(packages)))
+        )
+
+
+def _create_apt_root(root: str):
+    for folder in (
+        "etc/apt/apt.conf.d",
+        "etc/apt/preferences.d",
+        "etc/apt/sources.list.d",
+        "var/cache/apt/archives/partial",
+        "var/lib/apt/lists/partial",
+        "var/lib/dpkg",
+    ):
+        os.makedirs(os.path.join(root, folder), exist_ok=True)
+    open(os.path.join(root, "etc/apt/sources.list"), "w").close()
+
+
+def generate_apt_root(root: str, num_packages: int, arch: str):
+    """Create the dpkg status and apt lists of a system, under root."""
+    _create_apt_root(root)
+    status = []  # type: List[str]
+    for index in range(num_packages):
+        status += _package_stanza(index, INSTALLED_VERSION, arch, True)
+    _write_lines(os.path.join(root, "var/lib/dpkg/status"), status)
+
+    _write_apt_repository(
+        root,
+        ARCHIVE_URL,
+        SERIES,
+        "Ubuntu",
+        {
+            "main": [i for i in range(num_packages) if component(i) == "main"],
+            "universe": [
+                i for i in range(num_packages) if component(i) == "universe"
+            ],
+        },
+        {i: INSTALLED_VERSION for i in range(num_packages)},
+        arch,
+    )
+    security = [
+        i for i in range(num_packages) if fixed_version(i) == SECURITY_VERSION
+    ]
+    _write_apt_repository(
+        root,
+        ARCHIVE_URL,
+        "{}-security".format(SERIES),
+        "Ubuntu",
+        {"main": [i for i in security if component(i) == "main"]},
+        {i: SECURITY_VERSION for i in security},
+        arch,
+    )
+
+
+def generate_esm_apt_root(root: str, num_packages: int, arch: str):
+    """Create the apt lists of the ESM cache, under root."""
+    _create_apt_root(root)
+    _write_lines(os.path.join(root, "var/lib/dpkg/status"), [])
+    esm = [i for i in range(num_packages) if fixed_version(i) == ESM_VERSION]
+    for url, suite, origin, comp in (
+        (ESM_INFRA_URL, "infra-security", "UbuntuESM", "main"),
+        (ESM_APPS_URL, "apps-security", "UbuntuESMApps", "universe"),
+    ):
+        _write_apt_repository(
+            root,
+            url,
+            "{}-{}".format(SERIES, suite),
+            origin,
+            {"main": [i for i in esm if component(i) == comp]},
+            {i: ESM_VERSION for i in esm},
+            arch,
+        )
+
+
+def get_dpkg_query_output(num_packages: int) -> str:
+    """Return what dpkg-query prints for query_installed_source_pkg_versions"""
+    return "".join(
+        "{},{},{},installed\n".format(
+            binary_name(index), source_name(index), INSTALLED_VERSION
+        )
+        for index in range(num_packages)
+    )
+
+
+def generate_vulnerability_data(num_packages: int) -> Dict[str, Any]:
+    """Return vulnerability data in the format of the published feeds."""
+    packages = {}  # type: Dict[str, Any]
+    cves = {}  # type: Dict[str, Any]
+    for index in range(0, num_packages, BINARIES_PER_SOURCE):
+        src = source_name(index)
+        binaries = range(index, min(index + BINARIES_PER_SOURCE, num_packages))
+        fix = fixed_version(index)
+        source_cves = {}
+        for cve_index in range(CVES_PER_SOURCE):
+            name = "CVE-2024-{}".format(index * CVES_PER_SOURCE + cve_index)
+            source_cves[name] = {
+                "source_fixed_version": fix or None,
+                "status": "fixed" if fix else "needed",
+            }
+            cves[name] = {
+                "description": "synthetic vulnerability in {}".format(src),
+                "published_at": PUBLISHED_AT,
+                "ubuntu_priority": "medium",
+                "notes": [],
+                "cvss_score": 5.0,
+                "cvss_severity": "medium",
+                "related_usns": [],
+                "related_packages": [src],
+            }
+        packages[src] = {
+            "source_versions": {
+                version: {
+                    "pocket": (
+                        "security" if version == SECURITY_VERSION else "esm"
+                    ),
+                    "binary_packages": {
+                        binary_name(i): version for i in binaries
+                    },
+                }
+                for version in (SECURITY_VERSION, ESM_VERSION)
+            },
+            "cves": source_cves,
+        }
+
+    return {
+        "published_at": PUBLISHED_AT,
+        "packages": packages,
+        "security_issues": {"cves": cves, "usns": {}},
+    }
+
+
+def write_vulnerability_feed(path: str, num_packages: int):
+    """Write the vulnerability data xz-compressed, as it is published."""
+    with lzma.open(path, "wt") as f:
+        json.dump(generate_vulnerability_data(num_packages), f)
+
+
+def generate_security_issue(
+    num_packages: int, max_sources: int
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Return the API responses for a CVE and its USN.
+
+    The CVE affects the first max_sources source packages with an update.
+    """
+    sources = [
+        index
+        for index in range(0, num_packages, BINARIES_PER_SOURCE)
+        if fixed_version(index)
+    ][:max_sources]
+    cve_id = "CVE-2024-0"
+    usn = {
+        "id": "USN-1-1",
+        "title": "synthetic security issue",
+        "cves_ids": [cve_id],
+        "release_packages": {SERIES: []},
+    }  # type: Dict[str, Any]
+    cve = {
+        "id": cve_id,
+        "description": "synthetic security issue",
+        "notices": [usn],
+        "notices_ids": [usn["id"]],
+        "packages": [],
+    }  # type: Dict[str, Any]
+    for index in sources:
+        src = source_name(index)
+        cve["packages"].append(
+            {
+                "name": src,
+                "statuses": [
+                    {
+                        "release_codename": SERIES,
+                        "status": "released",
+                        "description": fixed_version(index),
+                        "pocket": pocket(index),
+                    }
+                ],
+            }
+        )
+        usn["release_packages"][SERIES].append(
+            {"name": src, "version": fixed_version(index), "is_source": True}
+        )
+        for binary in range(
+            index, min(index + BINARIES_PER_SOURCE, num_packages)
+        ):
+            usn["release_packages"][SERIES].append(
+                {
+                    "name": binary_name(binary),
+                    "version": fixed_version(binary),
+                    "source_link": "https://launchpad.net/ubuntu/+source/"
+                    + src,
+                    "pocket": pocket(binary),
+                }
+            )
+    return cve, usn
+
+
+def generate_machine_token(
+    entitlement_names: List[str], num_extra_entitlements: int
+) -> Dict[str, Any]:
+    """Return a machine token entitled to every known service.
+
+    num_extra_entitlements unknown entitlements are added, as contracts can
+    list services this client version doesn't know about.
+    """
+    names = list(entitlement_names) + [
+        "bench-service{}".format(i) for i in range(num_extra_entitlements)
+    ]
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return {
+        "availableResources": [
+            {"name": name, "available": True} for name in names
+        ],
+        "machineToken": "bench-machine-token",
+        "machineTokenInfo": {
+            "machineId": "bench-machine-id",
+            "accountInfo": {
+                "id": "bench-account",
+                "name": "bench",
+                "createdAt": now,
+            },
+            "contractInfo": {
+                "id": "bench-contract",
+                "name": "bench",
+                "createdAt": now,
+                "effectiveFrom": now - datetime.timedelta(days=1),
+                "effectiveTo": now + datetime.timedelta(days=365),
+                "products": ["uai-essential-virtual"],
+                "resourceEntitlements": [
+                    {
+                        "type": name,
+                        "entitled": True,
+                        "obligations": {"enableByDefault": False},
+                        "directives": {
+                            "aptURL": "https://esm.ubuntu.com/{}".format(name),
+                            "suites": [SERIES],
+                        },
+                        "affordances": {"series": [SERIES]},
+                    }
+                    for name in names
+                ],
+            },
+        },
+    }
@@ -1,5 +1,6 @@
 """Client to manage Ubuntu Pro services on a machine."""
 
+import json
 import logging
 import sys
 
@@ -12,9 +13,10 @@ from uaclient import (
     lock,
     log,
     messages,
-    util,
-    version,
+    profiling,
 )
+from uaclient import system as pro_system
+from uaclient import util, version
 from uaclient.cli.api import api_command
 from uaclient.cli.attach import attach_command
 from uaclient.cli.auto_attach import auto_attach_command
@@ -79,6 +81,13 @@ def get_parser():
         HelpCategory.FLAGS, "--debug", messages.CLI_ROOT_DEBUG
     )
 
+    parser.add_argument(
+        "--profile", metavar="FILE", help=messages.CLI_ROOT_PROFILE
+    )
+    parser.add_help_entry(
+        HelpCategory.FLAGS, "--profile FILE", messages.CLI_ROOT_PROFILE
+    )
+
     parser.add_argument(
         "--version",
         action="version",
@@ -126,6 +135,48 @@ def _warn_about_new_version(cmd_args=None) -> None:
         )
 
 
+def _run_action(args, cfg: UAConfig, extra_args):
+    """Run the command action, reusing the output of read-only commands.
+
+    When the subp_trace feature is set, the count and wall time of every
+    command run are logged at the end.
+    """
+    with pro_system.SubpCache():
+        if not cfg.features.get("subp_trace"):
+            return args.action(args, cfg=cfg, extra_args=extra_args)
+
+        with pro_system.SubpTrace() as subp_trace:
+            try:
+                return args.action(args, cfg=cfg, extra_args=extra_args)
+            finally:
+                for line in subp_trace.summary():
+                    LOG.debug("Subprocess trace: %s", line)
+
+
+def _run_profiled_action(args, cfg: UAConfig, extra_args):
+    """Run the command action, writing a trace of its timing spans.
+
+    The trace is written to the file passed to --profile in the Chrome trace
+    event format, even if the command fails. Failing to write the trace is
+    only logged, so it never hides the result or the error of the command.
+    """
+    with profiling.Profile() as profile:
+        try:
+            with profiling.span("cli.main", command=args.command):
+                return _run_action(args, cfg, extra_args)
+        finally:
+            try:
+                pro_system.write_file(
+                    args.profile, json.dumps(profile.to_chrome_trace())
+                )
+            except Exception as e:
+                LOG.warning(
+                    "Failed to write the profile trace to %s: %r",
+                    args.profile,
+                    e,
+                )
+
+
 def _warn_about_output_redirection(cmd_args) -> None:
     """Warn users that the user readable output may change."""
     if (
@@ -297,7 +348,10 @@ def main(sys_argv=None):
 
     _warn_about_output_redirection(args)
 
-    return_value = args.action(args, cfg=cfg, extra_args=extra_args)
+    if args.profile:
+        return_value = _run_profiled_action(args, cfg, extra_args)
+    else:
+        return_value = _run_action(args, cfg, extra_args)
 
     _warn_about_new_version(args)
 
@@ -5,7 +5,7 @@ from typing import Any, Optional  # noqa: F401
 
 from uaclient import exceptions, messages
 from uaclient.api import AbstractProgress
-from uaclient.api.api import call_api
+from uaclient.api.api import call_api, stream_api, write_api
 from uaclient.cli.commands import ProArgument, ProArgumentGroup, ProCommand
 from uaclient.cli.parser import HelpCategory
 
@@ -35,6 +35,31 @@ def action_api(args, *, cfg, **kwargs):
         if not sys.stdin.isatty():
             args.data = sys.stdin.read()
 
+    if args.stream and args.output:
+        raise exceptions.CLIAPIStreamXOROutput()
+
+    if args.output:
+        to_stdout = args.output == "-"
+        response = write_api(
+            args.endpoint_path,
+            args.options,
+            args.data,
+            cfg,
+            output_path=None if to_stdout else args.output,
+            compress=args.compress,
+        )
+        # The written result owns stdout, so report the call on stderr
+        print(response.to_json(), file=sys.stderr if to_stdout else sys.stdout)
+        return 0 if response.result == "success" else 1
+
+    if args.stream:
+        result = None
+        for result in stream_api(
+            args.endpoint_path, args.options, args.data, cfg
+        ):
+            print(result.to_json(), flush=True)
+        return 0 if getattr(result, "result", None) == "success" else 1
+
     if args.show_progress:
         progress = CLIAPIProgress()
     else:
@@ -67,6 +92,11 @@ api_command = ProCommand(
                     help=messages.CLI_API_SHOW_PROGRESS,
                     action="store_true",
                 ),
+                ProArgument(
+                    "--stream",
+                    help=messages.CLI_API_STREAM,
+                    action="store_true",
+                ),
                 ProArgument(
                     "--args",
                     help=messages.CLI_API_ARGS,
@@ -80,6 +110,15 @@ api_command = ProCommand(
                     dest="data",
                     default="",
                 ),
+                ProArgument(
+                    "--output",
+                    help=messages.CLI_API_OUTPUT,
+                ),
+                ProArgument(
+                    "--compress",
+                    help=messages.CLI_API_COMPRESS,
+                    action="store_true",
+                ),
             ]
         )
     ],
@@ -1,6 +1,15 @@
 import logging
 
-from uaclient import apt_news, config, contract, exceptions, messages, util
+from uaclient import (
+    apt_news,
+    config,
+    contract,
+    exceptions,
+    messages,
+    status,
+    util,
+    version,
+)
 from uaclient.cli import cli_util
 from uaclient.cli.commands import ProArgument, ProArgumentGroup, ProCommand
 from uaclient.cli.parser import HelpCategory
@@ -24,6 +33,7 @@ def _action_refresh_contract(_args, cfg: config.UAConfig):
         contract.refresh(cfg)
     except exceptions.ConnectivityError:
         raise exceptions.RefreshContractFailure()
+    status.status(cfg=cfg)  # Update the status cache
     print(messages.REFRESH_CONTRACT_SUCCESS)
 
 
@@ -34,6 +44,7 @@ def _action_refresh_messages(_args, cfg: config.UAConfig):
     try:
         update_motd_messages(cfg)
         refresh_motd()
+        version.update_candidate_version_cache()
         if cfg.apt_news:
             apt_news.update_apt_news(cfg)
     except Exception as exc:
@@ -14,9 +14,9 @@ from uaclient.yaml import safe_dump
 def action_security_status(args, *, cfg, **kwargs):
     if args.format == "text":
         if args.thirdparty:
-            security_status.list_third_party_packages()
+            security_status.list_third_party_packages(cfg)
         elif args.unavailable:
-            security_status.list_unavailable_packages()
+            security_status.list_unavailable_packages(cfg)
         elif args.esm_infra:
             security_status.list_esm_infra_packages(cfg)
         elif args.esm_apps:
@@ -1,6 +1,14 @@
 import time
 
-from uaclient import actions, config, event_logger, messages, status, util
+from uaclient import (
+    actions,
+    config,
+    event_logger,
+    messages,
+    status,
+    system,
+    util,
+)
 from uaclient.cli.commands import ProArgument, ProArgumentGroup, ProCommand
 from uaclient.cli.parser import HelpCategory
 
@@ -13,15 +21,26 @@ def action_status(args, *, cfg: config.UAConfig, **kwargs):
     show_all = args.all if args else False
     token = args.simulate_with_token if args else None
     active_value = status.UserFacingConfigStatus.ACTIVE.value
-    status_dict, ret = actions.status(
-        cfg, simulate_with_token=token, show_all=show_all
-    )
+    # Unprivileged users are served the status published by root, already
+    # rendered, as long as it is up to date
+    snapshot = None
+    if not token and not util.we_are_currently_root():
+        snapshot = status.get_status_snapshot(cfg)
+    if snapshot is not None:
+        status_dict, ret = snapshot.get_status(show_all), 0
+    else:
+        status_dict, ret = actions.status(
+            cfg, simulate_with_token=token, show_all=show_all
+        )
     config_active = bool(status_dict["execution_status"] == active_value)
 
     if args and args.wait and config_active:
+        snapshot = None
         while status_dict["execution_status"] == active_value:
             event.info(".", end="")
             time.sleep(1)
+            # The lock and the services checked below change while we wait
+            system.invalidate_subp_cache()
             status_dict, ret = actions.status(
                 cfg,
                 simulate_with_token=token,
@@ -30,7 +49,10 @@ def action_status(args, *, cfg: config.UAConfig, **kwargs):
         event.info("")
 
     event.set_output_content(status_dict)
-    output = status.format_tabular(status_dict, show_all=show_all)
+    if snapshot is not None:
+        output = snapshot.get_tabular(show_all=show_all)
+    else:
+        output = status.format_tabular(status_dict, show_all=show_all)
     event.info(util.handle_unicode_characters(output))
     event.process_events()
     return ret
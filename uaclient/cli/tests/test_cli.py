@@ -1,12 +1,17 @@
 import contextlib
+import json
 import logging
 import socket
 
 import mock
 import pytest
 
-from uaclient import defaults, exceptions, messages
-from uaclient.cli import _warn_about_output_redirection, main
+from uaclient import defaults, exceptions, messages, profiling
+from uaclient.cli import (
+    _run_profiled_action,
+    _warn_about_output_redirection,
+    main,
+)
 from uaclient.exceptions import (
     AlreadyAttachedError,
     LockHeldError,
@@ -45,6 +50,7 @@ class TestMain:
         FakeConfig,
     ):
         m_args = m_get_parser.return_value.parse_args.return_value
+        m_args.profile = None
         m_args.action.side_effect = exception
 
         with pytest.raises(SystemExit) as excinfo:
@@ -84,6 +90,7 @@ class TestMain:
         FakeConfig,
     ):
         m_args = m_get_parser.return_value.parse_args.return_value
+        m_args.profile = None
         m_args.action.side_effect = exception
 
         with pytest.raises(SystemExit) as excinfo:
@@ -129,6 +136,7 @@ class TestMain:
         expected_exit_code,
     ):
         m_args = m_get_parser.return_value.parse_args.return_value
+        m_args.profile = None
         m_args.action.side_effect = exception
         expected_msg = exception.msg
 
@@ -170,6 +178,7 @@ class TestMain:
         expected_log_call,
     ):
         m_args = m_get_parser.return_value.parse_args.return_value
+        m_args.profile = None
         m_args.action.side_effect = exceptions.ConnectivityError(
             cause=socket.gaierror(-2, "Name or service not known"),
             url=error_url,
@@ -196,8 +205,9 @@ class TestMain:
     @mock.patch("uaclient.log.setup_cli_logging")
     @mock.patch("uaclient.cli.get_parser")
     def test_command_line_is_logged(
-        self, _m_get_parser, _m_setup_logging, caplog_text
+        self, m_get_parser, _m_setup_logging, caplog_text
     ):
+        m_get_parser.return_value.parse_args.return_value.profile = None
         main(["some", "args"])
 
         log = caplog_text()
@@ -214,10 +224,11 @@ class TestMain:
     def test_environment_is_logged(
         self,
         _m_pro_environment,
-        _m_get_parser,
+        m_get_parser,
         _m_setup_logging,
         caplog_text,
     ):
+        m_get_parser.return_value.parse_args.return_value.profile = None
         main(["some", "args"])
 
         log = caplog_text()
@@ -225,6 +236,58 @@ class TestMain:
         assert "UA_ENV=YES" in log
         assert "UA_FEATURES_WOW=XYZ" in log
 
+    @mock.patch("uaclient.cli._warn_about_new_version")
+    @mock.patch("uaclient.log.setup_cli_logging")
+    @mock.patch("uaclient.cli.get_parser")
+    def test_profile_writes_chrome_trace(
+        self, m_get_parser, _m_setup_logging, _m_warn_new_version, tmpdir
+    ):
+        trace_file = tmpdir.join("trace.json")
+        m_args = m_get_parser.return_value.parse_args.return_value
+        m_args.profile = trace_file.strpath
+        m_args.command = "status"
+
+        def action(*_args, **_kwargs):
+            with profiling.span("inner", key="value"):
+                return 0
+
+        m_args.action.side_effect = action
+
+        assert 0 == main(["pro", "--profile", trace_file.strpath, "status"])
+
+        trace = json.loads(trace_file.read())
+        assert [
+            ("cli.main", {"command": "status"}),
+            ("inner", {"key": "value"}),
+        ] == [(e["name"], e["args"]) for e in trace["traceEvents"]]
+        assert profiling._active_profile is None
+
+    @pytest.mark.parametrize("action_error", (None, KeyError("boom")))
+    @mock.patch(
+        "uaclient.system.write_file", side_effect=PermissionError("denied")
+    )
+    def test_profile_write_error_does_not_hide_command_result(
+        self, _m_write_file, action_error, caplog_text, FakeConfig
+    ):
+        trace_path = "/root/trace.json"
+        m_args = mock.MagicMock()
+        m_args.profile = trace_path
+        m_args.command = "status"
+        m_args.action.side_effect = action_error
+        m_args.action.return_value = 0
+
+        if action_error:
+            with pytest.raises(KeyError):
+                _run_profiled_action(m_args, FakeConfig(), None)
+        else:
+            assert 0 == _run_profiled_action(m_args, FakeConfig(), None)
+
+        assert (
+            "Failed to write the profile trace to {}".format(trace_path)
+            in caplog_text()
+        )
+        assert profiling._active_profile is None
+
     @mock.patch("uaclient.log.setup_cli_logging")
     @mock.patch("uaclient.cli.get_parser")
     @mock.patch("uaclient.cli.UAConfig")
@@ -22,6 +22,8 @@ class TestActionAPI:
         args.options = []
         args.data = ""
         args.show_progress = show_progress
+        args.stream = False
+        args.output = None
         cfg = FakeConfig()
         return_code = api_command.action(args, cfg=cfg)
 
@@ -36,6 +38,47 @@ class TestActionAPI:
         assert m_call_api.return_value.to_json.call_count == 1
         assert return_code == expected_return
 
+    @pytest.mark.parametrize(
+        ["result", "expected_return"],
+        (("success", 0), ("failure", 1)),
+    )
+    @mock.patch(M_PATH + "api.stream_api")
+    @mock.patch(M_PATH + "api.call_api")
+    def test_api_action_stream(
+        self,
+        m_call_api,
+        m_stream_api,
+        result,
+        expected_return,
+        capsys,
+        FakeConfig,
+    ):
+        record = mock.MagicMock()
+        record.to_json.return_value = '{"type": "record"}'
+        response = mock.MagicMock(result=result)
+        response.to_json.return_value = '{"result": "%s"}' % result
+        m_stream_api.return_value = iter([record, response])
+
+        args = mock.MagicMock()
+        args.endpoint_path = "example_endpoint"
+        args.options = []
+        args.data = ""
+        args.stream = True
+        args.output = None
+        cfg = FakeConfig()
+        return_code = api_command.action(args, cfg=cfg)
+
+        assert m_call_api.call_count == 0
+        assert m_stream_api.call_args_list == [
+            mock.call("example_endpoint", [], "", cfg)
+        ]
+        out, _ = capsys.readouterr()
+        assert [
+            '{"type": "record"}',
+            '{"result": "%s"}' % result,
+        ] == out.splitlines()
+        assert return_code == expected_return
+
     def test_api_error_out_if_options_and_data_are_provided(self):
         args = mock.MagicMock()
         args.endpoint_path = "example_endpoint"
@@ -50,3 +93,61 @@ class TestActionAPI:
             e.value.msg_code
             == messages.E_API_ERROR_ARGS_AND_DATA_TOGETHER.name
         )
+
+    def test_api_error_out_if_stream_and_output_are_provided(self):
+        args = mock.MagicMock()
+        args.options = []
+        args.data = ""
+        args.stream = True
+        args.output = "manifest"
+
+        with pytest.raises(exceptions.CLIAPIStreamXOROutput):
+            api_command.action(args, cfg=mock.MagicMock())
+
+    @pytest.mark.parametrize(
+        ["output", "expected_output_path"],
+        (("manifest.gz", "manifest.gz"), ("-", None)),
+    )
+    @pytest.mark.parametrize(
+        ["result", "expected_return"],
+        (("success", 0), ("failure", 1)),
+    )
+    @mock.patch(M_PATH + "api.write_api")
+    def test_api_action_output(
+        self,
+        m_write_api,
+        result,
+        expected_return,
+        output,
+        expected_output_path,
+        capsys,
+        FakeConfig,
+    ):
+        m_write_api.return_value.result = result
+        m_write_api.return_value.to_json.return_value = '{"result": "x"}'
+        args = mock.MagicMock()
+        args.endpoint_path = "example_endpoint"
+        args.options = []
+        args.data = ""
+        args.stream = False
+        args.output = output
+        args.compress = True
+        cfg = FakeConfig()
+
+        assert expected_return == api_command.action(args, cfg=cfg)
+
+        assert [
+            mock.call(
+                "example_endpoint",
+                [],
+                "",
+                cfg,
+                output_path=expected_output_path,
+                compress=True,
+            )
+        ] == m_write_api.call_args_list
+        out, err = capsys.readouterr()
+        if expected_output_path:
+            assert ('{"result": "x"}\n', "") == (out, err)
+        else:
+            assert ("", '{"result": "x"}\n') == (out, err)
@@ -4,8 +4,6 @@ import pytest
 from uaclient.cli.collect_logs import collect_logs_command
 from uaclient.defaults import APPARMOR_PROFILES
 
-M_PATH = "uaclient.cli."
-
 
 class TestActionCollectLogs:
     @pytest.mark.parametrize(
@@ -22,7 +20,7 @@ class TestActionCollectLogs:
     )
     @mock.patch("tarfile.open")
     @mock.patch("builtins.open")
-    @mock.patch(M_PATH + "util.redact_sensitive_logs", return_value="test")
+    @mock.patch("uaclient.actions._write_redacted_file")
     # let's pretend all files exist
     @mock.patch("pathlib.Path.stat")
     @mock.patch("os.chown")
@@ -48,7 +46,7 @@ class TestActionCollectLogs:
         m_isfile,
         _chown,
         _stat,
-        redact,
+        m_write_redacted_file,
         _fopen,
         _tarfile,
         _glob,
@@ -78,7 +76,8 @@ class TestActionCollectLogs:
         cfg = FakeConfig()
         collect_logs_command.action(mock.MagicMock(), cfg=cfg)
 
-        assert m_subp.call_args_list == [
+        # Commands are run concurrently, in no particular order
+        expected_subp_calls = [
             mock.call(["cloud-id"], rcs=None),
             mock.call(["/snap/bin/canonical-livepatch", "status"], rcs=None),
             mock.call(["systemctl", "list-timers", "--all"], rcs=None),
@@ -137,6 +136,9 @@ class TestActionCollectLogs:
             ),
             mock.call(["journalctl", "-b", "-k", "--since=1 day ago"]),
         ]
+        assert len(expected_subp_calls) == m_subp.call_count
+        for subp_call in expected_subp_calls:
+            assert subp_call in m_subp.call_args_list
 
         assert m_isfile.call_count == is_file_calls
         assert m_isfile.call_args_list == [
@@ -202,7 +204,7 @@ class TestActionCollectLogs:
             *[mock.call(f) for f in APPARMOR_PROFILES],
         ]
         # APPARMOR_PROFILES are not redacted
-        assert redact.call_count == is_file_calls + len(user_log_files) - len(
-            APPARMOR_PROFILES
-        )
+        assert m_write_redacted_file.call_count == is_file_calls + len(
+            user_log_files
+        ) - len(APPARMOR_PROFILES)
         assert m_shutilcopy.call_count == len(APPARMOR_PROFILES)
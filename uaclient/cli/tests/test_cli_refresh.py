@@ -103,6 +103,7 @@ class TestActionRefresh:
             mock.call("", messages.NOTICE_REFRESH_CONTRACT_WARNING)
         ] != m_remove_notice.call_args_list
 
+    @mock.patch(M_PATH + "status.status")
     @mock.patch("uaclient.lock.check_lock_info", return_value=(-1, ""))
     @mock.patch("uaclient.contract.refresh")
     @mock.patch("uaclient.files.notices.NoticesManager.remove")
@@ -111,6 +112,7 @@ class TestActionRefresh:
         m_remove_notice,
         refresh,
         _m_check_lock_info,
+        m_status,
         capsys,
         FakeConfig,
         fake_machine_token_file,
@@ -128,6 +130,7 @@ class TestActionRefresh:
         assert 0 == ret
         assert messages.REFRESH_CONTRACT_SUCCESS in capsys.readouterr()[0]
         assert [mock.call(cfg)] == refresh.call_args_list
+        assert [mock.call(cfg=cfg)] == m_status.call_args_list
         assert [
             mock.call(Notice.OPERATION_IN_PROGRESS),
         ] == m_remove_notice.call_args_list
@@ -148,6 +151,7 @@ class TestActionRefresh:
 
         assert messages.E_REFRESH_MESSAGES_FAILURE.msg == excinfo.value.msg
 
+    @mock.patch(M_PATH + "version.update_candidate_version_cache")
     @mock.patch("uaclient.lock.check_lock_info", return_value=(-1, ""))
     @mock.patch("uaclient.apt_news.update_apt_news")
     @mock.patch("uaclient.timer.update_messaging.exists", return_value=True)
@@ -162,6 +166,7 @@ class TestActionRefresh:
         _m_path,
         _m_update_apt_news,
         _m_check_lock_info,
+        _m_update_candidate,
         capsys,
         FakeConfig,
     ):
@@ -178,6 +183,7 @@ class TestActionRefresh:
         assert [mock.call(subp_exc)] == log_exception.call_args_list
         assert messages.REFRESH_MESSAGES_SUCCESS in capsys.readouterr()[0]
 
+    @mock.patch(M_PATH + "version.update_candidate_version_cache")
     @mock.patch("uaclient.lock.check_lock_info", return_value=(-1, ""))
     @mock.patch("uaclient.apt_news.update_apt_news")
     @mock.patch(M_PATH + "refresh_motd")
@@ -188,6 +194,7 @@ class TestActionRefresh:
         m_refresh_motd,
         m_update_apt_news,
         _m_check_lock_info,
+        m_update_candidate,
         capsys,
         FakeConfig,
     ):
@@ -205,6 +212,7 @@ class TestActionRefresh:
         assert 1 == m_update_motd.call_count
         assert 1 == m_refresh_motd.call_count
         assert 1 == m_update_apt_news.call_count
+        assert [mock.call()] == m_update_candidate.call_args_list
 
     @mock.patch("uaclient.lock.check_lock_info", return_value=(-1, ""))
     @mock.patch("logging.exception")
@@ -255,6 +263,8 @@ class TestActionRefresh:
         assert messages.REFRESH_CONFIG_SUCCESS in capsys.readouterr()[0]
         assert [mock.call()] == m_process_config.call_args_list
 
+    @mock.patch(M_PATH + "status.status")
+    @mock.patch(M_PATH + "version.update_candidate_version_cache")
     @mock.patch("uaclient.lock.check_lock_info", return_value=(-1, ""))
     @mock.patch("uaclient.apt_news.update_apt_news")
     @mock.patch(M_PATH + "refresh_motd")
@@ -271,6 +281,8 @@ class TestActionRefresh:
         m_refresh_motd,
         m_update_apt_news,
         _m_check_lock_info,
+        _m_update_candidate,
+        _m_status,
         capsys,
         FakeConfig,
         fake_machine_token_file,
@@ -466,11 +466,16 @@ class TestActionStatus:
         m_sleep.side_effect = fake_sleep
 
         with mock.patch.object(lock, "lock_data_file"):
-            assert 0 == status_command.action(
-                mock.MagicMock(all=False, simulate_with_token=None), cfg=cfg
-            )
+            with mock.patch(
+                "uaclient.system.invalidate_subp_cache"
+            ) as m_invalidate_subp_cache:
+                assert 0 == status_command.action(
+                    mock.MagicMock(all=False, simulate_with_token=None),
+                    cfg=cfg,
+                )
 
         assert [mock.call(1)] * 3 == m_sleep.call_args_list
+        assert 3 == m_invalidate_subp_cache.call_count
         assert "...\n" + UNATTACHED_STATUS == capsys.readouterr()[0]
 
     @pytest.mark.parametrize(
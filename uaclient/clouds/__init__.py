@@ -48,6 +48,14 @@ class PublicCloudAutoAttachInstance(AutoAttachInstance, metaclass=abc.ABCMeta):
         """Return a string of the cloud type on which this instance runs"""
         pass
 
+    @abc.abstractmethod
+    def probe_imds(self) -> bool:
+        """
+        Return True if the metadata service of the cloud answers. This is a
+        single attempt with a short timeout, meant to race the other clouds.
+        """
+        pass
+
     def acquire_pro_token(self, cfg: config.UAConfig) -> str:
         """
         Cloud-specific implementation of acquiring the pro token using whatever
@@ -3,7 +3,7 @@ import logging
 from typing import Any, Dict
 
 from uaclient import exceptions, http, secret_manager, system, util
-from uaclient.clouds import PublicCloudAutoAttachInstance
+from uaclient.clouds import PublicCloudAutoAttachInstance, identity
 
 IMDS_IPV4_ADDRESS = "169.254.169.254"
 IMDS_IPV6_ADDRESS = "[fd00:ec2::254]"
@@ -48,7 +48,6 @@ class AWSAutoAttachInstance(PublicCloudAutoAttachInstance):
         secret_manager.secrets.add_secret(imds_url_response)
         return {"pkcs7": imds_url_response}
 
-    @util.retry(exceptions.CloudMetadataError, retry_sleeps=[0.5, 1, 1])
     def _get_ii_doc(self) -> Dict:
         """
         Get the instance identity doc associated with the current instance.
@@ -57,8 +56,25 @@ class AWSAutoAttachInstance(PublicCloudAutoAttachInstance):
         https://docs.aws.amazon.com/AWSEC2/latest/UserGuide/retrieve-iid.html
         for more context.
 
+        The document doesn't change during a boot, so it is cached until
+        the next one.
+
         @return: Dict containing the instance identity document.
         """
+        ii_doc = identity.get_cloud_identity_cache().get(
+            "instance_identity_document"
+        )
+        if ii_doc:
+            return ii_doc
+        ii_doc = self._request_ii_doc()
+        if ii_doc:
+            identity.update_cloud_identity_cache(
+                instance_identity_document=ii_doc
+            )
+        return ii_doc
+
+    @util.retry(exceptions.CloudMetadataError, retry_sleeps=[0.5, 1, 1])
+    def _request_ii_doc(self) -> Dict:
         headers = self._request_imds_v2_token_headers()
         url = _IMDS_IID_URL.format(self._ip_address)
         try:
@@ -104,8 +120,31 @@ class AWSAutoAttachInstance(PublicCloudAutoAttachInstance):
             )
         return headers
 
+    def probe_imds(self) -> bool:
+        """Check, without retries, that the IMDS answers on any address.
+
+        The address and the IMDSv2 token found are kept for the next
+        requests.
+        """
+        for address in IMDS_IP_ADDRESS:
+            try:
+                self._get_imds_v2_token_headers_once(ip_address=address)
+            except Exception as e:
+                LOG.debug(
+                    "AWS IMDS probe failed at http://%s: %s",
+                    address,
+                    getattr(e, "reason", str(e)),
+                )
+            else:
+                self._ip_address = address
+                return True
+        return False
+
     @util.retry(exceptions.CloudMetadataError, retry_sleeps=[1, 2, 5])
     def _get_imds_v2_token_headers(self, ip_address):
+        return self._get_imds_v2_token_headers_once(ip_address=ip_address)
+
+    def _get_imds_v2_token_headers_once(self, ip_address):
         if self._api_token == "IMDSv1":
             return None
         elif self._api_token:
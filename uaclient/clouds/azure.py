@@ -48,6 +48,17 @@ class AzureAutoAttachInstance(PublicCloudAutoAttachInstance):
     def cloud_type(self) -> str:
         return "azure"
 
+    def probe_imds(self) -> bool:
+        """Check, without retries, that the IMDS answers."""
+        try:
+            response = http.readurl(
+                IMDS_URLS["compute"], headers={"Metadata": "true"}, timeout=1
+            )
+        except Exception as e:
+            LOG.debug("Azure IMDS probe failed: %s", str(e))
+            return False
+        return response.code == 200
+
     @property
     def is_viable(self) -> bool:
         """This machine is a viable AzureInstance"""
@@ -16,6 +16,9 @@ LICENSES_URL = (
     "http://metadata.google.internal/computeMetadata/v1/instance/licenses/"
     "?recursive=true"
 )
+INSTANCE_ID_URL = (
+    "http://metadata.google.internal/computeMetadata/v1/instance/id"
+)
 WAIT_FOR_CHANGE = "&wait_for_change=true"
 LAST_ETAG = "&last_etag={etag}"
 
@@ -98,6 +101,19 @@ class GCPAutoAttachInstance(PublicCloudAutoAttachInstance):
     def cloud_type(self) -> str:
         return "gcp"
 
+    def probe_imds(self) -> bool:
+        """Check, without retries, that the metadata server answers."""
+        try:
+            response = http.readurl(
+                INSTANCE_ID_URL,
+                headers={"Metadata-Flavor": "Google"},
+                timeout=1,
+            )
+        except Exception as e:
+            LOG.debug("GCP metadata server probe failed: %s", str(e))
+            return False
+        return response.code == 200
+
     @property
     def is_viable(self) -> bool:
         """This machine is a viable GCPInstance"""
@@ -1,13 +1,25 @@
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
 from enum import Enum
 from functools import lru_cache
-from typing import Dict, Optional, Tuple, Type  # noqa: F401
+from typing import Any, Dict, List, Optional, Tuple, Type  # noqa: F401
 
 from uaclient import clouds, exceptions, messages, system, util
 from uaclient.config import apply_config_settings_override
+from uaclient.files import state_files
 
 LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
 
+BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+# Written by cloud-init once all its stages ran. Before that, cloud-id and
+# cloud-init query may not know the final answer yet.
+CLOUD_INIT_RESULT_PATH = "/run/cloud-init/result.json"
+# cloud-id answers, when it couldn't tell which cloud we are on
+UNDETERMINED_CLOUD_TYPES = ("none", "unknown")
+# How long to wait for the first metadata service to answer, in seconds
+CLOUD_PROBE_DEADLINE = 3
+
 CLOUD_TYPE_TO_TITLE = {
     "aws": "AWS",
     "aws-china": "AWS China",
@@ -41,25 +53,73 @@ def cloud_type_to_contract_cloud_type(
     return CONTRACT_CLOUD_TYPE_ALIASES.get(cloud_type, cloud_type)
 
 
+def _get_boot_id() -> Optional[str]:
+    try:
+        return system.load_file(BOOT_ID_PATH).strip() or None
+    except OSError:
+        return None
+
+
+def get_cloud_identity_cache() -> Dict[str, Any]:
+    """Return the cloud identity values cached during this boot.
+
+    :returns: An empty dict if nothing was cached since the last boot.
+    """
+    boot_id = _get_boot_id()
+    if boot_id is None:
+        return {}
+    try:
+        cache = state_files.cloud_identity_cache_file.read()
+    except Exception as e:
+        LOG.warning("Ignoring invalid cloud identity cache: %s", str(e))
+        return {}
+    if not cache or cache.get("boot_id") != boot_id:
+        return {}
+    return cache
+
+
+def update_cloud_identity_cache(**values) -> None:
+    """Store cloud identity values until the next boot.
+
+    Only root can write the cache, other users read it.
+    """
+    boot_id = _get_boot_id()
+    if boot_id is None or not util.we_are_currently_root():
+        return
+    cache = get_cloud_identity_cache()
+    cache.update(values)
+    cache["boot_id"] = boot_id
+    try:
+        state_files.cloud_identity_cache_file.write(cache)
+    except OSError as e:
+        LOG.warning("Unable to write the cloud identity cache: %s", str(e))
+
+
 def get_instance_id() -> Optional[str]:
     """Query cloud instance-id from cmdline."""
+    cached_instance_id = get_cloud_identity_cache().get("instance_id")
+    if cached_instance_id:
+        return cached_instance_id
     try:
         # Present in cloud-init on >= Xenial
-        out, _err = system.subp(["cloud-init", "query", "instance_id"])
-        return out.strip()
+        out, _err = system.subp(
+            ["cloud-init", "query", "instance_id"], cache=True
+        )
+        instance_id = out.strip()
+        if instance_id and os.path.exists(CLOUD_INIT_RESULT_PATH):
+            update_cloud_identity_cache(instance_id=instance_id)
+        return instance_id
     except exceptions.ProcessExecutionError:
         pass
     LOG.warning("Unable to determine current instance-id")
     return None
 
 
-@lru_cache(maxsize=None)
-@apply_config_settings_override("cloud_type")
-def get_cloud_type() -> Tuple[Optional[str], Optional[NoCloudTypeReason]]:
+def _detect_cloud_type() -> Tuple[Optional[str], Optional[NoCloudTypeReason]]:
     if system.which("cloud-id"):
         # Present in cloud-init on >= Xenial
         try:
-            out, _err = system.subp(["cloud-id"])
+            out, _err = system.subp(["cloud-id"], cache=True)
             return (out.strip(), None)
         except exceptions.ProcessExecutionError as exc:
             LOG.debug("error running cloud-id: %s", str(exc))
@@ -68,6 +128,70 @@ def get_cloud_type() -> Tuple[Optional[str], Optional[NoCloudTypeReason]]:
     return (None, NoCloudTypeReason.NO_CLOUD_DETECTED)
 
 
+@lru_cache(maxsize=None)
+@apply_config_settings_override("cloud_type")
+def get_cloud_type() -> Tuple[Optional[str], Optional[NoCloudTypeReason]]:
+    cache = get_cloud_identity_cache()
+    if "cloud_type" in cache:
+        return (cache["cloud_type"], None)
+
+    cloud_type, reason = _detect_cloud_type()
+    # cloud-id errors can be transient, and cloud-id only knows the cloud
+    # for sure once cloud-init is done
+    if cloud_type and os.path.exists(CLOUD_INIT_RESULT_PATH):
+        update_cloud_identity_cache(cloud_type=cloud_type)
+    return (cloud_type, reason)
+
+
+def _probe_cloud_instance(instance: clouds.PublicCloudAutoAttachInstance):
+    try:
+        return instance.is_viable and instance.probe_imds()
+    except Exception as e:
+        LOG.debug("Error probing %s: %s", instance.cloud_type, str(e))
+        return False
+
+
+def probe_cloud_instance() -> Optional[clouds.PublicCloudAutoAttachInstance]:
+    """Race the metadata services of the public clouds.
+
+    The probes run concurrently. The first cloud that is viable and whose
+    metadata service answers wins, and the others are abandoned: each probe
+    is a single attempt with a short timeout, so they end soon after.
+
+    :returns: The instance of the winning cloud, or None if no metadata
+        service answered before CLOUD_PROBE_DEADLINE.
+    """
+    from uaclient.clouds import aws, azure, gcp
+
+    candidates = [
+        aws.AWSAutoAttachInstance(),
+        azure.AzureAutoAttachInstance(),
+        gcp.GCPAutoAttachInstance(),
+    ]  # type: List[clouds.PublicCloudAutoAttachInstance]
+    executor = ThreadPoolExecutor(max_workers=len(candidates))
+    futures = {
+        executor.submit(_probe_cloud_instance, candidate): candidate
+        for candidate in candidates
+    }
+    try:
+        for future in as_completed(futures, timeout=CLOUD_PROBE_DEADLINE):
+            if future.result():
+                LOG.debug(
+                    "Cloud detected by probing: %s", futures[future].cloud_type
+                )
+                return futures[future]
+    except TimeoutError:
+        LOG.debug(
+            "No cloud metadata service answered in %d seconds",
+            CLOUD_PROBE_DEADLINE,
+        )
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+    return None
+
+
 def cloud_instance_factory(
     cloud_override: Optional[str] = None,
 ) -> clouds.AutoAttachInstance:
@@ -95,6 +219,12 @@ def cloud_instance_factory(
         cloud_type = cloud_override
     else:
         cloud_type, _ = get_cloud_type()
+        # cloud-id may fail or be undecided, for example when cloud-init
+        # didn't find its datasource: ask the metadata services directly
+        if not cloud_type or cloud_type in UNDETERMINED_CLOUD_TYPES:
+            probed_instance = probe_cloud_instance()
+            if probed_instance is not None:
+                return probed_instance
 
     if not cloud_type:
         raise exceptions.CloudFactoryNoCloudError()
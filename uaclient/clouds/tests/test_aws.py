@@ -397,6 +397,25 @@ class TestAWSAutoAttachInstance:
             ),
         ] == instance._get_imds_url_response.call_args_list
 
+    @mock.patch("uaclient.clouds.identity._get_boot_id", return_value="boot-1")
+    def test__get_ii_doc_is_cached_until_reboot(self, m_get_boot_id):
+        instance = AWSAutoAttachInstance()
+        instance._ip_address = "169.254.169.254"
+        instance._request_imds_v2_token_headers = mock.MagicMock(
+            return_value=None
+        )
+        instance._get_imds_url_response = mock.MagicMock(
+            return_value=json.dumps({"billingProducts": ["bp-66a5400f"]})
+        )
+
+        assert instance.is_likely_pro
+        assert AWSAutoAttachInstance().is_likely_pro
+        assert 1 == instance._get_imds_url_response.call_count
+
+        m_get_boot_id.return_value = "boot-2"
+        assert instance.is_likely_pro
+        assert 2 == instance._get_imds_url_response.call_count
+
     def test__get_ii_doc_json_error(self):
         """test behavior when json.load fails"""
         instance = AWSAutoAttachInstance()
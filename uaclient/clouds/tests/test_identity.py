@@ -1,13 +1,21 @@
+import contextlib
+import http.server
+import socketserver
+import threading
+import time
+
 import mock
 import pytest
 
 from uaclient import exceptions
+from uaclient.clouds.aws import AWSAutoAttachInstance
 from uaclient.clouds.identity import (
     NoCloudTypeReason,
     cloud_instance_factory,
     cloud_type_to_contract_cloud_type,
     get_cloud_type,
     get_instance_id,
+    probe_cloud_instance,
 )
 
 M_PATH = "uaclient.clouds.identity."
@@ -19,7 +27,7 @@ class TestGetInstanceID:
         """Get instance_id from cloud-init query."""
         assert "my-iid" == get_instance_id()
         assert [
-            mock.call(["cloud-init", "query", "instance_id"])
+            mock.call(["cloud-init", "query", "instance_id"], cache=True)
         ] == m_subp.call_args_list
 
     @mock.patch(
@@ -32,7 +40,7 @@ class TestGetInstanceID:
         """Return None when cloud-init query fails."""
         assert None is get_instance_id()
         assert [
-            mock.call(["cloud-init", "query", "instance_id"])
+            mock.call(["cloud-init", "query", "instance_id"], cache=True)
         ] == m_subp.call_args_list
 
 
@@ -88,6 +96,69 @@ class TestGetCloudType:
         assert get_cloud_type.__wrapped__() == (expected_value, None)
 
 
+@mock.patch(M_PATH + "_get_boot_id", return_value="boot-1")
+class TestCloudIdentityCache:
+    @pytest.fixture
+    def cloud_init_done(self, tmpdir):
+        result_path = tmpdir.join("result.json")
+        result_path.write("{}")
+        with mock.patch(
+            M_PATH + "CLOUD_INIT_RESULT_PATH", result_path.strpath
+        ):
+            yield
+
+    @pytest.mark.usefixtures("cloud_init_done")
+    @mock.patch(M_PATH + "system.which", return_value="/usr/bin/cloud-id")
+    @mock.patch(M_PATH + "system.subp")
+    def test_identity_is_detected_once_per_boot(
+        self, m_subp, _m_which, m_get_boot_id, cloud_identity_cache_file
+    ):
+        m_subp.side_effect = [("aws\n", ""), ("i-1234\n", "")]
+        assert ("aws", None) == get_cloud_type.__wrapped__()
+        assert "i-1234" == get_instance_id()
+        assert {
+            "boot_id": "boot-1",
+            "cloud_type": "aws",
+            "instance_id": "i-1234",
+        } == cloud_identity_cache_file.read()
+
+        # Other processes of this boot read the cache
+        assert ("aws", None) == get_cloud_type.__wrapped__()
+        assert "i-1234" == get_instance_id()
+        assert 2 == m_subp.call_count
+
+        # The cache of a previous boot is ignored
+        m_get_boot_id.return_value = "boot-2"
+        m_subp.side_effect = [("azure\n", ""), ("i-5678\n", "")]
+        assert ("azure", None) == get_cloud_type.__wrapped__()
+        assert "i-5678" == get_instance_id()
+        assert 4 == m_subp.call_count
+
+    @mock.patch(M_PATH + "system.which", return_value="/usr/bin/cloud-id")
+    @mock.patch(M_PATH + "system.subp", return_value=("aws\n", ""))
+    def test_identity_is_not_cached_before_cloud_init_is_done(
+        self, _m_subp, _m_which, _m_get_boot_id, cloud_identity_cache_file
+    ):
+        with mock.patch(M_PATH + "CLOUD_INIT_RESULT_PATH", "/does/not/exist"):
+            assert ("aws", None) == get_cloud_type.__wrapped__()
+        assert None is cloud_identity_cache_file.read()
+
+    @pytest.mark.usefixtures("cloud_init_done")
+    @mock.patch(M_PATH + "util.we_are_currently_root", return_value=False)
+    @mock.patch(M_PATH + "system.which", return_value="/usr/bin/cloud-id")
+    @mock.patch(M_PATH + "system.subp", return_value=("aws\n", ""))
+    def test_identity_is_not_cached_by_non_root_users(
+        self,
+        _m_subp,
+        _m_which,
+        _m_we_are_currently_root,
+        _m_get_boot_id,
+        cloud_identity_cache_file,
+    ):
+        assert ("aws", None) == get_cloud_type.__wrapped__()
+        assert None is cloud_identity_cache_file.read()
+
+
 class TestCloudTypeToContractCloudType:
     @pytest.mark.parametrize(
         "cloud_type,expected",
@@ -111,9 +182,21 @@ class TestCloudInstanceFactory:
             None,
             NoCloudTypeReason.NO_CLOUD_DETECTED,
         )
-        with pytest.raises(exceptions.CloudFactoryNoCloudError):
-            cloud_instance_factory()
+        with mock.patch(
+            M_PATH + "probe_cloud_instance", return_value=None
+        ) as m_probe_cloud_instance:
+            with pytest.raises(exceptions.CloudFactoryNoCloudError):
+                cloud_instance_factory()
         assert 1 == m_get_cloud_type.call_count
+        assert 1 == m_probe_cloud_instance.call_count
+
+    @pytest.mark.parametrize("cloud_type", (None, "none", "unknown"))
+    @mock.patch(M_PATH + "probe_cloud_instance")
+    def test_probe_clouds_when_cloud_id_is_undecided(
+        self, m_probe_cloud_instance, m_get_cloud_type, cloud_type
+    ):
+        m_get_cloud_type.return_value = (cloud_type, None)
+        assert m_probe_cloud_instance.return_value == cloud_instance_factory()
 
     def test_raise_error_when_not_supported(self, m_get_cloud_type):
         """Raise appropriate error when unable to determine cloud_type."""
@@ -168,3 +251,100 @@ class TestCloudInstanceFactory:
         with mock.patch(M_INSTANCE_PATH) as m_instance:
             m_instance.side_effect = fake_viable_instance
             assert fake_instance == cloud_instance_factory()
+
+
+class TestProbeCloudInstance:
+    @pytest.fixture
+    def fake_imds(self, urllib_request_urlopen):
+        """A local HTTP stand-in for the metadata services of the clouds.
+
+        The AWS IMDS answers right away, the Azure one hangs and the GCP
+        metadata server doesn't know the request.
+        """
+        release_azure = threading.Event()
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_PUT(self):
+                if self.path == "/latest/api/token":
+                    self._reply(200, b"aws-token")
+                else:
+                    self._reply(404, b"")
+
+            def do_GET(self):
+                if self.path.startswith("/metadata/instance/compute"):
+                    release_azure.wait(5)
+                    self._reply(200, b"{}")
+                else:
+                    self._reply(404, b"")
+
+            def _reply(self, code, body):
+                self.send_response(code)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+            daemon_threads = True
+
+        server = Server(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        address = "127.0.0.1:{}".format(server.server_address[1])
+        base_url = "http://" + address
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(
+                mock.patch("urllib.request.urlopen", urllib_request_urlopen)
+            )
+            stack.enter_context(
+                mock.patch("uaclient.clouds.aws.IMDS_IP_ADDRESS", (address,))
+            )
+            stack.enter_context(
+                mock.patch.dict(
+                    "uaclient.clouds.azure.IMDS_URLS",
+                    {"compute": base_url + "/metadata/instance/compute"},
+                )
+            )
+            stack.enter_context(
+                mock.patch(
+                    "uaclient.clouds.gcp.INSTANCE_ID_URL",
+                    base_url + "/computeMetadata/v1/instance/id",
+                )
+            )
+            for cls in (
+                "aws.AWSAutoAttachInstance",
+                "azure.AzureAutoAttachInstance",
+                "gcp.GCPAutoAttachInstance",
+            ):
+                stack.enter_context(
+                    mock.patch(
+                        "uaclient.clouds.{}.is_viable".format(cls),
+                        new_callable=mock.PropertyMock,
+                        return_value=True,
+                    )
+                )
+            try:
+                yield
+            finally:
+                release_azure.set()
+                server.shutdown()
+                server.server_close()
+
+    @pytest.mark.usefixtures("fake_imds")
+    def test_first_answering_metadata_service_wins(self):
+        start = time.monotonic()
+        instance = probe_cloud_instance()
+
+        assert isinstance(instance, AWSAutoAttachInstance)
+        assert "aws-token" == instance._api_token
+        # The hanging Azure probe is abandoned, not waited for
+        assert time.monotonic() - start < 1
+
+    @pytest.mark.usefixtures("fake_imds")
+    def test_none_when_no_metadata_service_answers(self):
+        with mock.patch(
+            "uaclient.clouds.aws.AWSAutoAttachInstance.probe_imds",
+            return_value=False,
+        ), mock.patch(M_PATH + "CLOUD_PROBE_DEADLINE", 0.1):
+            assert None is probe_cloud_instance()
@@ -10,9 +10,10 @@ import pytest
 
 # Useless try/except to make flake8 happy \_("/)_/
 try:
-    from uaclient import event_logger
+    from uaclient import defaults, event_logger
     from uaclient.config import UAConfig
     from uaclient.entitlements.entitlement_status import ApplicationStatus
+    from uaclient.files.files import UAFile
     from uaclient.files.machine_token import MachineTokenFile
     from uaclient.files.notices import NoticeFileDetails
     from uaclient.files.user_config_file import UserConfigData
@@ -95,6 +96,16 @@ def urllib_request_urlopen():
         yield original
 
 
+@pytest.yield_fixture(scope="session", autouse=True)
+def dbus_module():
+    """
+    A fixture that hides python3-dbus from all tests.
+    This prevents us from querying the systemd of the host in unit tests
+    """
+    with mock.patch.dict("sys.modules", {"dbus": None}):
+        yield
+
+
 @pytest.fixture
 def caplog_text(request):
     """
@@ -173,25 +184,100 @@ def logging_sandbox():
 
 
 @pytest.yield_fixture(scope="function", autouse=True)
-def fake_machine_token_file():
+def status_snapshot_file(tmpdir):
+    """
+    A fixture that keeps the status snapshot in the test directory.
+    Status publishes the snapshot whenever it runs as root.
+    """
+    from uaclient.files import state_files
+
+    with mock.patch.object(
+        state_files.status_snapshot_file,
+        "pro_file",
+        UAFile("status-snapshot.json", tmpdir.strpath, private=False),
+    ):
+        yield state_files.status_snapshot_file
+
+
+@pytest.yield_fixture(scope="function", autouse=True)
+def cloud_identity_cache_file(tmpdir):
+    """
+    A fixture that keeps the cloud identity cache in the test directory.
+    """
+    from uaclient.files import state_files
+
+    with mock.patch.object(
+        state_files.cloud_identity_cache_file,
+        "pro_file",
+        UAFile("cloud-identity.json", tmpdir.strpath, private=False),
+    ):
+        yield state_files.cloud_identity_cache_file
+
+
+@pytest.yield_fixture(scope="function", autouse=True)
+def unattended_upgrades_snapshot_file(tmpdir):
+    """
+    A fixture that keeps the unattended-upgrades snapshot in the test
+    directory.
+    """
+    from uaclient.files import state_files
+
+    with mock.patch.object(
+        state_files.unattended_upgrades_snapshot_file,
+        "pro_file",
+        UAFile(
+            "unattended-upgrades-snapshot.json",
+            tmpdir.strpath,
+            private=False,
+        ),
+    ):
+        yield state_files.unattended_upgrades_snapshot_file
+
+
+@pytest.yield_fixture(scope="function", autouse=True)
+def security_status_cache_file(tmpdir):
+    """
+    A fixture that keeps the security-status cache in the test directory.
+    """
+    from uaclient.files import state_files
+
+    with mock.patch.object(
+        state_files.security_status_cache_file,
+        "pro_file",
+        UAFile("security-status-cache.json", tmpdir.strpath, private=False),
+    ):
+        yield state_files.security_status_cache_file
+
+
+@pytest.yield_fixture(scope="function", autouse=True)
+def fake_machine_token_file(tmpdir):
     from unittest.mock import patch
 
     with patch(
         "uaclient.files.machine_token.get_machine_token_file"
     ) as m_get_machine_token_file:
-        machine_token = FakeMachineToken(attached=False)
+        machine_token = FakeMachineToken(
+            attached=False, directory=tmpdir.strpath
+        )
         m_get_machine_token_file.return_value = machine_token
         yield machine_token
 
 
 class FakeMachineToken(MachineTokenFile):
-    def __init__(self, attached, token=None):
+    def __init__(
+        self, attached, token=None, directory=defaults.DEFAULT_DATA_DIR
+    ):
         self.attached = attached
+        self.public_file = UAFile(
+            defaults.MACHINE_TOKEN_FILE, directory, private=False
+        )
         self._machine_token = None
         self.token = token
         self.machine_token_overlay_path = None
         self._contract_expiry_datetime = None
         self._entitlements = None
+        self._validators = {}
+        self.generation = 0
         self.write_calls = 0
         self.delete_calls = 0
 
@@ -204,6 +290,16 @@ class FakeMachineToken(MachineTokenFile):
     def is_present(self):
         return self.attached
 
+    def get_validators(self, endpoint):
+        return self._validators.get(endpoint, {})
+
+    def write_validators(self, endpoint, validators):
+        self._validators[endpoint] = validators
+
+    @property
+    def entitlement_hashes(self):
+        return self.get_entitlement_hashes_from_token(self.machine_token or {})
+
     def read(self):
         if self.token:
             return self.token
@@ -268,9 +364,13 @@ class FakeMachineToken(MachineTokenFile):
 
     def write(self, private_content):
         self.token = private_content
+        self._validators = {}
+        self._entitlements = None
+        self.generation += 1
         self.write_calls += 1
 
     def delete(self):
+        self.generation += 1
         self.delete_calls += 1
 
 
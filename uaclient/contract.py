@@ -2,7 +2,7 @@ import copy
 import logging
 import socket
 from collections import namedtuple
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import uaclient.files.machine_token as mtf
 from uaclient import (
@@ -154,6 +154,24 @@ class CPUTypeData(data_types.DataObject):
         self.sysinfo_type = sysinfo_type
 
 
+def _get_conditional_headers(validators: Dict[str, str]) -> Dict[str, str]:
+    """Return the headers making a request conditional on validators."""
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last-modified"):
+        headers["If-Modified-Since"] = validators["last-modified"]
+    return headers
+
+
+def _get_response_validators(headers: Dict[str, str]) -> Dict[str, str]:
+    return {
+        name: headers[name]
+        for name in ("etag", "last-modified")
+        if headers.get(name)
+    }
+
+
 class UAContractClient(serviceclient.UAServiceClient):
     cfg_url_base_attr = "contract_url"
 
@@ -163,6 +181,9 @@ class UAContractClient(serviceclient.UAServiceClient):
     ) -> None:
         super().__init__(cfg=cfg)
         self.machine_token_file = mtf.get_machine_token_file()
+        # Validators of the last get_contract_machine response, to make the
+        # next GET of the machine token conditional
+        self.last_response_validators = {}  # type: Dict[str, str]
 
     @util.retry(socket.timeout, retry_sleeps=[1, 2, 2])
     def add_contract_machine(
@@ -433,6 +454,7 @@ class UAContractClient(serviceclient.UAServiceClient):
         machine_token: str,
         contract_id: str,
         machine_id: Optional[str] = None,
+        validators: Optional[Dict[str, str]] = None,
     ) -> Dict[str, Any]:
         """Get the updated machine token from the contract server.
 
@@ -441,12 +463,18 @@ class UAContractClient(serviceclient.UAServiceClient):
         @param contract_id: Unique contract id provided by contract service
         @param machine_id: Optional unique system machine id. When absent,
             contents of /etc/machine-id will be used.
+        @param validators: Optional validators of a previous response, to
+            only get the machine token if it changed since then.
+
+        @raise ETagUnchanged: if the machine token didn't change since the
+            response validators are from.
         """
         if not machine_id:
             machine_id = system.get_machine_id(self.cfg)
 
         headers = self.headers()
         headers.update({"Authorization": "Bearer {}".format(machine_token)})
+        headers.update(_get_conditional_headers(validators or {}))
         url = API_V1_GET_CONTRACT_MACHINE.format(
             contract=contract_id,
             machine=machine_id,
@@ -463,12 +491,17 @@ class UAContractClient(serviceclient.UAServiceClient):
                 "virt": activity_info["virt"],
             },
         )
+        if response.code == 304:
+            raise exceptions.ETagUnchanged(url=url)
         if response.code != 200:
             raise exceptions.ContractAPIError(
                 url=url, code=response.code, body=response.body
             )
         if response.headers.get("expires"):
             response.json_dict["expires"] = response.headers["expires"]
+        self.last_response_validators = _get_response_validators(
+            response.headers
+        )
         return response.json_dict
 
     def update_contract_machine(
@@ -484,7 +517,6 @@ class UAContractClient(serviceclient.UAServiceClient):
         @param contract_id: Unique contract id provided by contract service.
         @param machine_id: Optional unique system machine id. When absent,
             contents of /etc/machine-id will be used.
-
         @return: Dict of the JSON response containing refreshed machine-token
         """
         if not machine_id:
@@ -638,6 +670,7 @@ def process_entitlements_delta(
     allow_enable: bool,
     series_overrides: bool = True,
     verbose: bool = True,
+    unchanged_entitlements: Optional[Set[str]] = None,
 ) -> None:
     """Iterate over all entitlements in new_entitlement and apply any delta
     found according to past_entitlements.
@@ -653,9 +686,18 @@ def process_entitlements_delta(
     :param series_overrides: Boolean set True if series overrides should be
         applied to the new_access dict.
     :param verbose: If True, display output to stdout
+    :param unchanged_entitlements: names of the entitlements known to be
+        the same in past_entitlements and new_entitlements, which are
+        skipped without computing their deltas.
     """
     from uaclient.entitlements import entitlements_enable_order
 
+    if unchanged_entitlements is None:
+        unchanged_entitlements = set()
+    if all(name in unchanged_entitlements for name in new_entitlements):
+        LOG.debug("No entitlement changed, skipping contract deltas")
+        return
+
     delta_error = False
     unexpected_errors = []
 
@@ -663,6 +705,8 @@ def process_entitlements_delta(
     # depend on other service to be enable first.
     failed_services = []  # type: List[str]
     for name in entitlements_enable_order(cfg):
+        if name in unchanged_entitlements:
+            continue
         try:
             new_entitlement = new_entitlements[name]
         except KeyError:
@@ -829,6 +873,7 @@ def refresh(cfg: UAConfig, verbose=True):
     """
     machine_token_file = mtf.get_machine_token_file(cfg)
     orig_entitlements = machine_token_file.entitlements()
+    orig_entitlement_hashes = machine_token_file.entitlement_hashes
     orig_token = machine_token_file.machine_token
     machine_token = orig_token["machineToken"]
     contract_id = orig_token["machineTokenInfo"]["contractInfo"]["id"]
@@ -837,7 +882,6 @@ def refresh(cfg: UAConfig, verbose=True):
     resp = contract_client.update_contract_machine(
         machine_token=machine_token, contract_id=contract_id
     )
-
     machine_token_file.write(resp)
     system.get_machine_id.cache_clear()
     machine_id = resp.get("machineTokenInfo", {}).get(
@@ -845,12 +889,25 @@ def refresh(cfg: UAConfig, verbose=True):
     )
     machine_id_file.write(machine_id)
 
+    # The hashes cover the contract server response only, so everything is
+    # processed when an overlay may change the entitlements.
+    unchanged_entitlements = set()  # type: Set[str]
+    if not machine_token_file.machine_token_overlay_path:
+        unchanged_entitlements = {
+            name
+            for name, entitlement_hash in (
+                machine_token_file.entitlement_hashes.items()
+            )
+            if orig_entitlement_hashes.get(name) == entitlement_hash
+        }
+
     process_entitlements_delta(
         cfg,
         orig_entitlements,
         machine_token_file.entitlements(),
         allow_enable=False,
         verbose=verbose,
+        unchanged_entitlements=unchanged_entitlements,
     )
 
 
@@ -1,3 +1,5 @@
+import asyncio
+import functools
 import logging
 import os
 from subprocess import TimeoutExpired
@@ -16,7 +18,9 @@ AUTO_ATTACH_STATUS_MOTD_FILE = os.path.join(
 def start():
     try:
         system.subp(
-            ["systemctl", "start", "ubuntu-advantage.service"], timeout=2.0
+            ["systemctl", "start", "ubuntu-advantage.service"],
+            timeout=2.0,
+            mutating=True,
         )
     except (exceptions.ProcessExecutionError, TimeoutExpired) as e:
         LOG.warning(e, exc_info=e)
@@ -25,7 +29,9 @@ def start():
 def stop():
     try:
         system.subp(
-            ["systemctl", "stop", "ubuntu-advantage.service"], timeout=2.0
+            ["systemctl", "stop", "ubuntu-advantage.service"],
+            timeout=2.0,
+            mutating=True,
         )
     except (exceptions.ProcessExecutionError, TimeoutExpired) as e:
         LOG.warning(e, exc_info=e)
@@ -35,3 +41,26 @@ def cleanup(cfg: UAConfig):
     from uaclient.daemon import retry_auto_attach
 
     retry_auto_attach.cleanup(cfg)
+
+
+def run_until_complete(coroutine):
+    """Run coroutine in a new event loop and return its result."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+async def run_in_thread(func, *args, **kwargs):
+    """Run a blocking call in a worker thread, without blocking the loop.
+
+    The long polls of the cloud metadata services can block for minutes,
+    while the daemon keeps tracking cloud-config and its retry timers.
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(
+        None, functools.partial(func, *args, **kwargs)
+    )
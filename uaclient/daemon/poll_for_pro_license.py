@@ -1,5 +1,7 @@
+import asyncio
 import logging
 import time
+from typing import Optional
 
 from uaclient import actions, exceptions, lock, system, util
 from uaclient.api.u.pro.status.is_attached.v1 import _is_attached
@@ -9,7 +11,11 @@ from uaclient.clouds.gcp import GCPAutoAttachInstance
 from uaclient.clouds.identity import cloud_instance_factory
 from uaclient.clouds.lxd import LXDAutoAttachInstance
 from uaclient.config import UAConfig
-from uaclient.daemon import retry_auto_attach
+from uaclient.daemon import (
+    retry_auto_attach,
+    run_in_thread,
+    run_until_complete,
+)
 
 LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
 
@@ -27,7 +33,30 @@ def attempt_auto_attach(cfg: UAConfig, cloud: AutoAttachInstance):
     LOG.info("Successful auto attach")
 
 
-def poll_for_pro_license(cfg: UAConfig):
+async def _attach_when_ready(
+    cfg: UAConfig,
+    cloud: AutoAttachInstance,
+    cloud_config_ready: Optional[asyncio.Event],
+):
+    if cloud_config_ready is not None and not cloud_config_ready.is_set():
+        LOG.info("Pro license found, waiting for cloud-config to finish")
+        await cloud_config_ready.wait()
+        if _is_attached(cfg).is_attached:
+            # cloud-config may have attached the machine itself
+            LOG.info("Already attached, shutting down")
+            return
+    attempt_auto_attach(cfg, cloud)
+
+
+async def poll(
+    cfg: UAConfig, cloud_config_ready: Optional[asyncio.Event] = None
+):
+    """Poll for a pro license, and auto attach as soon as there is one.
+
+    The requests to the metadata service run in worker threads, so that the
+    daemon can track cloud-config at the same time. The auto attach itself
+    waits for cloud_config_ready to be set, if given.
+    """
     if util.is_config_value_true(
         config=cfg.cfg, path_to_value="features.disable_auto_attach"
     ):
@@ -63,8 +92,8 @@ def poll_for_pro_license(cfg: UAConfig):
         return
 
     try:
-        pro_license_present = cloud.is_pro_license_present(
-            wait_for_change=False
+        pro_license_present = await run_in_thread(
+            cloud.is_pro_license_present, wait_for_change=False
         )
     except exceptions.CancelProLicensePolling:
         LOG.info("Cancelling polling")
@@ -75,7 +104,7 @@ def poll_for_pro_license(cfg: UAConfig):
         pass
     else:
         if pro_license_present:
-            attempt_auto_attach(cfg, cloud)
+            await _attach_when_ready(cfg, cloud, cloud_config_ready)
             return
 
     if not cfg.poll_for_pro_license:
@@ -85,15 +114,15 @@ def poll_for_pro_license(cfg: UAConfig):
     while True:
         try:
             start = time.time()
-            pro_license_present = cloud.is_pro_license_present(
-                wait_for_change=True
+            pro_license_present = await run_in_thread(
+                cloud.is_pro_license_present, wait_for_change=True
             )
             end = time.time()
         except exceptions.CancelProLicensePolling:
             LOG.info("Cancelling polling")
             return
         except exceptions.DelayProLicensePolling:
-            time.sleep(cfg.polling_error_retry_delay)
+            await asyncio.sleep(cfg.polling_error_retry_delay)
             continue
         else:
             if _is_attached(cfg).is_attached:
@@ -101,7 +130,7 @@ def poll_for_pro_license(cfg: UAConfig):
                 LOG.info("Already attached, shutting down")
                 return
             if pro_license_present:
-                attempt_auto_attach(cfg, cloud)
+                await _attach_when_ready(cfg, cloud, cloud_config_ready)
                 return
             if end - start < 10:
                 LOG.info(
@@ -109,5 +138,9 @@ def poll_for_pro_license(cfg: UAConfig):
                     " present. Waiting %d seconds before polling again",
                     cfg.polling_error_retry_delay,
                 )
-                time.sleep(cfg.polling_error_retry_delay)
+                await asyncio.sleep(cfg.polling_error_retry_delay)
                 continue
+
+
+def poll_for_pro_license(cfg: UAConfig):
+    run_until_complete(poll(cfg))
@@ -1,6 +1,7 @@
+import asyncio
 import datetime
 import logging
-import time
+from typing import Optional
 
 from uaclient import exceptions, lock, messages, system, util
 from uaclient.api import exceptions as api_exceptions
@@ -10,7 +11,7 @@ from uaclient.api.u.pro.attach.auto.full_auto_attach.v1 import (
 )
 from uaclient.api.u.pro.status.is_attached.v1 import _is_attached
 from uaclient.config import UAConfig
-from uaclient.daemon import AUTO_ATTACH_STATUS_MOTD_FILE
+from uaclient.daemon import AUTO_ATTACH_STATUS_MOTD_FILE, run_until_complete
 from uaclient.files import notices, state_files
 
 LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
@@ -74,7 +75,15 @@ def cleanup(cfg: UAConfig):
     )
 
 
-def retry_auto_attach(cfg: UAConfig) -> None:
+async def retry(
+    cfg: UAConfig, cloud_config_ready: Optional[asyncio.Event] = None
+) -> None:
+    """Retry the auto attach after each of the RETRY_INTERVALS.
+
+    The intervals are timers of the event loop, so the daemon keeps tracking
+    cloud-config while waiting. Attempts wait for cloud_config_ready to be
+    set, if given.
+    """
     # in case we got started while already attached somehow
     if _is_attached(cfg).is_attached:
         return
@@ -130,7 +139,9 @@ def retry_auto_attach(cfg: UAConfig) -> None:
         except exceptions.LockHeldError:
             pass
 
-        time.sleep(interval)
+        await asyncio.sleep(interval)
+        if cloud_config_ready is not None:
+            await cloud_config_ready.wait()
 
         if _is_attached(cfg).is_attached:
             # We attached while sleeping - hooray!
@@ -183,3 +194,7 @@ def retry_auto_attach(cfg: UAConfig) -> None:
             num_attempts=len(RETRY_INTERVALS) + 1,
             reason=msg_reason,
         )
+
+
+def retry_auto_attach(cfg: UAConfig) -> None:
+    run_until_complete(retry(cfg))
@@ -15,7 +15,9 @@ class TestStart:
         start()
         assert [
             mock.call(
-                ["systemctl", "start", "ubuntu-advantage.service"], timeout=2.0
+                ["systemctl", "start", "ubuntu-advantage.service"],
+                timeout=2.0,
+                mutating=True,
             )
         ] == m_subp.call_args_list
 
@@ -32,7 +34,9 @@ class TestStart:
         start()
         assert [
             mock.call(
-                ["systemctl", "start", "ubuntu-advantage.service"], timeout=2.0
+                ["systemctl", "start", "ubuntu-advantage.service"],
+                timeout=2.0,
+                mutating=True,
             )
         ] == m_subp.call_args_list
         assert [mock.call(err, exc_info=err)] == m_log_warning.call_args_list
@@ -44,7 +48,9 @@ class TestStop:
         stop()
         assert [
             mock.call(
-                ["systemctl", "stop", "ubuntu-advantage.service"], timeout=2.0
+                ["systemctl", "stop", "ubuntu-advantage.service"],
+                timeout=2.0,
+                mutating=True,
             )
         ] == m_subp.call_args_list
 
@@ -61,7 +67,9 @@ class TestStop:
         stop()
         assert [
             mock.call(
-                ["systemctl", "stop", "ubuntu-advantage.service"], timeout=2.0
+                ["systemctl", "stop", "ubuntu-advantage.service"],
+                timeout=2.0,
+                mutating=True,
             )
         ] == m_subp.call_args_list
         assert [mock.call(err, exc_info=err)] == m_log_warning.call_args_list
@@ -1,13 +1,18 @@
+import asyncio
+
 import mock
 import pytest
 
 from uaclient import exceptions, lock
 from uaclient.clouds.aws import AWSAutoAttachInstance
 from uaclient.clouds.gcp import GCPAutoAttachInstance
+from uaclient.daemon import run_until_complete
 from uaclient.daemon.poll_for_pro_license import (
     attempt_auto_attach,
+    poll,
     poll_for_pro_license,
 )
+from uaclient.testing.helpers import no_sleep
 
 M_PATH = "uaclient.daemon.poll_for_pro_license."
 
@@ -78,7 +83,7 @@ class TestAttemptAutoAttach:
 
 
 @mock.patch(M_PATH + "LOG.info")
-@mock.patch(M_PATH + "time.sleep")
+@mock.patch(M_PATH + "asyncio.sleep", side_effect=no_sleep)
 @mock.patch(M_PATH + "time.time")
 @mock.patch(M_PATH + "attempt_auto_attach")
 @mock.patch(M_PATH + "GCPAutoAttachInstance.is_pro_license_present")
@@ -432,3 +437,57 @@ class TestPollForProLicense:
             expected_attempt_auto_attach_calls
             == m_attempt_auto_attach.call_args_list
         )
+
+    @pytest.mark.parametrize(
+        "attached_by_cloud_config,expected_attempt_auto_attach_calls",
+        ((False, 1), (True, 0)),
+    )
+    @mock.patch(M_PATH + "_is_attached")
+    def test_auto_attach_waits_for_cloud_config(
+        self,
+        m_is_attached,
+        m_is_config_value_true,
+        m_is_current_series_lts,
+        m_cloud_instance_factory,
+        m_should_poll,
+        m_is_pro_license_present,
+        m_attempt_auto_attach,
+        m_time,
+        m_sleep,
+        m_log_info,
+        attached_by_cloud_config,
+        expected_attempt_auto_attach_calls,
+        FakeConfig,
+    ):
+        cfg = FakeConfig()
+        m_is_attached.side_effect = [
+            mock.MagicMock(is_attached=False),
+            mock.MagicMock(is_attached=attached_by_cloud_config),
+        ]
+        m_is_config_value_true.return_value = False
+        m_is_current_series_lts.return_value = True
+        m_cloud_instance_factory.return_value = GCPAutoAttachInstance()
+        m_should_poll.return_value = True
+        m_is_pro_license_present.return_value = True
+        waiting = mock.call(
+            "Pro license found, waiting for cloud-config to finish"
+        )
+
+        async def _poll_until_cloud_config_is_ready():
+            cloud_config_ready = asyncio.Event()
+            task = asyncio.ensure_future(poll(cfg, cloud_config_ready))
+            for _ in range(500):
+                if waiting in m_log_info.call_args_list:
+                    break
+                await asyncio.wait([task], timeout=0.01)
+            assert not task.done()
+            assert 0 == m_attempt_auto_attach.call_count
+            cloud_config_ready.set()
+            await task
+
+        run_until_complete(_poll_until_cloud_config_is_ready())
+
+        assert (
+            expected_attempt_auto_attach_calls
+            == m_attempt_auto_attach.call_count
+        )
@@ -14,6 +14,7 @@ from uaclient.daemon.retry_auto_attach import (
 )
 from uaclient.files import state_files
 from uaclient.testing import fakes
+from uaclient.testing.helpers import no_sleep
 
 M_PATH = "uaclient.daemon.retry_auto_attach."
 
@@ -62,7 +63,7 @@ class TestFullAutoAttachToFailureReason:
 @mock.patch(M_PATH + "cleanup")
 @mock.patch(M_PATH + "full_auto_attach")
 @mock.patch(M_PATH + "state_files.retry_auto_attach_options_file.read")
-@mock.patch(M_PATH + "time.sleep")
+@mock.patch(M_PATH + "asyncio.sleep", side_effect=no_sleep)
 @mock.patch(M_PATH + "system.write_file")
 @mock.patch(M_PATH + "state_files.retry_auto_attach_state_file.write")
 @mock.patch(M_PATH + "state_files.retry_auto_attach_state_file.read")
@@ -16,6 +16,8 @@ DEFAULT_LOG_DIR = "/var/log"
 
 # Relative paths
 MACHINE_TOKEN_FILE = "machine-token.json"
+MACHINE_TOKEN_HASHES_FILE = "machine-token-hashes.json"
+MACHINE_TOKEN_VALIDATORS_FILE = "machine-token-validators.json"
 CONFIG_FILE = "uaclient.conf"
 USER_CONFIG_FILE = "user-config.json"
 CANDIDATE_VERSION_FILE = "candidate-version"
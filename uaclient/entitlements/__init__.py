@@ -1,13 +1,16 @@
 import enum
 import textwrap
 from collections import defaultdict
-from typing import Dict, List, Optional, Type
+from typing import Dict, List, Optional, Tuple, Type  # noqa: F401
 
 from uaclient import exceptions
 from uaclient.config import UAConfig
 from uaclient.entitlements import fips
 from uaclient.entitlements.anbox import AnboxEntitlement
-from uaclient.entitlements.base import UAEntitlement
+from uaclient.entitlements.base import (  # noqa: F401
+    EntitlementWithMessage,
+    UAEntitlement,
+)
 from uaclient.entitlements.cc import CommonCriteriaEntitlement
 from uaclient.entitlements.cis import CISEntitlement
 from uaclient.entitlements.entitlement_status import ApplicabilityStatus
@@ -22,6 +25,7 @@ from uaclient.entitlements.realtime import RealtimeKernelEntitlement
 from uaclient.entitlements.repo import RepoEntitlement
 from uaclient.entitlements.ros import ROSEntitlement, ROSUpdatesEntitlement
 from uaclient.exceptions import EntitlementNotFoundError
+from uaclient.files import machine_token
 
 ENTITLEMENT_CLASSES = [
     AnboxEntitlement,
@@ -42,6 +46,126 @@ ENTITLEMENT_CLASSES = [
 ]  # type: List[Type[UAEntitlement]]
 
 
+class EntitlementRegistry:
+    """Shared entitlement instances, per name and variant.
+
+    Reading the state of services, as status does, needs one instance per
+    service, and finding the class of a service by name needs the contract
+    data of every class. Both are kept here for a given config, machine
+    token and set of entitlement classes, and the instances compute their
+    variants and contract data lazily, once per version of the token.
+
+    Shared instances must only be used to read the state of a service:
+    operations carry options, such as purge or access_only, and go through
+    entitlement_factory instead.
+    """
+
+    def __init__(
+        self,
+        cfg: UAConfig,
+        machine_token_file: machine_token.MachineTokenFile,
+        entitlement_classes: List[Type[UAEntitlement]],
+    ):
+        self.cfg = cfg
+        self.machine_token_file = machine_token_file
+        self.generation = machine_token_file.generation
+        self.entitlement_classes = tuple(entitlement_classes)
+        self._instances = {}  # type: Dict[Tuple[str, str], UAEntitlement]
+        self._classes_by_name = (
+            None
+        )  # type: Optional[Dict[str, Type[UAEntitlement]]]
+
+    def is_current(
+        self,
+        cfg: UAConfig,
+        machine_token_file: machine_token.MachineTokenFile,
+        entitlement_classes: List[Type[UAEntitlement]],
+    ) -> bool:
+        """Return True if the registry is valid for this state."""
+        return (
+            self.cfg is cfg
+            and self.machine_token_file is machine_token_file
+            and self.generation == machine_token_file.generation
+            and self.entitlement_classes == tuple(entitlement_classes)
+        )
+
+    def get_class(self, name: str) -> Type[UAEntitlement]:
+        """Return the entitlement class that can be called name.
+
+        :raise EntitlementNotFoundError: If no entitlement has this name.
+        """
+        if self._classes_by_name is None:
+            classes_by_name = {}  # type: Dict[str, Type[UAEntitlement]]
+            for ent_cls in self.entitlement_classes:
+                key = (ent_cls.name, "")
+                if key not in self._instances:
+                    self._instances[key] = ent_cls(
+                        cfg=self.cfg, called_name=ent_cls.name
+                    )
+                for valid_name in self._instances[key].valid_names:
+                    classes_by_name.setdefault(valid_name, ent_cls)
+            self._classes_by_name = classes_by_name
+
+        if name not in self._classes_by_name:
+            raise EntitlementNotFoundError(entitlement_name=name)
+        return self._classes_by_name[name]
+
+    def get(self, name: str, variant: str = "") -> UAEntitlement:
+        """Return the shared instance of the entitlement called name.
+
+        :raise EntitlementNotFoundError: If no entitlement has this name, or
+          if it has no variant with the given name.
+        """
+        key = (name, variant)
+        if key not in self._instances:
+            if variant:
+                variants = self.get(name).variants
+                if variant not in variants:
+                    raise EntitlementNotFoundError(entitlement_name=variant)
+                ent_cls = variants[variant]
+            else:
+                ent_cls = self.get_class(name)
+            self._instances[key] = ent_cls(cfg=self.cfg, called_name=name)
+        return self._instances[key]
+
+
+_entitlement_registry = None  # type: Optional[EntitlementRegistry]
+
+
+def get_entitlement_registry(cfg: UAConfig) -> EntitlementRegistry:
+    """Return the registry of ENTITLEMENT_CLASSES for cfg.
+
+    A new registry is created whenever the config, the entitlement classes
+    or the machine token change, which invalidates every shared instance.
+    """
+    global _entitlement_registry
+
+    machine_token_file = machine_token.get_machine_token_file(cfg)
+    if _entitlement_registry is None or not _entitlement_registry.is_current(
+        cfg, machine_token_file, ENTITLEMENT_CLASSES
+    ):
+        _entitlement_registry = EntitlementRegistry(
+            cfg, machine_token_file, ENTITLEMENT_CLASSES
+        )
+    return _entitlement_registry
+
+
+def get_entitlement(
+    cfg: UAConfig, name: str, variant: str = ""
+) -> UAEntitlement:
+    """Return a shared UAEntitlement object, to read the service state.
+
+    :param cfg: UAConfig instance
+    :param name: The name of the entitlement to return
+    :param variant: The variant name to be used
+
+    :raise EntitlementNotFoundError: If no entitlement with the given name is
+      found, or if the entitlement exists but no variant with the specified
+      name is found.
+    """
+    return get_entitlement_registry(cfg).get(name, variant)
+
+
 def entitlement_factory(
     cfg: UAConfig,
     name: str,
@@ -63,28 +187,26 @@ def entitlement_factory(
       found, or if the entitlement exists but no variant with the specified
       name is found.
     """
-
-    for entitlement in ENTITLEMENT_CLASSES:
-        ent = entitlement(
+    registry = get_entitlement_registry(cfg)
+    ent_cls = registry.get_class(name)
+    if not variant:
+        return ent_cls(
             cfg=cfg,
             access_only=access_only,
             called_name=name,
             purge=purge,
             extra_args=extra_args,
         )
-        if name in ent.valid_names:
-            if not variant:
-                return ent
-            elif variant in ent.variants:
-                return ent.variants[variant](
-                    cfg=cfg,
-                    called_name=name,
-                    purge=purge,
-                    extra_args=extra_args,
-                )
-            else:
-                raise EntitlementNotFoundError(entitlement_name=variant)
-    raise EntitlementNotFoundError(entitlement_name=name)
+
+    variants = registry.get(name).variants
+    if variant not in variants:
+        raise EntitlementNotFoundError(entitlement_name=variant)
+    return variants[variant](
+        cfg=cfg,
+        called_name=name,
+        purge=purge,
+        extra_args=extra_args,
+    )
 
 
 def valid_services(cfg: UAConfig, all_names: bool = False) -> List[str]:
@@ -94,20 +216,19 @@ def valid_services(cfg: UAConfig, all_names: bool = False) -> List[str]:
     :param all_names: if we should return all the names for a service instead
         of just the presentation_name
     """
-    entitlements = ENTITLEMENT_CLASSES
+    registry = get_entitlement_registry(cfg)
+    entitlements = [
+        registry.get(entitlement_cls.name)
+        for entitlement_cls in ENTITLEMENT_CLASSES
+    ]
     if all_names:
         names = []
-        for entitlement_cls in entitlements:
-            names.extend(entitlement_cls(cfg=cfg).valid_names)
+        for ent in entitlements:
+            names.extend(ent.valid_names)
 
         return sorted(names)
 
-    return sorted(
-        [
-            entitlement_cls(cfg=cfg).presentation_name
-            for entitlement_cls in entitlements
-        ]
-    )
+    return sorted([ent.presentation_name for ent in entitlements])
 
 
 def order_entitlements_for_enabling(
@@ -116,15 +237,12 @@ def order_entitlements_for_enabling(
     """
     A function to sort entitlments for enabling that preserves invalid names
     """
-    valid_ents_ordered = entitlements_enable_order(cfg)
-
-    def sort_order_with_nonexistent_last(ent):
-        try:
-            return valid_ents_ordered.index(ent)
-        except ValueError:
-            return len(valid_ents_ordered)
+    enable_positions = get_entitlement_dependencies(cfg).enable_positions
+    nonexistent_position = len(enable_positions)
 
-    return sorted(ents, key=lambda ent: sort_order_with_nonexistent_last(ent))
+    return sorted(
+        ents, key=lambda ent: enable_positions.get(ent, nonexistent_position)
+    )
 
 
 @enum.unique
@@ -133,65 +251,124 @@ class SortOrder(enum.Enum):
     DEPENDENT_SERVICES = object()
 
 
+class EntitlementDependencies:
+    """The relations between entitlements, and the orders they imply.
+
+    The relations are defined by the entitlement classes, not by the
+    contract, so they are computed once per set of classes and every
+    lookup afterwards is a dict access. The entitlement instances used to
+    read the relations are dropped once the graph is built, so no config
+    or instance outlives the construction.
+    """
+
+    def __init__(
+        self, cfg: UAConfig, entitlement_classes: List[Type[UAEntitlement]]
+    ):
+        self.required_services = (
+            {}
+        )  # type: Dict[str, Tuple[EntitlementWithMessage, ...]]
+        self.incompatible_services = (
+            {}
+        )  # type: Dict[str, Tuple[EntitlementWithMessage, ...]]
+        self.dependent_services = (
+            {}
+        )  # type: Dict[str, Tuple[Type[UAEntitlement], ...]]
+
+        # Services can refer to classes outside of entitlement_classes, so
+        # the relations of every class reachable from them are read.
+        to_visit = list(entitlement_classes)
+        while to_visit:
+            ent_cls = to_visit.pop()
+            if ent_cls.name in self.required_services:
+                continue
+            ent = ent_cls(cfg)
+            self.required_services[ent_cls.name] = ent.required_services
+            self.incompatible_services[ent_cls.name] = (
+                ent.incompatible_services
+            )
+            self.dependent_services[ent_cls.name] = ent.dependent_services
+            to_visit.extend(e.entitlement for e in ent.required_services)
+            to_visit.extend(ent.dependent_services)
+
+        self.enable_order = self._sort(
+            entitlement_classes, SortOrder.REQUIRED_SERVICES
+        )
+        self.disable_order = self._sort(
+            entitlement_classes, SortOrder.DEPENDENT_SERVICES
+        )
+        self.enable_positions = {
+            name: position for position, name in enumerate(self.enable_order)
+        }
+
+    def _sort(
+        self,
+        entitlement_classes: List[Type[UAEntitlement]],
+        sort_order: SortOrder,
+    ) -> List[str]:
+        order = []  # type: List[str]
+        visited = {}  # type: Dict[str, bool]
+
+        for ent_cls in entitlement_classes:
+            self._sort_visit(ent_cls, sort_order, visited, order)
+
+        return order
+
+    def _sort_visit(
+        self,
+        ent_cls: Type[UAEntitlement],
+        sort_order: SortOrder,
+        visited: Dict[str, bool],
+        order: List[str],
+    ):
+        if ent_cls.name in visited:
+            return
+
+        if sort_order == SortOrder.REQUIRED_SERVICES:
+            cls_list = [
+                e.entitlement for e in self.required_services[ent_cls.name]
+            ]
+        else:
+            cls_list = list(self.dependent_services[ent_cls.name])
+
+        for cls_dependency in cls_list:
+            if ent_cls.name not in visited:
+                self._sort_visit(cls_dependency, sort_order, visited, order)
+
+        order.append(str(ent_cls.name))
+        visited[str(ent_cls.name)] = True
+
+
+_entitlement_dependencies = (
+    {}
+)  # type: Dict[Tuple[Type[UAEntitlement], ...], EntitlementDependencies]
+
+
+def get_entitlement_dependencies(cfg: UAConfig) -> EntitlementDependencies:
+    """Return the memoized dependencies between ENTITLEMENT_CLASSES.
+
+    cfg is only used to build the graph the first time: the relations do
+    not depend on it, and the memoized graph keeps no reference to it.
+    """
+    key = tuple(ENTITLEMENT_CLASSES)
+    if key not in _entitlement_dependencies:
+        _entitlement_dependencies[key] = EntitlementDependencies(
+            cfg, ENTITLEMENT_CLASSES
+        )
+    return _entitlement_dependencies[key]
+
+
 def entitlements_disable_order(cfg: UAConfig) -> List[str]:
     """
     Return the entitlements disable order based on dependent services logic.
     """
-    return _sort_entitlements(cfg=cfg, sort_order=SortOrder.DEPENDENT_SERVICES)
+    return list(get_entitlement_dependencies(cfg).disable_order)
 
 
 def entitlements_enable_order(cfg: UAConfig) -> List[str]:
     """
     Return the entitlements enable order based on required services logic.
     """
-    return _sort_entitlements(cfg=cfg, sort_order=SortOrder.REQUIRED_SERVICES)
-
-
-def _sort_entitlements_visit(
-    cfg: UAConfig,
-    ent_cls: Type[UAEntitlement],
-    sort_order: SortOrder,
-    visited: Dict[str, bool],
-    order: List[str],
-):
-    if ent_cls.name in visited:
-        return
-
-    ent = ent_cls(cfg)
-
-    if sort_order == SortOrder.REQUIRED_SERVICES:
-        cls_list = [e.entitlement for e in ent.required_services]
-    else:
-        cls_list = list(ent.dependent_services)
-
-    for cls_dependency in cls_list:
-        if ent_cls.name not in visited:
-            _sort_entitlements_visit(
-                cfg=cfg,
-                ent_cls=cls_dependency,
-                sort_order=sort_order,
-                visited=visited,
-                order=order,
-            )
-
-    order.append(str(ent_cls.name))
-    visited[str(ent_cls.name)] = True
-
-
-def _sort_entitlements(cfg: UAConfig, sort_order: SortOrder) -> List[str]:
-    order = []  # type: List[str]
-    visited = {}  # type: Dict[str, bool]
-
-    for ent_cls in ENTITLEMENT_CLASSES:
-        _sort_entitlements_visit(
-            cfg=cfg,
-            ent_cls=ent_cls,
-            sort_order=sort_order,
-            visited=visited,
-            order=order,
-        )
-
-    return order
+    return list(get_entitlement_dependencies(cfg).enable_order)
 
 
 def get_valid_entitlement_names(names: List[str], cfg: UAConfig):
@@ -201,9 +378,10 @@ def get_valid_entitlement_names(names: List[str], cfg: UAConfig):
     :return: a tuple of List containing the valid and invalid entitlements
     """
     entitlements_found = []
+    all_names = valid_services(cfg=cfg, all_names=True)
 
     for ent_name in names:
-        if ent_name in valid_services(cfg=cfg, all_names=True):
+        if ent_name in all_names:
             entitlements_found.append(ent_name)
 
     entitlements_not_found = sorted(set(names) - set(entitlements_found))
@@ -283,6 +461,6 @@ def check_entitlement_apt_directives_are_unique(
 
 def get_title(cfg: UAConfig, ent_name: str, variant=""):
     try:
-        return entitlement_factory(cfg, ent_name, variant=variant).title
+        return get_entitlement(cfg, ent_name, variant=variant).title
     except exceptions.UbuntuProError:
         return ent_name
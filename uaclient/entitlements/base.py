@@ -202,6 +202,11 @@ class UAEntitlement(metaclass=abc.ABCMeta):
         return valid_variants
 
     def _get_valid_variants(self) -> Dict[str, Type["UAEntitlement"]]:
+        return self._get_token_data(
+            "valid_variants", self._compute_valid_variants
+        )
+
+    def _compute_valid_variants(self) -> Dict[str, Type["UAEntitlement"]]:
         service_variants = self._get_variants()
         contract_variants = self._get_contract_variants()
 
@@ -310,19 +315,42 @@ class UAEntitlement(metaclass=abc.ABCMeta):
             self.extra_args = []
         self._called_name = called_name
         self._is_sources_list_updated = False
+        self._token_data = {}  # type: Dict[str, Tuple[int, Any]]
+
+    def _get_token_data(self, key: str, compute):
+        """Return the data derived from the machine token under key.
+
+        The data is computed on first use, and again only once the machine
+        token has been written or deleted since.
+        """
+        generation = self.machine_token_file.generation
+        cached = self._token_data.get(key)
+        if cached is None or cached[0] != generation:
+            cached = (generation, compute())
+            self._token_data[key] = cached
+        return cached[1]
 
     def _base_entitlement_cfg(self):
-        return copy.deepcopy(
-            self.machine_token_file.entitlements().get(self.name, {})
+        return self._get_token_data(
+            "base_entitlement_cfg",
+            lambda: copy.deepcopy(
+                self.machine_token_file.entitlements().get(self.name, {})
+            ),
         )
 
     @property
     def entitlement_cfg(self):
+        return self._get_token_data(
+            "entitlement_cfg", self._compute_entitlement_cfg
+        )
+
+    def _compute_entitlement_cfg(self):
         entitlement_cfg = self._base_entitlement_cfg()
 
         if not self.is_variant or not entitlement_cfg:
             return entitlement_cfg
 
+        entitlement_cfg = copy.deepcopy(entitlement_cfg)
         contract.apply_contract_overrides(
             orig_access=entitlement_cfg, variant=self.variant_name
         )
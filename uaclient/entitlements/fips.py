@@ -597,6 +597,7 @@ class FIPSCommonEntitlement(repo.RepoEntitlement):
         holds = apt.run_apt_command(
             cmd,
             messages.EXECUTING_COMMAND_FAILED.format(command=" ".join(cmd)),
+            cache=True,
         )
         unholds = []
         for hold in holds.splitlines():
@@ -36,7 +36,11 @@ class LandscapeEntitlement(UAEntitlement):
             )
         )
         try:
-            system.subp(cmd, pipe_stdouterr=not progress.is_interactive())
+            system.subp(
+                cmd,
+                pipe_stdouterr=not progress.is_interactive(),
+                mutating=True,
+            )
         except exceptions.ProcessExecutionError as e:
             LOG.exception(e)
             if not progress.is_interactive():
@@ -53,7 +57,7 @@ class LandscapeEntitlement(UAEntitlement):
             messages.EXECUTING_COMMAND.format(command=" ".join(cmd))
         )
         try:
-            system.subp(cmd)
+            system.subp(cmd, mutating=True)
         except exceptions.ProcessExecutionError as e:
             LOG.error(e)
             progress.emit("info", str(e).strip())
@@ -200,7 +200,9 @@ class LivepatchEntitlement(UAEntitlement):
                 LOG.info("Disabling livepatch before re-enabling")
                 progress.emit("info", messages.LIVEPATCH_DISABLE_REATTACH)
                 try:
-                    system.subp([livepatch.LIVEPATCH_CMD, "disable"])
+                    system.subp(
+                        [livepatch.LIVEPATCH_CMD, "disable"], mutating=True
+                    )
                 except exceptions.ProcessExecutionError as e:
                     LOG.error(str(e), exc_info=e)
                     return False
@@ -208,6 +210,7 @@ class LivepatchEntitlement(UAEntitlement):
                 system.subp(
                     [livepatch.LIVEPATCH_CMD, "enable", livepatch_token],
                     capture=True,
+                    mutating=True,
                 )
             except exceptions.ProcessExecutionError as e:
                 msg = messages.LIVEPATCH_UNABLE_TO_ENABLE
@@ -232,7 +235,7 @@ class LivepatchEntitlement(UAEntitlement):
         progress.progress(
             messages.EXECUTING_COMMAND.format(command=" ".join(cmd))
         )
-        system.subp(cmd, capture=True)
+        system.subp(cmd, capture=True, mutating=True)
         return True
 
     def application_status(
@@ -387,6 +390,7 @@ def process_config_directives(cfg):
                 "ca-certs={}".format(ca_certs),
             ],
             capture=True,
+            mutating=True,
         )
     remote_server = directives.get("remoteServer", "")
     if remote_server.endswith("/"):
@@ -399,4 +403,5 @@ def process_config_directives(cfg):
                 "remote-server={}".format(remote_server),
             ],
             capture=True,
+            mutating=True,
         )
@@ -1219,6 +1219,33 @@ class TestEntitlementCfg:
 
         assert expected_entitlement == entitlement.entitlement_cfg
 
+    def test_entitlement_cfg_is_computed_once_per_machine_token(
+        self, base_entitlement_factory
+    ):
+        entitlement = base_entitlement_factory(suites=["xenial"])
+        machine_token_file = entitlement.machine_token_file
+
+        with mock.patch.object(
+            machine_token_file,
+            "entitlements",
+            wraps=machine_token_file.entitlements,
+        ) as m_entitlements:
+            entitlement_cfg = entitlement.entitlement_cfg
+            assert entitlement_cfg is entitlement.entitlement_cfg
+            assert {} == entitlement.variants
+            assert 1 == m_entitlements.call_count
+
+            token = copy.deepcopy(machine_token_file.token)
+            token["machineTokenInfo"]["contractInfo"]["resourceEntitlements"][
+                0
+            ]["directives"]["suites"] = ["bionic"]
+            machine_token_file.write(token)
+
+            assert ["bionic"] == entitlement.entitlement_cfg["entitlement"][
+                "directives"
+            ]["suites"]
+            assert 2 == m_entitlements.call_count
+
 
 class TestVariant:
     @pytest.mark.parametrize(
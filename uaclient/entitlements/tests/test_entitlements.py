@@ -1,5 +1,8 @@
 """Tests related to uaclient.entitlement.__init__ module."""
 
+import gc
+import weakref
+
 import mock
 import pytest
 
@@ -84,6 +87,50 @@ class TestEntitlementFactory:
         )
 
 
+class TestEntitlementRegistry:
+    def test_shared_instances(self, FakeConfig):
+        cfg = FakeConfig()
+
+        esm_apps = entitlements.get_entitlement(cfg, "esm-apps")
+        assert esm_apps is entitlements.get_entitlement(cfg, "esm-apps")
+        assert esm_apps is not entitlements.get_entitlement(
+            FakeConfig(), "esm-apps"
+        )
+        # Instances used for operations are never shared
+        assert esm_apps is not entitlements.entitlement_factory(
+            cfg, "esm-apps"
+        )
+        assert esm_apps is not entitlements.entitlement_factory(
+            cfg, "esm-apps"
+        )
+        with pytest.raises(exceptions.EntitlementNotFoundError):
+            entitlements.get_entitlement(cfg, "nonexistent")
+
+    def test_machine_token_changes_invalidate_instances(
+        self, FakeConfig, fake_machine_token_file
+    ):
+        cfg = FakeConfig()
+        livepatch = entitlements.get_entitlement(cfg, "livepatch")
+        with pytest.raises(exceptions.EntitlementNotFoundError):
+            entitlements.get_entitlement(cfg, "kernel-livepatch")
+
+        fake_machine_token_file.attached = True
+        token = fake_machine_token_file.read()
+        token["machineTokenInfo"]["contractInfo"]["resourceEntitlements"] = [
+            {
+                "type": "livepatch",
+                "entitled": True,
+                "affordances": {"presentedAs": "kernel-livepatch"},
+            }
+        ]
+        fake_machine_token_file.write(token)
+
+        presented = entitlements.get_entitlement(cfg, "kernel-livepatch")
+        assert "livepatch" == presented.name
+        assert "kernel-livepatch" == presented.presentation_name
+        assert livepatch is not entitlements.get_entitlement(cfg, "livepatch")
+
+
 class TestSortEntitlements:
     def test_disable_order(self, FakeConfig):
         m_cls_1 = mock.MagicMock()
@@ -289,6 +336,53 @@ class TestSortEntitlements:
                 ents=["ent4", "notthere", "ent2", "ent6typo", "ent5"],
             )
 
+    def test_dependencies_are_computed_once(self, FakeConfig):
+        m_cls_1 = mock.MagicMock()
+        type(m_cls_1).name = mock.PropertyMock(return_value="ent1")
+        m_cls_2 = mock.MagicMock()
+        type(m_cls_2).name = mock.PropertyMock(return_value="ent2")
+        type(m_cls_2.return_value).required_services = mock.PropertyMock(
+            return_value=(mock.MagicMock(entitlement=m_cls_1),)
+        )
+        type(m_cls_1.return_value).dependent_services = mock.PropertyMock(
+            return_value=(m_cls_2,)
+        )
+
+        with mock.patch.object(
+            entitlements, "ENTITLEMENT_CLASSES", [m_cls_2, m_cls_1]
+        ):
+            for _ in range(3):
+                assert [
+                    "ent1",
+                    "ent2",
+                ] == entitlements.entitlements_enable_order(cfg=FakeConfig())
+                assert [
+                    "ent2",
+                    "ent1",
+                ] == entitlements.entitlements_disable_order(FakeConfig())
+                assert [
+                    "ent1",
+                    "ent2",
+                ] == entitlements.order_entitlements_for_enabling(
+                    cfg=FakeConfig(), ents=["ent2", "ent1"]
+                )
+
+        assert 1 == m_cls_1.call_count
+        assert 1 == m_cls_2.call_count
+
+    def test_dependencies_do_not_keep_the_config(self, FakeConfig):
+        cfg = FakeConfig()
+        cfg_ref = weakref.ref(cfg)
+
+        ent_dependencies = entitlements.EntitlementDependencies(
+            cfg, entitlements.ENTITLEMENT_CLASSES
+        )
+        del cfg
+        gc.collect()
+
+        assert cfg_ref() is None
+        assert "ros-updates" == ent_dependencies.enable_order[-1]
+
 
 class TestCheckEntitlementAPTDefinitionsAreUnique:
     @pytest.mark.parametrize(
@@ -666,6 +666,8 @@ class TestFIPSEntitlementRemovePackages:
             capture=True,
             retry_sleeps=apt.APT_RETRIES,
             override_env_vars={"DEBIAN_FRONTEND": "noninteractive"},
+            cache=False,
+            mutating=True,
         )
         if "ubuntu-fips" in installed_pkgs:
             assert [remove_cmd] == m_subp.call_args_list
@@ -1337,6 +1339,7 @@ class TestFipsSetupAPTConfig:
                 messages.EXECUTING_COMMAND_FAILED.format(
                     command="apt-mark showholds"
                 ),
+                cache=True,
             )
         ]
         if unhold_packages:
@@ -20,7 +20,13 @@ class TestLandscapeEntitlement:
                 False,
                 None,
                 None,
-                [mock.call(["landscape-config"], pipe_stdouterr=False)],
+                [
+                    mock.call(
+                        ["landscape-config"],
+                        pipe_stdouterr=False,
+                        mutating=True,
+                    )
+                ],
                 True,
             ),
             (
@@ -29,7 +35,9 @@ class TestLandscapeEntitlement:
                 None,
                 [
                     mock.call(
-                        ["landscape-config", "extra"], pipe_stdouterr=False
+                        ["landscape-config", "extra"],
+                        pipe_stdouterr=False,
+                        mutating=True,
                     )
                 ],
                 True,
@@ -40,7 +48,9 @@ class TestLandscapeEntitlement:
                 None,
                 [
                     mock.call(
-                        ["landscape-config", "--silent"], pipe_stdouterr=True
+                        ["landscape-config", "--silent"],
+                        pipe_stdouterr=True,
+                        mutating=True,
                     )
                 ],
                 True,
@@ -53,6 +63,7 @@ class TestLandscapeEntitlement:
                     mock.call(
                         ["landscape-config", "extra", "--silent"],
                         pipe_stdouterr=True,
+                        mutating=True,
                     )
                 ],
                 True,
@@ -65,6 +76,7 @@ class TestLandscapeEntitlement:
                     mock.call(
                         ["landscape-config", "--silent", "extra"],
                         pipe_stdouterr=True,
+                        mutating=True,
                     )
                 ],
                 True,
@@ -73,7 +85,13 @@ class TestLandscapeEntitlement:
                 False,
                 None,
                 exceptions.ProcessExecutionError("test"),
-                [mock.call(["landscape-config"], pipe_stdouterr=False)],
+                [
+                    mock.call(
+                        ["landscape-config"],
+                        pipe_stdouterr=False,
+                        mutating=True,
+                    )
+                ],
                 False,
             ),
         ],
@@ -105,12 +123,12 @@ class TestLandscapeEntitlement:
         [
             (
                 None,
-                [mock.call(["landscape-config", "--disable"])],
+                [mock.call(["landscape-config", "--disable"], mutating=True)],
                 True,
             ),
             (
                 exceptions.ProcessExecutionError("test"),
-                [mock.call(["landscape-config", "--disable"])],
+                [mock.call(["landscape-config", "--disable"], mutating=True)],
                 True,
             ),
         ],
@@ -112,6 +112,7 @@ class TestLivepatchProcessConfigDirectives:
                 livepatch_param_tmpl.format(directive_value),
             ],
             capture=True,
+            mutating=True,
         )
         assert [expected_subp] == m_subp.call_args_list
 
@@ -132,10 +133,12 @@ class TestLivepatchProcessConfigDirectives:
             mock.call(
                 [livepatch.LIVEPATCH_CMD, "config", "ca-certs=value2"],
                 capture=True,
+                mutating=True,
             ),
             mock.call(
                 [livepatch.LIVEPATCH_CMD, "config", "remote-server=value1"],
                 capture=True,
+                mutating=True,
             ),
         ]
         assert expected_calls == m_subp.call_args_list
@@ -315,6 +318,7 @@ class TestLivepatchEntitlementEnable:
         mock.call(
             ["apt-get", "install", "--assume-yes", "snapd"],
             retry_sleeps=apt.APT_RETRIES,
+            mutating=True,
         )
     ]
     mocks_snapd_install_as_a_snap = [
@@ -322,6 +326,7 @@ class TestLivepatchEntitlementEnable:
             ["/usr/bin/snap", "install", "snapd"],
             capture=True,
             retry_sleeps=[0.5, 1, 5],
+            mutating=True,
         )
     ]
     mocks_snap_wait_seed = [
@@ -333,6 +338,7 @@ class TestLivepatchEntitlementEnable:
         mock.call(
             ["/usr/bin/snap", "refresh", "snapd"],
             capture=True,
+            mutating=True,
         )
     ]
     mocks_livepatch_install = [
@@ -340,6 +346,7 @@ class TestLivepatchEntitlementEnable:
             ["/usr/bin/snap", "install", "canonical-livepatch"],
             capture=True,
             retry_sleeps=[0.5, 1, 5],
+            mutating=True,
         )
     ]
     mocks_install = (
@@ -357,11 +364,13 @@ class TestLivepatchEntitlementEnable:
                 "remote-server=https://alt.livepatch.com",
             ],
             capture=True,
+            mutating=True,
         ),
-        mock.call([livepatch.LIVEPATCH_CMD, "disable"]),
+        mock.call([livepatch.LIVEPATCH_CMD, "disable"], mutating=True),
         mock.call(
             [livepatch.LIVEPATCH_CMD, "enable", "livepatch-token"],
             capture=True,
+            mutating=True,
         ),
     ]
 
@@ -614,7 +623,9 @@ class TestLivepatchEntitlementEnable:
             mock.call(
                 [SNAP_CMD, "wait", "system", "seed.loaded"], capture=True
             ),
-            mock.call([SNAP_CMD, "refresh", "snapd"], capture=True),
+            mock.call(
+                [SNAP_CMD, "refresh", "snapd"], capture=True, mutating=True
+            ),
             mock.call(
                 [
                     livepatch.LIVEPATCH_CMD,
@@ -622,11 +633,13 @@ class TestLivepatchEntitlementEnable:
                     "remote-server=https://alt.livepatch.com",
                 ],
                 capture=True,
+                mutating=True,
             ),
-            mock.call([livepatch.LIVEPATCH_CMD, "disable"]),
+            mock.call([livepatch.LIVEPATCH_CMD, "disable"], mutating=True),
             mock.call(
                 [livepatch.LIVEPATCH_CMD, "enable", "livepatch-token"],
                 capture=True,
+                mutating=True,
             ),
         ]
         assert subp_calls == m_subp.call_args_list
@@ -676,7 +689,9 @@ class TestLivepatchEntitlementEnable:
             mock.call(
                 [SNAP_CMD, "wait", "system", "seed.loaded"], capture=True
             ),
-            mock.call([SNAP_CMD, "refresh", "snapd"], capture=True),
+            mock.call(
+                [SNAP_CMD, "refresh", "snapd"], capture=True, mutating=True
+            ),
             mock.call(
                 [
                     livepatch.LIVEPATCH_CMD,
@@ -684,10 +699,12 @@ class TestLivepatchEntitlementEnable:
                     "remote-server=https://alt.livepatch.com",
                 ],
                 capture=True,
+                mutating=True,
             ),
             mock.call(
                 [livepatch.LIVEPATCH_CMD, "enable", "livepatch-token"],
                 capture=True,
+                mutating=True,
             ),
         ]
         assert subp_no_livepatch_disable == m_subp.call_args_list
@@ -415,6 +415,8 @@ class TestRepoEnable:
                         capture=True,
                         retry_sleeps=apt.APT_RETRIES,
                         override_env_vars=None,
+                        cache=False,
+                        mutating=True,
                     )
                 )
                 expected_emit_calls = [
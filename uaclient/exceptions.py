@@ -616,6 +616,10 @@ class CLIAPIOptionsXORData(UbuntuProError):
     _msg = messages.E_API_ERROR_ARGS_AND_DATA_TOGETHER
 
 
+class CLIAPIStreamXOROutput(UbuntuProError):
+    _msg = messages.E_API_ERROR_STREAM_AND_OUTPUT_TOGETHER
+
+
 class PromptDeniedError(UbuntuProError):
     _msg = messages.E_PROMPT_DENIED
 
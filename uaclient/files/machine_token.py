@@ -1,4 +1,6 @@
+import hashlib
 import json
+import os
 from datetime import datetime
 from typing import Any, Dict, Optional
 
@@ -20,13 +22,28 @@ class MachineTokenFile:
             file_name, directory + "/" + defaults.PRIVATE_SUBDIR
         )
         self.public_file = UAFile(file_name, directory, False)
+        self.hashes_file = UAFile(
+            defaults.MACHINE_TOKEN_HASHES_FILE,
+            directory + "/" + defaults.PRIVATE_SUBDIR,
+        )
+        self.validators_file = UAFile(
+            defaults.MACHINE_TOKEN_VALIDATORS_FILE,
+            directory + "/" + defaults.PRIVATE_SUBDIR,
+        )
         self.machine_token_overlay_path = machine_token_overlay_path
         self._machine_token = None  # type: Optional[Dict[str, Any]]
         self._entitlements = None
         self._contract_expiry_datetime = None
+        # Incremented every time the token is written or deleted, so that
+        # data derived from the token can tell when it is outdated
+        self.generation = 0
 
     def write(self, private_content: dict):
-        """Update the machine_token file for both pub/private files"""
+        """Update the machine_token file for both pub/private files
+
+        The stored response validators are dropped, as they describe
+        responses that may not match the new token anymore.
+        """
         if util.we_are_currently_root():
             private_content_str = json.dumps(
                 private_content, cls=util.DatetimeAwareJSONEncoder
@@ -42,10 +59,17 @@ class MachineTokenFile:
                 public_content, cls=util.DatetimeAwareJSONEncoder
             )
             self.public_file.write(public_content_str)
+            self.hashes_file.write(
+                json.dumps(
+                    self.get_entitlement_hashes_from_token(private_content)
+                )
+            )
+            self.validators_file.delete()
 
             self._machine_token = None
             self._entitlements = None
             self._contract_expiry_datetime = None
+            self.generation += 1
         else:
             raise exceptions.NonRootUserError()
 
@@ -54,10 +78,13 @@ class MachineTokenFile:
         if util.we_are_currently_root():
             self.public_file.delete()
             self.private_file.delete()
+            self.hashes_file.delete()
+            self.validators_file.delete()
 
             self._machine_token = None
             self._entitlements = None
             self._contract_expiry_datetime = None
+            self.generation += 1
         else:
             raise exceptions.NonRootUserError()
 
@@ -175,6 +202,93 @@ class MachineTokenFile:
             entitlements[entitlement_name] = entitlement_cfg
         return entitlements
 
+    def _read_validators(self) -> Dict[str, Dict[str, str]]:
+        try:
+            return json.loads(self.validators_file.read() or "{}")
+        except (OSError, ValueError):
+            return {}
+
+    def get_validators(self, endpoint: str) -> Dict[str, str]:
+        """Return the validators of the last endpoint response whose content
+        is reflected in the token.
+
+        :param endpoint: the contract server endpoint the response came from
+        """
+        return self._read_validators().get(endpoint, {})
+
+    def write_validators(self, endpoint: str, validators: Dict[str, str]):
+        """Store the ETag and Last-Modified headers of an endpoint response
+        whose content is reflected in the token.
+
+        Validators are only meaningful for the endpoint that issued them, so
+        they are stored per endpoint.
+
+        :param endpoint: the contract server endpoint the response came from
+        :param validators: the response validators, or an empty dict to drop
+            the ones stored for endpoint
+        """
+        if not util.we_are_currently_root():
+            raise exceptions.NonRootUserError()
+
+        all_validators = self._read_validators()
+        if validators:
+            all_validators[endpoint] = validators
+        else:
+            all_validators.pop(endpoint, None)
+        self.validators_file.write(json.dumps(all_validators))
+
+    @property
+    def entitlement_hashes(self) -> Dict[str, str]:
+        """Return the content hash of each entitlement, keyed by name.
+
+        Hashes are persisted next to the private token when it is written.
+        They are computed from the token instead if they are missing, or
+        older than the token.
+        """
+        if not self.machine_token:
+            return {}
+        try:
+            if os.path.getmtime(self.hashes_file.path) >= os.path.getmtime(
+                self.private_file.path
+            ):
+                return json.loads(self.hashes_file.read() or "")
+        except (OSError, ValueError):
+            pass
+        return self.get_entitlement_hashes_from_token(self.machine_token)
+
+    @staticmethod
+    def get_entitlement_hashes_from_token(
+        machine_token: Dict[str, Any]
+    ) -> Dict[str, str]:
+        """Return a hash of each resource entitlement, keyed by name.
+
+        The hash covers the entitlement and its resource token as sent by
+        the contract server, before any override is applied. Equal hashes
+        mean that processing the entitlement deltas would be a no-op.
+        """
+        contractInfo = machine_token.get("machineTokenInfo", {}).get(
+            "contractInfo"
+        )
+        if not contractInfo:
+            return {}
+
+        tokens_by_name = dict(
+            (e.get("type"), e.get("token"))
+            for e in machine_token.get("resourceTokens", [])
+        )
+        hashes = {}
+        for ent_value in contractInfo.get("resourceEntitlements", []):
+            entitlement_name = ent_value.get("type")
+            content = json.dumps(
+                [ent_value, tokens_by_name.get(entitlement_name)],
+                sort_keys=True,
+                cls=util.DatetimeAwareJSONEncoder,
+            )
+            hashes[entitlement_name] = hashlib.sha256(
+                content.encode("utf-8")
+            ).hexdigest()
+        return hashes
+
     @property
     def contract_expiry_datetime(self) -> Optional[datetime]:
         """Return a datetime of the attached contract expiration."""
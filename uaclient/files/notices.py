@@ -2,7 +2,7 @@ import logging
 import os
 from collections import namedtuple
 from enum import Enum
-from typing import List
+from typing import Dict, Iterable, List  # noqa: F401
 
 from uaclient import defaults, event_logger, messages, system, util
 
@@ -112,6 +112,24 @@ class Notice(NoticeFileDetails, Enum):
     )
 
 
+def _get_notice_file_name(notice_details: Notice) -> str:
+    return "{}-{}".format(
+        notice_details.value.order_id, notice_details.value.label
+    )
+
+
+# The notices of each directory, by the name of their file. The keys are
+# whether the directory is the permanent one.
+_NOTICES_BY_FILE_NAME = {
+    is_permanent: {
+        _get_notice_file_name(notice): notice
+        for notice in Notice
+        if notice.is_permanent == is_permanent
+    }
+    for is_permanent in (True, False)
+}  # type: Dict[bool, Dict[str, Notice]]
+
+
 class NoticesManager:
     def add(
         self,
@@ -136,9 +154,7 @@ class NoticesManager:
             if notice_details.value.is_permanent
             else defaults.NOTICES_TEMPORARY_DIRECTORY
         )
-        filename = "{}-{}".format(
-            notice_details.value.order_id, notice_details.value.label
-        )
+        filename = _get_notice_file_name(notice_details)
         system.write_file(
             os.path.join(directory, filename),
             description,
@@ -161,22 +177,27 @@ class NoticesManager:
             if notice_details.value.is_permanent
             else defaults.NOTICES_TEMPORARY_DIRECTORY
         )
-        filename = "{}-{}".format(
-            notice_details.value.order_id, notice_details.value.label
-        )
+        filename = _get_notice_file_name(notice_details)
         system.ensure_file_absent(os.path.join(directory, filename))
 
     def _get_notice_file_names(self, directory: str) -> List[str]:
         """Gets the list of notice file names in the given directory.
 
+        The directory is read with a single scandir pass: file types come
+        with the directory entries, so no file is stat'ed.
+
         :param directory: The directory to search for notice files.
         :returns: List of notice file names.
         """
+        try:
+            entries = os.scandir(directory)
+        except FileNotFoundError:
+            return []
         return [
-            file_name
-            for file_name in os.listdir(directory)
-            if os.path.isfile(os.path.join(directory, file_name))
-            and self._is_valid_notice_file(directory, file_name)
+            entry.name
+            for entry in entries
+            if self._is_valid_notice_file(directory, entry.name)
+            and entry.is_file()
         ]
 
     def _is_valid_notice_file(self, directory: str, file_name: str) -> bool:
@@ -186,12 +207,7 @@ class NoticesManager:
         :returns: True if the file is valid, False otherwise.
         """
         is_permanent_dir = directory == defaults.NOTICES_PERMANENT_DIRECTORY
-        valid_file_names = {
-            "{}-{}".format(n.order_id, n.label)
-            for n in Notice
-            if n.is_permanent == is_permanent_dir
-        }
-        return file_name in valid_file_names
+        return file_name in _NOTICES_BY_FILE_NAME[is_permanent_dir]
 
     def _get_default_message(self, file_name: str) -> str:
         """Gets the default message for a notice file.
@@ -199,31 +215,42 @@ class NoticesManager:
         :param file_name: The name of the notice file.
         :returns: The default message defined in the enum.
         """
-        order_id, label = file_name.split("-")
-        for notice in Notice:
-            if notice.order_id == order_id and notice.label == label:
+        for notices_by_file_name in _NOTICES_BY_FILE_NAME.values():
+            notice = notices_by_file_name.get(file_name)
+            if notice is not None:
                 return notice.value.message
         return ""
 
-    def list(self) -> List[str]:
+    def list(self, remove: Iterable[Notice] = ()) -> List[str]:
         """Gets all the notice files currently saved.
 
+        :param remove: Notices to delete before listing. Only the ones
+            found while listing are deleted, so that callers clearing
+            stale notices don't pay for a filesystem operation each.
         :returns: List of notice file contents.
         """
         notice_directories = (
             defaults.NOTICES_PERMANENT_DIRECTORY,
             defaults.NOTICES_TEMPORARY_DIRECTORY,
         )
+        remove_file_names = {_get_notice_file_name(n) for n in remove}
         notices = []
         for notice_directory in notice_directories:
-            if not os.path.exists(notice_directory):
-                continue
             notice_file_names = self._get_notice_file_names(notice_directory)
             for notice_file_name in notice_file_names:
-                try:
-                    notice_file_contents = system.load_file(
-                        os.path.join(notice_directory, notice_file_name)
+                notice_file_path = os.path.join(
+                    notice_directory, notice_file_name
+                )
+                if notice_file_name in remove_file_names:
+                    if util.we_are_currently_root():
+                        system.ensure_file_absent(notice_file_path)
+                        continue
+                    LOG.warning(
+                        "NoticesManager.remove(%s) called as non-root user",
+                        notice_file_name.split("-", 1)[1],
                     )
+                try:
+                    notice_file_contents = system.load_file(notice_file_path)
                 except PermissionError:
                     LOG.warning(
                         "Permission error while reading " + notice_file_name
@@ -262,6 +289,6 @@ def remove(notice_details: Notice) -> None:
     notice.remove(notice_details)
 
 
-def list() -> List[str]:
+def list(remove: Iterable[Notice] = ()) -> List[str]:
     notice = get_notice()
-    return notice.list()
+    return notice.list(remove=remove)
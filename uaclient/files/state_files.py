@@ -7,6 +7,7 @@ from uaclient.data_types import (
     DataObject,
     DatetimeDataValue,
     Field,
+    FloatDataValue,
     IntDataValue,
     StringDataValue,
     data_list,
@@ -133,6 +134,37 @@ timer_jobs_state_file = DataObjectFile(
 )
 
 
+class UpdateMessagingInputs(DataObject):
+    fields = [
+        Field("machine_token_mtime", FloatDataValue, required=False),
+        Field("dpkg_status_mtime", FloatDataValue, required=False),
+        Field("apt_cache_mtime", FloatDataValue, required=False),
+        Field("contract_status", StringDataValue, required=False),
+        Field("contract_remaining_days", IntDataValue, required=False),
+    ]
+
+    def __init__(
+        self,
+        machine_token_mtime: Optional[float] = None,
+        dpkg_status_mtime: Optional[float] = None,
+        apt_cache_mtime: Optional[float] = None,
+        contract_status: Optional[str] = None,
+        contract_remaining_days: Optional[int] = None,
+    ):
+        self.machine_token_mtime = machine_token_mtime
+        self.dpkg_status_mtime = dpkg_status_mtime
+        self.apt_cache_mtime = apt_cache_mtime
+        self.contract_status = contract_status
+        self.contract_remaining_days = contract_remaining_days
+
+
+update_messaging_inputs_file = DataObjectFile(
+    UpdateMessagingInputs,
+    UAFile("update-messaging-inputs.json", private=False),
+    DataObjectFileFormat.JSON,
+)
+
+
 apt_news_contents_file = UAFile("apt-news", directory=defaults.MESSAGES_DIR)
 apt_news_raw_file = UAFile(
     "apt-news-raw", private=False, directory=defaults.MESSAGES_DIR
@@ -231,6 +263,78 @@ status_cache_file = ProJSONFile(
     )
 )
 
+
+class StatusSnapshotInputs(DataObject):
+    fields = [
+        Field("machine_token_mtime", FloatDataValue, required=False),
+        Field("dpkg_status_mtime", FloatDataValue, required=False),
+        Field("permanent_notices_mtime", FloatDataValue, required=False),
+        Field("temporary_notices_mtime", FloatDataValue, required=False),
+        Field("config_path", StringDataValue, required=False),
+        Field("config_mtime", FloatDataValue, required=False),
+        Field("user_config_mtime", FloatDataValue, required=False),
+        Field("locale", StringDataValue, required=False),
+    ]
+
+    def __init__(
+        self,
+        machine_token_mtime: Optional[float] = None,
+        dpkg_status_mtime: Optional[float] = None,
+        permanent_notices_mtime: Optional[float] = None,
+        temporary_notices_mtime: Optional[float] = None,
+        config_path: Optional[str] = None,
+        config_mtime: Optional[float] = None,
+        user_config_mtime: Optional[float] = None,
+        locale: Optional[str] = None,
+    ):
+        self.machine_token_mtime = machine_token_mtime
+        self.dpkg_status_mtime = dpkg_status_mtime
+        self.permanent_notices_mtime = permanent_notices_mtime
+        self.temporary_notices_mtime = temporary_notices_mtime
+        self.config_path = config_path
+        self.config_mtime = config_mtime
+        self.user_config_mtime = user_config_mtime
+        self.locale = locale
+
+
+# Contains a versioned status snapshot: the status dict, the status rendered
+# as tabular text and the StatusSnapshotInputs it was computed from
+status_snapshot_file = ProJSONFile(
+    pro_file=UAFile(
+        name="status-snapshot.json",
+        private=False,
+    )
+)
+
+# Cloud identity values that don't change during a boot: the cloud type,
+# the instance id and the instance identity document, along with the boot id
+# they were read on. It lives under /run, so it doesn't outlive the boot.
+cloud_identity_cache_file = ProJSONFile(
+    pro_file=UAFile(
+        name="cloud-identity.json",
+        directory=defaults.UAC_RUN_PATH,
+        private=False,
+    )
+)
+
+# The unattended-upgrades APT configuration and whether the package is
+# installed, along with the mtimes of the files they were read from
+unattended_upgrades_snapshot_file = ProJSONFile(
+    pro_file=UAFile(
+        name="unattended-upgrades-snapshot.json",
+        private=False,
+    )
+)
+
+# The results of security-status that only depend on the apt state and the
+# machine token, along with the mtimes of the files they were computed from
+security_status_cache_file = ProJSONFile(
+    pro_file=UAFile(
+        name="security-status-cache.json",
+        private=False,
+    )
+)
+
 machine_id_file = UAFile(
     "machine-id",
     defaults.DEFAULT_PRIVATE_DATA_DIR,
@@ -266,4 +370,6 @@ def delete_state_files():
     reboot_cmd_marker_file.delete()
     only_series_check_marker_file.delete()
     status_cache_file.delete()
+    status_snapshot_file.delete()
     lxd_pro_config_file.delete()
+    update_messaging_inputs_file.delete()
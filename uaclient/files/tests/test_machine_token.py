@@ -207,3 +207,81 @@ class TestEntitlements:
             },
         }
         assert expected == machine_token_file.entitlements()
+
+
+class TestEntitlementHashes:
+    TOKEN = {
+        "machineTokenInfo": {
+            "contractInfo": {
+                "resourceEntitlements": [
+                    {"type": "entitlement1", "entitled": True},
+                    {"type": "entitlement2", "entitled": True},
+                ]
+            }
+        },
+        "resourceTokens": [{"type": "entitlement1", "token": "ent1-token"}],
+    }
+
+    def test_hashes_change_only_for_changed_entitlements(self):
+        orig_hashes = MachineTokenFile.get_entitlement_hashes_from_token(
+            self.TOKEN
+        )
+        new_token = copy.deepcopy(self.TOKEN)
+        new_token["resourceTokens"][0]["token"] = "new-ent1-token"
+        new_hashes = MachineTokenFile.get_entitlement_hashes_from_token(
+            new_token
+        )
+
+        assert ["entitlement1", "entitlement2"] == sorted(new_hashes)
+        assert orig_hashes["entitlement1"] != new_hashes["entitlement1"]
+        assert orig_hashes["entitlement2"] == new_hashes["entitlement2"]
+
+    @mock.patch("uaclient.util.we_are_currently_root", return_value=True)
+    def test_hashes_are_persisted_next_to_the_private_file(
+        self, _m_root, tmpdir
+    ):
+        machine_token_file = MachineTokenFile(directory=tmpdir.strpath)
+        machine_token_file.write(self.TOKEN)
+
+        expected = MachineTokenFile.get_entitlement_hashes_from_token(
+            self.TOKEN
+        )
+        assert machine_token_file.hashes_file.is_private
+        assert expected == json.loads(machine_token_file.hashes_file.read())
+        assert self.TOKEN == machine_token_file.machine_token
+        with mock.patch.object(
+            MachineTokenFile, "get_entitlement_hashes_from_token"
+        ) as m_get_hashes:
+            assert expected == machine_token_file.entitlement_hashes
+        assert 0 == m_get_hashes.call_count
+
+        machine_token_file.delete()
+        assert not machine_token_file.hashes_file.is_present
+
+
+class TestValidators:
+    @mock.patch("uaclient.util.we_are_currently_root", return_value=True)
+    def test_validators_are_stored_per_endpoint(self, _m_root, tmpdir):
+        machine_token_file = MachineTokenFile(directory=tmpdir.strpath)
+
+        machine_token_file.write_validators("get", {"etag": '"v1"'})
+        machine_token_file.write_validators("other", {"etag": '"v2"'})
+
+        assert {"etag": '"v1"'} == machine_token_file.get_validators("get")
+        assert {"etag": '"v2"'} == machine_token_file.get_validators("other")
+        assert {} == machine_token_file.get_validators("update")
+
+        machine_token_file.write_validators("other", {})
+        assert {} == machine_token_file.get_validators("other")
+        assert {"etag": '"v1"'} == machine_token_file.get_validators("get")
+
+    @mock.patch("uaclient.util.we_are_currently_root", return_value=True)
+    def test_validators_are_dropped_when_token_is_written(
+        self, _m_root, tmpdir
+    ):
+        machine_token_file = MachineTokenFile(directory=tmpdir.strpath)
+        machine_token_file.write_validators("get", {"etag": '"v1"'})
+
+        machine_token_file.write({"machineToken": "token"})
+
+        assert {} == machine_token_file.get_validators("get")
@@ -6,7 +6,7 @@ import pytest
 from uaclient import defaults
 from uaclient.conftest import FakeNotice
 from uaclient.files import notices
-from uaclient.files.notices import NoticesManager
+from uaclient.files.notices import Notice, NoticesManager
 
 
 class TestNotices:
@@ -160,3 +160,50 @@ class TestNotices:
         m_load_file.return_value = "test"
 
         assert ["test"] == notice.list()
+
+    def test_list_ignores_unknown_files_and_directories(self):
+        notice = NoticesManager()
+        notice.add(Notice.REBOOT_SCRIPT_FAILED, "")
+        permanent_dir = defaults.NOTICES_PERMANENT_DIRECTORY
+        with open(os.path.join(permanent_dir, "99-unknown"), "w") as f:
+            f.write("unknown")
+        # A temporary notice file in the permanent directory isn't valid
+        with open(os.path.join(permanent_dir, "10-reboot_required"), "w") as f:
+            f.write("misplaced")
+        os.mkdir(os.path.join(permanent_dir, "5-contract_expired"))
+
+        assert [Notice.REBOOT_SCRIPT_FAILED.message] == notice.list()
+
+    @mock.patch("uaclient.files.notices.system.ensure_file_absent")
+    def test_list_removes_only_present_notices(self, m_ensure_file_absent):
+        notice = NoticesManager()
+        notice.add(Notice.REBOOT_REQUIRED, "reboot")
+        notice.add(Notice.CONTRACT_EXPIRED, "expired")
+
+        assert ["reboot"] == notice.list(
+            remove=[
+                Notice.CONTRACT_EXPIRED,
+                Notice.AUTO_ATTACH_RETRY_TOTAL_FAILURE,
+            ]
+        )
+        assert [
+            mock.call(
+                os.path.join(
+                    defaults.NOTICES_PERMANENT_DIRECTORY, "5-contract_expired"
+                )
+            )
+        ] == m_ensure_file_absent.call_args_list
+
+    def test_list_keeps_notices_to_remove_as_non_root(self, caplog_text):
+        notice = NoticesManager()
+        notice.add(Notice.CONTRACT_EXPIRED, "expired")
+
+        with mock.patch(
+            "uaclient.util.we_are_currently_root", return_value=False
+        ):
+            assert ["expired"] == notice.list(remove=[Notice.CONTRACT_EXPIRED])
+        assert ["expired"] == notice.list()
+        assert (
+            "NoticesManager.remove(contract_expired) called as non-root user"
+            in caplog_text()
+        )
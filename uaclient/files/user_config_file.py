@@ -120,6 +120,10 @@ class UserConfigFileObject:
             optional_type_errors_become_null=True,
         )
 
+    @property
+    def public_path(self) -> str:
+        return self._public.path
+
     @property
     def public_config(self) -> UserConfigData:
         public_config = self._public.read()
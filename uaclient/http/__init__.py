@@ -10,7 +10,7 @@ from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 from urllib import error, request
 from urllib.parse import ParseResult, urlparse
 
-from uaclient import defaults, exceptions, system, util
+from uaclient import defaults, exceptions, profiling, system, util
 
 UA_NO_PROXY_URLS = ("169.254.169.254", "metadata", "[fd00:ec2::254]")
 PROXY_VALIDATION_APT_HTTP_URL = "http://archive.ubuntu.com"
@@ -399,6 +399,7 @@ def download_xz_file_from_url(
                 raise
 
 
+@profiling.profiled("http.readurl")
 def readurl(
     url: str,
     data: Optional[bytes] = None,
@@ -128,7 +128,8 @@ def status() -> Optional[LivepatchStatusStatus]:
 
     try:
         out, _ = system.subp(
-            [LIVEPATCH_CMD, "status", "--verbose", "--format", "json"]
+            [LIVEPATCH_CMD, "status", "--verbose", "--format", "json"],
+            cache=True,
         )
     except exceptions.ProcessExecutionError as e:
         # only raise an error if there is a legitimate problem, not just lack
@@ -388,6 +389,7 @@ def unconfigure_livepatch_proxy(
     system.subp(
         [LIVEPATCH_CMD, "config", "{}-proxy=".format(protocol_type)],
         retry_sleeps=retry_sleeps,
+        mutating=True,
     )
 
 
@@ -419,12 +421,14 @@ def configure_livepatch_proxy(
         system.subp(
             [LIVEPATCH_CMD, "config", "http-proxy={}".format(http_proxy)],
             retry_sleeps=retry_sleeps,
+            mutating=True,
         )
 
     if https_proxy:
         system.subp(
             [LIVEPATCH_CMD, "config", "https-proxy={}".format(https_proxy)],
             retry_sleeps=retry_sleeps,
+            mutating=True,
         )
 
 
@@ -434,7 +438,7 @@ def get_config_option_value(key: str) -> Optional[str]:
     :param key: can be any valid livepatch config option
     :return: the value of the livepatch config option, or None if not set
     """
-    out, _ = system.subp([LIVEPATCH_CMD, "config"])
+    out, _ = system.subp([LIVEPATCH_CMD, "config"], cache=True)
     match = re.search("^{}: (.*)$".format(key), out, re.MULTILINE)
     value = match.group(1) if match else None
     if value:
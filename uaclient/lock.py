@@ -54,7 +54,7 @@ def check_lock_info() -> Tuple[int, str]:
     lock_holder = lock_data_obj.lock_holder
 
     try:
-        system.subp(["ps", lock_pid])
+        system.subp(["ps", lock_pid], cache=True)
         return (int(lock_pid), lock_holder)
     except exceptions.ProcessExecutionError:
         if not util.we_are_currently_root():
@@ -141,6 +141,8 @@ class RetryLock:
                     raise e
                 else:
                     time.sleep(self.sleep_time)
+                    # The lock holder may have exited while we slept
+                    system.invalidate_subp_cache()
 
     def __exit__(self, _exc_type, _exc_value, _traceback):
         lock_data_file.delete()
@@ -919,6 +919,16 @@ CLI_API_ARGS = t.gettext(
     "Options to pass to the API endpoint, formatted as key=value"
 )
 CLI_API_DATA = t.gettext("arguments in JSON format to the API endpoint")
+CLI_API_STREAM = t.gettext(
+    "For endpoints that support streaming, print each record on a new line "
+    "in JSON format as soon as it is available, followed by a final line "
+    "with the result of the call"
+)
+CLI_API_OUTPUT = t.gettext(
+    "For endpoints that support it, write the raw result to OUTPUT instead "
+    "of printing it in JSON format. Use - to write it to stdout"
+)
+CLI_API_COMPRESS = t.gettext("gzip-compress the result written to --output")
 
 CLI_AUTO_ATTACH_DESC = t.gettext(
     "Automatically attach on an Ubuntu Pro cloud instance."
@@ -1170,6 +1180,7 @@ CLI_STATUS_SIMULATE_WITH_TOKEN = t.gettext(
 CLI_STATUS_ALL = t.gettext("Include unavailable and beta services")
 
 CLI_ROOT_DEBUG = t.gettext("show all debug log messages to console")
+CLI_ROOT_PROFILE = t.gettext("write a trace of where time is spent to FILE")
 CLI_ROOT_VERSION = t.gettext("show version of {name}")
 CLI_ROOT_ATTACH = t.gettext(
     "attach this machine to an Ubuntu Pro subscription"
@@ -2699,6 +2710,11 @@ E_API_ERROR_ARGS_AND_DATA_TOGETHER = NamedMessage(
     t.gettext("Cannot provide both --args and --data at the same time"),
 )
 
+E_API_ERROR_STREAM_AND_OUTPUT_TOGETHER = NamedMessage(
+    "api-error-stream-and-output-together",
+    t.gettext("Cannot provide both --stream and --output at the same time"),
+)
+
 E_PROMPT_DENIED = NamedMessage(
     "prompt-denied",
     t.gettext("Operation cancelled by user"),
@@ -2750,6 +2766,16 @@ E_API_NO_ARG_FOR_ENDPOINT = FormattedNamedMessage(
     msg=t.gettext("{endpoint} accepts no arguments"),
 )
 
+E_API_STREAM_NOT_SUPPORTED = FormattedNamedMessage(
+    name="api-stream-not-supported",
+    msg=t.gettext("{endpoint} does not support streaming output"),
+)
+
+E_API_WRITE_NOT_SUPPORTED = FormattedNamedMessage(
+    name="api-write-not-supported",
+    msg=t.gettext("{endpoint} does not support writing to an output file"),
+)
+
 E_API_JSON_DATA_FORMAT_ERROR = FormattedNamedMessage(
     "api-json-data-format-error",
     t.gettext("Error parsing API json data parameter:\n{data}"),
@@ -0,0 +1,117 @@
+"""
+Named timing spans around the hot paths of the Pro Client.
+
+Spans are only recorded while a Profile is active, for example when running
+the CLI with --profile. Otherwise span() returns a shared no-op context
+manager, so instrumented code pays close to nothing.
+"""
+
+import os
+import threading
+import time
+from functools import wraps
+from typing import Any, Dict, List, Optional  # noqa: F401
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    def __init__(self, profile: "Profile", name: str, args: Dict[str, Any]):
+        self.profile = profile
+        self.name = name
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.profile.add_event(self.name, self.start, end, self.args)
+        return False
+
+
+class Profile:
+    """Collect the spans run while this context is active.
+
+    The collected spans can be exported in the Chrome trace event format,
+    which can be loaded in chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    def __init__(self):
+        self.events = []  # type: List[Dict[str, Any]]
+        self._origin = time.perf_counter()
+        self._previous = None  # type: Optional[Profile]
+
+    def __enter__(self):
+        global _active_profile
+        self._previous = _active_profile
+        _active_profile = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _active_profile
+        _active_profile = self._previous
+
+    def add_event(
+        self, name: str, start: float, end: float, args: Dict[str, Any]
+    ):
+        self.events.append(
+            {
+                "name": name,
+                "ph": "X",
+                "ts": round((start - self._origin) * 1e6, 3),
+                "dur": round((end - start) * 1e6, 3),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+        )
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        return {
+            "traceEvents": sorted(self.events, key=lambda e: e["ts"]),
+            "displayTimeUnit": "ms",
+        }
+
+
+_active_profile = None  # type: Optional[Profile]
+
+
+def span(name: str, **args):
+    """Time the enclosed block as a span called name, if profiling.
+
+    @param name: The name of the span, usually <module>.<function>.
+    @param args: Extra information to attach to the span.
+    """
+    if _active_profile is None:
+        return _NOOP_SPAN
+    return _Span(_active_profile, name, args)
+
+
+def profiled(name: str):
+    """Decorator timing every call of the function as a span called name."""
+
+    def wrapper(f):
+        @wraps(f)
+        def new_f(*args, **kwargs):
+            if _active_profile is None:
+                return f(*args, **kwargs)
+            with _Span(_active_profile, name, {}):
+                return f(*args, **kwargs)
+
+        return new_f
+
+    return wrapper
@@ -1,13 +1,21 @@
-from typing import List
+from typing import List, Set  # noqa: F401
 
 
 class SecretManager:
     def __init__(self):
-        self._secrets = []
+        self._secrets = []  # type: List[str]
+        self._known_secrets = set()  # type: Set[str]
 
     def add_secret(self, secret: str) -> None:
-        if secret:  # Add only non-empty secrets
+        # Add only non-empty secrets, and only once: the same tokens are
+        # added again on every contract request, and each stored secret
+        # costs one scan of every log record.
+        if secret and secret not in self._known_secrets:
+            self._known_secrets.add(secret)
             self._secrets.append(secret)
+            # Longer secrets go first, so that a secret which contains
+            # another one is redacted as a whole.
+            self._secrets.sort(key=len, reverse=True)
 
     @property
     def secrets(self) -> List[str]:
@@ -1,9 +1,19 @@
-from collections import defaultdict
+import logging
+import os
+from collections import Counter, defaultdict
 from datetime import datetime, timezone
 from enum import Enum
 from functools import lru_cache
 from random import choice
-from typing import Any, DefaultDict, Dict, List, Tuple
+from typing import (  # noqa: F401
+    Any,
+    DefaultDict,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
 import apt_pkg  # type: ignore
 
@@ -16,6 +26,7 @@ from uaclient.apt import (
     PreserveAptCfg,
     get_apt_cache_datetime,
     get_apt_pkg_cache,
+    get_apt_state_mtimes,
     get_esm_apt_pkg_cache,
     get_pkg_candidate_version,
 )
@@ -26,6 +37,7 @@ from uaclient.entitlements.entitlement_status import (
     ApplicationStatus,
     ContractStatus,
 )
+from uaclient.files import machine_token, state_files
 from uaclient.system import (
     get_distro_info,
     get_kernel_info,
@@ -35,6 +47,10 @@ from uaclient.system import (
 )
 
 ESM_SERVICES = ("esm-infra", "esm-apps")
+# Bump when the content of the security-status cache changes
+SECURITY_STATUS_CACHE_VERSION = 1
+
+LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
 
 
 class UpdateStatus(Enum):
@@ -300,6 +316,113 @@ def create_updates_list(
     return updates
 
 
+def _get_security_status_cache_inputs(cfg: UAConfig) -> Dict[str, Any]:
+    machine_token_path = machine_token.get_machine_token_file(
+        cfg
+    ).public_file.path
+    try:
+        machine_token_mtime = os.stat(
+            machine_token_path
+        ).st_mtime  # type: Optional[float]
+    except OSError:
+        machine_token_mtime = None
+    return {
+        "version": SECURITY_STATUS_CACHE_VERSION,
+        "series": get_release_info().series,
+        "machine_token_mtime": machine_token_mtime,
+        "apt_mtimes": get_apt_state_mtimes(),
+    }
+
+
+def _get_security_status_data(cfg: UAConfig) -> Dict[str, Any]:
+    ua_info = get_ua_info(cfg)
+
+    esm_services = {}
+    for entitlement in (ESMInfraEntitlement(cfg), ESMAppsEntitlement(cfg)):
+        esm_services[entitlement.name] = {
+            "application_status": entitlement.application_status()[0].name,
+            "applicability_status": (
+                entitlement.applicability_status()[0].name
+            ),
+        }
+
+    packages_by_origin = get_installed_packages_by_origin()
+    upgradable_versions = filter_updates(packages_by_origin["all"])
+
+    return {
+        "ua_info": ua_info,
+        "esm_services": esm_services,
+        "packages_by_origin": {
+            origin: [package.name for package in packages]
+            for origin, packages in packages_by_origin.items()
+            if origin != "all"
+        },
+        "updates": create_updates_list(upgradable_versions, ua_info),
+    }
+
+
+def get_security_status_data(cfg: UAConfig) -> Dict[str, Any]:
+    """Return the parts of security-status that depend on the apt state.
+
+    That is the Pro information, the status of the ESM services, the names
+    of the installed packages by origin and every available update.
+
+    Opening the apt caches and going through every installed package is
+    slow, so the result is cached until the apt state or the machine token
+    change.
+    """
+    # The inputs are taken first, so that any change while we go through
+    # the apt caches invalidates the cache
+    inputs = _get_security_status_cache_inputs(cfg)
+    try:
+        content = state_files.security_status_cache_file.read()
+    except Exception as e:
+        LOG.warning("Ignoring invalid security-status cache: %s", str(e))
+        content = None
+    if content and content.get("inputs") == inputs:
+        return content["data"]
+
+    data = _get_security_status_data(cfg)
+    if util.we_are_currently_root():
+        state_files.security_status_cache_file.write(
+            {"inputs": inputs, "data": data}
+        )
+    return data
+
+
+def get_package_names_by_origin(
+    data: Dict[str, Any]
+) -> DefaultDict[str, List[str]]:
+    """Return the installed package names of the data, by origin."""
+    package_names = defaultdict(
+        list, data["packages_by_origin"]
+    )  # type: DefaultDict[str, List[str]]
+    package_names["all"] = [
+        name for names in data["packages_by_origin"].values() for name in names
+    ]
+    return package_names
+
+
+def _get_updated_package_names(
+    data: Dict[str, Any], service: str, origins: Iterable[str]
+) -> List[str]:
+    """Return the packages from origins with updates in service.
+
+    A package is listed once per available update.
+    """
+    package_names = set(
+        name
+        for origin in origins
+        for name in data["packages_by_origin"].get(origin, [])
+    )
+    return [
+        update["package"]
+        for update in data["updates"]
+        if update["service_name"] == service
+        and update["package"] in package_names
+    ]
+
+
 def security_status_dict(cfg: UAConfig) -> Dict[str, Any]:
     """Returns the status of security updates on a system.
 
@@ -310,19 +433,19 @@ def security_status_dict(cfg: UAConfig) -> Dict[str, Any]:
     There is also a summary with the Ubuntu Pro information and the package
     counts.
     """
-    ua_info = get_ua_info(cfg)
-
-    summary = {"ua": ua_info}  # type: Dict[str, Any]
-    packages_by_origin = get_installed_packages_by_origin()
+    data = get_security_status_data(cfg)
+    summary = {"ua": data["ua_info"]}  # type: Dict[str, Any]
+    packages_by_origin = get_package_names_by_origin(data)
 
-    installed_packages = packages_by_origin["all"]
-    summary["num_installed_packages"] = len(installed_packages)
+    summary["num_installed_packages"] = len(packages_by_origin["all"])
 
-    upgradable_versions = filter_updates(installed_packages)
     # This version of security-status only cares about security updates
-    upgradable_versions["standard-updates"] = []
-
-    updates = create_updates_list(upgradable_versions, ua_info)
+    updates = [
+        update
+        for update in data["updates"]
+        if update["service_name"] != "standard-updates"
+    ]
+    num_updates = Counter(update["service_name"] for update in updates)
 
     summary["num_main_packages"] = len(packages_by_origin["main"])
     summary["num_restricted_packages"] = len(packages_by_origin["restricted"])
@@ -335,11 +458,11 @@ def security_status_dict(cfg: UAConfig) -> Dict[str, Any]:
     summary["num_esm_infra_packages"] = len(packages_by_origin["esm-infra"])
     summary["num_esm_apps_packages"] = len(packages_by_origin["esm-apps"])
 
-    summary["num_esm_infra_updates"] = len(upgradable_versions["esm-infra"])
-    summary["num_esm_apps_updates"] = len(upgradable_versions["esm-apps"])
-    summary["num_standard_security_updates"] = len(
-        upgradable_versions["standard-security"]
-    )
+    summary["num_esm_infra_updates"] = num_updates["esm-infra"]
+    summary["num_esm_apps_updates"] = num_updates["esm-apps"]
+    summary["num_standard_security_updates"] = num_updates["standard-security"]
+    # The reboot and livepatch states are not part of the cached data: they
+    # change without any change to the apt state
     summary["reboot_required"] = _reboot_required(cfg).reboot_required
 
     return {
@@ -351,7 +474,7 @@ def security_status_dict(cfg: UAConfig) -> Dict[str, Any]:
 
 
 def _print_package_summary(
-    package_lists: DefaultDict[str, List[apt_pkg.Package]],
+    package_lists: DefaultDict[str, List[str]],
     show_items: str = "all",
     always_show: bool = False,
 ) -> None:
@@ -494,31 +617,36 @@ def _print_apt_update_call():
         print("")
 
 
-def security_status(cfg: UAConfig):
-    esm_infra_ent = ESMInfraEntitlement(cfg)
-    esm_apps_ent = ESMAppsEntitlement(cfg)
+def _get_esm_service_status(
+    data: Dict[str, Any], service: str
+) -> Tuple[ApplicationStatus, ApplicabilityStatus]:
+    esm_service = data["esm_services"][service]
+    return (
+        ApplicationStatus[esm_service["application_status"]],
+        ApplicabilityStatus[esm_service["applicability_status"]],
+    )
+
 
-    esm_infra_status = esm_infra_ent.application_status()[0]
-    esm_infra_applicability = esm_infra_ent.applicability_status()[0]
-    esm_apps_status = esm_apps_ent.application_status()[0]
-    esm_apps_applicability = esm_apps_ent.applicability_status()[0]
+def security_status(cfg: UAConfig):
+    data = get_security_status_data(cfg)
+    esm_infra_status, esm_infra_applicability = _get_esm_service_status(
+        data, "esm-infra"
+    )
+    esm_apps_status, esm_apps_applicability = _get_esm_service_status(
+        data, "esm-apps"
+    )
 
     series = get_release_info().series
     is_lts = is_current_series_lts()
-    is_attached = get_ua_info(cfg)["attached"]
-
-    packages_by_origin = get_installed_packages_by_origin()
-    security_upgradable_versions_infra = filter_updates(
-        packages_by_origin["main"]
-        + packages_by_origin["restricted"]
-        + packages_by_origin["esm-infra"],
-    )["esm-infra"]
+    is_attached = data["ua_info"]["attached"]
 
-    security_upgradable_versions_apps = filter_updates(
-        packages_by_origin["universe"]
-        + packages_by_origin["multiverse"]
-        + packages_by_origin["esm-apps"],
-    )["esm-apps"]
+    packages_by_origin = get_package_names_by_origin(data)
+    security_upgradable_versions_infra = _get_updated_package_names(
+        data, "esm-infra", ("main", "restricted", "esm-infra")
+    )
+    security_upgradable_versions_apps = _get_updated_package_names(
+        data, "esm-apps", ("universe", "multiverse", "esm-apps")
+    )
 
     _print_package_summary(packages_by_origin)
 
@@ -571,16 +699,17 @@ def security_status(cfg: UAConfig):
         print(messages.SS_LEARN_MORE)
 
 
-def list_third_party_packages():
-    packages_by_origin = get_installed_packages_by_origin()
-    third_party_packages = packages_by_origin["third-party"]
-    package_names = [package.name for package in third_party_packages]
+def list_third_party_packages(cfg: UAConfig):
+    packages_by_origin = get_package_names_by_origin(
+        get_security_status_data(cfg)
+    )
+    package_names = packages_by_origin["third-party"]
 
     _print_package_summary(
         packages_by_origin, show_items="third-party", always_show=True
     )
 
-    if third_party_packages:
+    if package_names:
         print(messages.SS_THIRD_PARTY)
 
         print("")
@@ -591,16 +720,17 @@ def list_third_party_packages():
         print(messages.SS_NO_THIRD_PARTY)
 
 
-def list_unavailable_packages():
-    packages_by_origin = get_installed_packages_by_origin()
-    unknown_packages = packages_by_origin["unknown"]
-    package_names = [package.name for package in unknown_packages]
+def list_unavailable_packages(cfg: UAConfig):
+    packages_by_origin = get_package_names_by_origin(
+        get_security_status_data(cfg)
+    )
+    package_names = packages_by_origin["unknown"]
 
     _print_package_summary(
         packages_by_origin, show_items="unknown", always_show=True
     )
 
-    if unknown_packages:
+    if package_names:
         print(messages.SS_UNAVAILABLE)
         print("")
 
@@ -613,40 +743,33 @@ def list_unavailable_packages():
 
 
 def list_esm_infra_packages(cfg):
-    packages_by_origin = get_installed_packages_by_origin()
+    data = get_security_status_data(cfg)
+    packages_by_origin = get_package_names_by_origin(data)
     infra_packages = packages_by_origin["esm-infra"]
     mr_packages = packages_by_origin["main"] + packages_by_origin["restricted"]
 
     all_infra_packages = infra_packages + mr_packages
 
-    infra_updates = set()
-    security_upgradable_versions = filter_updates(all_infra_packages)[
-        "esm-infra"
-    ]
-    for update, _ in security_upgradable_versions:
-        infra_updates.add(update.parent_pkg)
+    infra_updates = set(
+        _get_updated_package_names(
+            data, "esm-infra", ("main", "restricted", "esm-infra")
+        )
+    )
 
     series = get_release_info().series
     is_lts = is_current_series_lts()
 
-    esm_infra_ent = ESMInfraEntitlement(cfg)
-    esm_apps_ent = ESMAppsEntitlement(cfg)
+    esm_infra_status, _ = _get_esm_service_status(data, "esm-infra")
+    _, esm_infra_applicability = _get_esm_service_status(data, "esm-apps")
 
-    esm_infra_status = esm_infra_ent.application_status()[0]
-    esm_infra_applicability = esm_apps_ent.applicability_status()[0]
-
-    installed_package_names = sorted(
-        [package.name for package in infra_packages]
-    )
-    available_package_names = sorted(
-        [package.name for package in infra_updates]
-    )
+    installed_package_names = sorted(infra_packages)
+    available_package_names = sorted(infra_updates)
     remaining_package_names = sorted(
         [
-            package.name
-            for package in all_infra_packages
-            if package.name not in installed_package_names
-            and package.name not in available_package_names
+            name
+            for name in all_infra_packages
+            if name not in installed_package_names
+            and name not in available_package_names
         ]
     )
 
@@ -702,7 +825,8 @@ def list_esm_infra_packages(cfg):
 
 
 def list_esm_apps_packages(cfg):
-    packages_by_origin = get_installed_packages_by_origin()
+    data = get_security_status_data(cfg)
+    packages_by_origin = get_package_names_by_origin(data)
     apps_packages = packages_by_origin["esm-apps"]
     um_packages = (
         packages_by_origin["universe"] + packages_by_origin["multiverse"]
@@ -710,31 +834,26 @@ def list_esm_apps_packages(cfg):
 
     all_apps_packages = apps_packages + um_packages
 
-    apps_updates = set()
-    security_upgradable_versions = filter_updates(all_apps_packages)[
-        "esm-apps"
-    ]
-    for update, _ in security_upgradable_versions:
-        apps_updates.add(update.parent_pkg)
+    apps_updates = set(
+        _get_updated_package_names(
+            data, "esm-apps", ("universe", "multiverse", "esm-apps")
+        )
+    )
 
     is_lts = is_current_series_lts()
 
-    esm_apps_ent = ESMAppsEntitlement(cfg)
-    esm_apps_status = esm_apps_ent.application_status()[0]
-    esm_apps_applicability = esm_apps_ent.applicability_status()[0]
-
-    installed_package_names = sorted(
-        [package.name for package in apps_packages]
-    )
-    available_package_names = sorted(
-        [package.name for package in apps_updates]
+    esm_apps_status, esm_apps_applicability = _get_esm_service_status(
+        data, "esm-apps"
     )
+
+    installed_package_names = sorted(apps_packages)
+    available_package_names = sorted(apps_updates)
     remaining_package_names = sorted(
         [
-            package.name
-            for package in all_apps_packages
-            if package.name not in installed_package_names
-            and package.name not in available_package_names
+            name
+            for name in all_apps_packages
+            if name not in installed_package_names
+            and name not in available_package_names
         ]
     )
 
@@ -1,6 +1,6 @@
 import logging
 import re
-from typing import List, NamedTuple, Optional
+from typing import Iterator, List, NamedTuple, Optional
 
 from uaclient import (
     api,
@@ -74,12 +74,14 @@ def configure_snap_proxy(
         system.subp(
             ["snap", "set", "system", "proxy.http={}".format(http_proxy)],
             retry_sleeps=retry_sleeps,
+            mutating=True,
         )
 
     if https_proxy:
         system.subp(
             ["snap", "set", "system", "proxy.https={}".format(https_proxy)],
             retry_sleeps=retry_sleeps,
+            mutating=True,
         )
 
 
@@ -101,6 +103,7 @@ def unconfigure_snap_proxy(
     system.subp(
         ["snap", "unset", "system", "proxy.{}".format(protocol_type)],
         retry_sleeps=retry_sleeps,
+        mutating=True,
     )
 
 
@@ -111,24 +114,26 @@ def get_config_option_value(key: str) -> Optional[str]:
     :return: the value of the snap config option, or None if not set
     """
     try:
-        out, _ = system.subp(["snap", "get", "system", key])
+        out, _ = system.subp(["snap", "get", "system", key], cache=True)
         return out.strip()
     except exceptions.ProcessExecutionError:
         return None
 
 
-def get_installed_snaps() -> List[SnapPackage]:
+def iter_installed_snaps() -> Iterator[SnapPackage]:
+    """Yield the installed snaps, querying snapd for each one lazily."""
     out, _ = system.subp(
-        ["snap", "list", "--color", "never", "--unicode", "never"]
+        ["snap", "list", "--color", "never", "--unicode", "never"], cache=True
     )
     apps = out.splitlines()
     apps = apps[1:]
-    snaps = []
     for line in apps:
         snap = line.split()[0]
-        snaps.append(get_snap_info(snap))
+        yield get_snap_info(snap)
+
 
-    return snaps
+def get_installed_snaps() -> List[SnapPackage]:
+    return list(iter_installed_snaps())
 
 
 def install_snapd():
@@ -144,6 +149,7 @@ def install_snapd():
         system.subp(
             ["apt-get", "install", "--assume-yes", "snapd"],
             retry_sleeps=apt.APT_RETRIES,
+            mutating=True,
         )
     except exceptions.ProcessExecutionError:
         raise exceptions.CannotInstallSnapdError()
@@ -179,11 +185,12 @@ def install_snap(
         cmd,
         capture=True,
         retry_sleeps=SNAP_INSTALL_RETRIES,
+        mutating=True,
     )
 
 
 def refresh_snap(snap: str):
-    system.subp([SNAP_CMD, "refresh", snap], capture=True)
+    system.subp([SNAP_CMD, "refresh", snap], capture=True, mutating=True)
 
 
 def get_snap_info(snap: str) -> SnapPackage:
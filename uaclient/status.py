@@ -1,5 +1,6 @@
 import copy
 import logging
+import os
 import sys
 import textwrap
 from collections import OrderedDict
@@ -8,11 +9,14 @@ from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple
 
 from uaclient import (
+    apt,
+    defaults,
     event_logger,
     exceptions,
     livepatch,
     lock,
     messages,
+    profiling,
     util,
     version,
 )
@@ -20,7 +24,7 @@ from uaclient.api.u.pro.status.is_attached.v1 import _is_attached
 from uaclient.config import UA_CONFIGURABLE_KEYS, UAConfig
 from uaclient.contract import get_available_resources, get_contract_information
 from uaclient.defaults import ATTACH_FAIL_DATE_FORMAT, PRINT_WRAP_WIDTH
-from uaclient.entitlements import entitlement_factory
+from uaclient.entitlements import entitlement_factory, get_entitlement
 from uaclient.entitlements.entitlement_status import (
     ContractStatus,
     UserFacingAvailability,
@@ -106,6 +110,19 @@ VARIANT_STATUS_TMPL = (
     "{marker} {name: <15}{entitled: <19}{status: <22}{description}"
 )
 
+# Bump when the content of the status snapshot changes, so that readers
+# ignore snapshots they don't know how to serve
+STATUS_SNAPSHOT_VERSION = 1
+# Environment variables changing the messages and dates shown in status
+STATUS_SNAPSHOT_LOCALE_VARIABLES = (
+    "LANGUAGE",
+    "LC_ALL",
+    "LC_MESSAGES",
+    "LC_TIME",
+    "LANG",
+    "TZ",
+)
+
 DEFAULT_STATUS = {
     "_doc": "Content provided in json response is currently considered"
     " Experimental and may change",
@@ -185,11 +202,11 @@ def _attached_service_status(
             if ent.variants:
                 variants = {
                     variant_name: _attached_service_status(
-                        variant_cls(cfg=cfg),
+                        get_entitlement(cfg, ent.name, variant_name),
                         inapplicable_resources,
                         cfg,
                     )
-                    for variant_name, variant_cls in ent.variants.items()
+                    for variant_name in ent.variants
                 }
 
     blocked_by = _get_blocked_by_services(ent)
@@ -212,12 +229,16 @@ def _attached_service_status(
     return service_status
 
 
+@profiling.profiled("status._attached_status")
 def _attached_status(cfg: UAConfig) -> Dict[str, Any]:
     """Return configuration of attached status as a dictionary."""
-    notices.remove(Notice.AUTO_ATTACH_RETRY_FULL_NOTICE)
-    notices.remove(Notice.AUTO_ATTACH_RETRY_TOTAL_FAILURE)
+    # Cleared while listing the notices, which only touches the ones found
+    stale_notices = [
+        Notice.AUTO_ATTACH_RETRY_FULL_NOTICE,
+        Notice.AUTO_ATTACH_RETRY_TOTAL_FAILURE,
+    ]
     if _is_attached(cfg).is_attached_and_contract_valid:
-        notices.remove(Notice.CONTRACT_EXPIRED)
+        stale_notices.append(Notice.CONTRACT_EXPIRED)
 
     response = copy.deepcopy(DEFAULT_STATUS)
     machine_token_file = machine_token.get_machine_token_file(cfg)
@@ -229,7 +250,7 @@ def _attached_status(cfg: UAConfig) -> Dict[str, Any]:
             "machine_id": machineTokenInfo["machineId"],
             "attached": True,
             "origin": contractInfo.get("origin"),
-            "notices": notices.list() or [],
+            "notices": notices.list(remove=stale_notices) or [],
             "contract": {
                 "id": contractInfo["id"],
                 "name": contractInfo["name"],
@@ -264,7 +285,7 @@ def _attached_status(cfg: UAConfig) -> Dict[str, Any]:
 
     for resource in resources:
         try:
-            ent = entitlement_factory(cfg=cfg, name=resource.get("name", ""))
+            ent = get_entitlement(cfg=cfg, name=resource.get("name", ""))
         except exceptions.EntitlementNotFoundError:
             continue
 
@@ -283,6 +304,7 @@ def _attached_status(cfg: UAConfig) -> Dict[str, Any]:
     return response
 
 
+@profiling.profiled("status._unattached_status")
 def _unattached_status(cfg: UAConfig) -> Dict[str, Any]:
     """Return unattached status as a dict."""
 
@@ -295,7 +317,7 @@ def _unattached_status(cfg: UAConfig) -> Dict[str, Any]:
         else:
             available = UserFacingAvailability.UNAVAILABLE.value
         try:
-            ent = entitlement_factory(cfg=cfg, name=resource.get("name", ""))
+            ent = get_entitlement(cfg=cfg, name=resource.get("name", ""))
 
         except exceptions.EntitlementNotFoundError:
             LOG.debug(
@@ -329,20 +351,12 @@ def _unattached_status(cfg: UAConfig) -> Dict[str, Any]:
     return response
 
 
-def _get_config_status(cfg) -> Dict[str, Any]:
-    """Return a dict with execution_status, execution_details and notices.
-
-    Values for execution_status will be one of UserFacingConfigStatus
-    enum:
-        inactive, active, reboot-required
-    execution_details will provide more details about that state.
-    notices is a list of tuples with label and description items.
-    """
+def _get_execution_status() -> Dict[str, Any]:
+    """Return a dict with execution_status and execution_details."""
     userStatus = UserFacingConfigStatus
     status_val = userStatus.INACTIVE.value
     status_desc = messages.NO_ACTIVE_OPERATIONS
     (lock_pid, lock_holder) = lock.check_lock_info()
-    notices_list = notices.list() or []
     if lock_pid > 0:
         status_val = userStatus.ACTIVE.value
         status_desc = messages.LOCK_HELD.format(
@@ -354,14 +368,31 @@ def _get_config_status(cfg) -> Dict[str, Any]:
         status_desc = messages.ENABLE_REBOOT_REQUIRED_TMPL.format(
             operation=operation
         )
-    ret = {
+    return {
         "execution_status": status_val,
         "execution_details": status_desc,
-        "notices": notices_list,
-        "config_path": cfg.cfg_path,
-        "config": cfg.cfg,
-        "features": cfg.features,
     }
+
+
+def _get_config_status(cfg) -> Dict[str, Any]:
+    """Return a dict with execution_status, execution_details and notices.
+
+    Values for execution_status will be one of UserFacingConfigStatus
+    enum:
+        inactive, active, reboot-required
+    execution_details will provide more details about that state.
+    notices is a list of tuples with label and description items.
+    """
+    notices_list = notices.list() or []
+    ret = _get_execution_status()
+    ret.update(
+        {
+            "notices": notices_list,
+            "config_path": cfg.cfg_path,
+            "config": cfg.cfg,
+            "features": cfg.features,
+        }
+    )
     # LP: #2004280 maintain backwards compatibility
     ua_config = user_config_file.user_config.public_config.to_dict()
     for key in UA_CONFIGURABLE_KEYS:
@@ -376,15 +407,157 @@ def _get_config_status(cfg) -> Dict[str, Any]:
     return ret
 
 
+def _get_mtime(path: Optional[str]) -> Optional[float]:
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _get_status_snapshot_inputs(
+    cfg: UAConfig,
+) -> state_files.StatusSnapshotInputs:
+    """Return the state that status depends on and is cheap to check."""
+    machine_token_file = machine_token.get_machine_token_file(cfg)
+    return state_files.StatusSnapshotInputs(
+        machine_token_mtime=_get_mtime(machine_token_file.public_file.path),
+        dpkg_status_mtime=apt.get_dpkg_status_time(),
+        permanent_notices_mtime=_get_mtime(
+            defaults.NOTICES_PERMANENT_DIRECTORY
+        ),
+        temporary_notices_mtime=_get_mtime(
+            defaults.NOTICES_TEMPORARY_DIRECTORY
+        ),
+        config_path=cfg.cfg_path,
+        config_mtime=_get_mtime(cfg.cfg_path),
+        user_config_mtime=_get_mtime(user_config_file.user_config.public_path),
+        locale=";".join(
+            "{}={}".format(variable, os.environ.get(variable, ""))
+            for variable in STATUS_SNAPSHOT_LOCALE_VARIABLES
+        ),
+    )
+
+
+def _filter_available_services(
+    response: Dict[str, Any], show_all: bool
+) -> Dict[str, Any]:
+    if not show_all:
+        available_services = [
+            service
+            for service in response.get("services", [])
+            if service.get("available", "yes") == "yes"
+        ]
+        response["services"] = available_services
+    return response
+
+
+class StatusSnapshot:
+    """Status published by root, for unprivileged readers.
+
+    The snapshot is only served while the state it was computed from is
+    unchanged, see StatusSnapshotInputs. The execution status depends on
+    the lock, which is held while root publishes the snapshot, so it is
+    always checked again when reading.
+    """
+
+    def __init__(self, content: Dict[str, Any]):
+        self._content = content
+        self._execution_status = _get_execution_status()
+
+    def get_status(self, show_all: bool = False) -> Dict[str, Any]:
+        response = copy.deepcopy(self._content["status"])
+        response.update(self._execution_status)
+        return _filter_available_services(response, show_all)
+
+    def get_tabular(self, show_all: bool = False) -> str:
+        """Return the status rendered by format_tabular."""
+        colorized = "colorized" if sys.stdout.isatty() else "plain"
+        return self._content["tabular"][colorized][
+            "all" if show_all else "default"
+        ]
+
+
+def publish_status_snapshot(
+    response: Dict[str, Any], inputs: state_files.StatusSnapshotInputs
+):
+    """Write the status snapshot, with the status rendered ahead of time.
+
+    :param response: The status of the machine, with all services.
+    :param inputs: The state the status was computed from.
+    """
+    tabular = {}  # type: Dict[str, Dict[str, str]]
+    for colorized, colorize in (("plain", False), ("colorized", True)):
+        tabular[colorized] = {
+            "default": format_tabular(
+                _filter_available_services(copy.deepcopy(response), False),
+                colorize=colorize,
+            ),
+            "all": format_tabular(response, show_all=True, colorize=colorize),
+        }
+    state_files.status_snapshot_file.write(
+        {
+            "version": STATUS_SNAPSHOT_VERSION,
+            "inputs": inputs.to_dict(),
+            "status": response,
+            "tabular": tabular,
+        }
+    )
+
+
+def get_status_snapshot(cfg: UAConfig) -> Optional[StatusSnapshot]:
+    """Return the status snapshot, if it matches the current state."""
+    try:
+        content = state_files.status_snapshot_file.read()
+        if not content or content.get("version") != STATUS_SNAPSHOT_VERSION:
+            return None
+        inputs = state_files.StatusSnapshotInputs.from_dict(content["inputs"])
+    except Exception as e:
+        LOG.warning("Ignoring invalid status snapshot: %s", str(e))
+        return None
+
+    if inputs != _get_status_snapshot_inputs(cfg):
+        LOG.debug("Status snapshot inputs changed, ignoring snapshot.")
+        return None
+    return StatusSnapshot(content)
+
+
+def update_status_snapshot(cfg: UAConfig) -> bool:
+    """Publish the status snapshot, unless it is still up to date.
+
+    Used by the timer job.
+
+    :return: True if the snapshot was published.
+    """
+    if get_status_snapshot(cfg) is not None:
+        LOG.debug("Status snapshot is up to date.")
+        return False
+    status(cfg=cfg)
+    return True
+
+
+@profiling.profiled("status.status")
 def status(cfg: UAConfig, show_all: bool = False) -> Dict[str, Any]:
-    """Return status as a dict, using a cache for non-root users
+    """Return status as a dict, using a snapshot for non-root users
 
     When unattached, get available resources from the contract service
     to report detailed availability of different resources for this
     machine.
 
-    Write the status-cache when called by root.
+    Write the status-cache and the status snapshot when called by root.
+    Non-root users are served the snapshot while it is up to date.
     """
+    is_root = util.we_are_currently_root()
+    if not is_root:
+        snapshot = get_status_snapshot(cfg)
+        if snapshot is not None:
+            return snapshot.get_status(show_all)
+    else:
+        # Read before computing the status: a change happening while the
+        # status is computed invalidates the snapshot
+        inputs = _get_status_snapshot_inputs(cfg)
+
     if _is_attached(cfg).is_attached:
         response = _attached_status(cfg)
     else:
@@ -392,18 +565,11 @@ def status(cfg: UAConfig, show_all: bool = False) -> Dict[str, Any]:
 
     response.update(_get_config_status(cfg))
 
-    if util.we_are_currently_root():
+    if is_root:
         state_files.status_cache_file.write(response)
+        publish_status_snapshot(response, inputs)
 
-    if not show_all:
-        available_services = [
-            service
-            for service in response.get("services", [])
-            if service.get("available", "yes") == "yes"
-        ]
-        response["services"] = available_services
-
-    return response
+    return _filter_available_services(response, show_all)
 
 
 def _get_entitlement_information(
@@ -508,7 +674,7 @@ def simulate_status(
     for resource in resources:
         entitlement_name = resource.get("name", "")
         try:
-            ent = entitlement_factory(cfg=cfg, name=entitlement_name)
+            ent = get_entitlement(cfg=cfg, name=entitlement_name)
         except exceptions.EntitlementNotFoundError:
             continue
         entitlement_information = _get_entitlement_information(
@@ -546,13 +712,14 @@ def simulate_status(
     return response, ret
 
 
-def for_human_colorized(string: str) -> str:
-    """Return colorized string if using a tty, else original string."""
-    return (
-        STATUS_HUMANIZE_COLORIZE.get(string, string)
-        if sys.stdout.isatty()
-        else string
-    )
+def for_human_colorized(string: str, colorize: Optional[bool] = None) -> str:
+    """Return colorized string if using a tty, else original string.
+
+    :param colorize: Colorize the string or not, regardless of the tty.
+    """
+    if colorize is None:
+        colorize = sys.stdout.isatty()
+    return STATUS_HUMANIZE_COLORIZE.get(string, string) if colorize else string
 
 
 def colorize_commands(commands: List[List[str]]) -> str:
@@ -614,8 +781,16 @@ def format_expires(expires: Optional[datetime]) -> str:
     return expires.strftime("%c %Z")
 
 
-def format_tabular(status: Dict[str, Any], show_all: bool = False) -> str:
-    """Format status dict for tabular output."""
+@profiling.profiled("status.format_tabular")
+def format_tabular(
+    status: Dict[str, Any],
+    show_all: bool = False,
+    colorize: Optional[bool] = None,
+) -> str:
+    """Format status dict for tabular output.
+
+    :param colorize: Colorize the output or not, regardless of the tty.
+    """
     if not status.get("attached"):
         if status.get("simulated"):
             if not status.get("services", None):
@@ -704,9 +879,9 @@ def format_tabular(status: Dict[str, Any], show_all: bool = False) -> str:
             )
             fmt_args = {
                 "name": service_status.get("name", ""),
-                "entitled": for_human_colorized(entitled),
+                "entitled": for_human_colorized(entitled, colorize),
                 "status": for_human_colorized(
-                    service_status.get("status", "")
+                    service_status.get("status", ""), colorize
                 ),
                 "description": description,
             }
@@ -729,10 +904,10 @@ def format_tabular(status: Dict[str, Any], show_all: bool = False) -> str:
                             marker=marker,
                             name=variant.get("name"),
                             entitled=for_human_colorized(
-                                variant.get("entitled", "")
+                                variant.get("entitled", ""), colorize
                             ),
                             status=for_human_colorized(
-                                variant.get("status", "")
+                                variant.get("status", ""), colorize
                             ),
                             description=variant.get("description", ""),
                         )
@@ -791,7 +966,7 @@ def format_tabular(status: Dict[str, Any], show_all: bool = False) -> str:
         pairs.append(
             (
                 messages.STATUS_FOOTER_SUPPORT_LEVEL,
-                for_human_colorized(tech_support_level),
+                for_human_colorized(tech_support_level, colorize),
             )
         )
 
@@ -7,13 +7,23 @@ import re
 import stat
 import subprocess  # nosec B404
 import tempfile
+import threading
 import time
 import uuid
 from functools import lru_cache
 from shutil import rmtree
-from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+from typing import (
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
-from uaclient import defaults, exceptions, util
+from uaclient import defaults, exceptions, profiling, util
 
 REBOOT_FILE_CHECK_PATH = "/var/run/reboot-required"
 REBOOT_PKGS_FILE_PATH = "/var/run/reboot-required.pkgs"
@@ -217,7 +227,7 @@ def get_installed_ubuntu_kernels():
     vmlinux_kernel_files = [
         file
         for file in glob.glob("/boot/vmlinu[x|z]-*")
-        if "Linux kernel" in subp(["file", file])[0]
+        if "Linux kernel" in subp(["file", file], cache=True)[0]
     ]
 
     linux_image_versions = [
@@ -237,14 +247,14 @@ def get_installed_ubuntu_kernels():
 
 @lru_cache(maxsize=None)
 def get_dpkg_arch() -> str:
-    out, _err = subp(["dpkg", "--print-architecture"])
+    out, _err = subp(["dpkg", "--print-architecture"], cache=True)
     return out.strip()
 
 
 @lru_cache(maxsize=None)
 def get_virt_type() -> str:
     try:
-        out, _ = subp(["systemd-detect-virt"])
+        out, _ = subp(["systemd-detect-virt"], cache=True)
         return out.strip()
     except exceptions.ProcessExecutionError:
         # The main known place where that will fail is in a docker/podman
@@ -391,7 +401,9 @@ def get_release_info() -> ReleaseInfo:
 
 @lru_cache(maxsize=None)
 def is_lts(series: str) -> bool:
-    out, _err = subp(["/usr/bin/ubuntu-distro-info", "--supported-esm"])
+    out, _err = subp(
+        ["/usr/bin/ubuntu-distro-info", "--supported-esm"], cache=True
+    )
     return series in out
 
 
@@ -402,7 +414,9 @@ def is_current_series_lts() -> bool:
 
 @lru_cache(maxsize=None)
 def is_supported(series: str) -> bool:
-    out, _err = subp(["/usr/bin/ubuntu-distro-info", "--supported"])
+    out, _err = subp(
+        ["/usr/bin/ubuntu-distro-info", "--supported"], cache=True
+    )
     return series in out
 
 
@@ -412,7 +426,8 @@ def is_active_esm(series: str) -> bool:
     if not is_lts(series):
         return False
     out, _err = subp(
-        ["/usr/bin/ubuntu-distro-info", "--series", series, "-yeol"]
+        ["/usr/bin/ubuntu-distro-info", "--series", series, "-yeol"],
+        cache=True,
     )
     return int(out) <= 0
 
@@ -431,13 +446,13 @@ def is_container(run_path: str = "/run") -> bool:
     # we do not identify a schroot as a container, we are explicitly
     # using the 'ischroot' command here.
     try:
-        subp(["ischroot"])
+        subp(["ischroot"], cache=True)
         return False
     except exceptions.ProcessExecutionError:
         pass
 
     try:
-        subp(["systemd-detect-virt", "--quiet", "--container"])
+        subp(["systemd-detect-virt", "--quiet", "--container"], cache=True)
         return True
     except (IOError, OSError):
         pass
@@ -649,6 +664,121 @@ def ensure_file_absent(file_path: str) -> None:
         LOG.debug("Tried to remove %s but file does not exist", file_path)
 
 
+SubpResult = Union[Tuple[str, str], Exception]
+
+
+class SubpTraceEntry:
+    def __init__(self):
+        self.count = 0
+        self.cache_hits = 0
+        self.total_time = 0.0
+
+
+class SubpTrace:
+    """Record how many times and for how long each command runs.
+
+    While used as a context manager, every command run through subp is
+    recorded, including the ones answered by the subp cache.
+    """
+
+    def __init__(self):
+        self.commands = {}  # type: Dict[str, SubpTraceEntry]
+        self._previous = None  # type: Optional[SubpTrace]
+
+    def __enter__(self):
+        global _subp_trace
+        self._previous = _subp_trace
+        _subp_trace = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _subp_trace
+        _subp_trace = self._previous
+
+    def record(self, cmd: str, duration: float, cache_hit: bool = False):
+        entry = self.commands.setdefault(cmd, SubpTraceEntry())
+        entry.count += 1
+        entry.total_time += duration
+        if cache_hit:
+            entry.cache_hits += 1
+
+    def summary(self) -> List[str]:
+        """Return one line per command, slowest first."""
+        return [
+            "{:.3f}s {} run(s) ({} cached): {}".format(
+                entry.total_time, entry.count, entry.cache_hits, cmd
+            )
+            for cmd, entry in sorted(
+                self.commands.items(),
+                key=lambda item: item[1].total_time,
+                reverse=True,
+            )
+        ]
+
+
+class SubpCache:
+    """Memoize the commands run with subp(cache=True) in this context.
+
+    Only idempotent read-only commands should be flagged as cacheable.
+    Commands run with subp(mutating=True) change the state of the system, so
+    they invalidate every result cached so far, and so does
+    invalidate_subp_cache() for callers waiting on the system to change.
+    Nested contexts share the cache of the outermost one.
+
+    The cache can be used from several threads, for example by the commands
+    collect-logs runs concurrently.
+    """
+
+    def __init__(self):
+        self._previous = None  # type: Optional[Dict[tuple, SubpResult]]
+
+    def __enter__(self):
+        global _subp_cache
+        self._previous = _subp_cache
+        if _subp_cache is None:
+            _subp_cache = {}
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _subp_cache
+        _subp_cache = self._previous
+
+
+_subp_trace = None  # type: Optional[SubpTrace]
+_subp_cache = (
+    None
+)  # type: Optional[Dict[tuple, Union[Tuple[str, str], Exception]]]  # noqa: E501
+
+
+# Guards the updates of _subp_cache, which the commands run from worker
+# threads share with the main thread. The generation counts invalidations,
+# so that a result can't be cached if the cache was invalidated while its
+# command was running.
+_subp_cache_lock = threading.Lock()
+_subp_cache_generation = 0
+
+
+def invalidate_subp_cache() -> None:
+    """Forget every command result cached by the current SubpCache."""
+    global _subp_cache_generation
+    subp_cache = _subp_cache
+    if subp_cache is not None:
+        with _subp_cache_lock:
+            _subp_cache_generation += 1
+            subp_cache.clear()
+
+
+def _cache_subp_result(
+    subp_cache: Dict[tuple, Union[Tuple[str, str], Exception]],
+    cache_key: tuple,
+    generation: int,
+    result: Union[Tuple[str, str], Exception],
+):
+    with _subp_cache_lock:
+        if generation == _subp_cache_generation:
+            subp_cache[cache_key] = result
+
+
 def _subp(
     args: Sequence[str],
     rcs: Optional[List[int]] = None,
@@ -698,13 +828,14 @@ def _subp(
         rcs = [0]
     redacted_cmd = util.redact_sensitive_logs(" ".join(args))
     try:
-        proc = subprocess.Popen(  # nosec B603
-            bytes_args,
-            stdout=stdout,
-            stderr=stderr,
-            env=merged_env,
-        )
-        (out, err) = proc.communicate(timeout=timeout)
+        with profiling.span("system._subp", cmd=redacted_cmd):
+            proc = subprocess.Popen(  # nosec B603
+                bytes_args,
+                stdout=stdout,
+                stderr=stderr,
+                env=merged_env,
+            )
+            (out, err) = proc.communicate(timeout=timeout)
     except OSError:
         try:
             out_result = out.decode("utf-8", errors="ignore") if out else ""
@@ -745,6 +876,8 @@ def subp(
     retry_sleeps: Optional[List[float]] = None,
     override_env_vars: Optional[Dict[str, str]] = None,
     pipe_stdouterr: bool = True,
+    cache: bool = False,
+    mutating: bool = False,
 ) -> Tuple[str, str]:
     """Run a command and return a tuple of decoded stdout, stderr.
 
@@ -763,33 +896,79 @@ def subp(
         If defined, these env vars get merged with the current process'
         os.environ for the subprocess, overriding any values that already
         existed in os.environ.
+     @param cache: Boolean set True if the command is read-only, so that its
+        result can be reused inside a SubpCache context.
+     @param mutating: Boolean set True if the command changes the state of
+        the system, which invalidates the results cached so far.
 
     @return: Tuple of utf-8 decoded stdout, stderr
     @raises ProcessExecutionError on invalid command or returncode not in rcs.
     @raises subprocess.TimeoutError when timeout specified and the command
         exceeds that number of seconds.
     """
+    cache_key = None
+    subp_cache = _subp_cache
+    generation = _subp_cache_generation
+    if subp_cache is not None:
+        if mutating:
+            invalidate_subp_cache()
+        elif cache:
+            cache_key = (
+                tuple(args),
+                tuple(rcs) if rcs is not None else None,
+                tuple(sorted((override_env_vars or {}).items())),
+                pipe_stdouterr,
+            )
+            # A single lookup, as another thread may clear the cache at any
+            # time
+            result = subp_cache.get(cache_key)
+            if result is not None:
+                if _subp_trace is not None:
+                    _subp_trace.record(
+                        util.redact_sensitive_logs(" ".join(args)),
+                        0.0,
+                        cache_hit=True,
+                    )
+                if isinstance(result, Exception):
+                    raise result
+                return result
+
     retry_sleeps = retry_sleeps.copy() if retry_sleeps is not None else None
     while True:
+        start_time = time.monotonic()
         try:
-            out, err = _subp(
-                args,
-                rcs,
-                capture,
-                timeout,
-                override_env_vars=override_env_vars,
-                pipe_stdouterr=pipe_stdouterr,
-            )
+            try:
+                out, err = _subp(
+                    args,
+                    rcs,
+                    capture,
+                    timeout,
+                    override_env_vars=override_env_vars,
+                    pipe_stdouterr=pipe_stdouterr,
+                )
+            finally:
+                if _subp_trace is not None:
+                    _subp_trace.record(
+                        util.redact_sensitive_logs(" ".join(args)),
+                        time.monotonic() - start_time,
+                    )
+                if mutating:
+                    # Results cached while the command ran may be outdated
+                    invalidate_subp_cache()
             break
         except exceptions.ProcessExecutionError as e:
             if capture:
                 LOG.debug(str(e))
                 LOG.warning("Stderr: %s\nStdout: %s", e.stderr, e.stdout)
             if not retry_sleeps:
+                if cache_key is not None and subp_cache is not None:
+                    _cache_subp_result(subp_cache, cache_key, generation, e)
                 raise
             LOG.debug(str(e))
             LOG.debug("Retrying %d more times.", len(retry_sleeps))
             time.sleep(retry_sleeps.pop(0))
+    if cache_key is not None and subp_cache is not None:
+        _cache_subp_result(subp_cache, cache_key, generation, (out, err))
     return out, err
 
 
@@ -801,6 +980,114 @@ def ensure_folder_absent(folder_path: str) -> None:
         LOG.debug("Tried to remove %s but folder does not exist", folder_path)
 
 
+def _get_systemd_units_active_states_dbus(
+    unit_names: List[str],
+) -> Dict[str, Optional[str]]:
+    # python3-dbus is not a dependency of the Pro Client: this raises
+    # ImportError on systems without it, to fall back to systemctl
+    import dbus  # type: ignore
+
+    manager = dbus.Interface(
+        dbus.SystemBus().get_object(
+            "org.freedesktop.systemd1", "/org/freedesktop/systemd1"
+        ),
+        "org.freedesktop.systemd1.Manager",
+    )
+    # systemctl adds the .service suffix to bare unit names, but the D-Bus
+    # API only knows full unit names
+    full_names = [
+        name if "." in name else name + ".service" for name in unit_names
+    ]
+    states = {
+        str(unit[0]): str(unit[3])
+        for unit in manager.ListUnitsByNames(full_names)
+    }
+    return {
+        name: states.get(full_name)
+        for name, full_name in zip(unit_names, full_names)
+    }
+
+
+def _get_systemd_units_active_states_systemctl(
+    unit_names: List[str],
+) -> Dict[str, Optional[str]]:
+    try:
+        out, _ = subp(
+            ["systemctl", "show", "--property=ActiveState", "--no-pager"]
+            + unit_names,
+            cache=True,
+        )
+    except exceptions.ProcessExecutionError as e:
+        LOG.warning(
+            "Failed to get ActiveState for systemd units %s",
+            ", ".join(unit_names),
+            exc_info=e,
+        )
+        return {name: None for name in unit_names}
+
+    # The properties of each unit are printed in the order of the arguments
+    states = [
+        line.split("=")[1].strip()
+        for line in out.splitlines()
+        if line.startswith("ActiveState=")
+    ]
+    if len(states) != len(unit_names):
+        LOG.warning(
+            "Couldn't find ActiveState in systemctl show output for %s",
+            ", ".join(unit_names),
+        )
+        return {name: None for name in unit_names}
+    return dict(zip(unit_names, states))
+
+
+# Queried in order, until one of them succeeds
+SYSTEMD_UNIT_STATE_BACKENDS = (
+    _get_systemd_units_active_states_dbus,
+    _get_systemd_units_active_states_systemctl,
+)
+
+
+def get_systemd_units_active_states(
+    unit_names: List[str],
+) -> Dict[str, Optional[str]]:
+    """
+    Get the ActiveState of several systemd units in a single query.
+
+    The systemd D-Bus API is used when python3-dbus is available, which
+    doesn't fork any process. Otherwise, a single systemctl call is made for
+    all the units.
+
+    @param unit_names: Names of the systemd units to look at
+
+    @return: A dict of the ActiveState of each unit, None for the units
+             we couldn't get the state of
+    """
+    for backend in SYSTEMD_UNIT_STATE_BACKENDS:
+        try:
+            return backend(unit_names)
+        except Exception as e:
+            LOG.debug(
+                "Couldn't get systemd units state with %s: %r",
+                backend.__name__,
+                e,
+            )
+    return {name: None for name in unit_names}
+
+
+def are_systemd_units_active(unit_names: List[str]) -> bool:
+    """
+    Get if all the systemd units are active in the system, querying them
+    all at once.
+
+    @param unit_names: Names of the systemd units to look at
+
+    @return: A Boolean specifying if all the units are active or not
+    """
+    states = get_systemd_units_active_states(unit_names)
+    # The same states systemctl is-active considers active
+    return all(states[name] in ("active", "reloading") for name in unit_names)
+
+
 def is_systemd_unit_active(service_name: str) -> bool:
     """
     Get if the systemd job is active in the system. Note that any status
@@ -812,38 +1099,11 @@ def is_systemd_unit_active(service_name: str) -> bool:
 
     @return: A Boolean specifying if the job is active or not
     """
-    try:
-        subp(["systemctl", "is-active", "--quiet", service_name])
-    except exceptions.ProcessExecutionError:
-        return False
-    return True
+    return are_systemd_units_active([service_name])
 
 
 def get_systemd_unit_active_state(service_name: str) -> Optional[str]:
-    try:
-        out, _ = subp(
-            [
-                "systemctl",
-                "show",
-                "--property=ActiveState",
-                "--no-pager",
-                service_name,
-            ]
-        )
-        if out and out.startswith("ActiveState="):
-            return out.split("=")[1].strip()
-        else:
-            LOG.warning(
-                "Couldn't find ActiveState in systemctl show output for %s",
-                service_name,
-            )
-    except exceptions.ProcessExecutionError as e:
-        LOG.warning(
-            "Failed to get ActiveState for systemd unit %s",
-            service_name,
-            exc_info=e,
-        )
-    return None
+    return get_systemd_units_active_states([service_name])[service_name]
 
 
 def get_user_cache_dir() -> str:
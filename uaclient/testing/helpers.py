@@ -39,3 +39,12 @@ def mock_with_name_attr(*args, name, mock_name=None, **kwargs):
     m = mock.MagicMock(*args, name=mock_name, **kwargs)
     m.name = name
     return m
+
+
+async def no_sleep(*args, **kwargs):
+    """Stand-in for asyncio.sleep, to use as side_effect of its mock.
+
+    Works both with the AsyncMock patch creates for coroutine functions on
+    recent versions of mock, and with the plain MagicMock of older ones.
+    """
+    pass
@@ -1,11 +1,17 @@
 import json
 import os
+import stat
 
 import mock
 import pytest
 
 from uaclient import exceptions
-from uaclient.actions import attach_with_token, auto_attach, collect_logs
+from uaclient.actions import (
+    _write_redacted_file,
+    attach_with_token,
+    auto_attach,
+    collect_logs,
+)
 from uaclient.testing import fakes, helpers
 
 M_PATH = "uaclient.actions."
@@ -309,7 +315,6 @@ class TestCollectLogs:
     @mock.patch("uaclient.util.get_pro_environment")
     @mock.patch("uaclient.util.we_are_currently_root", return_value=False)
     @mock.patch("uaclient.system.write_file")
-    @mock.patch("uaclient.system.load_file")
     @mock.patch("uaclient.actions._get_state_files")
     @mock.patch("glob.glob")
     @mock.patch("uaclient.log.get_user_log_file")
@@ -320,7 +325,6 @@ class TestCollectLogs:
         m_get_user,
         m_glob,
         m_get_state_files,
-        m_load_file,
         m_write_file,
         m_we_are_currently_root,
         m_env_vars,
@@ -332,22 +336,25 @@ class TestCollectLogs:
     ):
         m_env_vars.return_value = {"test": "test"}
         m_status.return_value = ({"test": "test"}, 0)
-        log_file = tmpdir.join("user-log").strpath
-        m_get_user.return_value = log_file
-        m_get_state_files.return_value = ["a", "b"]
-        m_load_file.side_effect = ["test", UnicodeError("test"), "test"]
+        log_file = tmpdir.join("user-log")
+        log_file.write("test")
+        m_get_user.return_value = log_file.strpath
+        invalid_file = tmpdir.join("a")
+        invalid_file.write_binary(b"\xff\xfe")
+        valid_file = tmpdir.join("b")
+        valid_file.write("test")
+        m_get_state_files.return_value = [
+            invalid_file.strpath,
+            valid_file.strpath,
+        ]
         m_glob.return_value = []
+        output_dir = tmpdir.mkdir("output")
 
-        with mock.patch("os.path.isfile", return_value=True):
-            collect_logs(cfg=mock.MagicMock(), output_dir="test")
+        collect_logs(cfg=mock.MagicMock(), output_dir=output_dir.strpath)
 
-        assert 3 == m_load_file.call_count
-        assert [
-            mock.call(log_file),
-            mock.call("a"),
-            mock.call("b"),
-        ] == m_load_file.call_args_list
-        assert 5 == m_write_file.call_count
+        assert ["b", "user0.log"] == sorted(os.listdir(output_dir.strpath))
+        assert "test" == output_dir.join("user0.log").read()
+        assert "test" == output_dir.join("b").read()
 
         # apparmor checks
         assert 1 == m_system_subp.call_count
@@ -355,17 +362,30 @@ class TestCollectLogs:
             mock.call(["journalctl", "-b", "-k", "--since=1 day ago"]),
         ] == m_system_subp.call_args_list
 
-        print(m_write_file.call_args_list)
-        assert [
-            mock.call("test/pro-status.json", '{"test": "test"}'),
-            mock.call("test/environment_vars.json", '{"test": "test"}'),
-            mock.call("test/user0.log", "test"),
-            mock.call("test/b", "test"),
-            mock.call("test/apparmor_logs.txt", APPARMOR_DENIED),
-        ] == m_write_file.call_args_list
+        assert 3 == m_write_file.call_count
         assert [
-            mock.call("Failed to load file: %s\n%s", "a", "test")
-        ] in m_log_warning.call_args_list
+            mock.call(
+                output_dir.join("apparmor_logs.txt").strpath, APPARMOR_DENIED
+            ),
+            mock.call(
+                output_dir.join("environment_vars.json").strpath,
+                '{"test": "test"}',
+            ),
+            mock.call(
+                output_dir.join("pro-status.json").strpath, '{"test": "test"}'
+            ),
+        ] == sorted(m_write_file.call_args_list, key=lambda c: c[0][0])
+        assert 1 == len(
+            [
+                c
+                for c in m_log_warning.call_args_list
+                if c[0][:2]
+                == (
+                    "Failed to load file: %s\n%s",
+                    invalid_file.strpath,
+                )
+            ]
+        )
 
     @mock.patch("uaclient.actions.shutil.copy")
     @mock.patch("uaclient.actions._write_command_output_to_file")
@@ -374,7 +394,7 @@ class TestCollectLogs:
     @mock.patch("uaclient.util.get_pro_environment")
     @mock.patch("uaclient.util.we_are_currently_root", return_value=True)
     @mock.patch("uaclient.system.write_file")
-    @mock.patch("uaclient.system.load_file")
+    @mock.patch("uaclient.actions._write_redacted_file")
     @mock.patch("uaclient.actions._get_state_files")
     @mock.patch("glob.glob", return_value=[])
     @mock.patch("uaclient.log.get_all_user_log_files")
@@ -385,7 +405,7 @@ class TestCollectLogs:
         m_get_all_users,
         m_glob,
         m_get_state_files,
-        m_load_file,
+        m_write_redacted_file,
         m_write_file,
         m_we_are_currently_root,
         m_env_vars,
@@ -398,7 +418,6 @@ class TestCollectLogs:
         m_env_vars.return_value = {"test": "test"}
         m_status.return_value = ({"test": "test"}, 0)
         m_get_state_files.return_value = []
-        m_load_file.return_value = "test"
 
         # Create a real log file (should be collected)
         real_log_path = tmpdir.join("real.log").strpath
@@ -416,13 +435,50 @@ class TestCollectLogs:
         with mock.patch("os.path.isfile", return_value=True):
             collect_logs(cfg=mock.MagicMock(), output_dir=output_dir)
 
-        # The symlinked file should NOT be read
-        assert not any(
-            call == mock.call(symlink_path)
-            for call in m_load_file.call_args_list
+        # The symlinked file should NOT be read, the real log file SHOULD
+        assert [
+            mock.call(real_log_path, os.path.join(output_dir, "user0.log"))
+        ] == m_write_redacted_file.call_args_list
+
+    @pytest.mark.parametrize("overwrite_source", ((True), (False)))
+    @mock.patch("uaclient.actions.COLLECT_LOGS_CHUNK_SIZE", 100)
+    @mock.patch("os.chown")
+    def test_write_redacted_file_streams_by_lines(
+        self, m_chown, overwrite_source, tmpdir
+    ):
+        content = "".join(
+            (
+                "line {} Bearer secret{}\n".format(i, i)
+                if i % 10 == 0
+                else "line {}\n".format(i)
+            )
+            for i in range(100)
         )
-        # The real log file SHOULD be read and written
-        assert mock.call(real_log_path) in m_load_file.call_args_list
-        assert any(
-            "user0.log" in str(call) for call in m_write_file.call_args_list
+        source = tmpdir.join("source.log")
+        source.write(content)
+        source.chmod(0o600)
+        destination = tmpdir.mkdir("output").join("source.log")
+
+        _write_redacted_file(
+            source.strpath,
+            destination.strpath,
+            overwrite_source=overwrite_source,
+        )
+
+        expected = "".join(
+            (
+                "line {} Bearer <REDACTED>\n".format(i)
+                if i % 10 == 0
+                else "line {}\n".format(i)
+            )
+            for i in range(100)
         )
+        assert expected == destination.read()
+        if overwrite_source:
+            assert expected == source.read()
+            assert 0o600 == stat.S_IMODE(os.stat(source.strpath).st_mode)
+            assert 1 == m_chown.call_count
+        else:
+            assert content == source.read()
+            assert 0 == m_chown.call_count
+        assert ["output", "source.log"] == sorted(os.listdir(tmpdir.strpath))
@@ -31,6 +31,7 @@ from uaclient.apt import (
     find_apt_list_files,
     get_apt_cache_policy,
     get_apt_cache_time,
+    get_apt_config_mtimes,
     get_apt_config_values,
     get_installed_packages_by_origin,
     get_installed_packages_names,
@@ -39,6 +40,7 @@ from uaclient.apt import (
     get_remote_versions_for_package,
     get_system_sources_file,
     is_installed,
+    iter_installed_packages,
     remove_apt_list_files,
     remove_auth_apt_repo,
     remove_repo_from_apt_auth_file,
@@ -1026,6 +1028,24 @@ class TestGetInstalledPackagesNames:
         assert expected_result == get_installed_packages_names()
 
 
+class TestIterInstalledPackages:
+    @mock.patch("uaclient.apt.PreserveAptCfg")
+    def test_apt_cfg_is_restored_when_closed_early(self, m_preserve_apt_cfg):
+        m_preserve_apt_cfg.return_value.__enter__.return_value.packages = [
+            mock_package("one", mock_version("1", [])),
+            mock_package("two"),  # not installed
+            mock_package("three", mock_version("1", [])),
+        ]
+
+        installed_packages = iter_installed_packages()
+        assert "one" == next(installed_packages).name
+        assert 0 == m_preserve_apt_cfg.return_value.__exit__.call_count
+
+        installed_packages.close()
+
+        assert 1 == m_preserve_apt_cfg.return_value.__exit__.call_count
+
+
 class TestRunAptCommand:
     @pytest.mark.parametrize(
         "error_list, output_list",
@@ -1378,6 +1398,29 @@ class TestGetAptConfigValues:
         )
 
 
+class TestGetAptConfigMtimes:
+    def test_mtimes_change_with_apt_config_files(self, tmpdir):
+        parts_dir = tmpdir.mkdir("apt.conf.d")
+        parts_dir.join("10periodic").write("")
+        main_path = tmpdir.join("apt.conf").strpath
+
+        with mock.patch(
+            "uaclient.apt.APT_CONFIG_PARTS_DIR", parts_dir.strpath
+        ), mock.patch("uaclient.apt.APT_CONFIG_MAIN_PATH", main_path):
+            mtimes = get_apt_config_mtimes()
+            assert [
+                parts_dir.strpath,
+                parts_dir.join("10periodic").strpath,
+            ] == (list(mtimes))
+
+            parts_dir.join("20auto-upgrades").write("")
+            os.utime(parts_dir.strpath, (0, 0))
+            new_mtimes = get_apt_config_mtimes()
+
+        assert parts_dir.join("20auto-upgrades").strpath in new_mtimes
+        assert mtimes != new_mtimes
+
+
 class TestPreserveAptCfg:
     def test_apt_config_is_preserved(self):
         class AptDict(dict):
@@ -1,6 +1,10 @@
 import copy
 import datetime
+import json
 import socket
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, HTTPServer
 
 import mock
 import pytest
@@ -1431,10 +1435,212 @@ class TestRefresh:
                 mock.sentinel.new_entitlements,
                 allow_enable=False,
                 verbose=True,
+                unchanged_entitlements=set(),
             )
         ] == m_process_entitlements_deltas.call_args_list
 
 
+class _MachineTokenHandler(BaseHTTPRequestHandler):
+    """Serve a machine token, honoring If-None-Match like the server."""
+
+    etag = '"v1"'
+    requests = []  # type: list
+
+    def _respond(self):
+        type(self).requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({"machineToken": "new-token"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._respond()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestConditionalMachineTokenRequests:
+    @pytest.fixture
+    def contract_server(self):
+        _MachineTokenHandler.requests = []
+        server = HTTPServer(("127.0.0.1", 0), _MachineTokenHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        yield "http://127.0.0.1:{}".format(server.server_port)
+        server.shutdown()
+        thread.join()
+        server.server_close()
+
+    @mock.patch.object(
+        UAContractClient,
+        "_get_activity_info",
+        return_value={
+            "architecture": "amd64",
+            "series": "jammy",
+            "kernel": "kernel",
+            "virt": "lxd",
+        },
+    )
+    def test_not_modified_when_validators_match(
+        self,
+        _m_activity_info,
+        contract_server,
+        FakeConfig,
+    ):
+        cfg = FakeConfig({"contract_url": contract_server})
+        client = UAContractClient(cfg)
+        request = client.get_contract_machine
+        # Go straight to the stub server, whatever proxy other tests set up
+        opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+        with mock.patch("urllib.request.urlopen", opener.open):
+            assert {"machineToken": "new-token"} == request(
+                "mToken", "cId", machine_id="mId"
+            )
+            assert {"etag": '"v1"'} == client.last_response_validators
+
+            with pytest.raises(exceptions.ETagUnchanged):
+                request(
+                    "mToken",
+                    "cId",
+                    machine_id="mId",
+                    validators=client.last_response_validators,
+                )
+
+        assert [None, '"v1"'] == [
+            headers.get("If-None-Match")
+            for headers in _MachineTokenHandler.requests
+        ]
+
+    @mock.patch.object(
+        UAContractClient,
+        "_get_activity_info",
+        return_value={
+            "architecture": "amd64",
+            "series": "jammy",
+            "kernel": "kernel",
+            "virt": "lxd",
+        },
+    )
+    def test_update_is_never_conditional(
+        self, _m_activity_info, contract_server, FakeConfig
+    ):
+        cfg = FakeConfig({"contract_url": contract_server})
+        client = UAContractClient(cfg)
+        opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+        with mock.patch("urllib.request.urlopen", opener.open):
+            client.get_contract_machine("mToken", "cId", machine_id="mId")
+            assert {"machineToken": "new-token"} == (
+                client.update_contract_machine(
+                    "mToken", "cId", machine_id="mId"
+                )
+            )
+
+        assert [None, None] == [
+            headers.get("If-None-Match")
+            for headers in _MachineTokenHandler.requests
+        ]
+
+    @mock.patch(M_PATH + "process_entitlement_delta")
+    @mock.patch("uaclient.files.state_files.machine_id_file.write")
+    @mock.patch(M_PATH + "UAContractClient.update_contract_machine")
+    def test_refresh_only_processes_changed_entitlements(
+        self,
+        m_update_contract_machine,
+        _m_machine_id_file_write,
+        m_process_entitlement_delta,
+        fake_machine_token_file,
+        FakeConfig,
+    ):
+        orig_token = {
+            "machineToken": "mToken",
+            "machineTokenInfo": {
+                "machineId": "machine-id",
+                "contractInfo": {
+                    "id": "cId",
+                    "resourceEntitlements": [
+                        {"type": "esm-infra", "entitled": True},
+                        {"type": "livepatch", "entitled": True},
+                    ],
+                },
+            },
+        }
+        new_token = copy.deepcopy(orig_token)
+        new_token["machineTokenInfo"]["contractInfo"]["resourceEntitlements"][
+            1
+        ]["entitled"] = False
+        fake_machine_token_file.attached = True
+        fake_machine_token_file.token = orig_token
+        m_update_contract_machine.return_value = new_token
+        m_process_entitlement_delta.return_value = ({}, False)
+
+        refresh(FakeConfig())
+
+        assert [
+            mock.call(
+                cfg=mock.ANY,
+                orig_access={
+                    "entitlement": {"type": "livepatch", "entitled": True}
+                },
+                new_access={
+                    "entitlement": {"type": "livepatch", "entitled": False}
+                },
+                allow_enable=False,
+                series_overrides=True,
+                verbose=True,
+            )
+        ] == m_process_entitlement_delta.call_args_list
+
+    @mock.patch(M_PATH + "process_entitlement_delta")
+    @mock.patch("uaclient.files.state_files.machine_id_file.write")
+    @mock.patch(M_PATH + "UAContractClient.update_contract_machine")
+    def test_refresh_skips_deltas_when_nothing_changed(
+        self,
+        m_update_contract_machine,
+        _m_machine_id_file_write,
+        m_process_entitlement_delta,
+        fake_machine_token_file,
+        FakeConfig,
+    ):
+        token = {
+            "machineToken": "mToken",
+            "machineTokenInfo": {
+                "machineId": "machine-id",
+                "contractInfo": {
+                    "id": "cId",
+                    "resourceEntitlements": [
+                        {"type": "esm-infra", "entitled": True}
+                    ],
+                },
+            },
+        }
+        fake_machine_token_file.attached = True
+        fake_machine_token_file.token = token
+        m_update_contract_machine.return_value = copy.deepcopy(token)
+
+        with mock.patch(
+            "uaclient.entitlements.entitlements_enable_order"
+        ) as m_enable_order:
+            refresh(FakeConfig())
+
+        assert 1 == fake_machine_token_file.write_calls
+        assert 0 == m_enable_order.call_count
+        assert 0 == m_process_entitlement_delta.call_count
+
+
 class TestApplyContractOverrides:
     @pytest.mark.parametrize(
         "override_selector,expected_weight",
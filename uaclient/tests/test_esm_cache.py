@@ -5,16 +5,36 @@ from uaclient.exceptions import MissingSeriesOnOSReleaseFile
 from uaclient.messages import E_MISSING_SERIES_ON_OS_RELEASE
 
 
+@mock.patch("lib.esm_cache.update_candidate_version_cache")
 @mock.patch("lib.esm_cache.update_esm_caches")
 class TestUpdateEsmCaches:
-    def test_builds_local_cache(self, m_update_caches, FakeConfig):
+    def test_builds_local_cache(
+        self, m_update_caches, m_update_candidate, FakeConfig
+    ):
         main(FakeConfig())
 
         assert m_update_caches.call_count == 1
+        assert m_update_candidate.call_count == 1
+
+    def test_updates_candidate_cache_when_esm_cache_fails(
+        self, m_update_caches, m_update_candidate, caplog_text, FakeConfig
+    ):
+        m_update_caches.side_effect = Exception("esm failure")
+        m_update_candidate.side_effect = Exception("candidate failure")
+        main(FakeConfig())
+        log = caplog_text()
+
+        assert m_update_candidate.call_count == 1
+        assert "esm failure" in log
+        assert "candidate failure" in log
 
     @mock.patch("lib.esm_cache.LOG.error")
     def test_log_user_facing_exception(
-        self, m_esm_cache_log_err, m_update_caches, FakeConfig
+        self,
+        m_esm_cache_log_err,
+        m_update_caches,
+        _m_update_candidate,
+        FakeConfig,
     ):
         expected_exception = MissingSeriesOnOSReleaseFile(version="version")
         m_update_caches.side_effect = expected_exception
@@ -28,7 +48,9 @@ class TestUpdateEsmCaches:
 
         assert expected_log_args == m_esm_cache_log_err.call_args_list
 
-    def test_log_exception(self, m_update_caches, caplog_text, FakeConfig):
+    def test_log_exception(
+        self, m_update_caches, _m_update_candidate, caplog_text, FakeConfig
+    ):
         expected_msg = "unexpected exception"
         expected_exception = Exception(expected_msg)
         m_update_caches.side_effect = expected_exception
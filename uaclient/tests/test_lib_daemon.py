@@ -1,11 +1,16 @@
+import asyncio
+
 import mock
 import pytest
 
 from lib.daemon import (
     WAIT_FOR_CLOUD_CONFIG_POLL_TIMES,
     WAIT_FOR_CLOUD_CONFIG_SLEEP_TIME,
+    _run,
     _wait_for_cloud_config,
 )
+from uaclient.daemon import run_until_complete
+from uaclient.testing.helpers import no_sleep
 
 
 class TestWaitForCloudConfig:
@@ -62,15 +67,127 @@ class TestWaitForCloudConfig:
             ),
         ),
     )
-    @mock.patch("lib.daemon.time.sleep")
-    @mock.patch("lib.daemon.system.get_systemd_unit_active_state")
+    @mock.patch("lib.daemon.asyncio.sleep", side_effect=no_sleep)
+    @mock.patch("lib.daemon.system.get_systemd_units_active_states")
     def test_wait_for_cloud_config(
         self,
-        m_get_systemd_unit_active_state,
+        m_get_systemd_units_active_states,
         m_sleep,
         active_state_side_effect,
         expected_sleep_calls,
     ):
-        m_get_systemd_unit_active_state.side_effect = active_state_side_effect
-        _wait_for_cloud_config()
+        # cloud-config.service and cloud-init.service states, in pairs
+        states = iter(active_state_side_effect)
+        m_get_systemd_units_active_states.side_effect = lambda units: {
+            unit: next(states) for unit in units
+        }
+
+        async def _wait():
+            cloud_config_ready = asyncio.Event()
+            await _wait_for_cloud_config(cloud_config_ready)
+            return cloud_config_ready.is_set()
+
+        assert run_until_complete(_wait()) is True
         assert m_sleep.call_args_list == expected_sleep_calls
+
+
+class TestRun:
+    @pytest.mark.parametrize(
+        "flag_file_exists,expected_modes",
+        (
+            # Polling for a license starts before cloud-config is ready
+            (False, [("poll", False)]),
+            # Retrying the auto attach waits for cloud-config
+            (True, [("retry", True)]),
+        ),
+    )
+    @mock.patch("lib.daemon.retry_auto_attach.retry")
+    @mock.patch("lib.daemon.poll_for_pro_license.poll")
+    @mock.patch("lib.daemon.asyncio.sleep", side_effect=no_sleep)
+    @mock.patch("lib.daemon.system.get_systemd_units_active_states")
+    @mock.patch("lib.daemon.os.path.exists")
+    def test_modes_and_cloud_config(
+        self,
+        m_exists,
+        m_get_systemd_units_active_states,
+        _m_sleep,
+        m_poll,
+        m_retry,
+        flag_file_exists,
+        expected_modes,
+        FakeConfig,
+    ):
+        m_exists.side_effect = lambda path: (
+            flag_file_exists
+            if path == "/run/ubuntu-advantage/flags/auto-attach-failed"
+            else path == "/run/cloud-init/cloud-id-gce"
+        )
+        m_get_systemd_units_active_states.side_effect = [
+            {
+                "cloud-config.service": "activating",
+                "cloud-init.service": "active",
+            }
+        ] * 3 + [
+            {"cloud-config.service": "active", "cloud-init.service": "active"}
+        ]
+        modes = []
+
+        def _mode(name):
+            async def _wait_for_cloud_config(cfg, cloud_config_ready):
+                modes.append((name, cloud_config_ready.is_set()))
+                await cloud_config_ready.wait()
+
+            return _wait_for_cloud_config
+
+        m_poll.side_effect = _mode("poll")
+        m_retry.side_effect = _mode("retry")
+
+        run_until_complete(_run(FakeConfig()))
+
+        assert expected_modes == modes
+
+    @mock.patch("lib.daemon.retry_auto_attach.retry")
+    @mock.patch("lib.daemon.poll_for_pro_license.poll")
+    @mock.patch("lib.daemon.asyncio.sleep", side_effect=no_sleep)
+    @mock.patch("lib.daemon.system.get_systemd_units_active_states")
+    @mock.patch("lib.daemon.os.path.exists")
+    def test_retry_when_flag_appears_while_cloud_config_is_activating(
+        self,
+        m_exists,
+        m_get_systemd_units_active_states,
+        _m_sleep,
+        m_poll,
+        m_retry,
+        FakeConfig,
+    ):
+        flag_file_exists = [False]
+        m_exists.side_effect = lambda path: (
+            flag_file_exists[0]
+            if path == "/run/ubuntu-advantage/flags/auto-attach-failed"
+            else path == "/run/cloud-init/cloud-id-gce"
+        )
+        states = iter(["activating"] * 3 + ["active"])
+
+        def _get_states(units):
+            state = next(states)
+            if state == "active":
+                # The auto attach in cloud-config failed
+                flag_file_exists[0] = True
+            return {
+                "cloud-config.service": state,
+                "cloud-init.service": "active",
+            }
+
+        m_get_systemd_units_active_states.side_effect = _get_states
+
+        async def _no_license(cfg, cloud_config_ready):
+            # Without a license to poll for, this returns right away
+            pass
+
+        m_poll.side_effect = _no_license
+        m_retry.side_effect = _no_license
+
+        run_until_complete(_run(FakeConfig()))
+
+        assert 1 == m_poll.call_count
+        assert 1 == m_retry.call_count
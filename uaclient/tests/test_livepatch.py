@@ -938,6 +938,7 @@ class TestConfigureLivepatchProxy:
                         "http-proxy={}".format(http_proxy),
                     ],
                     retry_sleeps=retry_sleeps,
+                    mutating=True,
                 )
             )
 
@@ -950,6 +951,7 @@ class TestConfigureLivepatchProxy:
                         "https-proxy={}".format(https_proxy),
                     ],
                     retry_sleeps=retry_sleeps,
+                    mutating=True,
                 )
             )
 
@@ -1032,7 +1034,7 @@ check-interval: 60  # minutes""",
         ret = get_config_option_value(key)
         assert ret == expected_ret
         assert [
-            mock.call([LIVEPATCH_CMD, "config"])
+            mock.call([LIVEPATCH_CMD, "config"], cache=True)
         ] == m_util_subp.call_args_list
 
 
@@ -1064,6 +1066,7 @@ class TestUnconfigureLivepatchProxy:
                 mock.call(
                     [LIVEPATCH_CMD, "config", protocol_type + "-proxy="],
                     retry_sleeps=retry_sleeps,
+                    mutating=True,
                 )
             ]
         else:
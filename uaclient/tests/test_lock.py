@@ -3,9 +3,13 @@ import os
 import mock
 import pytest
 
-from uaclient import lock
+from uaclient import lock, system
 from uaclient.defaults import DEFAULT_DATA_DIR
-from uaclient.exceptions import InvalidLockFile, LockHeldError
+from uaclient.exceptions import (
+    InvalidLockFile,
+    LockHeldError,
+    ProcessExecutionError,
+)
 from uaclient.files.notices import Notice
 from uaclient.lock import RetryLock
 from uaclient.messages import E_INVALID_LOCK_FILE, LOCK_HELD
@@ -129,6 +133,30 @@ class TestRetryLock:
         ] == m_single_attempt_lock_enter.call_args_list
         assert [mock.call(1)] == m_sleep.call_args_list
 
+    @mock.patch("uaclient.files.notices.NoticesManager.add")
+    @mock.patch("uaclient.system.ensure_file_absent")
+    @mock.patch(M_PATH + "time.sleep")
+    @mock.patch("uaclient.system._subp")
+    def test_lock_holder_exit_is_seen_after_sleeping_inside_subp_cache(
+        self, m_subp, m_sleep, _m_ensure_file_absent, _m_add_notice
+    ):
+        m_subp.side_effect = [
+            ("", ""),
+            ProcessExecutionError(cmd="ps 123"),
+        ]
+
+        with mock.patch.object(lock, "lock_data_file") as m_lock_file:
+            m_lock_file.read.return_value = lock.LockData(
+                lock_pid="123", lock_holder="some operation"
+            )
+            with system.SubpCache():
+                with RetryLock(lock_holder="request", sleep_time=1):
+                    pass
+
+        assert 2 == m_subp.call_count
+        assert [mock.call(1)] == m_sleep.call_args_list
+        assert 1 == m_lock_file.write.call_count
+
 
 class TestCheckLockInfo:
     @pytest.mark.parametrize("lock_content", ((""), ("corrupted")))
@@ -149,3 +177,15 @@ class TestCheckLockInfo:
 
         assert expected_msg.msg == exc_info.value.msg
         assert m_load_file.call_count == 1
+
+    @mock.patch("uaclient.system._subp", return_value=("", ""))
+    def test_lock_holder_check_is_cached(self, m_subp):
+        with mock.patch.object(lock, "lock_data_file") as m_lock_file:
+            m_lock_file.read.return_value = lock.LockData(
+                lock_pid="123", lock_holder="some operation"
+            )
+            with system.SubpCache():
+                assert (123, "some operation") == lock.check_lock_info()
+                assert (123, "some operation") == lock.check_lock_info()
+
+        assert 1 == m_subp.call_count
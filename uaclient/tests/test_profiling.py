@@ -0,0 +1,45 @@
+import mock
+import pytest
+
+from uaclient import profiling
+
+
+class TestSpan:
+    def test_noop_when_not_profiling(self):
+        assert profiling._NOOP_SPAN is profiling.span("name", key="value")
+
+    @mock.patch("uaclient.profiling.time.perf_counter")
+    def test_record_spans_while_profiling(self, m_perf_counter):
+        m_perf_counter.side_effect = [10.0, 11.0, 11.5, 12.0, 13.0]
+        with profiling.Profile() as profile:
+            with profiling.span("outer"):
+                with pytest.raises(ValueError):
+                    with profiling.span("inner", key="value"):
+                        raise ValueError()
+
+        assert [
+            ("outer", 1000000.0, 2000000.0, {}),
+            (
+                "inner",
+                1500000.0,
+                500000.0,
+                {"key": "value", "error": "ValueError"},
+            ),
+        ] == [
+            (e["name"], e["ts"], e["dur"], e["args"])
+            for e in profile.to_chrome_trace()["traceEvents"]
+        ]
+        assert profiling._NOOP_SPAN is profiling.span("name")
+
+
+class TestProfiled:
+    def test_profiled_function(self):
+        @profiling.profiled("function")
+        def function(arg, kwarg=None):
+            return (arg, kwarg)
+
+        assert (1, 2) == function(1, kwarg=2)
+        with profiling.Profile() as profile:
+            assert (3, None) == function(3)
+
+        assert ["function"] == [e["name"] for e in profile.events]
@@ -0,0 +1,57 @@
+import timeit
+
+from uaclient.secret_manager import SecretManager
+
+
+class TestSecretManager:
+    def test_ignore_empty_and_duplicated_secrets(self):
+        manager = SecretManager()
+        for secret in ("token", "", "token", "password", "token"):
+            manager.add_secret(secret)
+
+        assert ["password", "token"] == manager.secrets
+
+    def test_redact_secret_containing_another_secret(self):
+        manager = SecretManager()
+        manager.add_secret("KEY")
+        manager.add_secret("SECRETKEYVALUE")
+
+        assert "a <REDACTED> b <REDACTED>" == manager.redact_secrets(
+            "a SECRETKEYVALUE b KEY"
+        )
+
+    def test_redaction_cost_does_not_grow_with_repeated_secrets(self):
+        """Micro-benchmark: re-adding known secrets keeps redaction cheap.
+
+        The same tokens are added on every contract request. Redacting a
+        record must cost the same whether a secret was added once or a
+        thousand times.
+        """
+        record = (
+            "Get:1 https://esm.ubuntu.com/apps/ubuntu jammy-apps-security "
+            "InRelease [7,565 B] bearer machine-token-secret "
+        ) * 20
+        secrets = ["machine-token-secret", "resource-token", "password"]
+
+        once = SecretManager()
+        for secret in secrets:
+            once.add_secret(secret)
+
+        repeated = SecretManager()
+        for _ in range(1000):
+            for secret in secrets:
+                repeated.add_secret(secret)
+
+        once_time = min(
+            timeit.repeat(
+                lambda: once.redact_secrets(record), number=200, repeat=3
+            )
+        )
+        repeated_time = min(
+            timeit.repeat(
+                lambda: repeated.redact_secrets(record), number=200, repeat=3
+            )
+        )
+
+        assert once.redact_secrets(record) == repeated.redact_secrets(record)
+        assert repeated_time < once_time * 10
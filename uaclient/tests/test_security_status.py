@@ -9,11 +9,13 @@ from uaclient.entitlements.entitlement_status import (
     ApplicationStatus,
     ContractStatus,
 )
+from uaclient.files import machine_token
 from uaclient.security_status import (
     UpdateStatus,
     filter_updates,
     get_livepatch_fixed_cves,
     get_origin_for_installed_package,
+    get_security_status_data,
     get_ua_info,
     get_update_status,
     security_status_dict,
@@ -648,6 +650,70 @@ class TestSecurityStatus:
         )
 
 
+@mock.patch(M_PATH + "get_apt_state_mtimes")
+@mock.patch(M_PATH + "_get_security_status_data")
+class TestGetSecurityStatusData:
+    DATA = {
+        "ua_info": {
+            "attached": False,
+            "enabled_services": [],
+            "entitled_services": [],
+        },
+        "esm_services": {},
+        "packages_by_origin": {"main": ["pkg"]},
+        "updates": [],
+    }
+
+    @pytest.mark.parametrize(
+        "second_apt_mtimes,new_machine_token,expected_computations",
+        (
+            ({"/var/lib/dpkg/status": 1.0}, False, 1),
+            ({"/var/lib/dpkg/status": 2.0}, False, 2),
+            ({"/var/lib/dpkg/status": 1.0}, True, 2),
+        ),
+    )
+    def test_data_is_cached_until_its_inputs_change(
+        self,
+        m_data,
+        m_apt_mtimes,
+        second_apt_mtimes,
+        new_machine_token,
+        expected_computations,
+        FakeConfig,
+    ):
+        cfg = FakeConfig()
+        m_data.return_value = self.DATA
+        m_apt_mtimes.side_effect = [
+            {"/var/lib/dpkg/status": 1.0},
+            second_apt_mtimes,
+        ]
+
+        assert self.DATA == get_security_status_data(cfg)
+        if new_machine_token:
+            token_file = machine_token.get_machine_token_file(cfg)
+            token_file.public_file.write("{}")
+        assert self.DATA == get_security_status_data(cfg)
+        assert expected_computations == m_data.call_count
+
+    @mock.patch("uaclient.util.we_are_currently_root", return_value=False)
+    def test_data_is_not_cached_as_non_root(
+        self,
+        _m_we_are_currently_root,
+        m_data,
+        m_apt_mtimes,
+        FakeConfig,
+        security_status_cache_file,
+    ):
+        m_data.return_value = self.DATA
+        m_apt_mtimes.return_value = {"/var/lib/dpkg/status": 1.0}
+
+        get_security_status_data(FakeConfig())
+        get_security_status_data(FakeConfig())
+
+        assert not security_status_cache_file.is_present
+        assert 2 == m_data.call_count
+
+
 @mock.patch(M_PATH + "livepatch.status")
 @mock.patch(M_PATH + "get_kernel_info")
 class TestGetLivepatchFixedCVEs:
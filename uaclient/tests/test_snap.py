@@ -87,6 +87,7 @@ class TestConfigureSnapProxy:
                             "proxy.http={}".format(http_proxy),
                         ],
                         retry_sleeps=retry_sleeps,
+                        mutating=True,
                     )
                 )
 
@@ -100,6 +101,7 @@ class TestConfigureSnapProxy:
                             "proxy.https={}".format(https_proxy),
                         ],
                         retry_sleeps=retry_sleeps,
+                        mutating=True,
                     )
                 )
 
@@ -131,7 +133,7 @@ class TestConfigureSnapProxy:
         ret = get_config_option_value(key)
         assert ret == expected_ret
         assert [
-            mock.call(["snap", "get", "system", key])
+            mock.call(["snap", "get", "system", key], cache=True)
         ] == m_util_subp.call_args_list
 
 
@@ -156,6 +158,7 @@ class TestUnconfigureSnapProxy:
                 mock.call(
                     ["snap", "unset", "system", "proxy." + protocol_type],
                     retry_sleeps=retry_sleeps,
+                    mutating=True,
                 )
             ]
 
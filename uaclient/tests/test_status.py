@@ -716,6 +716,8 @@ class TestStatus:
         fake_machine_token_file.token = token
 
         mock_notice = NoticesManager()
+        mock_notice.add(Notice.AUTO_ATTACH_RETRY_FULL_NOTICE, "retrying")
+        mock_notice.add(Notice.AUTO_ATTACH_RETRY_TOTAL_FAILURE, "failed")
         if not entitlements:
             support_level = UserFacingStatus.INAPPLICABLE.value
         else:
@@ -841,12 +843,8 @@ class TestStatus:
             assert expected_status_calls == m_repo_uf_status.call_count
             assert 1 == m_livepatch_uf_status.call_count
 
-        expected_calls = [
-            mock.call(Notice.AUTO_ATTACH_RETRY_FULL_NOTICE),
-            mock.call(Notice.AUTO_ATTACH_RETRY_TOTAL_FAILURE),
-        ]
-
-        assert expected_calls == mock_notice.remove.call_args_list
+        # The auto-attach retry notices are cleared, and not reported
+        assert [] == mock_notice.list()
 
     @pytest.mark.usefixtures("all_resources_available")
     @mock.patch("uaclient.files.state_files.status_cache_file.write")
@@ -956,6 +954,89 @@ class TestStatus:
         assert cached_status != status.status(cfg=cfg)
         assert before == status.status(cfg=cfg)
 
+    @mock.patch("uaclient.files.state_files.status_cache_file.write")
+    @mock.patch("uaclient.util.we_are_currently_root")
+    @mock.patch(
+        "uaclient.files.user_config_file.UserConfigFileObject.public_config",
+        new_callable=mock.PropertyMock,
+    )
+    def test_nonroot_user_is_served_the_status_snapshot(
+        self,
+        m_public_config,
+        m_we_are_currently_root,
+        _m_status_cache_file,
+        _m_should_reboot,
+        _m_remove_notice,
+        _m_on_supported_kernel,
+        FakeConfig,
+        fake_machine_token_file,
+        status_snapshot_file,
+    ):
+        m_public_config.return_value = UserConfigData()
+        fake_machine_token_file.attached = True
+        fake_machine_token_file.token = fake_machine_token_file.read()
+        fake_machine_token_file.token["availableResources"] = [
+            {"name": "esm-infra", "available": True},
+            {"name": "ros", "available": False},
+        ]
+        cfg = FakeConfig()
+        m_we_are_currently_root.return_value = True
+        root_status = status.status(cfg=cfg, show_all=True)
+
+        snapshot = status_snapshot_file.read()
+        assert status.STATUS_SNAPSHOT_VERSION == snapshot["version"]
+        assert {
+            "plain": {
+                "default": format_tabular(
+                    status.status(cfg=cfg), colorize=False
+                ),
+                "all": format_tabular(
+                    root_status, show_all=True, colorize=False
+                ),
+            },
+            "colorized": {
+                "default": format_tabular(
+                    status.status(cfg=cfg), colorize=True
+                ),
+                "all": format_tabular(
+                    root_status, show_all=True, colorize=True
+                ),
+            },
+        } == snapshot["tabular"]
+
+        m_we_are_currently_root.return_value = False
+        with mock.patch(
+            "uaclient.status._attached_status"
+        ) as m_attached_status, mock.patch(
+            "uaclient.lock.check_lock_info", return_value=(123, "pro enable")
+        ):
+            nonroot_status = status.status(cfg=cfg, show_all=True)
+            assert 0 == m_attached_status.call_count
+            # The lock is always checked when reading the snapshot
+            assert (
+                UserFacingConfigStatus.ACTIVE.value
+                == nonroot_status["execution_status"]
+            )
+            nonroot_status.update(
+                {
+                    "execution_status": root_status["execution_status"],
+                    "execution_details": root_status["execution_details"],
+                }
+            )
+            assert root_status == nonroot_status
+            assert ["esm-infra"] == [
+                service["name"]
+                for service in status.status(cfg=cfg)["services"]
+            ]
+
+            # The snapshot is outdated once the installed packages change
+            with mock.patch(
+                "uaclient.apt.get_dpkg_status_time", return_value=123.0
+            ):
+                assert None is status.get_status_snapshot(cfg)
+                status.status(cfg=cfg)
+            assert 1 == m_attached_status.call_count
+
 
 ATTACHED_SERVICE_STATUS_PARAMETERS = [
     # ENTITLED => display the given user-facing status
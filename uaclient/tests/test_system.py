@@ -3,6 +3,7 @@ import logging
 import os
 import subprocess
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 import mock
 import pytest
@@ -349,7 +350,7 @@ class TestGetDpkgArch:
         m_subp.return_value = (stdout, "")
         assert system.get_dpkg_arch.__wrapped__() == expected
         assert m_subp.call_args_list == [
-            mock.call(["dpkg", "--print-architecture"])
+            mock.call(["dpkg", "--print-architecture"], cache=True)
         ]
 
 
@@ -427,7 +428,9 @@ class TestIsLTS:
         # Use __wrapped__ to avoid hitting the lru_cached value across tests
         assert expected is system.is_lts.__wrapped__(series)
         assert [
-            mock.call(["/usr/bin/ubuntu-distro-info", "--supported-esm"])
+            mock.call(
+                ["/usr/bin/ubuntu-distro-info", "--supported-esm"], cache=True
+            )
         ] == subp.call_args_list
 
 
@@ -440,7 +443,9 @@ class TestIsSupported:
         subp.return_value = "sup1\nsup2\nsup3", ""
         assert expected is system.is_supported.__wrapped__(series)
         assert [
-            mock.call(["/usr/bin/ubuntu-distro-info", "--supported"])
+            mock.call(
+                ["/usr/bin/ubuntu-distro-info", "--supported"], cache=True
+            )
         ] == subp.call_args_list
 
 
@@ -476,7 +481,8 @@ class TestIsActiveESM:
                         "--series",
                         series,
                         "-yeol",
-                    ]
+                    ],
+                    cache=True,
                 )
             )
         assert expected is system.is_active_esm.__wrapped__(series)
@@ -499,8 +505,10 @@ class TestIsContainer:
         # Second call for lru_cache test
         system.is_container()
         calls = [
-            mock.call(["ischroot"]),
-            mock.call(["systemd-detect-virt", "--quiet", "--container"]),
+            mock.call(["ischroot"], cache=True),
+            mock.call(
+                ["systemd-detect-virt", "--quiet", "--container"], cache=True
+            ),
         ]
         assert calls == m_subp.call_args_list
 
@@ -518,8 +526,10 @@ class TestIsContainer:
 
         assert True is system.is_container(run_path=tmpdir.strpath)
         calls = [
-            mock.call(["ischroot"]),
-            mock.call(["systemd-detect-virt", "--quiet", "--container"]),
+            mock.call(["ischroot"], cache=True),
+            mock.call(
+                ["systemd-detect-virt", "--quiet", "--container"], cache=True
+            ),
         ]
         assert calls == m_subp.call_args_list
 
@@ -537,8 +547,10 @@ class TestIsContainer:
 
         assert True is system.is_container(run_path=tmpdir.strpath)
         calls = [
-            mock.call(["ischroot"]),
-            mock.call(["systemd-detect-virt", "--quiet", "--container"]),
+            mock.call(["ischroot"], cache=True),
+            mock.call(
+                ["systemd-detect-virt", "--quiet", "--container"], cache=True
+            ),
         ]
         assert calls == m_subp.call_args_list
 
@@ -560,8 +572,10 @@ class TestIsContainer:
             m_exists.return_value = False
             assert False is system.is_container(run_path=tmpdir.strpath)
         calls = [
-            mock.call(["ischroot"]),
-            mock.call(["systemd-detect-virt", "--quiet", "--container"]),
+            mock.call(["ischroot"], cache=True),
+            mock.call(
+                ["systemd-detect-virt", "--quiet", "--container"], cache=True
+            ),
         ]
         assert calls == m_subp.call_args_list
         exists_calls = [
@@ -576,7 +590,7 @@ class TestIsContainer:
         m_subp.return_value = ("", "")
         assert False is system.is_container()
 
-        calls = [mock.call(["ischroot"])]
+        calls = [mock.call(["ischroot"], cache=True)]
         assert calls == m_subp.call_args_list
 
 
@@ -1369,6 +1383,117 @@ class TestSubp:
         assert "TEST!" == out
 
 
+class TestSubpCache:
+    @mock.patch("uaclient.system._subp", return_value=("out", "err"))
+    def test_cache_only_inside_context(self, m_subp):
+        system.subp(["cmd"], cache=True)
+        with system.SubpCache():
+            assert ("out", "err") == system.subp(["cmd"], cache=True)
+            assert ("out", "err") == system.subp(["cmd"], cache=True)
+            system.subp(["cmd", "other-arg"], cache=True)
+        system.subp(["cmd"], cache=True)
+
+        assert [
+            mock.call(["cmd"], None, False, None, **kwargs)
+            for kwargs in [{"override_env_vars": None, "pipe_stdouterr": True}]
+            * 2
+        ] == m_subp.call_args_list[:2]
+        assert 4 == m_subp.call_count
+
+    @mock.patch("uaclient.system._subp", return_value=("out", "err"))
+    def test_mutating_commands_invalidate_the_cache(self, m_subp):
+        with system.SubpCache():
+            system.subp(["read"], cache=True)
+            system.subp(["read"], cache=True)
+            system.subp(["other-read"])
+            system.subp(["read"], cache=True)
+            system.subp(["write"], mutating=True)
+            system.subp(["read"], cache=True)
+            system.invalidate_subp_cache()
+            system.subp(["read"], cache=True)
+
+        assert [
+            ["read"],
+            ["other-read"],
+            ["write"],
+            ["read"],
+            ["read"],
+        ] == [c[0][0] for c in m_subp.call_args_list]
+
+    @mock.patch("uaclient.system._subp")
+    def test_results_cached_while_mutating_are_dropped(self, m_subp):
+        def _subp(args, *_args, **_kwargs):
+            if args == ["write"]:
+                # Another thread caches a result while the system changes
+                system.subp(["read"], cache=True)
+                return ("", "")
+            return ("fresh", "")
+
+        m_subp.side_effect = _subp
+
+        with system.SubpCache():
+            system.subp(["write"], mutating=True)
+            system.subp(["read"], cache=True)
+
+        assert [["write"], ["read"], ["read"]] == [
+            c[0][0] for c in m_subp.call_args_list
+        ]
+
+    @mock.patch("uaclient.system._subp")
+    def test_cache_errors(self, m_subp):
+        m_subp.side_effect = exceptions.ProcessExecutionError(cmd="ps 1")
+        with system.SubpCache():
+            for _ in range(2):
+                with pytest.raises(exceptions.ProcessExecutionError):
+                    system.subp(["ps", "1"], cache=True)
+
+        assert 1 == m_subp.call_count
+
+    @mock.patch("uaclient.system._subp", return_value=("out", "err"))
+    def test_cache_is_shared_safely_between_threads(self, _m_subp):
+        def _run_commands():
+            for _ in range(500):
+                assert ("out", "err") == system.subp(["read"], cache=True)
+                system.subp(["write"])
+
+        with system.SubpCache():
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = [executor.submit(_run_commands) for _ in range(4)]
+            for future in futures:
+                future.result()
+
+    @mock.patch("uaclient.system._subp")
+    def test_invalidated_results_are_not_cached(self, m_subp):
+        def _subp(args, *_args, **_kwargs):
+            # Another thread changes the system while "read" runs
+            system.invalidate_subp_cache()
+            return ("stale", "")
+
+        m_subp.side_effect = _subp
+        with system.SubpCache():
+            system.subp(["read"], cache=True)
+            m_subp.side_effect = None
+            m_subp.return_value = ("fresh", "")
+            assert ("fresh", "") == system.subp(["read"], cache=True)
+
+
+class TestSubpTrace:
+    @mock.patch("uaclient.system.time.monotonic")
+    @mock.patch("uaclient.system._subp", return_value=("out", "err"))
+    def test_record_commands_and_cache_hits(self, _m_subp, m_monotonic):
+        m_monotonic.side_effect = [0.0, 2.0, 10.0, 10.5, 20.0, 30.0]
+        with system.SubpCache(), system.SubpTrace() as trace:
+            system.subp(["slow"], cache=True)
+            system.subp(["slow"], cache=True)
+            system.subp(["fast"])
+        system.subp(["untraced"])
+
+        assert [
+            "2.000s 2 run(s) (1 cached): slow",
+            "0.500s 1 run(s) (0 cached): fast",
+        ] == trace.summary()
+
+
 class TestIsSystemdServiceActive:
     @pytest.mark.parametrize(
         [
@@ -1376,7 +1501,9 @@ class TestIsSystemdServiceActive:
             "expected_return",
         ],
         (
-            (None, True),
+            ([("ActiveState=active\n", "")], True),
+            ([("ActiveState=reloading\n", "")], True),
+            ([("ActiveState=inactive\n", "")], False),
             (exceptions.ProcessExecutionError("test"), False),
         ),
     )
@@ -1416,6 +1543,89 @@ class TestGetSystemdUnitActiveState:
         assert expected == system.get_systemd_unit_active_state("test.service")
 
 
+def _fake_dbus_module(list_units_by_names):
+    """A local stand-in for python3-dbus, with a systemd manager."""
+    dbus = mock.MagicMock()
+    dbus.Interface.return_value.ListUnitsByNames.side_effect = (
+        list_units_by_names
+    )
+    return dbus
+
+
+class TestGetSystemdUnitsActiveStates:
+    @mock.patch("uaclient.system.subp")
+    def test_query_all_units_with_a_single_systemctl_call(self, m_subp):
+        m_subp.return_value = (
+            "ActiveState=active\n\nActiveState=inactive\n",
+            "",
+        )
+
+        assert {
+            "apt-daily.timer": "active",
+            "landscape-client": "inactive",
+        } == system.get_systemd_units_active_states(
+            ["apt-daily.timer", "landscape-client"]
+        )
+        assert [
+            mock.call(
+                [
+                    "systemctl",
+                    "show",
+                    "--property=ActiveState",
+                    "--no-pager",
+                    "apt-daily.timer",
+                    "landscape-client",
+                ],
+                cache=True,
+            )
+        ] == m_subp.call_args_list
+
+    @mock.patch("uaclient.system.subp")
+    def test_missing_states_in_systemctl_output(self, m_subp):
+        m_subp.return_value = ("ActiveState=active\n", "")
+
+        assert {
+            "a.service": None,
+            "b.service": None,
+        } == system.get_systemd_units_active_states(["a.service", "b.service"])
+
+    @mock.patch("uaclient.system.subp")
+    def test_query_units_with_dbus_when_available(self, m_subp):
+        def list_units_by_names(names):
+            return [
+                (name, "", "loaded", state, "", "", "", 0, "", "")
+                for name, state in zip(names, ("active", "failed"))
+            ]
+
+        dbus = _fake_dbus_module(list_units_by_names)
+        with mock.patch.dict("sys.modules", {"dbus": dbus}):
+            states = system.get_systemd_units_active_states(
+                ["apt-daily.timer", "landscape-client"]
+            )
+
+        assert {
+            "apt-daily.timer": "active",
+            "landscape-client": "failed",
+        } == states
+        assert [
+            mock.call(["apt-daily.timer", "landscape-client.service"])
+        ] == dbus.Interface.return_value.ListUnitsByNames.call_args_list
+        assert 0 == m_subp.call_count
+
+    @mock.patch("uaclient.system.subp")
+    def test_fall_back_to_systemctl_on_dbus_errors(self, m_subp):
+        m_subp.return_value = ("ActiveState=activating\n", "")
+        dbus = _fake_dbus_module(Exception("Unknown method ListUnitsByNames"))
+
+        with mock.patch.dict("sys.modules", {"dbus": dbus}):
+            assert {
+                "cloud-config.service": "activating"
+            } == system.get_systemd_units_active_states(
+                ["cloud-config.service"]
+            )
+        assert 1 == m_subp.call_count
+
+
 class TestGetCpuInfo:
     @pytest.mark.parametrize(
         [
@@ -117,8 +117,11 @@ class TestTimer:
 
         m_job_func = mock.Mock()
         m_jobs = TimedJob("fake_job", m_job_func, 43200)
+        m_update_messaging_job = TimedJob("update_messaging", mock.Mock(), 1)
 
-        with mock.patch("lib.timer.metering_job", m_jobs):
+        with mock.patch("lib.timer.metering_job", m_jobs), mock.patch(
+            "lib.timer.update_message_job", m_update_messaging_job
+        ):
             with mock.patch.object(timer, "timer_jobs_state_file", fake_file):
                 run_jobs(cfg, now)
 
@@ -144,8 +147,11 @@ class TestTimer:
 
         m_job_func = mock.Mock()
         m_job = TimedJob("metering", m_job_func, 43200)
+        m_update_messaging_job = TimedJob("update_messaging", mock.Mock(), 1)
 
-        with mock.patch("lib.timer.metering_job", m_job):
+        with mock.patch("lib.timer.metering_job", m_job), mock.patch(
+            "lib.timer.update_message_job", m_update_messaging_job
+        ):
             with mock.patch.object(timer, "timer_jobs_state_file", fake_file):
                 run_jobs(cfg, now)
 
@@ -3,10 +3,12 @@ import os.path
 import mock
 import pytest
 
+from uaclient.defaults import CANDIDATE_CACHE_PATH
 from uaclient.version import (
     check_for_new_version,
     get_last_known_candidate,
     get_version,
+    update_candidate_version_cache,
 )
 
 
@@ -38,49 +40,50 @@ class TestGetVersion:
 
 
 class TestGetLastKnownCandidate:
-    @mock.patch("builtins.open", mock.mock_open(read_data="1.2.3"))
-    @mock.patch("os.stat")
-    @mock.patch("os.path.exists", return_value=True)
-    @mock.patch("uaclient.version.get_apt_cache_time", return_value=1)
-    def test_get_known_candidate_from_cache(
-        self, _m_apt_cache_time, _m_exists, m_stat
-    ):
-        m_stat.return_value.st_mtime = 2
+    @mock.patch("builtins.open", mock.mock_open(read_data="1.2.3\n"))
+    @mock.patch("uaclient.version.get_pkg_candidate_version")
+    def test_get_known_candidate_from_cache(self, m_candidate):
         assert "1.2.3" == get_last_known_candidate()
+        assert 0 == m_candidate.call_count
 
     @mock.patch("builtins.open")
-    @mock.patch("os.stat")
-    @mock.patch("os.path.exists", return_value=True)
-    @mock.patch("uaclient.version.get_apt_cache_time", return_value=1)
-    def test_cant_open_cache_file(
-        self, _m_apt_cache_time, _m_exists, m_stat, m_open
-    ):
-        m_stat.return_value.st_mtime = 2
+    @mock.patch("uaclient.version.get_pkg_candidate_version")
+    def test_cant_open_cache_file(self, m_candidate, m_open):
         m_open.side_effect = OSError()
         assert None is get_last_known_candidate()
+        assert 0 == m_candidate.call_count
+
 
-    @mock.patch("os.makedirs")
+class TestUpdateCandidateVersionCache:
+    @mock.patch("uaclient.version.ensure_file_absent")
     @mock.patch(
         "uaclient.version.get_pkg_candidate_version", return_value="1.2.3"
     )
-    @mock.patch("os.path.exists", return_value=False)
-    def test_create_cache_before_returning(
-        self, _m_exists, _m_candidate, _m_makedirs
+    def test_write_candidate_to_cache(
+        self, _m_candidate, m_ensure_file_absent, tmpdir
     ):
-        with mock.patch("builtins.open", mock.mock_open()) as m_open:
-            get_last_known_candidate()
-            assert m_open.return_value.write.call_args_list == [
-                mock.call("1.2.3")
-            ]
+        run_path = tmpdir.join("run").strpath
+        cache_path = os.path.join(run_path, "candidate-version")
+        with mock.patch("uaclient.version.UAC_RUN_PATH", run_path):
+            with mock.patch(
+                "uaclient.version.CANDIDATE_CACHE_PATH", cache_path
+            ):
+                update_candidate_version_cache()
+                assert "1.2.3" == get_last_known_candidate()
 
-    @mock.patch("builtins.open")
+        assert 0 == m_ensure_file_absent.call_count
+
+    @mock.patch("uaclient.version.ensure_file_absent")
     @mock.patch(
-        "uaclient.version.get_pkg_candidate_version", return_value="1.2.3"
+        "uaclient.version.get_pkg_candidate_version", return_value=None
     )
-    @mock.patch("os.path.exists", return_value=False)
-    def test_problem_updating_file(self, _m_exists, _m_candidate, m_open):
-        m_open.side_effect = OSError()
-        assert "1.2.3" == get_last_known_candidate()
+    def test_remove_cache_without_candidate(
+        self, _m_candidate, m_ensure_file_absent
+    ):
+        update_candidate_version_cache()
+        assert [
+            mock.call(CANDIDATE_CACHE_PATH)
+        ] == m_ensure_file_absent.call_args_list
 
 
 class TestCheckForNewVersion:
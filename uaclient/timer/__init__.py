@@ -8,13 +8,19 @@ LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
 
 def start():
     try:
-        system.subp(["systemctl", "start", "ua-timer.timer"], timeout=2.0)
+        system.subp(
+            ["systemctl", "start", "ua-timer.timer"],
+            timeout=2.0,
+            mutating=True,
+        )
     except (exceptions.ProcessExecutionError, TimeoutExpired) as e:
         LOG.warning(e, exc_info=e)
 
 
 def stop():
     try:
-        system.subp(["systemctl", "stop", "ua-timer.timer"], timeout=2.0)
+        system.subp(
+            ["systemctl", "stop", "ua-timer.timer"], timeout=2.0, mutating=True
+        )
     except (exceptions.ProcessExecutionError, TimeoutExpired) as e:
         LOG.warning(e, exc_info=e)
@@ -3,16 +3,19 @@ import datetime
 import mock
 import pytest
 
-from uaclient import messages
+from uaclient import contract, exceptions, messages
 from uaclient.api.u.pro.packages.updates.v1 import (
     PackageUpdatesResult,
     UpdateSummary,
 )
 from uaclient.api.u.pro.status.is_attached.v1 import ContractExpiryStatus
 from uaclient.files import notices
+from uaclient.files.state_files import UpdateMessagingInputs
 from uaclient.timer.update_messaging import (
+    _get_update_messaging_inputs,
     update_contract_expiry,
     update_motd_messages,
+    update_motd_messages_on_change,
 )
 
 M_PATH = "uaclient.timer.update_messaging."
@@ -69,6 +72,55 @@ class TestGetContractExpiryStatus:
         else:
             assert 0 == fake_machine_token_file.write_calls
 
+    @mock.patch(M_PATH + "contract.UAContractClient.get_contract_machine")
+    def test_update_contract_expiry_not_modified(
+        self, m_get_contract_machine, FakeConfig, fake_machine_token_file
+    ):
+        m_get_contract_machine.side_effect = exceptions.ETagUnchanged(
+            url="url"
+        )
+        fake_machine_token_file.attached = True
+
+        update_contract_expiry(FakeConfig())
+
+        assert 0 == fake_machine_token_file.write_calls
+
+    @pytest.mark.parametrize("expiry_changed", (False, True))
+    def test_update_contract_expiry_stores_get_validators(
+        self, expiry_changed, FakeConfig, fake_machine_token_file
+    ):
+        fake_machine_token_file.attached = True
+        fake_machine_token_file.write_validators(
+            contract.API_V1_GET_CONTRACT_MACHINE, {"etag": '"v1"'}
+        )
+        expiry = fake_machine_token_file.contract_expiry_datetime
+        if expiry_changed:
+            expiry = datetime.datetime(
+                2042, 5, 8, 19, 2, 26, tzinfo=datetime.timezone.utc
+            )
+
+        def get_contract_machine(client, *args, **kwargs):
+            client.last_response_validators = {"etag": '"v2"'}
+            return {
+                "machineTokenInfo": {"contractInfo": {"effectiveTo": expiry}}
+            }
+
+        with mock.patch.object(
+            contract.UAContractClient,
+            "get_contract_machine",
+            autospec=True,
+            side_effect=get_contract_machine,
+        ) as m_get_contract_machine:
+            update_contract_expiry(FakeConfig())
+
+        assert {"etag": '"v1"'} == m_get_contract_machine.call_args[1][
+            "validators"
+        ]
+        assert {"etag": '"v2"'} == fake_machine_token_file.get_validators(
+            contract.API_V1_GET_CONTRACT_MACHINE
+        )
+        assert int(expiry_changed) == fake_machine_token_file.write_calls
+
 
 class TestUpdateMotdMessages:
     @pytest.mark.parametrize(
@@ -539,3 +591,81 @@ class TestUpdateMotdMessages:
         assert ensure_file_absent_calls == m_ensure_file_absent.call_args_list
         assert write_file_calls == m_write_file.call_args_list
         assert notices_add_calls == m_notices_add.call_args_list
+
+
+class TestGetUpdateMessagingInputs:
+    @pytest.mark.parametrize(
+        ["contract_status", "expected_remaining_days"],
+        (
+            (ContractExpiryStatus.ACTIVE, None),
+            (ContractExpiryStatus.NONE, None),
+            (ContractExpiryStatus.ACTIVE_EXPIRED_SOON, 10),
+            (ContractExpiryStatus.EXPIRED_GRACE_PERIOD, 10),
+            (ContractExpiryStatus.EXPIRED, 10),
+        ),
+    )
+    @mock.patch(M_PATH + "apt.get_apt_cache_time", return_value=2.0)
+    @mock.patch(M_PATH + "apt.get_dpkg_status_time", return_value=1.0)
+    @mock.patch(M_PATH + "_get_mtime", return_value=3.0)
+    @mock.patch(M_PATH + "machine_token.get_machine_token_file")
+    @mock.patch(M_PATH + "_is_attached")
+    def test_remaining_days_only_tracked_close_to_expiry(
+        self,
+        m_is_attached,
+        _m_get_machine_token_file,
+        _m_get_mtime,
+        _m_dpkg_status_time,
+        _m_apt_cache_time,
+        contract_status,
+        expected_remaining_days,
+        FakeConfig,
+    ):
+        m_is_attached.return_value = mock.MagicMock(
+            contract_status=contract_status.value,
+            contract_remaining_days=10,
+        )
+        assert UpdateMessagingInputs(
+            machine_token_mtime=3.0,
+            dpkg_status_mtime=1.0,
+            apt_cache_mtime=2.0,
+            contract_status=contract_status.value,
+            contract_remaining_days=expected_remaining_days,
+        ) == _get_update_messaging_inputs(FakeConfig())
+
+
+class TestUpdateMotdMessagesOnChange:
+    @pytest.mark.parametrize(
+        ["previous_inputs", "expected_update"],
+        (
+            (None, True),
+            (UpdateMessagingInputs(dpkg_status_mtime=1.0), True),
+            (UpdateMessagingInputs(dpkg_status_mtime=2.0), False),
+        ),
+    )
+    @mock.patch(M_PATH + "update_messaging_inputs_file")
+    @mock.patch(M_PATH + "_get_update_messaging_inputs")
+    @mock.patch(M_PATH + "update_motd_messages", return_value=True)
+    def test_only_update_messages_when_inputs_change(
+        self,
+        m_update_motd_messages,
+        m_get_inputs,
+        m_inputs_file,
+        previous_inputs,
+        expected_update,
+        FakeConfig,
+    ):
+        current_inputs = UpdateMessagingInputs(dpkg_status_mtime=2.0)
+        m_get_inputs.return_value = current_inputs
+        m_inputs_file.read.return_value = previous_inputs
+        cfg = FakeConfig()
+
+        assert expected_update == update_motd_messages_on_change(cfg)
+
+        if expected_update:
+            assert [mock.call(cfg)] == m_update_motd_messages.call_args_list
+            assert [
+                mock.call(current_inputs)
+            ] == m_inputs_file.write.call_args_list
+        else:
+            assert 0 == m_update_motd_messages.call_count
+            assert 0 == m_inputs_file.write.call_count
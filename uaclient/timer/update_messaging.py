@@ -9,8 +9,17 @@ present updated text about Ubuntu Pro service and token state.
 import logging
 import os
 from os.path import exists
+from typing import Optional
 
-from uaclient import contract, defaults, messages, system, util
+from uaclient import (
+    apt,
+    contract,
+    defaults,
+    exceptions,
+    messages,
+    system,
+    util,
+)
 from uaclient.api.u.pro.packages.updates.v1 import (
     _updates as api_u_pro_packages_updates_v1,
 )
@@ -21,6 +30,10 @@ from uaclient.api.u.pro.status.is_attached.v1 import (
 )
 from uaclient.config import UAConfig
 from uaclient.files import machine_token, notices
+from uaclient.files.state_files import (
+    UpdateMessagingInputs,
+    update_messaging_inputs_file,
+)
 
 MOTD_CONTRACT_STATUS_FILE_NAME = "motd-contract-status"
 UPDATE_NOTIFIER_MOTD_SCRIPT = (
@@ -38,9 +51,19 @@ def update_contract_expiry(cfg: UAConfig):
         .get("id", None)
     )
     contract_client = contract.UAContractClient(cfg)
-    resp = contract_client.get_contract_machine(
-        orig_token.get("machineToken", ""), contract_id
-    )
+    try:
+        # The validators are only kept while the token reflects the expiry
+        # of the response they came from, so an unchanged answer means an
+        # unchanged expiry
+        resp = contract_client.get_contract_machine(
+            orig_token.get("machineToken", ""),
+            contract_id,
+            validators=machine_token_file.get_validators(
+                contract.API_V1_GET_CONTRACT_MACHINE
+            ),
+        )
+    except exceptions.ETagUnchanged:
+        return
     resp_expiry = (
         resp.get("machineTokenInfo", {})
         .get("contractInfo", {})
@@ -54,6 +77,10 @@ def update_contract_expiry(cfg: UAConfig):
             "effectiveTo"
         ] = resp_expiry
         machine_token_file.write(orig_token)
+    machine_token_file.write_validators(
+        contract.API_V1_GET_CONTRACT_MACHINE,
+        contract_client.last_response_validators,
+    )
 
 
 def update_motd_messages(cfg: UAConfig) -> bool:
@@ -161,6 +188,65 @@ def update_motd_messages(cfg: UAConfig) -> bool:
     return True
 
 
+def _get_mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _get_update_messaging_inputs(cfg: UAConfig) -> UpdateMessagingInputs:
+    is_attached_info = _is_attached(cfg)
+    machine_token_file = machine_token.get_machine_token_file(cfg)
+
+    # The number of remaining days only shows up in the messages when the
+    # contract is about to expire or already expired. Tracking it in any
+    # other state would regenerate the messages every day for nothing.
+    remaining_days = None
+    if is_attached_info.contract_status not in (
+        ContractExpiryStatus.ACTIVE.value,
+        ContractExpiryStatus.NONE.value,
+    ):
+        remaining_days = is_attached_info.contract_remaining_days
+
+    return UpdateMessagingInputs(
+        machine_token_mtime=_get_mtime(machine_token_file.public_file.path),
+        dpkg_status_mtime=apt.get_dpkg_status_time(),
+        apt_cache_mtime=apt.get_apt_cache_time(),
+        contract_status=is_attached_info.contract_status,
+        contract_remaining_days=remaining_days,
+    )
+
+
+def update_motd_messages_on_change(cfg: UAConfig) -> bool:
+    """Emit the MOTD messages only if their inputs changed since last time.
+
+    Used by the timer job. The messages depend on the machine token, on the
+    installed packages and apt lists, and on how close the contract is to
+    expiring. When none of those changed, the messages on disk are still
+    correct and we avoid recomputing them, including the contract server
+    call made for contracts close to expiry.
+
+    :param cfg: UAConfig instance for this environment.
+    """
+    try:
+        previous_inputs = update_messaging_inputs_file.read()
+    except Exception as e:
+        LOG.warning("Ignoring invalid update messaging inputs: %s", str(e))
+        previous_inputs = None
+
+    current_inputs = _get_update_messaging_inputs(cfg)
+    if previous_inputs is not None and previous_inputs == current_inputs:
+        LOG.debug("Update messaging inputs unchanged, skipping messages.")
+        return False
+
+    result = update_motd_messages(cfg)
+    # Read the inputs again, as the contract expiry check may have updated
+    # the machine token
+    update_messaging_inputs_file.write(_get_update_messaging_inputs(cfg))
+    return result
+
+
 def refresh_motd():
     # If update-notifier is present, we might as well update
     # the package updates count related to MOTD
@@ -169,6 +255,8 @@ def refresh_motd():
         # since this command should already be triggered by
         # update-notifier apt hooks
         try:
-            system.subp([UPDATE_NOTIFIER_MOTD_SCRIPT, "--force"])
+            system.subp(
+                [UPDATE_NOTIFIER_MOTD_SCRIPT, "--force"], mutating=True
+            )
         except Exception as exc:
             LOG.exception(exc)
@@ -3,17 +3,12 @@ Client version related functions
 """
 
 import os.path
-from math import inf
 from typing import Optional
 
-from uaclient.apt import (
-    get_apt_cache_time,
-    get_pkg_candidate_version,
-    version_compare,
-)
+from uaclient.apt import get_pkg_candidate_version, version_compare
 from uaclient.defaults import CANDIDATE_CACHE_PATH, UAC_RUN_PATH
 from uaclient.exceptions import ProcessExecutionError
-from uaclient.system import subp
+from uaclient.system import ensure_file_absent, subp
 
 __VERSION__ = "1:1+devel"
 PACKAGED_VERSION = "@@PACKAGED_VERSION@@"
@@ -44,29 +39,31 @@ def get_version() -> str:
     return __VERSION__
 
 
-def get_last_known_candidate() -> Optional[str]:
-    # If we can't determine when the cache was updated for the last time,
-    # We always assume it was as recent as possible - thus `inf`.
-    last_apt_cache_update = get_apt_cache_time() or inf
-    if (
-        not os.path.exists(CANDIDATE_CACHE_PATH)
-        or os.stat(CANDIDATE_CACHE_PATH).st_mtime < last_apt_cache_update
-    ):
-        candidate_version = None
-        try:
-            candidate_version = get_pkg_candidate_version("ubuntu-pro-client")
-            if candidate_version:
-                os.makedirs(UAC_RUN_PATH, exist_ok=True)
-                with open(CANDIDATE_CACHE_PATH, "w") as f:
-                    f.write(candidate_version)
-                return candidate_version
-        except Exception:
-            if candidate_version is not None:
-                return candidate_version
+def update_candidate_version_cache() -> None:
+    """
+    Look up the candidate version of ubuntu-pro-client in the apt cache and
+    store it in CANDIDATE_CACHE_PATH for get_last_known_candidate.
 
+    Opening the apt cache is expensive, so this is meant to run in the
+    background (apt update hook, timer, pro refresh) and never on the path
+    of a user facing command or API call.
+    """
+    candidate_version = get_pkg_candidate_version("ubuntu-pro-client")
+    if candidate_version:
+        os.makedirs(UAC_RUN_PATH, exist_ok=True)
+        with open(CANDIDATE_CACHE_PATH, "w") as f:
+            f.write(candidate_version)
+    else:
+        ensure_file_absent(CANDIDATE_CACHE_PATH)
+
+
+def get_last_known_candidate() -> Optional[str]:
+    # This only reads the value stored by update_candidate_version_cache.
+    # If it is missing, we don't know about new versions until the next
+    # background refresh, which is preferable to blocking on the apt cache.
     try:
         with open(CANDIDATE_CACHE_PATH, "r") as f:
-            return f.read().strip()
+            return f.read().strip() or None
     except Exception:
         pass
 